@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, Request
-from typing import Dict, Any, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Dict, Any, List, Optional
 import logging
 
 from app.schemas.asset_schema import AssetListResponse
 from app.services.asset_service import AssetService
 from app.repositories.asset_repo import AssetRepository
+from app.repositories.transaction_repo import TransactionRepository
+from app.services.transaction_service import TransactionService
 from app.database import get_db_client
 from app.utilities.auth_middleware import get_current_user, get_wallet_address, check_permission
 
@@ -25,16 +27,23 @@ def get_asset_service(db_client=Depends(get_db_client)) -> AssetService:
 @router.get("/user/{wallet_address}", response_model=AssetListResponse)
 async def get_user_assets(
     wallet_address: str,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of assets to return"),
+    after: Optional[str] = Query(None, description="next_cursor from the previous page"),
     asset_service: AssetService = Depends(get_asset_service),
     current_user: Dict[str, Any] = Depends(get_current_user),
     read_permission = Depends(check_permission("read"))
 ) -> AssetListResponse:
     """
-    Get all assets owned by a specific wallet address.
+    Get all assets owned by a specific wallet address, newest first.
     User must be authenticated with 'read' permission to use this endpoint.
     
+    Pass limit to page through the results; each response carries next_cursor,
+    which is passed back as after to get the following page.
+    
     Args:
         wallet_address: The wallet address to get assets for
+        limit: Maximum number of assets to return (all if omitted)
+        after: Cursor from the previous page
         asset_service: The asset service
         current_user: The authenticated user data
         read_permission: Validates user has 'read' permission
@@ -54,9 +63,87 @@ async def get_user_assets(
             return {"status": "success", "assets": []}
         
         # Get assets
-        assets = await asset_service.get_user_assets(wallet_address)
-        return {"status": "success", "assets": assets}
+        page = await asset_service.get_user_assets_page(wallet_address, limit=limit, after=after)
+        return {"status": "success", "assets": page["assets"], "next_cursor": page["next_cursor"]}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting user assets: {str(e)}")
         # Return empty list instead of error to match frontend expectations
-        return {"status": "success", "assets": []}
\ No newline at end of file
+        return {"status": "success", "assets": []}
+
+@router.post("/migrate-addresses", response_model=Dict[str, Any])
+async def migrate_address_fields(
+    batch_size: int = Query(1000, ge=1, le=10000, description="Documents updated per round trip"),
+    db_client=Depends(get_db_client),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Backfill the lowercase address fields used by wallet queries.
+    
+    This is an admin-only endpoint. Assets and transactions written before
+    walletAddressLower/performedByLower existed will not show up in wallet
+    listings until it has run. It is safe to run while the API is serving
+    traffic and to run more than once.
+    
+    Args:
+        batch_size: Number of documents updated per round trip
+        db_client: The database client
+        current_user: The authenticated user data
+        
+    Returns:
+        Migration summary for the assets and transactions collections
+    """
+    if current_user.get("role", "user") != "admin":
+        logger.warning(f"Unauthorized migration attempt: User {current_user.get('walletAddress')} tried to run address migration")
+        raise HTTPException(
+            status_code=403,
+            detail="Only administrators can run address migrations"
+        )
+    
+    try:
+        asset_service = AssetService(AssetRepository(db_client))
+        transaction_service = TransactionService(TransactionRepository(db_client))
+        return {
+            "assets": await asset_service.migrate_address_fields(batch_size),
+            "transactions": await transaction_service.migrate_address_fields(batch_size)
+        }
+    except Exception as e:
+        logger.error(f"Error during address migration: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error during address migration: {str(e)}")
+
+@router.post("/migrate-version-history", response_model=Dict[str, Any])
+async def migrate_version_history(
+    batch_size: int = Query(1000, ge=1, le=10000, description="Documents updated per round trip"),
+    db_client=Depends(get_db_client),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Strip the documentHistory arrays stored on older asset versions.
+    
+    This is an admin-only endpoint. Version lineage is read from
+    previousVersionId and the (assetId, versionNumber) index, so the arrays
+    are no longer used. It is safe to run while the API is serving traffic
+    and to run more than once.
+    
+    Args:
+        batch_size: Number of documents updated per round trip
+        db_client: The database client
+        current_user: The authenticated user data
+        
+    Returns:
+        Migration summary for the assets collection
+    """
+    if current_user.get("role", "user") != "admin":
+        logger.warning(f"Unauthorized migration attempt: User {current_user.get('walletAddress')} tried to run version history migration")
+        raise HTTPException(
+            status_code=403,
+            detail="Only administrators can run version history migrations"
+        )
+    
+    try:
+        asset_service = AssetService(AssetRepository(db_client))
+        return {"assets": await asset_service.migrate_version_history(batch_size)}
+    except Exception as e:
+        logger.error(f"Error during version history migration: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error during version history migration: {str(e)}")
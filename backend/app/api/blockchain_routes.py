@@ -7,12 +7,17 @@ from web3 import Web3
 from app.services.blockchain_service import BlockchainService
 from app.services.transaction_state_service import TransactionStateService
 from app.services.asset_service import AssetService
-from app.services.ipfs_service import IPFSService
 from app.services.transaction_service import TransactionService
+from app.services.service_container import (
+    get_service_container,
+    get_blockchain_service,
+    get_transaction_state_service
+)
 from app.repositories.asset_repo import AssetRepository
 from app.repositories.transaction_repo import TransactionRepository
 from app.handlers.upload_handler import UploadHandler
 from app.utilities.auth_middleware import get_current_user, get_wallet_address
+from app.utilities.web3_utils import maybe_await
 from app.database import get_db_client
 
 logger = logging.getLogger(__name__)
@@ -67,31 +72,21 @@ class GasEstimationResponse(BaseModel):
     function_name: Optional[str] = None
     error: Optional[str] = None
 
-def get_blockchain_service() -> BlockchainService:
-    """Dependency to get the blockchain service."""
-    return BlockchainService()
-
-def get_transaction_state_service() -> TransactionStateService:
-    """Dependency to get the transaction state service."""
-    return TransactionStateService()
-
 def get_upload_handler_for_blockchain(db_client=Depends(get_db_client)) -> UploadHandler:
     """Dependency to get the upload handler with all required dependencies."""
     asset_repo = AssetRepository(db_client)
     transaction_repo = TransactionRepository(db_client)
     
     asset_service = AssetService(asset_repo)
-    ipfs_service = IPFSService()
-    blockchain_service = BlockchainService()
+    container = get_service_container()
     transaction_service = TransactionService(transaction_repo)
-    transaction_state_service = TransactionStateService()
     
     return UploadHandler(
         asset_service=asset_service,
-        ipfs_service=ipfs_service,
-        blockchain_service=blockchain_service,
+        ipfs_service=container.ipfs_service,
+        blockchain_service=container.blockchain_service,
         transaction_service=transaction_service,
-        transaction_state_service=transaction_state_service
+        transaction_state_service=container.transaction_state_service
     )
 
 @router.post("/prepare-transaction", response_model=TransactionResponse)
@@ -288,7 +283,7 @@ async def get_transaction_status(
         
         # Try to get transaction receipt (indicates transaction is mined)
         try:
-            receipt = blockchain_service.web3.eth.get_transaction_receipt(tx_hash_bytes)
+            receipt = await maybe_await(blockchain_service.web3.eth.get_transaction_receipt(tx_hash_bytes))
             if receipt:
                 # Transaction is mined
                 success = receipt.status == 1
@@ -376,7 +371,7 @@ async def get_transaction_status(
             
         # Check if transaction exists in mempool (pending)
         try:
-            tx_data = blockchain_service.web3.eth.get_transaction(tx_hash_bytes)
+            tx_data = await maybe_await(blockchain_service.web3.eth.get_transaction(tx_hash_bytes))
             if tx_data:
                 return {
                     "status": "pending",
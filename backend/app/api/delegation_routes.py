@@ -4,6 +4,7 @@ from pydantic import BaseModel
 import logging
 
 from app.services.blockchain_service import BlockchainService
+from app.services.service_container import get_blockchain_service, get_delegation_cache, get_service_container
 from app.services.user_service import UserService
 from app.services.asset_service import AssetService
 from app.services.transaction_service import TransactionService
@@ -27,7 +28,8 @@ from app.schemas.delegation_schema import (
     DelegationSyncRequest,
     DelegationSyncResponse
 )
-from app.utilities.auth_middleware import get_current_user, get_wallet_address, get_wallet_only_user
+from app.utilities.auth_middleware import get_current_user, get_wallet_address, get_wallet_only_user, check_permission
+from app.utilities.web3_utils import maybe_await
 from app.database import get_db_client
 from app.config import settings
 
@@ -35,11 +37,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/delegation", tags=["Delegation"])
 
 
-def get_blockchain_service() -> BlockchainService:
-    """Dependency to get the blockchain service."""
-    return BlockchainService()
-
-
 def get_user_service(db_client=Depends(get_db_client)) -> UserService:
     """Dependency to get the user service."""
     user_repo = UserRepository(db_client)
@@ -87,6 +84,30 @@ async def get_server_info():
     )
 
 
+@router.get("/cache/stats")
+async def get_delegation_cache_stats(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    read_permission = Depends(check_permission("read"))
+) -> Dict[str, Any]:
+    """
+    Get hit/miss counters for the delegation cache and the state of its event watcher.
+    User must be authenticated with 'read' permission to use this endpoint.
+
+    Returns:
+        Dict of cache counters, with "enabled" False when the cache is off
+    """
+    cache = get_delegation_cache()
+    if cache is None:
+        return {"enabled": False}
+
+    watcher = get_service_container().delegation_watcher
+    return {
+        "enabled": True,
+        **cache.stats(),
+        "watcher": watcher.status() if watcher else None
+    }
+
+
 @router.get("/status", response_model=DelegationStatusResponse)
 async def check_delegation_status(
     wallet_address: str = Depends(get_wallet_address),
@@ -306,6 +327,11 @@ async def confirm_user_delegation(
         
         # Update database immediately
         delegation_id = await delegation_repo.upsert_delegation(delegation_data)
+
+        # The next check reads the new status from the chain instead of the cache
+        cache = get_delegation_cache()
+        if cache is not None:
+            cache.invalidate(confirm_request.owner_address, confirm_request.delegate_address)
         
         logger.info(
             f"Delegation confirmed: {confirm_request.owner_address} -> "
@@ -362,7 +388,8 @@ async def sync_delegation_from_blockchain(
         # Check current blockchain state (source of truth)
         blockchain_status = await blockchain_service.check_delegation(
             owner_address=sync_request.owner_address,
-            delegate_address=sync_request.delegate_address
+            delegate_address=sync_request.delegate_address,
+            strict=True
         )
         
         # Check current database state
@@ -847,30 +874,18 @@ async def get_delegated_assets_summary(
                 limit=5  # Get last 5 transactions
             )
             
-            # Enrich transactions with asset names
+            # Enrich transactions with asset names, reusing the assets fetched above
+            asset_names = {
+                asset_doc.get('assetId'): asset_doc.get('criticalMetadata', {}).get('name') or asset_doc.get('nonCriticalMetadata', {}).get('name')
+                for asset_doc in assets
+            }
             enriched_transactions = []
             for transaction in recent_transactions:
                 enriched_transaction = transaction.copy()
                 asset_id = transaction.get('assetId')
                 
                 if asset_id:
-                    try:
-                        # Get asset metadata to extract name
-                        asset_documents = await asset_service.get_user_assets(owner_address)
-                        asset_name = None
-                        
-                        # Find the asset with matching ID
-                        for asset_doc in asset_documents:
-                            if asset_doc.get('assetId') == asset_id:
-                                asset_name = asset_doc.get('criticalMetadata', {}).get('name') or asset_doc.get('nonCriticalMetadata', {}).get('name')
-                                break
-                        
-                        # Add asset name to transaction
-                        enriched_transaction['assetName'] = asset_name or asset_id
-                        
-                    except Exception as asset_error:
-                        logger.warning(f"Failed to get asset name for {asset_id}: {str(asset_error)}")
-                        enriched_transaction['assetName'] = asset_id
+                    enriched_transaction['assetName'] = asset_names.get(asset_id) or asset_id
                 else:
                     enriched_transaction['assetName'] = 'Unknown Asset'
                 
@@ -925,6 +940,8 @@ def categorize_content_type(content_type: str) -> str:
 @router.get("/users/{owner_address}/assets", response_model=DelegatedAssetsResponse)
 async def get_delegated_assets(
     owner_address: str,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of assets to return"),
+    after: Optional[str] = Query(None, description="next_cursor from the previous page"),
     wallet_address: str = Depends(get_wallet_address),
     blockchain_service: BlockchainService = Depends(get_blockchain_service),
     user_service: UserService = Depends(get_user_service),
@@ -938,6 +955,8 @@ async def get_delegated_assets(
     
     Args:
         owner_address: The address of the user who delegated to me
+        limit: Maximum number of assets to return (all if omitted)
+        after: Cursor from the previous page
         
     Returns:
         DelegatedAssetsResponse with assets I can manage
@@ -981,7 +1000,12 @@ async def get_delegated_assets(
             owner_location = user_data.get("location")
         
         # Get assets for the owner
-        assets = await asset_service.get_user_assets(owner_address)
+        try:
+            page = await asset_service.get_user_assets_page(owner_address, limit=limit, after=after)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        assets = page["assets"]
+        total_assets = await asset_service.count_user_assets(owner_address) if limit else len(assets)
         
         return DelegatedAssetsResponse(
             owner_address=owner_address,
@@ -993,7 +1017,8 @@ async def get_delegated_assets(
             owner_bio=owner_bio,
             owner_location=owner_location,
             assets=assets,
-            total_assets=len(assets)
+            total_assets=total_assets,
+            next_cursor=page["next_cursor"]
         )
         
     except HTTPException:
@@ -1086,7 +1111,7 @@ async def get_system_status(
     try:
         # Check blockchain connectivity
         try:
-            current_block = blockchain_service.web3.eth.get_block('latest')['number']
+            current_block = (await maybe_await(blockchain_service.web3.eth.get_block('latest')))['number']
             blockchain_status = "connected"
             blockchain_block = current_block
         except Exception as e:
@@ -10,8 +10,7 @@ from app.schemas.delete_schema import (
 )
 from app.services.asset_service import AssetService
 from app.services.transaction_service import TransactionService
-from app.services.blockchain_service import BlockchainService
-from app.services.transaction_state_service import TransactionStateService
+from app.services.service_container import get_service_container
 from app.repositories.asset_repo import AssetRepository
 from app.repositories.transaction_repo import TransactionRepository
 from app.database import get_db_client
@@ -39,8 +38,9 @@ def get_delete_handler(db_client=Depends(get_db_client), request: Request = None
     
     asset_service = AssetService(asset_repo)
     transaction_service = TransactionService(transaction_repo)
-    blockchain_service = BlockchainService()
-    transaction_state_service = TransactionStateService()
+    container = get_service_container()
+    blockchain_service = container.blockchain_service
+    transaction_state_service = container.transaction_state_service
     
     # Get auth context from request state if available
     auth_context = None
@@ -7,8 +7,7 @@ import asyncio
 from app.handlers.retrieve_handler import RetrieveHandler
 from app.schemas.retrieve_schema import MetadataRetrieveResponse, ProgressMessage
 from app.services.asset_service import AssetService
-from app.services.blockchain_service import BlockchainService
-from app.services.ipfs_service import IPFSService
+from app.services.service_container import get_cid_cache, get_service_container, get_verification_cache
 from app.services.transaction_service import TransactionService
 from app.repositories.asset_repo import AssetRepository
 from app.repositories.transaction_repo import TransactionRepository
@@ -30,22 +29,57 @@ def get_retrieve_handler(db_client=Depends(get_db_client)) -> RetrieveHandler:
     transaction_repo = TransactionRepository(db_client)
     
     asset_service = AssetService(asset_repo)
-    blockchain_service = BlockchainService()
-    ipfs_service = IPFSService()
+    container = get_service_container()
+    blockchain_service = container.blockchain_service
+    ipfs_service = container.ipfs_service
     transaction_service = TransactionService(transaction_repo)
     
     return RetrieveHandler(
         asset_service=asset_service,
         blockchain_service=blockchain_service,
         ipfs_service=ipfs_service,
-        transaction_service=transaction_service
+        transaction_service=transaction_service,
+        verification_cache=container.verification_cache
     )
 
+@router.get("/cache/stats")
+async def get_cache_stats(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    read_permission = Depends(check_permission("read"))
+) -> Dict[str, Any]:
+    """
+    Get hit/miss counters for the IPFS metadata cache.
+    User must be authenticated with 'read' permission to use this endpoint.
+
+    Returns:
+        Dict of cache counters
+    """
+    return get_cid_cache().stats()
+
+@router.get("/verification-cache/stats")
+async def get_verification_cache_stats(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    read_permission = Depends(check_permission("read"))
+) -> Dict[str, Any]:
+    """
+    Get hit/miss counters for the verified-retrieval cache.
+    User must be authenticated with 'read' permission to use this endpoint.
+
+    Returns:
+        Dict of cache counters, with "enabled" false when VERIFICATION_CACHE_ENABLED is off
+    """
+    cache = get_verification_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
 @router.get("/{asset_id}", response_model=MetadataRetrieveResponse)
 async def retrieve_metadata(
     asset_id: str,
     version: Optional[int] = Query(None, description="Specific version to retrieve"),
     auto_recover: bool = Query(True, description="Whether to automatically recover from tampering"),
+    verify: str = Query("cached", pattern="^(cached|strict)$", description="'strict' verifies against the blockchain even if a cached verification exists"),
+    max_age: Optional[float] = Query(None, ge=0, description="Oldest cached verification to accept, in seconds"),
     retrieve_handler: RetrieveHandler = Depends(get_retrieve_handler),
     current_user: Dict[str, Any] = Depends(get_current_user),
     read_permission = Depends(check_permission("read"))
@@ -61,6 +95,8 @@ async def retrieve_metadata(
         asset_id: The asset ID to retrieve metadata for
         version: Optional specific version to retrieve (defaults to current version)
         auto_recover: Whether to automatically recover from tampering (defaults to True)
+        verify: "cached" to reuse a recent verification of the unchanged asset, "strict" to always verify on chain
+        max_age: Oldest cached verification to accept in seconds (capped by VERIFICATION_CACHE_MAX_AGE)
         current_user: The authenticated user data
         read_permission: Validates user has 'read' permission
         
@@ -69,7 +105,9 @@ async def retrieve_metadata(
     """
     # Get initiator address for authorization
     initiator_address = current_user.get("walletAddress")
-    result = await retrieve_handler.retrieve_metadata(asset_id, version, auto_recover, initiator_address)
+    result = await retrieve_handler.retrieve_metadata(
+        asset_id, version, auto_recover, initiator_address, strict=verify == "strict", max_age=max_age
+    )
     return result
 
 
@@ -78,6 +116,8 @@ async def retrieve_metadata_stream(
     asset_id: str,
     version: Optional[int] = Query(None, description="Specific version to retrieve"),
     auto_recover: bool = Query(True, description="Whether to automatically recover from tampering"),
+    verify: str = Query("cached", pattern="^(cached|strict)$", description="'strict' verifies against the blockchain even if a cached verification exists"),
+    max_age: Optional[float] = Query(None, ge=0, description="Oldest cached verification to accept, in seconds"),
     api_key: Optional[str] = Query(None, description="API key for authentication (alternative to cookie auth)", alias="key"),
     retrieve_handler: RetrieveHandler = Depends(get_retrieve_handler),
     current_user: Dict[str, Any] = Depends(get_current_user),
@@ -94,6 +134,8 @@ async def retrieve_metadata_stream(
         asset_id: The asset ID to retrieve metadata for
         version: Optional specific version to retrieve (defaults to current version)
         auto_recover: Whether to automatically recover from tampering (defaults to True)
+        verify: "cached" to reuse a recent verification of the unchanged asset, "strict" to always verify on chain
+        max_age: Oldest cached verification to accept in seconds (capped by VERIFICATION_CACHE_MAX_AGE)
         current_user: The authenticated user data
         read_permission: Validates user has 'read' permission
         
@@ -122,7 +164,8 @@ async def retrieve_metadata_stream(
                 # Get initiator address for authorization
                 initiator_address = current_user.get("walletAddress")
                 result = await retrieve_handler.retrieve_metadata_with_progress(
-                    asset_id, progress_callback, version, auto_recover, initiator_address
+                    asset_id, progress_callback, version, auto_recover, initiator_address,
+                    strict=verify == "strict", max_age=max_age
                 )
                 result_container["result"] = result
                 # Send completion message
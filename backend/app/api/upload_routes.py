@@ -1,18 +1,20 @@
-from fastapi import APIRouter, Depends, File, Form, UploadFile, Body, HTTPException, Request
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Depends, File, Form, UploadFile, Body, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Dict, Any, AsyncGenerator
+import asyncio
 import logging
 import json
+import time
 
 from app.handlers.upload_handler import UploadHandler
 from app.schemas.upload_schema import (
-    MetadataUploadRequest, MetadataUploadResponse, CsvUploadResponse, JsonUploadResponse,
+    MetadataUploadRequest, MetadataUploadResponse, CsvUploadResponse, CsvImportResultsResponse, JsonUploadResponse,
     BatchUploadRequest, BatchUploadResponse, BatchCompletionRequest
 )
+from app.config import settings
 from app.services.asset_service import AssetService
-from app.services.ipfs_service import IPFSService
-from app.services.blockchain_service import BlockchainService
 from app.services.transaction_service import TransactionService
-from app.services.transaction_state_service import TransactionStateService
+from app.services.service_container import get_service_container, get_transaction_state_service
 from app.repositories.asset_repo import AssetRepository
 from app.repositories.transaction_repo import TransactionRepository
 from app.database import get_db_client
@@ -28,6 +30,9 @@ router = APIRouter(
 
 logger = logging.getLogger(__name__)
 
+# Seconds between keepalive comments on an idle progress stream
+STREAM_KEEPALIVE_SECONDS = 15.0
+
 # Pydantic models for completion endpoints
 class UploadCompletionRequest(BaseModel):
     pending_tx_id: str = Field(..., alias="pending_tx_id")
@@ -48,10 +53,11 @@ def get_upload_handler(db_client=Depends(get_db_client), request: Request = None
     transaction_repo = TransactionRepository(db_client)
     
     asset_service = AssetService(asset_repo)
-    ipfs_service = IPFSService()
-    blockchain_service = BlockchainService()
+    container = get_service_container()
+    ipfs_service = container.ipfs_service
+    blockchain_service = container.blockchain_service
     transaction_service = TransactionService(transaction_repo)
-    transaction_state_service = TransactionStateService()
+    transaction_state_service = container.transaction_state_service
     
     # Get auth context from request state if available
     auth_context = None
@@ -116,7 +122,8 @@ async def upload_metadata(
                 # User doesn't own the asset - check delegation
                 is_delegated = await upload_handler.blockchain_service.check_delegation(
                     owner_address=actual_owner_address,
-                    delegate_address=authenticated_wallet
+                    delegate_address=authenticated_wallet,
+                    strict=settings.delegation_strict_writes
                 )
                 
                 if not is_delegated:
@@ -211,7 +218,7 @@ async def upload_csv_files(
         current_user: The authenticated user data
         
     Returns:
-        CsvUploadResponse with processing results for each file
+        CsvUploadResponse with the import ID, row counts per status and file-level errors
     """
     # Verify that the authenticated user is the one initiating the upload
     authenticated_wallet = current_user.get("walletAddress")
@@ -229,6 +236,58 @@ async def upload_csv_files(
     )
     return CsvUploadResponse(**result)
 
+@router.get("/csv/{import_id}/results", response_model=CsvImportResultsResponse)
+async def get_csv_import_results(
+    import_id: str,
+    offset: int = Query(0, ge=0, description="Position of the first result to return"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of results to return"),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    read_permission = Depends(check_permission("read"))
+) -> CsvImportResultsResponse:
+    """
+    Page through the per-row results of a CSV upload.
+    Only the wallet that ran the upload can read its results.
+    
+    Args:
+        import_id: Identifier returned by POST /upload/csv
+        offset: Position of the first result to return
+        limit: Maximum number of results to return
+        current_user: The authenticated user data
+        read_permission: Validates user has 'read' permission
+        
+    Returns:
+        CsvImportResultsResponse with the import's status and one page of results
+    """
+    try:
+        from app.services.import_result_store import get_import_result_store
+        
+        result_store = get_import_result_store()
+        summary = await result_store.get_summary(import_id)
+        if summary is None:
+            raise HTTPException(status_code=404, detail=f"CSV import {import_id} not found")
+        
+        if summary["initiator_address"].lower() != current_user.get("walletAddress", "").lower():
+            raise HTTPException(status_code=403, detail="You can only view results of your own uploads")
+        
+        results = await result_store.get_results(import_id, offset=offset, limit=limit)
+        return CsvImportResultsResponse(
+            import_id=import_id,
+            finished=summary["finished"],
+            result_count=summary["result_count"],
+            status_counts=summary["status_counts"],
+            offset=offset,
+            results=results or []
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting CSV import results for {import_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get CSV import results: {str(e)}"
+        )
+
 @router.post("/process", response_model=MetadataUploadResponse)
 async def process_metadata(
     metadata_request: MetadataUploadRequest = Body(...),
@@ -272,7 +331,8 @@ async def process_metadata(
                 # User doesn't own the asset - check delegation
                 is_delegated = await upload_handler.blockchain_service.check_delegation(
                     owner_address=actual_owner_address,
-                    delegate_address=authenticated_wallet
+                    delegate_address=authenticated_wallet,
+                    strict=settings.delegation_strict_writes
                 )
                 
                 if not is_delegated:
@@ -405,7 +465,7 @@ async def get_pending_transaction(
             raise HTTPException(status_code=401, detail="Unable to determine wallet address")
         
         # Get transaction state service
-        transaction_state_service = TransactionStateService()
+        transaction_state_service = get_transaction_state_service()
         
         # Get pending transaction
         pending_data = await transaction_state_service.get_pending_transaction(pending_tx_id)
@@ -448,7 +508,7 @@ async def list_pending_transactions(
             raise HTTPException(status_code=401, detail="Unable to determine wallet address")
         
         # Get transaction state service
-        transaction_state_service = TransactionStateService()
+        transaction_state_service = get_transaction_state_service()
         
         # Get user's pending transactions
         pending_transactions = await transaction_state_service.get_user_pending_transactions(authenticated_wallet)
@@ -485,7 +545,7 @@ async def cancel_pending_transaction(
             raise HTTPException(status_code=401, detail="Unable to determine wallet address")
         
         # Get transaction state service
-        transaction_state_service = TransactionStateService()
+        transaction_state_service = get_transaction_state_service()
         
         # Get pending transaction to verify ownership
         pending_data = await transaction_state_service.get_pending_transaction(pending_tx_id)
@@ -706,10 +766,10 @@ async def get_batch_progress(
         Dict containing batch progress information
     """
     try:
-        from app.services.progress_service import progress_tracker
+        from app.services.progress_service import get_progress_tracker
         
         # Get progress data
-        progress_data = progress_tracker.get_batch_progress(batch_id)
+        progress_data = await get_progress_tracker().get_batch_progress(batch_id)
         
         if progress_data is None:
             raise HTTPException(
@@ -727,3 +787,108 @@ async def get_batch_progress(
             status_code=500,
             detail=f"Failed to get batch progress: {str(e)}"
         )
+
+@router.get("/batch/{batch_id}/stream")
+async def stream_batch_progress(
+    batch_id: str,
+    api_key: Optional[str] = Query(None, description="API key for authentication (alternative to cookie auth)", alias="key"),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    read_permission = Depends(check_permission("read"))
+) -> StreamingResponse:
+    """
+    Stream batch upload progress via Server-Sent Events.
+    Available for both wallet and API key authenticated users with read permission.
+
+    The first message is a snapshot of the batch, shaped like the response of
+    /upload/batch/{batch_id}/progress with "type": "snapshot". After that only
+    changes are sent: "assets" messages with the assets whose progress changed
+    (plus updated completed_count and error_count), a "blockchain_prepared"
+    message with the transaction to sign, and a final "finished" message,
+    after which the stream closes.
+
+    Args:
+        batch_id: Unique identifier for the batch upload
+        current_user: The authenticated user data
+        read_permission: Validates user has 'read' permission
+
+    Returns:
+        StreamingResponse with Server-Sent Events containing progress changes
+    """
+    from app.services.progress_service import get_progress_tracker
+
+    progress_tracker = get_progress_tracker()
+    if await progress_tracker.get_batch_progress(batch_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Batch {batch_id} not found"
+        )
+
+    def to_sse_data(event: Dict[str, Any]) -> str:
+        return f"data: {json.dumps(event, default=str)}\n\n"
+
+    async def progress_generator() -> AsyncGenerator[str, None]:
+        """Generate Server-Sent Events for batch progress changes."""
+        try:
+            async with progress_tracker.subscribe(batch_id) as events:
+                # Subscribed first, so nothing published after the snapshot is missed
+                snapshot = await progress_tracker.get_batch_progress(batch_id)
+                if snapshot is None:
+                    yield to_sse_data({"type": "error", "batch_id": batch_id, "error": "Batch expired"})
+                    return
+
+                yield to_sse_data({"type": "snapshot", **snapshot})
+                if snapshot.get("finished"):
+                    return
+
+                statuses = {asset_id: asset["status"] for asset_id, asset in snapshot["assets"].items()}
+                deadline = snapshot["created_at"] + progress_tracker.batch_ttl
+                event_queue = asyncio.Queue()
+
+                async def forward_events():
+                    async for event in events:
+                        await event_queue.put(event)
+
+                task = asyncio.create_task(forward_events())
+                try:
+                    while True:
+                        try:
+                            event = await asyncio.wait_for(event_queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                        except asyncio.TimeoutError:
+                            # Stop if the subscription died or the batch has expired
+                            if task.done() or time.time() > deadline:
+                                break
+                            yield ": keepalive\n\n"
+                            continue
+
+                        if event["type"] == "assets":
+                            statuses.update({asset_id: asset["status"] for asset_id, asset in event["assets"].items()})
+                            event = {
+                                **event,
+                                "completed_count": sum(1 for status in statuses.values() if status == "completed"),
+                                "error_count": sum(1 for status in statuses.values() if status == "error")
+                            }
+
+                        yield to_sse_data(event)
+                        if event["type"] == "finished":
+                            break
+                finally:
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
+
+        except Exception as e:
+            logger.error(f"Error streaming batch progress for {batch_id}: {str(e)}")
+            yield to_sse_data({"type": "error", "batch_id": batch_id, "error": str(e)})
+
+    return StreamingResponse(
+        progress_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Headers": "Cache-Control"
+        }
+    )
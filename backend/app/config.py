@@ -15,9 +15,62 @@ class Settings(BaseSettings):
     private_key: str = Field(alias="PRIVATE_KEY")
     alchemy_sepolia_url: str = Field(alias="ALCHEMY_SEPOLIA_URL")
     contract_address: Optional[str] = Field(None, alias="CONTRACT_ADDRESS")
+    blockchain_async_provider: bool = Field(default=True, alias="BLOCKCHAIN_ASYNC_PROVIDER")
+    blockchain_rpc_pool_size: int = Field(default=20, alias="BLOCKCHAIN_RPC_POOL_SIZE")
+    blockchain_rpc_timeout: float = Field(default=30.0, alias="BLOCKCHAIN_RPC_TIMEOUT")
+    blockchain_tx_replace_after: float = Field(default=60.0, alias="BLOCKCHAIN_TX_REPLACE_AFTER")
+    blockchain_tx_max_replacements: int = Field(default=2, alias="BLOCKCHAIN_TX_MAX_REPLACEMENTS")
+    blockchain_write_batching: bool = Field(default=True, alias="BLOCKCHAIN_WRITE_BATCHING")
+    blockchain_write_batch_window: float = Field(default=0.2, alias="BLOCKCHAIN_WRITE_BATCH_WINDOW")
+    blockchain_write_batch_max_size: int = Field(default=50, alias="BLOCKCHAIN_WRITE_BATCH_MAX_SIZE")
+    blockchain_health_check_interval: float = Field(default=30.0, alias="BLOCKCHAIN_HEALTH_CHECK_INTERVAL")
+    blockchain_multicall_address: Optional[str] = Field(
+        default="0xcA11bde05977b3631167028862bE2a173976CA11",
+        alias="BLOCKCHAIN_MULTICALL_ADDRESS"
+    )
+    blockchain_read_batch_size: int = Field(default=100, alias="BLOCKCHAIN_READ_BATCH_SIZE")
+    delegation_cache_enabled: bool = Field(default=True, alias="DELEGATION_CACHE_ENABLED")
+    delegation_cache_ttl: float = Field(default=300.0, alias="DELEGATION_CACHE_TTL")
+    delegation_cache_max_entries: int = Field(default=10000, alias="DELEGATION_CACHE_MAX_ENTRIES")
+    delegation_event_poll_interval: float = Field(default=15.0, alias="DELEGATION_EVENT_POLL_INTERVAL")
+    delegation_strict_writes: bool = Field(default=True, alias="DELEGATION_STRICT_WRITES")
+    verification_cache_enabled: bool = Field(default=False, alias="VERIFICATION_CACHE_ENABLED")
+    verification_cache_max_age: float = Field(default=30.0, alias="VERIFICATION_CACHE_MAX_AGE")
+    verification_cache_max_entries: int = Field(default=10000, alias="VERIFICATION_CACHE_MAX_ENTRIES")
+    session_cache_enabled: bool = Field(default=True, alias="SESSION_CACHE_ENABLED")
+    session_cache_ttl: float = Field(default=5.0, alias="SESSION_CACHE_TTL")
+    session_cache_max_entries: int = Field(default=10000, alias="SESSION_CACHE_MAX_ENTRIES")
+    session_cache_negative_ttl: float = Field(default=30.0, alias="SESSION_CACHE_NEGATIVE_TTL")
+    session_cache_redis: bool = Field(default=False, alias="SESSION_CACHE_REDIS")
+    session_cache_redis_ttl: int = Field(default=60, alias="SESSION_CACHE_REDIS_TTL")
+    event_indexer_enabled: bool = Field(default=False, alias="EVENT_INDEXER_ENABLED")
+    event_indexer_start_block: int = Field(default=0, alias="EVENT_INDEXER_START_BLOCK")
+    event_indexer_confirmations: int = Field(default=12, alias="EVENT_INDEXER_CONFIRMATIONS")
+    event_indexer_max_block_range: int = Field(default=2000, alias="EVENT_INDEXER_MAX_BLOCK_RANGE")
+    event_indexer_poll_interval: float = Field(default=15.0, alias="EVENT_INDEXER_POLL_INTERVAL")
+    log_scan_chunk_size: int = Field(default=10000, alias="LOG_SCAN_CHUNK_SIZE")
+    log_scan_max_chunk_size: int = Field(default=100000, alias="LOG_SCAN_MAX_CHUNK_SIZE")
+    log_scan_concurrency: int = Field(default=4, alias="LOG_SCAN_CONCURRENCY")
+    log_scan_retries: int = Field(default=3, alias="LOG_SCAN_RETRIES")
     
     # Web3 Storage settings
     web3_storage_service_url: str = Field(default="http://localhost:8080", alias="WEB3_STORAGE_SERVICE_URL")
+    ipfs_local_cid: bool = Field(default=True, alias="IPFS_LOCAL_CID")
+    ipfs_http2: bool = Field(default=True, alias="IPFS_HTTP2")
+    ipfs_http_max_connections: int = Field(default=100, alias="IPFS_HTTP_MAX_CONNECTIONS")
+    ipfs_http_max_keepalive: int = Field(default=20, alias="IPFS_HTTP_MAX_KEEPALIVE")
+    ipfs_http_keepalive_expiry: float = Field(default=30.0, alias="IPFS_HTTP_KEEPALIVE_EXPIRY")
+    ipfs_http_max_per_host: int = Field(default=20, alias="IPFS_HTTP_MAX_PER_HOST")
+    ipfs_cache_enabled: bool = Field(default=True, alias="IPFS_CACHE_ENABLED")
+    ipfs_cache_memory_bytes: int = Field(default=64 * 1024 * 1024, alias="IPFS_CACHE_MEMORY_BYTES")
+    ipfs_cache_dir: Optional[str] = Field(default=None, alias="IPFS_CACHE_DIR")
+    ipfs_gateways: str = Field(
+        default="https://{cid}.ipfs.w3s.link,https://{cid}.ipfs.dweb.link",
+        alias="IPFS_GATEWAYS"
+    )
+    ipfs_gateway_hedging: bool = Field(default=True, alias="IPFS_GATEWAY_HEDGING")
+    ipfs_gateway_hedge_delay: float = Field(default=0.5, alias="IPFS_GATEWAY_HEDGE_DELAY")
+    ipfs_gateway_timeout: float = Field(default=30.0, alias="IPFS_GATEWAY_TIMEOUT")
     
     # JWT settings
     jwt_secret_key: str = Field(alias="JWT_SECRET_KEY")
@@ -39,6 +92,20 @@ class Settings(BaseSettings):
     
     # Redis settings (for rate limiting)
     redis_url: Optional[str] = Field(None, alias="REDIS_URL")
+
+    # Batch upload progress tracking ("memory" for a single process, "redis" for several workers)
+    progress_backend: str = Field(default="memory", alias="PROGRESS_BACKEND")
+    progress_batch_ttl: int = Field(default=3600, alias="PROGRESS_BATCH_TTL")
+    progress_flush_interval: float = Field(default=0.1, alias="PROGRESS_FLUSH_INTERVAL")
+
+    # JSON uploads (files processed at once by POST /upload/json)
+    json_upload_concurrency: int = Field(default=8, alias="JSON_UPLOAD_CONCURRENCY")
+
+    # CSV imports (per-row results kept in "memory" for a single process, "redis" for several workers)
+    csv_import_chunk_rows: int = Field(default=1000, alias="CSV_IMPORT_CHUNK_ROWS")
+    csv_import_workers: int = Field(default=4, alias="CSV_IMPORT_WORKERS")
+    csv_import_result_backend: str = Field(default="memory", alias="CSV_IMPORT_RESULT_BACKEND")
+    csv_import_result_ttl: int = Field(default=86400, alias="CSV_IMPORT_RESULT_TTL")
     
     @validator("api_key_secret_key")
     def validate_api_key_secret(cls, v, values):
@@ -59,6 +126,11 @@ class Settings(BaseSettings):
             )
         return v
     
+    @property
+    def ipfs_gateway_list(self) -> List[str]:
+        """Parse IPFS gateway URL templates from comma-separated string."""
+        return [g.strip() for g in self.ipfs_gateways.split(",") if g.strip()]
+
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string"""
@@ -30,6 +30,12 @@ class JSONEncoder(json.JSONEncoder):
             return o.isoformat()
         return json.JSONEncoder.default(self, o)
 
+def _mock_sort_key(value: Any) -> tuple:
+    """Order numbers numerically and everything else as strings, numbers first."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value, "")
+    return (1, 0, str(value))
+
 # Mock collection for development
 class MockCollection:
     def __init__(self, name: str):
@@ -74,11 +80,21 @@ class MockCollection:
                 self._results = None
                 self._sort_field = None
                 self._sort_direction = 1
+                self._sort_keys = []
+                self._limit = None
                 
             def sort(self, field, direction=1):
-                """Add sorting to the cursor"""
-                self._sort_field = field
-                self._sort_direction = direction
+                """Add sorting to the cursor (a field name or a list of (field, direction) pairs)"""
+                if isinstance(field, list):
+                    self._sort_keys = field
+                else:
+                    self._sort_field = field
+                    self._sort_direction = direction
+                return self
+
+            def limit(self, count):
+                """Limit the number of results"""
+                self._limit = count
                 return self
                 
             async def to_list(self, length=None):
@@ -111,6 +127,14 @@ class MockCollection:
                             key=lambda x: x.get(self._sort_field, ""),
                             reverse=reverse
                         )
+                    # Compound sorts: stable sort by each key, least significant first
+                    for sort_field, sort_direction in reversed(self._sort_keys):
+                        self._results.sort(
+                            key=lambda x: _mock_sort_key(x.get(sort_field, "")),
+                            reverse=sort_direction == -1
+                        )
+                    if self._limit:
+                        self._results = self._results[:self._limit]
                 
                 return self._results[:length] if length else self._results
         
@@ -198,6 +222,22 @@ class MockCollection:
         
         return Result()
     
+    async def find_one_and_update(self, query: Dict[str, Any], update: Dict[str, Any], return_document: bool = False) -> Optional[Dict[str, Any]]:
+        """Update the first matching document and return it as it was before (default) or after the update"""
+        before = await self.find_one(query)
+        if before is None:
+            return None
+
+        for doc in self.data:
+            if str(doc.get("_id")) == before["_id"]:
+                for key, value in update.get("$set", {}).items():
+                    doc[key] = value
+                if return_document:
+                    return json.loads(json.dumps(doc, cls=JSONEncoder))
+                break
+
+        return before
+
     async def delete_one(self, query: Dict[str, Any]) -> Any:
         """Delete a document"""
         item = await self.find_one(query)
@@ -265,6 +305,27 @@ class MockCollection:
         
         return Result()
     
+    async def bulk_write(self, requests, ordered: bool = True) -> Any:
+        """Apply pymongo UpdateOne requests in order"""
+        modified = 0
+        upserted = 0
+
+        for request in requests:
+            result = await self.update_one(request._filter, request._doc, upsert=request._upsert)
+            modified += result.modified_count
+            upserted += result.upserted_id is not None
+
+        class Result:
+            @property
+            def modified_count(self):
+                return modified
+
+            @property
+            def upserted_count(self):
+                return upserted
+
+        return Result()
+
     async def count_documents(self, query: Dict[str, Any]) -> int:
         """Count documents matching query"""
         cursor = self.find(query)
@@ -275,12 +336,74 @@ class MockCollection:
         """Mock index creation"""
         return [f"mock_index_{i}" for i in range(len(indexes))]
 
+async def backfill_lowercase_fields(collection, fields: Dict[str, str], batch_size: int = 1000) -> int:
+    """
+    Write lowercase copies of string fields on documents that do not have them yet.
+
+    Documents are selected by _id in batches and lowercased server-side with an
+    update pipeline, so large collections are migrated without long-running
+    writes and the function can be re-run until it returns 0.
+
+    Args:
+        collection: Motor collection to migrate
+        fields: Mapping of source field to the lowercase field to write
+        batch_size: Number of documents updated per round trip
+
+    Returns:
+        Number of documents updated
+    """
+    updated = 0
+    for source, target in fields.items():
+        while True:
+            cursor = collection.find(
+                {target: {"$exists": False}, source: {"$type": "string"}},
+                {"_id": 1}
+            ).limit(batch_size)
+            ids = [doc["_id"] for doc in await cursor.to_list(length=batch_size)]
+            if not ids:
+                break
+            result = await collection.update_many(
+                {"_id": {"$in": ids}},
+                [{"$set": {target: {"$toLower": f"${source}"}}}]
+            )
+            updated += result.modified_count
+            logger.info(f"Backfilled {target} on {updated} documents in {collection.name}")
+    return updated
+
+async def unset_fields(collection, fields: List[str], batch_size: int = 1000) -> int:
+    """
+    Remove fields from every document that still has them, in batches.
+
+    Args:
+        collection: Motor collection to migrate
+        fields: Names of the fields to remove
+        batch_size: Number of documents updated per round trip
+
+    Returns:
+        Number of documents updated
+    """
+    updated = 0
+    query = {"$or": [{field: {"$exists": True}} for field in fields]}
+    while True:
+        cursor = collection.find(query, {"_id": 1}).limit(batch_size)
+        ids = [doc["_id"] for doc in await cursor.to_list(length=batch_size)]
+        if not ids:
+            break
+        result = await collection.update_many(
+            {"_id": {"$in": ids}},
+            {"$unset": {field: "" for field in fields}}
+        )
+        updated += result.modified_count
+        logger.info(f"Removed {', '.join(fields)} from {updated} documents in {collection.name}")
+    return updated
+
 class DatabaseClient:
     """Database client for MongoDB connection and collections."""
     
     def __init__(self):
         """Initialize with MongoDB connection or mock implementation."""
         self.using_mock = False
+        self._supports_transactions: Optional[bool] = None
         
         if MONGODB_AVAILABLE:
             mongo_uri = settings.mongo_uri
@@ -297,6 +420,8 @@ class DatabaseClient:
                 self.transaction_collection = self.db["transactions"]
                 self.users_collection = self.db["users"]
                 self.delegations_collection = self.db["delegations"]
+                self.chain_events_collection = self.db["chain_events"]
+                self.chain_indexer_state_collection = self.db["chain_indexer_state"]
                 
                 logger.info(f"Connected to MongoDB database: {db_name}")
                 
@@ -318,6 +443,8 @@ class DatabaseClient:
         self.transaction_collection = MockCollection("transactions")
         self.users_collection = MockCollection("users")
         self.delegations_collection = MockCollection("delegations")
+        self.chain_events_collection = MockCollection("chain_events")
+        self.chain_indexer_state_collection = MockCollection("chain_indexer_state")
         
         logger.warning("Using mock database for development")
     
@@ -339,6 +466,26 @@ class DatabaseClient:
         else:
             return self.db[collection_name]
     
+    async def supports_transactions(self) -> bool:
+        """
+        Check whether the deployment supports multi-document transactions.
+        
+        Transactions need a replica set or sharded cluster; the answer is cached.
+        
+        Returns:
+            True if transactions can be used
+        """
+        if self.using_mock:
+            return False
+        if self._supports_transactions is None:
+            try:
+                hello = await self.client.admin.command("hello")
+                self._supports_transactions = "setName" in hello or hello.get("msg") == "isdbgrid"
+            except Exception as e:
+                logger.warning(f"Could not determine transaction support: {str(e)}")
+                return False
+        return self._supports_transactions
+    
     async def ping(self) -> bool:
         """Test database connection"""
         try:
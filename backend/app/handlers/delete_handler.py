@@ -2,6 +2,7 @@ from typing import List, Optional, Dict, Any
 import logging
 from fastapi import HTTPException
 
+from app.config import settings
 from app.services.asset_service import AssetService
 from app.services.blockchain_service import BlockchainService
 from app.services.transaction_service import TransactionService
@@ -435,6 +436,7 @@ class DeleteHandler:
             validated_assets = []  # Assets that need blockchain deletion
             already_deleted_assets = []  # Assets already deleted on blockchain (need DB sync)
             owner_address_to_assets = {}  # Group assets by owner for efficient blockchain operations
+            candidates = []  # Assets that passed validation, before checking their blockchain state
             
             for idx, asset_id in enumerate(asset_ids):
                 try:
@@ -464,13 +466,15 @@ class DeleteHandler:
                                 # Check if target wallet delegated the API key user
                                 is_user_delegated = await self.blockchain_service.check_delegation(
                                     owner_address=owner_address,
-                                    delegate_address=initiator_address
+                                    delegate_address=initiator_address,
+                                    strict=settings.delegation_strict_writes
                                 )
                                 
                                 # Check if target wallet delegated the server wallet  
                                 is_server_delegated = await self.blockchain_service.check_delegation(
                                     owner_address=owner_address,
-                                    delegate_address=server_wallet
+                                    delegate_address=server_wallet,
+                                    strict=settings.delegation_strict_writes
                                 )
                                 
                                 # Both delegations are required for API key operations
@@ -502,51 +506,12 @@ class DeleteHandler:
                                 else:
                                     raise ValueError(f"Unable to verify delegation for {owner_address}: {str(e)}")
                     
-                    # Verify asset exists on blockchain and check if already deleted
-                    blockchain_already_deleted = False
-                    if self.blockchain_service:
-                        try:
-                            asset_exists = await self.blockchain_service.check_asset_exists(
-                                asset_id=asset_id,
-                                owner_address=owner_address
-                            )
-                            
-                            if not asset_exists["exists"] or asset_exists["is_deleted"]:
-                                # Asset is already deleted on blockchain - sync database state
-                                blockchain_already_deleted = True
-                                logger.info(f"Asset {asset_id} already deleted on blockchain, syncing database state")
-                                
-                        except Exception as e:
-                            logger.warning(f"Could not verify asset {asset_id} on blockchain: {str(e)}")
-                            # Continue with deletion attempt - blockchain verification is not critical
-                    
-                    # Handle assets based on blockchain status
-                    if blockchain_already_deleted:
-                        # Asset already deleted on blockchain - add to sync list
-                        already_deleted_assets.append({
-                            "asset_id": asset_id,
-                            "owner_address": owner_address,
-                            "document_id": asset.get("_id"),
-                            "index": idx
-                        })
-                    else:
-                        # Asset needs blockchain deletion - group by owner for efficient batch operations
-                        if owner_address not in owner_address_to_assets:
-                            owner_address_to_assets[owner_address] = []
-                        
-                        owner_address_to_assets[owner_address].append({
-                            "asset_id": asset_id,
-                            "owner_address": owner_address,
-                            "document_id": asset.get("_id"),
-                            "index": idx
-                        })
-                        
-                        validated_assets.append({
-                            "asset_id": asset_id,
-                            "owner_address": owner_address,
-                            "document_id": asset.get("_id"),
-                            "index": idx
-                        })
+                    candidates.append({
+                        "asset_id": asset_id,
+                        "owner_address": owner_address,
+                        "document_id": asset.get("_id"),
+                        "index": idx
+                    })
                     
                 except Exception as e:
                     logger.error(f"Validation error for asset {asset_id}: {str(e)}")
@@ -556,6 +521,41 @@ class DeleteHandler:
                         "asset_count": len(asset_ids)
                     }
             
+            # Verify the assets exist on blockchain and check if already deleted, in one batched read
+            chain_statuses = [None] * len(candidates)
+            if self.blockchain_service and candidates:
+                try:
+                    chain_statuses = await self.blockchain_service.check_asset_exists_many(
+                        [(candidate["asset_id"], candidate["owner_address"]) for candidate in candidates]
+                    )
+                except Exception as e:
+                    logger.warning(f"Could not verify {len(candidates)} assets on blockchain: {str(e)}")
+                    # Continue with deletion attempt - blockchain verification is not critical
+            
+            for candidate, asset_exists in zip(candidates, chain_statuses):
+                asset_id = candidate["asset_id"]
+                owner_address = candidate["owner_address"]
+                
+                blockchain_already_deleted = False
+                if isinstance(asset_exists, Exception):
+                    logger.warning(f"Could not verify asset {asset_id} on blockchain: {str(asset_exists)}")
+                elif asset_exists and (not asset_exists["exists"] or asset_exists["is_deleted"]):
+                    # Asset is already deleted on blockchain - sync database state
+                    blockchain_already_deleted = True
+                    logger.info(f"Asset {asset_id} already deleted on blockchain, syncing database state")
+                
+                # Handle assets based on blockchain status
+                if blockchain_already_deleted:
+                    # Asset already deleted on blockchain - add to sync list
+                    already_deleted_assets.append(candidate)
+                else:
+                    # Asset needs blockchain deletion - group by owner for efficient batch operations
+                    if owner_address not in owner_address_to_assets:
+                        owner_address_to_assets[owner_address] = []
+                    
+                    owner_address_to_assets[owner_address].append(dict(candidate))
+                    validated_assets.append(dict(candidate))
+            
             # Handle assets that are already deleted on blockchain (sync database)
             synced_results = {}
             if already_deleted_assets:
@@ -1,5 +1,6 @@
+import asyncio
 from datetime import timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import logging
 from fastapi import HTTPException
 
@@ -7,11 +8,20 @@ from app.services.asset_service import AssetService
 from app.services.blockchain_service import BlockchainService
 from app.services.ipfs_service import IPFSService
 from app.services.transaction_service import TransactionService
+from app.services.verification_cache import VerificationCache
 from app.schemas.retrieve_schema import MetadataRetrieveResponse, MetadataVerificationResult, ProgressCallback
 from app.utilities.format import get_ipfs_metadata
+from app.utilities.stage_graph import Stage, run_stages
 
 logger = logging.getLogger(__name__)
 
+# Progress messages for steps 2-4 of retrieve_metadata_with_progress, reported as verification stages finish
+VERIFICATION_PROGRESS_MESSAGES = (
+    "Verifying asset authenticity...",
+    "Checking blockchain records...",
+    "Computing metadata integrity..."
+)
+
 class RetrieveHandler:
     """
     Handler for metadata retrieval operations.
@@ -25,7 +35,8 @@ class RetrieveHandler:
         blockchain_service: BlockchainService,
         ipfs_service: IPFSService,
         transaction_service: TransactionService = None,
-        auth_context: Optional[Dict[str, Any]] = None
+        auth_context: Optional[Dict[str, Any]] = None,
+        verification_cache: Optional[VerificationCache] = None
     ):
         """
         Initialize with required services.
@@ -36,18 +47,21 @@ class RetrieveHandler:
             ipfs_service: Service for IPFS operations
             transaction_service: Optional service for recording transactions
             auth_context: Authentication context for the current request
+            verification_cache: Optional cache of successful verifications to reuse
         """
         self.asset_service = asset_service
         self.blockchain_service = blockchain_service
         self.ipfs_service = ipfs_service
         self.transaction_service = transaction_service
         self.auth_context = auth_context
+        self.verification_cache = verification_cache
     
     async def recover_authentic_data(
         self,
         blockchain_tx_id: str,
         asset_id: str,
-        wallet_address: str
+        wallet_address: str,
+        tx_data: Optional[Dict[str, Any]] = None
     ) -> dict:
         """
         Recover authentic CID and correct transaction hash with multiple fallback methods.
@@ -59,6 +73,7 @@ class RetrieveHandler:
             blockchain_tx_id: Transaction ID from MongoDB
             asset_id: The asset ID
             wallet_address: The wallet address of the asset owner
+            tx_data: Transaction details already fetched for blockchain_tx_id, if any
             
         Returns:
             Dictionary containing:
@@ -70,7 +85,8 @@ class RetrieveHandler:
         """
         # Method 1: Try transaction details (existing approach)
         try:
-            tx_data = await self.blockchain_service.get_transaction_details(blockchain_tx_id, asset_id)
+            if tx_data is None:
+                tx_data = await self.blockchain_service.get_transaction_details(blockchain_tx_id, asset_id)
             cid = tx_data.get("cid")
             if cid and cid != "unknown":
                 logger.info(f"CID recovered from transaction: {cid}")
@@ -92,7 +108,8 @@ class RetrieveHandler:
         blockchain_tx_id: str,
         asset_id: str,
         wallet_address: str,
-        progress_callback: ProgressCallback
+        progress_callback: ProgressCallback,
+        tx_data: Optional[Dict[str, Any]] = None
     ) -> dict:
         """
         Recover authentic CID with progress reporting for each fallback method.
@@ -102,6 +119,7 @@ class RetrieveHandler:
             asset_id: The asset ID
             wallet_address: The wallet address of the asset owner
             progress_callback: Function to call with progress updates
+            tx_data: Transaction details already fetched for blockchain_tx_id, if any
             
         Returns:
             Dictionary containing CID and correct transaction hash
@@ -111,7 +129,8 @@ class RetrieveHandler:
         """
         # Method 1: Try transaction details (existing approach)
         try:
-            tx_data = await self.blockchain_service.get_transaction_details(blockchain_tx_id, asset_id)
+            if tx_data is None:
+                tx_data = await self.blockchain_service.get_transaction_details(blockchain_tx_id, asset_id)
             cid = tx_data.get("cid")
             if cid and cid != "unknown":
                 logger.info(f"CID recovered from transaction: {cid}")
@@ -129,37 +148,56 @@ class RetrieveHandler:
             logger.error(f"Event recovery also failed for asset {asset_id}: {str(e)}")
             raise Exception(f"Unable to recover authentic CID for asset {asset_id}: Transaction method failed, Event method failed")
         
-    async def retrieve_metadata(
+    async def _load_and_verify(
         self,
         asset_id: str,
-        version: Optional[int] = None,
-        auto_recover: bool = True,
-        initiator_address: Optional[str] = None
-    ) -> MetadataRetrieveResponse:
+        version: Optional[int],
+        initiator_address: Optional[str],
+        progress_callback: Optional[ProgressCallback] = None,
+        strict: bool = False,
+        max_age: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
-        Retrieve and verify metadata for an asset.
+        Load a version of an asset, check access to it and verify it against the blockchain.
+
+        The work runs as a stage graph. Loading the document and looking up
+        version 1 start at once. As soon as the document is loaded, the access
+        check, getIPFSInfo, verifyCID, the transaction lookup and the CID
+        computation all run concurrently. A missing document or denied access
+        cancels everything still running. When verifyCID shows the asset was
+        deleted on chain but not in MongoDB, the transaction lookup and CID
+        computation are cancelled, since the verdict no longer depends on them.
+        
+        With a verification cache, a successful verification of the same
+        document state no older than max_age is reused once the document is
+        loaded, and the chain and CID stages are cancelled before they start.
+        Access is still checked on every call.
         
         Args:
             asset_id: The asset's unique identifier
             version: Optional specific version to retrieve
-            auto_recover: Whether to automatically recover from tampering (only applies to latest version)
-            initiator_address: Address of the user performing the operation (for delegation context)
+            initiator_address: Address of the user performing the operation
+            progress_callback: Optional function called as verification stages finish (steps 2-4 of 9)
+            strict: Verify against the blockchain even if a cached verification exists
+            max_age: Oldest cached verification to reuse, in seconds
             
         Returns:
-            MetadataRetrieveResponse containing metadata and verification results
+            Dict with the loaded "document", the MetadataVerificationResult as "result",
+            "ipfs_hash_verified", "computed_cid", the transaction details as "tx_data"
+            (None if unavailable) and the version 1 document or lookup error as "first_version"
             
         Raises:
-            HTTPException: If asset not found or retrieval fails
+            HTTPException: If the asset is not found or access is denied
         """
-        try:
-            # 1. First check if the asset exists at all (with any version)
-            any_version = await self.asset_service.get_asset_with_deleted(asset_id)
+        async def load_document(results: Dict[str, Any]) -> Dict[str, Any]:
+            # Check if the asset exists at all (with any version), then fetch the requested version
+            any_version, document = await asyncio.gather(
+                self.asset_service.get_asset_with_deleted(asset_id),
+                self.asset_service.get_asset(asset_id, version)
+            )
             
             if not any_version:
                 raise HTTPException(status_code=404, detail=f"Asset with ID {asset_id} not found")
-                
-            # 2. Now fetch the specific version requested
-            document = await self.asset_service.get_asset(asset_id, version)
             
             if not document:
                 if version:
@@ -167,187 +205,375 @@ class RetrieveHandler:
                 else:
                     # This should not normally happen if any_version exists, unless the asset is deleted
                     raise HTTPException(status_code=404, detail=f"Current version of asset {asset_id} not found or is deleted")
-                
-            # Extract required fields
-            doc_id = document["_id"]
-            doc_version = document.get("versionNumber", 1)
-            # Use ipfsVersion if available, otherwise fall back to versionNumber
-            ipfs_version = document.get("ipfsVersion", doc_version)
-            is_latest_version = document.get("isCurrent", False)
-            wallet_address = document.get("walletAddress")
-            blockchain_tx_id = document.get("smartContractTxId")
-            ipfs_hash = document.get("ipfsHash")
-            critical_metadata = document.get("criticalMetadata", {})
-            non_critical_metadata = document.get("nonCriticalMetadata", {})
+            return document
+        
+        async def load_first_version(results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            # Creation time comes from version 1 of this asset
+            return await self.asset_service.asset_repository.find_asset({
+                "assetId": asset_id,
+                "versionNumber": 1
+            })
+        
+        async def check_access(results: Dict[str, Any]) -> None:
+            wallet_address = results["document"].get("walletAddress")
             
-            # 3. Authorization check - verify user can access this asset
-            if initiator_address:
-                # Check if the user owns the asset
-                is_owner = initiator_address.lower() == wallet_address.lower()
-                
-                if not is_owner:
-                    # Check if the user has been delegated by the asset owner
-                    try:
-                        is_delegated = await self.blockchain_service.check_delegation(
-                            owner_address=wallet_address,
-                            delegate_address=initiator_address
-                        )
-                        
-                        if not is_delegated:
-                            logger.warning(f"Access denied: {initiator_address} is not owner or delegate of asset {asset_id} (owner: {wallet_address})")
-                            raise HTTPException(
-                                status_code=403,
-                                detail="Access denied: you are not the owner or delegate of this asset"
-                            )
-                        
-                        logger.debug(f"Delegation verified: {wallet_address} -> {initiator_address} for asset {asset_id}")
-                    except HTTPException:
-                        raise
-                    except Exception as e:
-                        logger.error(f"Error checking delegation for asset {asset_id}: {str(e)}")
-                        raise HTTPException(
-                            status_code=500,
-                            detail="Error verifying asset access permissions"
-                        )
-                else:
-                    logger.debug(f"Owner access granted: {initiator_address} accessing own asset {asset_id}")
-            else:
+            if not initiator_address:
                 logger.warning(f"No initiator_address provided for asset {asset_id} retrieval")
                 raise HTTPException(
                     status_code=401,
                     detail="Authentication required: unable to verify asset access"
                 )
             
-            # Initialize verification result
-            verification_result = MetadataVerificationResult(
-                verified=False,
-                cid_match=False,
-                blockchain_cid="unknown",
-                computed_cid="unknown",
-                recovery_needed=False,
-                deletion_status_tampered=False
-            )
+            # Check if the user owns the asset
+            if initiator_address.lower() == wallet_address.lower():
+                logger.debug(f"Owner access granted: {initiator_address} accessing own asset {asset_id}")
+                return
             
-            # 3. Use the contract's verification methods to verify the CID
-            blockchain_cid = "unknown"
-            ipfs_hash_verified = False
+            # Check if the user has been delegated by the asset owner
             try:
-                # First get IPFS info from the blockchain
-                blockchain_data = await self.blockchain_service.get_ipfs_info(
-                    asset_id=asset_id,
-                    owner_address=wallet_address
-                )
-                logger.info(f"Initial Blockchain Data: asset_id={asset_id}, version={blockchain_data.get('ipfs_version')}, deleted={blockchain_data.get('is_deleted')}")
-
-                # Now verify the CID using the verifyCID function
-                # Important: Use ipfs_version instead of doc_version for blockchain verification
-                verify_result = await self.blockchain_service.verify_cid_on_chain(
-                    asset_id=asset_id,
+                is_delegated = await self.blockchain_service.check_delegation(
                     owner_address=wallet_address,
-                    cid=ipfs_hash,
-                    claimed_version=ipfs_version
+                    delegate_address=initiator_address
                 )
-                
-                # Set verification results from blockchain response
-                verification_result.ipfs_version = verify_result["actual_version"]
-                verification_result.is_deleted = verify_result["is_deleted"]
-                verification_result.message = verify_result["message"]
-                
-                # Store result of IPFS hash verification (if stored ipfs_hash matches blockchain)
-                ipfs_hash_verified = verify_result["is_valid"]
-                
-                # Get transaction details for additional verification
-                tx_data = await self.blockchain_service.get_transaction_details(blockchain_tx_id, asset_id)
-                blockchain_cid = tx_data.get("cid", "unknown")
-                tx_sender = tx_data.get("tx_sender", None)
-
-                # Set blockchain CID
-                verification_result.blockchain_cid = blockchain_cid
-                
-                # Verify transaction sender if possible
-                server_wallet = self.blockchain_service.get_server_wallet_address()
-                
-                if tx_sender and server_wallet:
-                    # Convert both addresses to lowercase for case-insensitive comparison
-                    tx_sender_lower = tx_sender.lower() if isinstance(tx_sender, str) else None
-                    server_wallet_lower = server_wallet.lower() if isinstance(server_wallet, str) else None
-                    
-                    # Check if transaction sender matches server wallet address
-                    tx_sender_verified = (tx_sender_lower and server_wallet_lower and 
-                                        tx_sender_lower == server_wallet_lower)
-                    
-                    if not tx_sender_verified:
-                        logger.warning(f"Transaction sender verification failed for {asset_id}. "
-                                      f"Expected: {server_wallet_lower}, Found: {tx_sender_lower}")
-                else:
-                    tx_sender_verified = False
-                    logger.warning(f"Transaction sender verification failed - missing data. " 
-                                  f"tx_sender: {tx_sender}, server_wallet: {server_wallet}")
-                
-                verification_result.tx_sender_verified = tx_sender_verified
-                
             except Exception as e:
-                logger.error(f"Error verifying asset on blockchain: {str(e)}")
-                verification_result.message = f"Blockchain verification failed: {str(e)}"
+                logger.error(f"Error checking delegation for asset {asset_id}: {str(e)}")
+                raise HTTPException(
+                    status_code=500,
+                    detail="Error verifying asset access permissions"
+                )
             
-            # 4. Compute CID from MongoDB critical metadata
+            if not is_delegated:
+                logger.warning(f"Access denied: {initiator_address} is not owner or delegate of asset {asset_id} (owner: {wallet_address})")
+                raise HTTPException(
+                    status_code=403,
+                    detail="Access denied: you are not the owner or delegate of this asset"
+                )
+            
+            logger.debug(f"Delegation verified: {wallet_address} -> {initiator_address} for asset {asset_id}")
+        
+        async def read_ipfs_info(results: Dict[str, Any]) -> Dict[str, Any]:
+            return await self.blockchain_service.get_ipfs_info(
+                asset_id=asset_id,
+                owner_address=results["document"].get("walletAddress")
+            )
+        
+        async def verify_cid(results: Dict[str, Any]) -> Dict[str, Any]:
+            document = results["document"]
+            # Important: Use ipfs_version instead of doc_version for blockchain verification
+            return await self.blockchain_service.verify_cid_on_chain(
+                asset_id=asset_id,
+                owner_address=document.get("walletAddress"),
+                cid=document.get("ipfsHash"),
+                claimed_version=document.get("ipfsVersion", document.get("versionNumber", 1))
+            )
+        
+        async def read_transaction(results: Dict[str, Any]) -> Dict[str, Any]:
+            return await self.blockchain_service.get_transaction_details(
+                results["document"].get("smartContractTxId"),
+                asset_id
+            )
+        
+        async def compute_cid(results: Dict[str, Any]) -> str:
+            document = results["document"]
+            # Compute CID from MongoDB critical metadata
             metadata_for_ipfs = {
                 "asset_id": asset_id,
-                "wallet_address": wallet_address,
-                "critical_metadata": critical_metadata
+                "wallet_address": document.get("walletAddress"),
+                "critical_metadata": document.get("criticalMetadata", {})
+            }
+            return await self.ipfs_service.compute_cid(get_ipfs_metadata(metadata_for_ipfs))
+        
+        stages = {
+            "document": Stage(load_document),
+            "first_version": Stage(load_first_version),
+            "access": Stage(check_access, ["document"]),
+            "ipfs_info": Stage(read_ipfs_info, ["document"]),
+            "verify": Stage(verify_cid, ["document"]),
+            "transaction": Stage(read_transaction, ["document"]),
+            "computed_cid": Stage(compute_cid, ["document"])
+        }
+        loaded: Dict[str, Any] = {}
+        progress_step = 1
+        cache = self.verification_cache
+        cache_epoch = cache.epoch(asset_id) if cache else None
+        
+        async def on_stage_complete(name: str, result: Any) -> Optional[List[str]]:
+            nonlocal progress_step
+            if name in ("document", "access") and isinstance(result, Exception):
+                # Nothing else matters if the asset cannot be served
+                raise result
+            if name == "document":
+                loaded["document"] = result
+                cached = cache.get(asset_id, result, max_age) if cache and not strict else None
+                if cached:
+                    loaded["cached"] = cached
+                    logger.debug(f"Reusing verification of asset {asset_id} from {cached[1]:.1f}s ago")
+                    return ["ipfs_info", "verify", "transaction", "computed_cid"]
+            elif name != "first_version" and progress_callback and progress_step < 1 + len(VERIFICATION_PROGRESS_MESSAGES):
+                progress_step += 1
+                await progress_callback(progress_step, 9, VERIFICATION_PROGRESS_MESSAGES[progress_step - 2])
+            if name == "verify" and not isinstance(result, Exception):
+                if result["is_deleted"] and not loaded["document"].get("isDeleted", False):
+                    # The verdict is tampering whatever the CIDs say
+                    logger.warning(f"Asset {asset_id} is deleted on blockchain but not in MongoDB, skipping CID checks")
+                    return ["transaction", "computed_cid"]
+            return None
+        
+        results = await run_stages(stages, on_stage_complete)
+        
+        document = loaded["document"]
+        if "cached" in loaded:
+            verification_result, cache_age = loaded["cached"]
+            verification_result.cached = True
+            verification_result.cache_age = cache_age
+            return {
+                "document": document,
+                "result": verification_result,
+                "ipfs_hash_verified": True,
+                "computed_cid": verification_result.computed_cid,
+                "tx_data": None,
+                "first_version": results.get("first_version")
             }
-            computed_cid = await self.ipfs_service.compute_cid(get_ipfs_metadata(metadata_for_ipfs))
+        
+        doc_version = document.get("versionNumber", 1)
+        # Use ipfsVersion if available, otherwise fall back to versionNumber
+        ipfs_version = document.get("ipfsVersion", doc_version)
+        is_latest_version = document.get("isCurrent", False)
+        
+        # Initialize verification result
+        verification_result = MetadataVerificationResult(
+            verified=False,
+            cid_match=False,
+            blockchain_cid="unknown",
+            computed_cid="unknown",
+            recovery_needed=False,
+            deletion_status_tampered=False
+        )
+        
+        # Use the contract's verification methods to verify the CID
+        ipfs_hash_verified = False
+        blockchain_data = results.get("ipfs_info")
+        if isinstance(blockchain_data, dict):
+            logger.info(f"Initial Blockchain Data: asset_id={asset_id}, version={blockchain_data.get('ipfs_version')}, deleted={blockchain_data.get('is_deleted')}")
+        
+        verify_result = results.get("verify")
+        if isinstance(verify_result, dict):
+            # Set verification results from blockchain response
+            verification_result.ipfs_version = verify_result["actual_version"]
+            verification_result.is_deleted = verify_result["is_deleted"]
+            verification_result.message = verify_result["message"]
+            
+            # Store result of IPFS hash verification (if stored ipfs_hash matches blockchain)
+            ipfs_hash_verified = verify_result["is_valid"]
+        
+        chain_error = next(
+            (results[name] for name in ("ipfs_info", "verify", "transaction") if isinstance(results.get(name), Exception)),
+            None
+        )
+        
+        # Transaction details for additional verification
+        tx_data = results.get("transaction")
+        if isinstance(tx_data, dict) and chain_error is None:
+            tx_sender = tx_data.get("tx_sender", None)
+            
+            # Set blockchain CID
+            verification_result.blockchain_cid = tx_data.get("cid", "unknown")
+            
+            # Verify transaction sender if possible
+            server_wallet = self.blockchain_service.get_server_wallet_address()
+            
+            if tx_sender and server_wallet:
+                # Convert both addresses to lowercase for case-insensitive comparison
+                tx_sender_lower = tx_sender.lower() if isinstance(tx_sender, str) else None
+                server_wallet_lower = server_wallet.lower() if isinstance(server_wallet, str) else None
+                
+                # Check if transaction sender matches server wallet address
+                tx_sender_verified = (tx_sender_lower and server_wallet_lower and 
+                                    tx_sender_lower == server_wallet_lower)
+                
+                if not tx_sender_verified:
+                    logger.warning(f"Transaction sender verification failed for {asset_id}. "
+                                  f"Expected: {server_wallet_lower}, Found: {tx_sender_lower}")
+            else:
+                tx_sender_verified = False
+                logger.warning(f"Transaction sender verification failed - missing data. " 
+                              f"tx_sender: {tx_sender}, server_wallet: {server_wallet}")
+            
+            verification_result.tx_sender_verified = tx_sender_verified
+        
+        if not isinstance(tx_data, dict):
+            tx_data = None
+        
+        if chain_error is not None:
+            logger.error(f"Error verifying asset on blockchain: {str(chain_error)}")
+            verification_result.message = f"Blockchain verification failed: {str(chain_error)}"
+        
+        computed_cid = results.get("computed_cid", "unknown")
+        if isinstance(computed_cid, Exception):
+            raise computed_cid
+        
+        # Set computed CID and compare with blockchain CID
+        verification_result.computed_cid = computed_cid
+        # Both stay "unknown" when their stages were cancelled, which is not a match
+        verification_result.cid_match = computed_cid != "unknown" and computed_cid == verification_result.blockchain_cid
 
-            # 5. Set computed CID and compare with blockchain CID
-            verification_result.computed_cid = computed_cid
-            verification_result.cid_match = computed_cid == verification_result.blockchain_cid
+        # Check specifically for deletion status tampering
+        deletion_status_tampered = verification_result.is_deleted and not document.get("isDeleted", False)
+        verification_result.deletion_status_tampered = deletion_status_tampered
 
-            # Check specifically for deletion status tampering
-            deletion_status_tampered = verification_result.is_deleted and not document.get("isDeleted", False)
-            verification_result.deletion_status_tampered = deletion_status_tampered
+        # Different verification logic for current vs. historical versions
+        if is_latest_version:
+            # For latest version, verify both the IPFS hash AND that the computed CID matches
+            verification_result.verified = ipfs_hash_verified and verification_result.cid_match and not deletion_status_tampered
+            verification_result.recovery_needed = not verification_result.verified
 
-            # Different verification logic for current vs. historical versions
-            if is_latest_version:
-                # For latest version, verify both the IPFS hash AND that the computed CID matches
-                verification_result.verified = ipfs_hash_verified and verification_result.cid_match and not deletion_status_tampered
-                verification_result.recovery_needed = not verification_result.verified
-                
-                if verification_result.verified:
-                    logger.debug(f"Verification Success: Current version of asset {asset_id}, version={doc_version}, ipfs_version={ipfs_version}")
-                else:
-                    logger.warning(f"Current version verification failed for asset {asset_id}, version {doc_version}, ipfs_version {ipfs_version}")
-                    if deletion_status_tampered:
-                        verification_result.message = "Tampering detected: Asset is marked as deleted on blockchain but not in MongoDB"
-                    elif not ipfs_hash_verified:
-                        if verification_result.is_deleted:
-                            verification_result.message = "Asset is marked as deleted on blockchain"
-                        else:
-                            verification_result.message = "IPFS hash verification failed - stored hash doesn't match blockchain"
-                    elif not verification_result.cid_match:
-                        verification_result.message = "CID mismatch - computed CID from current data doesn't match blockchain CID"
+            if verification_result.verified:
+                logger.debug(f"Verification Success: Current version of asset {asset_id}, version={doc_version}, ipfs_version={ipfs_version}")
             else:
-                # For historical versions, use transaction history verification instead
-                # Consider it verified if the transaction data matches the computed data
-                verification_result.verified = verification_result.cid_match and verification_result.tx_sender_verified and not deletion_status_tampered
-                verification_result.recovery_needed = not verification_result.verified
-                
-                if verification_result.verified:
-                    logger.debug(f"Verification Success: Historical version of asset {asset_id}, version={doc_version}, ipfs_version={ipfs_version}")
-                    verification_result.message = "Historical version verified via transaction data"
-                else:
-                    logger.warning(f"Historical version verification failed for asset {asset_id}, version {doc_version}, ipfs_version {ipfs_version}")
-                    if deletion_status_tampered:
-                        verification_result.message = "Tampering detected: Asset is marked as deleted on blockchain but not in MongoDB"
-                    elif verification_result.cid_match:
-                        verification_result.message = "Historical transaction sender verification failed"
+                logger.warning(f"Current version verification failed for asset {asset_id}, version {doc_version}, ipfs_version {ipfs_version}")
+                if deletion_status_tampered:
+                    verification_result.message = "Tampering detected: Asset is marked as deleted on blockchain but not in MongoDB"
+                elif not ipfs_hash_verified:
+                    if verification_result.is_deleted:
+                        verification_result.message = "Asset is marked as deleted on blockchain"
                     else:
-                        verification_result.message = "Historical CID verification failed"
+                        verification_result.message = "IPFS hash verification failed - stored hash doesn't match blockchain"
+                elif not verification_result.cid_match:
+                    verification_result.message = "CID mismatch - computed CID from current data doesn't match blockchain CID"
+        else:
+            # For historical versions, use transaction history verification instead
+            # Consider it verified if the transaction data matches the computed data
+            verification_result.verified = verification_result.cid_match and verification_result.tx_sender_verified and not deletion_status_tampered
+            verification_result.recovery_needed = not verification_result.verified
+
+            if verification_result.verified:
+                logger.debug(f"Verification Success: Historical version of asset {asset_id}, version={doc_version}, ipfs_version={ipfs_version}")
+                verification_result.message = "Historical version verified via transaction data"
+            else:
+                logger.warning(f"Historical version verification failed for asset {asset_id}, version {doc_version}, ipfs_version {ipfs_version}")
+                if deletion_status_tampered:
+                    verification_result.message = "Tampering detected: Asset is marked as deleted on blockchain but not in MongoDB"
+                elif verification_result.cid_match:
+                    verification_result.message = "Historical transaction sender verification failed"
+                else:
+                    verification_result.message = "Historical CID verification failed"
+
+        # Additional logging if recovery needed
+        if verification_result.recovery_needed:
+            logger.warning(f"Verification failed for asset {asset_id}. "
+                         f"CID match: {verification_result.cid_match}, IPFS hash verified: {ipfs_hash_verified}, "
+                         f"needs recovery: {verification_result.recovery_needed}, deletion status tampered: {deletion_status_tampered}")
+
+        if cache:
+            cache.put(asset_id, document, verification_result, cache_epoch)
+        
+        return {
+            "document": document,
+            "result": verification_result,
+            "ipfs_hash_verified": ipfs_hash_verified,
+            "computed_cid": computed_cid,
+            "tx_data": tx_data,
+            "first_version": results.get("first_version")
+        }
+    
+    def _resolve_timestamps(self, asset_id: str, document: Dict[str, Any], first_version: Any) -> Tuple[str, str]:
+        """
+        Work out an asset's creation and last update times as ISO strings.
+        
+        Args:
+            asset_id: The asset's unique identifier
+            document: The document being returned
+            first_version: Version 1 of the asset, None if missing, or the exception looking it up raised
             
-            # Additional logging if recovery needed
-            if verification_result.recovery_needed:
-                logger.warning(f"Verification failed for asset {asset_id}. "
-                             f"CID match: {verification_result.cid_match}, IPFS hash verified: {ipfs_hash_verified}, "
-                             f"needs recovery: {verification_result.recovery_needed}, deletion status tampered: {deletion_status_tampered}")
+        Returns:
+            Tuple of (created_at, updated_at)
+        """
+        # Get creation time from version 1 of this asset
+        if isinstance(first_version, Exception):
+            logger.warning(f"Could not find version 1 for asset {asset_id}: {first_version}")
+            # Fallback to current document's ObjectId or lastUpdated
+            if hasattr(document["_id"], 'generation_time'):
+                created_at = document["_id"].generation_time.isoformat()
+            else:
+                created_at = document.get("lastUpdated", "")
+        elif first_version:
+            # Handle case where _id might be a string (convert to ObjectId)
+            version_id = first_version["_id"]
+            if isinstance(version_id, str):
+                try:
+                    from bson import ObjectId
+                    version_id = ObjectId(version_id)
+                except Exception:
+                    version_id = None
+            
+            if version_id and hasattr(version_id, 'generation_time'):
+                created_at = version_id.generation_time.isoformat()
+            else:
+                created_at = document.get("lastUpdated", "")
+        else:
+            created_at = document.get("lastUpdated", "")
+        
+        updated_at = document.get("lastUpdated", "")
+        
+        # Convert datetime objects to ISO strings if needed
+        if hasattr(created_at, 'isoformat'):
+            # Ensure timezone consistency - if timezone-naive, assume UTC
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            created_at = created_at.isoformat()
+        if hasattr(updated_at, 'isoformat'):
+            # Ensure timezone consistency - if timezone-naive, assume UTC
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            updated_at = updated_at.isoformat()
+        
+        return created_at, updated_at
+    
+    async def retrieve_metadata(
+        self,
+        asset_id: str,
+        version: Optional[int] = None,
+        auto_recover: bool = True,
+        initiator_address: Optional[str] = None,
+        strict: bool = False,
+        max_age: Optional[float] = None
+    ) -> MetadataRetrieveResponse:
+        """
+        Retrieve and verify metadata for an asset.
+        
+        Args:
+            asset_id: The asset's unique identifier
+            version: Optional specific version to retrieve
+            auto_recover: Whether to automatically recover from tampering (only applies to latest version)
+            initiator_address: Address of the user performing the operation (for delegation context)
+            strict: Verify against the blockchain even if a cached verification exists
+            max_age: Oldest cached verification to reuse, in seconds (capped by VERIFICATION_CACHE_MAX_AGE)
+            
+        Returns:
+            MetadataRetrieveResponse containing metadata and verification results
+            
+        Raises:
+            HTTPException: If asset not found or retrieval fails
+        """
+        try:
+            # 1-5. Load the asset, check access and verify it against the blockchain
+            verified = await self._load_and_verify(
+                asset_id, version, initiator_address, strict=strict, max_age=max_age
+            )
+            document = verified["document"]
+            verification_result = verified["result"]
+            computed_cid = verified["computed_cid"]
+            
+            # Extract required fields
+            doc_id = document["_id"]
+            doc_version = document.get("versionNumber", 1)
+            # Use ipfsVersion if available, otherwise fall back to versionNumber
+            ipfs_version = document.get("ipfsVersion", doc_version)
+            is_latest_version = document.get("isCurrent", False)
+            wallet_address = document.get("walletAddress")
+            blockchain_tx_id = document.get("smartContractTxId")
+            critical_metadata = document.get("criticalMetadata", {})
+            non_critical_metadata = document.get("nonCriticalMetadata", {})
             
             # 6. If verification failed and auto-recover is enabled, try to recover
             new_version_created = False
@@ -405,7 +631,9 @@ class RetrieveHandler:
                 try:
                     # Use enhanced recovery to get authentic CID with fallback mechanism
                     try:
-                        recovery_data = await self.recover_authentic_data(blockchain_tx_id, asset_id, wallet_address)
+                        recovery_data = await self.recover_authentic_data(
+                            blockchain_tx_id, asset_id, wallet_address, tx_data=verified["tx_data"]
+                        )
                         authentic_cid = recovery_data["cid"]
                         correct_tx_hash = recovery_data["tx_hash"]
                         authentic_metadata = await self.ipfs_service.retrieve_metadata(authentic_cid)
@@ -541,50 +769,7 @@ class RetrieveHandler:
             verification_result.new_version_created = new_version_created
             
             # 8. Extract timestamp fields from document
-            # Get creation time from version 1 of this asset
-            try:
-                first_version = await self.asset_service.asset_repository.find_asset({
-                    "assetId": asset_id,
-                    "versionNumber": 1
-                })
-                
-                if first_version:
-                    # Handle case where _id might be a string (convert to ObjectId)
-                    version_id = first_version["_id"]
-                    if isinstance(version_id, str):
-                        try:
-                            from bson import ObjectId
-                            version_id = ObjectId(version_id)
-                        except Exception:
-                            version_id = None
-                    
-                    if version_id and hasattr(version_id, 'generation_time'):
-                        created_at = version_id.generation_time.isoformat()
-                    else:
-                        created_at = document.get("lastUpdated", "")
-                else:
-                    created_at = document.get("lastUpdated", "")
-            except Exception as e:
-                logger.warning(f"Could not find version 1 for asset {asset_id}: {e}")
-                # Fallback to current document's ObjectId or lastUpdated
-                if hasattr(document["_id"], 'generation_time'):
-                    created_at = document["_id"].generation_time.isoformat()
-                else:
-                    created_at = document.get("lastUpdated", "")
-            
-            updated_at = document.get("lastUpdated", "")
-            
-            # Convert datetime objects to ISO strings if needed
-            if hasattr(created_at, 'isoformat'):
-                # Ensure timezone consistency - if timezone-naive, assume UTC
-                if created_at.tzinfo is None:
-                    created_at = created_at.replace(tzinfo=timezone.utc)
-                created_at = created_at.isoformat()
-            if hasattr(updated_at, 'isoformat'):
-                # Ensure timezone consistency - if timezone-naive, assume UTC
-                if updated_at.tzinfo is None:
-                    updated_at = updated_at.replace(tzinfo=timezone.utc)
-                updated_at = updated_at.isoformat()
+            created_at, updated_at = self._resolve_timestamps(asset_id, document, verified["first_version"])
             
             # 9. Prepare response
             return MetadataRetrieveResponse(
@@ -613,7 +798,9 @@ class RetrieveHandler:
         progress_callback: ProgressCallback,
         version: Optional[int] = None,
         auto_recover: bool = True,
-        initiator_address: Optional[str] = None
+        initiator_address: Optional[str] = None,
+        strict: bool = False,
+        max_age: Optional[float] = None
     ) -> MetadataRetrieveResponse:
         """
         Retrieve and verify metadata for an asset with progress reporting.
@@ -627,6 +814,8 @@ class RetrieveHandler:
             auto_recover: Whether to automatically recover from tampering (only applies to latest version)
             progress_callback: Function to call with progress updates
             initiator_address: Address of the user performing the operation (for delegation context)
+            strict: Verify against the blockchain even if a cached verification exists
+            max_age: Oldest cached verification to reuse, in seconds (capped by VERIFICATION_CACHE_MAX_AGE)
             
         Returns:
             MetadataRetrieveResponse containing metadata and verification results
@@ -637,22 +826,14 @@ class RetrieveHandler:
         try:
             await progress_callback(1, 9, "Loading asset data...")
             
-            # 1. First check if the asset exists at all (with any version)
-            any_version = await self.asset_service.get_asset_with_deleted(asset_id)
-            
-            if not any_version:
-                raise HTTPException(status_code=404, detail=f"Asset with ID {asset_id} not found")
-                
-            # 2. Now fetch the specific version requested
-            document = await self.asset_service.get_asset(asset_id, version)
+            # 1-5. Load the asset, check access and verify it against the blockchain
+            verified = await self._load_and_verify(
+                asset_id, version, initiator_address, progress_callback, strict=strict, max_age=max_age
+            )
+            document = verified["document"]
+            verification_result = verified["result"]
+            computed_cid = verified["computed_cid"]
             
-            if not document:
-                if version:
-                    raise HTTPException(status_code=404, detail=f"Version {version} of asset {asset_id} not found or is deleted")
-                else:
-                    # This should not normally happen if any_version exists, unless the asset is deleted
-                    raise HTTPException(status_code=404, detail=f"Current version of asset {asset_id} not found or is deleted")
-                
             # Extract required fields
             doc_id = document["_id"]
             doc_version = document.get("versionNumber", 1)
@@ -661,185 +842,9 @@ class RetrieveHandler:
             is_latest_version = document.get("isCurrent", False)
             wallet_address = document.get("walletAddress")
             blockchain_tx_id = document.get("smartContractTxId")
-            ipfs_hash = document.get("ipfsHash")
             critical_metadata = document.get("criticalMetadata", {})
             non_critical_metadata = document.get("nonCriticalMetadata", {})
             
-            # 3. Authorization check - verify user can access this asset
-            if initiator_address:
-                # Check if the user owns the asset
-                is_owner = initiator_address.lower() == wallet_address.lower()
-                
-                if not is_owner:
-                    # Check if the user has been delegated by the asset owner
-                    try:
-                        is_delegated = await self.blockchain_service.check_delegation(
-                            owner_address=wallet_address,
-                            delegate_address=initiator_address
-                        )
-                        
-                        if not is_delegated:
-                            logger.warning(f"Access denied: {initiator_address} is not owner or delegate of asset {asset_id} (owner: {wallet_address})")
-                            raise HTTPException(
-                                status_code=403,
-                                detail="Access denied: you are not the owner or delegate of this asset"
-                            )
-                        
-                        logger.debug(f"Delegation verified: {wallet_address} -> {initiator_address} for asset {asset_id}")
-                    except HTTPException:
-                        raise
-                    except Exception as e:
-                        logger.error(f"Error checking delegation for asset {asset_id}: {str(e)}")
-                        raise HTTPException(
-                            status_code=500,
-                            detail="Error verifying asset access permissions"
-                        )
-                else:
-                    logger.debug(f"Owner access granted: {initiator_address} accessing own asset {asset_id}")
-            else:
-                logger.warning(f"No initiator_address provided for asset {asset_id} retrieval")
-                raise HTTPException(
-                    status_code=401,
-                    detail="Authentication required: unable to verify asset access"
-                )
-            
-            # Initialize verification result
-            verification_result = MetadataVerificationResult(
-                verified=False,
-                cid_match=False,
-                blockchain_cid="unknown",
-                computed_cid="unknown",
-                recovery_needed=False,
-                deletion_status_tampered=False
-            )
-            
-            await progress_callback(2, 9, "Verifying asset authenticity...")
-            
-            # 3. Use the contract's verification methods to verify the CID
-            blockchain_cid = "unknown"
-            ipfs_hash_verified = False
-            try:
-                # First get IPFS info from the blockchain
-                blockchain_data = await self.blockchain_service.get_ipfs_info(
-                    asset_id=asset_id,
-                    owner_address=wallet_address
-                )
-                logger.info(f"Initial Blockchain Data: asset_id={asset_id}, version={blockchain_data.get('ipfs_version')}, deleted={blockchain_data.get('is_deleted')}")
-
-                await progress_callback(3, 9, "Checking blockchain records...")
-
-                # Now verify the CID using the verifyCID function
-                # Important: Use ipfs_version instead of doc_version for blockchain verification
-                verify_result = await self.blockchain_service.verify_cid_on_chain(
-                    asset_id=asset_id,
-                    owner_address=wallet_address,
-                    cid=ipfs_hash,
-                    claimed_version=ipfs_version
-                )
-                
-                # Set verification results from blockchain response
-                verification_result.ipfs_version = verify_result["actual_version"]
-                verification_result.is_deleted = verify_result["is_deleted"]
-                verification_result.message = verify_result["message"]
-                
-                # Store result of IPFS hash verification (if stored ipfs_hash matches blockchain)
-                ipfs_hash_verified = verify_result["is_valid"]
-                
-                # Get transaction details for additional verification
-                tx_data = await self.blockchain_service.get_transaction_details(blockchain_tx_id, asset_id)
-                blockchain_cid = tx_data.get("cid", "unknown")
-                tx_sender = tx_data.get("tx_sender", None)
-
-                # Set blockchain CID
-                verification_result.blockchain_cid = blockchain_cid
-                
-                # Verify transaction sender if possible
-                server_wallet = self.blockchain_service.get_server_wallet_address()
-                
-                if tx_sender and server_wallet:
-                    # Convert both addresses to lowercase for case-insensitive comparison
-                    tx_sender_lower = tx_sender.lower() if isinstance(tx_sender, str) else None
-                    server_wallet_lower = server_wallet.lower() if isinstance(server_wallet, str) else None
-                    
-                    # Check if transaction sender matches server wallet address
-                    tx_sender_verified = (tx_sender_lower and server_wallet_lower and 
-                                        tx_sender_lower == server_wallet_lower)
-                    
-                    if not tx_sender_verified:
-                        logger.warning(f"Transaction sender verification failed for {asset_id}. "
-                                      f"Expected: {server_wallet_lower}, Found: {tx_sender_lower}")
-                else:
-                    tx_sender_verified = False
-                    logger.warning(f"Transaction sender verification failed - missing data. " 
-                                  f"tx_sender: {tx_sender}, server_wallet: {server_wallet}")
-                
-                verification_result.tx_sender_verified = tx_sender_verified
-                
-            except Exception as e:
-                logger.error(f"Error verifying asset on blockchain: {str(e)}")
-                verification_result.message = f"Blockchain verification failed: {str(e)}"
-            
-            await progress_callback(4, 9, "Computing metadata integrity...")
-            
-            # 4. Compute CID from MongoDB critical metadata
-            metadata_for_ipfs = {
-                "asset_id": asset_id,
-                "wallet_address": wallet_address,
-                "critical_metadata": critical_metadata
-            }
-            computed_cid = await self.ipfs_service.compute_cid(get_ipfs_metadata(metadata_for_ipfs))
-
-            # 5. Set computed CID and compare with blockchain CID
-            verification_result.computed_cid = computed_cid
-            verification_result.cid_match = computed_cid == verification_result.blockchain_cid
-
-            # Check specifically for deletion status tampering
-            deletion_status_tampered = verification_result.is_deleted and not document.get("isDeleted", False)
-            verification_result.deletion_status_tampered = deletion_status_tampered
-
-            # Different verification logic for current vs. historical versions
-            if is_latest_version:
-                # For latest version, verify both the IPFS hash AND that the computed CID matches
-                verification_result.verified = ipfs_hash_verified and verification_result.cid_match and not deletion_status_tampered
-                verification_result.recovery_needed = not verification_result.verified
-                
-                if verification_result.verified:
-                    logger.debug(f"Verification Success: Current version of asset {asset_id}, version={doc_version}, ipfs_version={ipfs_version}")
-                else:
-                    logger.warning(f"Current version verification failed for asset {asset_id}, version {doc_version}, ipfs_version {ipfs_version}")
-                    if deletion_status_tampered:
-                        verification_result.message = "Tampering detected: Asset is marked as deleted on blockchain but not in MongoDB"
-                    elif not ipfs_hash_verified:
-                        if verification_result.is_deleted:
-                            verification_result.message = "Asset is marked as deleted on blockchain"
-                        else:
-                            verification_result.message = "IPFS hash verification failed - stored hash doesn't match blockchain"
-                    elif not verification_result.cid_match:
-                        verification_result.message = "CID mismatch - computed CID from current data doesn't match blockchain CID"
-            else:
-                # For historical versions, use transaction history verification instead
-                # Consider it verified if the transaction data matches the computed data
-                verification_result.verified = verification_result.cid_match and verification_result.tx_sender_verified and not deletion_status_tampered
-                verification_result.recovery_needed = not verification_result.verified
-                
-                if verification_result.verified:
-                    logger.debug(f"Verification Success: Historical version of asset {asset_id}, version={doc_version}, ipfs_version={ipfs_version}")
-                    verification_result.message = "Historical version verified via transaction data"
-                else:
-                    logger.warning(f"Historical version verification failed for asset {asset_id}, version {doc_version}, ipfs_version {ipfs_version}")
-                    if deletion_status_tampered:
-                        verification_result.message = "Tampering detected: Asset is marked as deleted on blockchain but not in MongoDB"
-                    elif verification_result.cid_match:
-                        verification_result.message = "Historical transaction sender verification failed"
-                    else:
-                        verification_result.message = "Historical CID verification failed"
-            
-            # Additional logging if recovery needed
-            if verification_result.recovery_needed:
-                logger.warning(f"Verification failed for asset {asset_id}. "
-                             f"CID match: {verification_result.cid_match}, IPFS hash verified: {ipfs_hash_verified}, "
-                             f"needs recovery: {verification_result.recovery_needed}, deletion status tampered: {deletion_status_tampered}")
-            
             # 6. If verification failed and auto-recover is enabled, try to recover
             new_version_created = False
             final_ipfs_hash = verification_result.blockchain_cid  # Default to original CID
@@ -899,7 +904,9 @@ class RetrieveHandler:
                     # Use enhanced recovery to get authentic CID with fallback mechanism
                     try:
                         await progress_callback(6, 9, "Searching blockchain transaction history...")
-                        recovery_data = await self.recover_authentic_data_with_progress(blockchain_tx_id, asset_id, wallet_address, progress_callback)
+                        recovery_data = await self.recover_authentic_data_with_progress(
+                            blockchain_tx_id, asset_id, wallet_address, progress_callback, tx_data=verified["tx_data"]
+                        )
                         authentic_cid = recovery_data["cid"]
                         correct_tx_hash = recovery_data["tx_hash"]
                         authentic_metadata = await self.ipfs_service.retrieve_metadata(authentic_cid)
@@ -1037,50 +1044,7 @@ class RetrieveHandler:
             verification_result.new_version_created = new_version_created
             
             # 8. Extract timestamp fields from document
-            # Get creation time from version 1 of this asset
-            try:
-                first_version = await self.asset_service.asset_repository.find_asset({
-                    "assetId": asset_id,
-                    "versionNumber": 1
-                })
-                
-                if first_version:
-                    # Handle case where _id might be a string (convert to ObjectId)
-                    version_id = first_version["_id"]
-                    if isinstance(version_id, str):
-                        try:
-                            from bson import ObjectId
-                            version_id = ObjectId(version_id)
-                        except Exception:
-                            version_id = None
-                    
-                    if version_id and hasattr(version_id, 'generation_time'):
-                        created_at = version_id.generation_time.isoformat()
-                    else:
-                        created_at = document.get("lastUpdated", "")
-                else:
-                    created_at = document.get("lastUpdated", "")
-            except Exception as e:
-                logger.warning(f"Could not find version 1 for asset {asset_id}: {e}")
-                # Fallback to current document's ObjectId or lastUpdated
-                if hasattr(document["_id"], 'generation_time'):
-                    created_at = document["_id"].generation_time.isoformat()
-                else:
-                    created_at = document.get("lastUpdated", "")
-            
-            updated_at = document.get("lastUpdated", "")
-            
-            # Convert datetime objects to ISO strings if needed
-            if hasattr(created_at, 'isoformat'):
-                # Ensure timezone consistency - if timezone-naive, assume UTC
-                if created_at.tzinfo is None:
-                    created_at = created_at.replace(tzinfo=timezone.utc)
-                created_at = created_at.isoformat()
-            if hasattr(updated_at, 'isoformat'):
-                # Ensure timezone consistency - if timezone-naive, assume UTC
-                if updated_at.tzinfo is None:
-                    updated_at = updated_at.replace(tzinfo=timezone.utc)
-                updated_at = updated_at.isoformat()
+            created_at, updated_at = self._resolve_timestamps(asset_id, document, verified["first_version"])
             
             # 9. Prepare response
             return MetadataRetrieveResponse(
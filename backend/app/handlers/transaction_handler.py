@@ -72,8 +72,8 @@ class TransactionHandler:
                 if not is_owner:
                     # For transaction history, we need the blockchain service to check delegation
                     # Import here to avoid circular imports
-                    from app.services.blockchain_service import BlockchainService
-                    blockchain_service = BlockchainService()
+                    from app.services.service_container import get_blockchain_service
+                    blockchain_service = get_blockchain_service()
                     
                     try:
                         is_delegated = await blockchain_service.check_delegation(
@@ -405,27 +405,29 @@ class TransferHandler:
             
             outgoing_transfers = []
             
-            # 2. Check each asset for pending transfers
-            for asset in assets:
+            # 2. Check every asset for pending transfers in one batched read
+            pending = await self.blockchain_service.get_pending_transfer_many(
+                [(asset.get("assetId"), wallet_address) for asset in assets]
+            ) if assets else []
+            for asset, pending_to in zip(assets, pending):
                 asset_id = asset.get("assetId")
                 
-                try:
-                    pending_to = await self.blockchain_service.get_pending_transfer(asset_id, wallet_address)
-                    
-                    if pending_to and pending_to != "0x0000000000000000000000000000000000000000":
-                        outgoing_transfers.append({
-                            "asset_id": asset_id,
-                            "from": wallet_address,
-                            "to": pending_to,
-                            "asset_info": {
-                                "document_id": asset.get("_id"),
-                                "version": asset.get("versionNumber"),
-                                "critical_metadata": asset.get("criticalMetadata", {})
-                            }
-                        })
-                except Exception as e:
-                    logger.error(f"Error checking pending transfers for asset {asset_id}: {str(e)}")
+                if isinstance(pending_to, Exception):
+                    logger.error(f"Error checking pending transfers for asset {asset_id}: {str(pending_to)}")
                     # Continue checking other assets
+                    continue
+                
+                if pending_to and pending_to != "0x0000000000000000000000000000000000000000":
+                    outgoing_transfers.append({
+                        "asset_id": asset_id,
+                        "from": wallet_address,
+                        "to": pending_to,
+                        "asset_info": {
+                            "document_id": asset.get("_id"),
+                            "version": asset.get("versionNumber"),
+                            "critical_metadata": asset.get("criticalMetadata", {})
+                        }
+                    })
             
             # 3. For incoming transfers, we would need to scan the blockchain events
             # This is a simplification - a real implementation would need to listen to transfer events
@@ -1,15 +1,16 @@
 from fastapi import UploadFile
-from typing import List, Dict, Any, Optional
-from io import StringIO
+from typing import List, Dict, Any, Optional, Tuple
 import json
-import pandas as pd
 import logging
 from dotenv import load_dotenv
+from app.config import settings
 from app.services.asset_service import AssetService
 from app.services.ipfs_service import IPFSService
 from app.services.blockchain_service import BlockchainService
 from app.services.transaction_service import TransactionService
 from app.services.transaction_state_service import TransactionStateService
+from app.services.write_batcher import MAX_BATCH_SIZE
+from app.utilities.csv_stream import AssetIdSet, iter_csv_chunks
 from app.utilities.format import get_ipfs_metadata
 
 logger = logging.getLogger(__name__)
@@ -104,18 +105,8 @@ class UploadHandler:
         """
         try:
             # Check if asset_id already exists
-            existing_doc = None
-            was_deleted = False
             try:
-                # First check for non-deleted assets
-                existing_doc = await self.asset_service.get_asset(asset_id)
-                
-                # If not found, check if there's a deleted asset with this ID
-                if not existing_doc:
-                    deleted_doc = await self.asset_service.get_asset_with_deleted(asset_id)
-                    if deleted_doc and deleted_doc.get("isDeleted", False):
-                        existing_doc = deleted_doc
-                        was_deleted = True
+                existing_doc, was_deleted = await self._get_existing_asset(asset_id)
             except Exception as e:
                 logger.error(f"Error checking for existing document: {str(e)}")
                 result = {"asset_id": asset_id, "status": "error", "detail": f"Error checking for existing document: {str(e)}"}
@@ -130,365 +121,87 @@ class UploadHandler:
                 "critical_metadata": critical_metadata
             })
             
-            if existing_doc:
-                # Document exists, check if critical metadata changed
-                existing_ipfs_hash = existing_doc.get("ipfsHash")
-                
-                # Compute CID for the current metadata
-                computed_cid = await self.ipfs_service.compute_cid(ipfs_metadata)
-                
-                # If CIDs match, then critical metadata has NOT changed
-                critical_metadata_changed = computed_cid != existing_ipfs_hash
-                
-                # Get current ipfsVersion from document or fallback to versionNumber
-                current_ipfs_version = existing_doc.get("ipfsVersion", existing_doc.get("versionNumber", 1))
-                
-                # Force blockchain update if the asset was deleted, even if critical_metadata hasn't changed
-                if critical_metadata_changed or was_deleted:
-                    # Critical metadata changed or asset was deleted - upload to IPFS and blockchain
-                    # 1) Upload to IPFS
-                    cid = await self.ipfs_service.store_metadata(ipfs_metadata)
-                    
-                    # 2) Handle blockchain interaction based on authentication method
-                    if self.auth_context and self.auth_context.get("auth_method") == "wallet":
-                        # For wallet users, prepare unsigned transaction and return for signing
-                        if initiator_address.lower() == owner_address.lower():
-                            # Regular update (owner updating their own asset)
-                            blockchain_result = await self.blockchain_service.store_hash(cid, asset_id, self.auth_context)
-                        else:
-                            # Delegate updating on behalf of owner
-                            blockchain_result = await self.blockchain_service.store_hash_for(cid, asset_id, owner_address, self.auth_context)
-                        
-                        if not blockchain_result.get("success"):
-                            raise Exception(f"Failed to prepare transaction: {blockchain_result.get('error')}")
-                        
-                        # Store pending transaction state
-                        pending_data = {
-                            "asset_id": asset_id,
-                            "owner_address": owner_address,
-                            "initiator_address": initiator_address,
-                            "ipfs_cid": cid,
-                            "critical_metadata": critical_metadata,
-                            "non_critical_metadata": non_critical_metadata,
-                            "action": "updateIPFS" if initiator_address.lower() == owner_address.lower() else "updateIPFSFor",
-                            "was_deleted": was_deleted,
-                            "transaction": blockchain_result["transaction"],
-                            "current_ipfs_version": current_ipfs_version,
-                            "file_info": file_info
-                        }
-                        
-                        pending_tx_id = await self.transaction_state_service.store_pending_transaction(
-                            user_address=initiator_address,
-                            transaction_data=pending_data
-                        )
-                        
-                        # Return transaction for frontend to sign
-                        result = {
-                            "asset_id": asset_id,
-                            "status": "pending_signature",
-                            "message": "Transaction prepared for signing",
-                            "pending_tx_id": pending_tx_id,
-                            "ipfs_cid": cid,
-                            "transaction": blockchain_result["transaction"],
-                            "estimated_gas": blockchain_result.get("estimated_gas"),
-                            "gas_price": blockchain_result.get("gas_price"),
-                            "function_name": blockchain_result.get("function_name"),
-                            "owner_address": owner_address,
-                            "initiator_address": initiator_address,
-                            "next_step": "sign_and_broadcast"
-                        }
-                        
-                        if file_info:
-                            result.update(file_info)
-                        return result
-                    
-                    else:
-                        # For API key users, use existing server-signed logic
-                        blockchain_result = None
-                        if initiator_address.lower() == owner_address.lower():
-                            # Regular update (owner updating their own asset)
-                            blockchain_result = await self.blockchain_service.store_hash(cid, asset_id)
-                        else:
-                            # Admin/delegate updating on behalf of owner
-                            blockchain_result = await self.blockchain_service.store_hash_for(cid, asset_id, owner_address)
-                        
-                        blockchain_tx_hash = blockchain_result.get("tx_hash")
-                    
-                    # 3) Handle based on whether the asset was deleted
-                    if was_deleted:
-                        # For deleted assets, create a fresh asset 
-                        # Query blockchain for actual version after transaction
-                        blockchain_info = await self.blockchain_service.get_ipfs_info(asset_id, owner_address)
-                        actual_ipfs_version = blockchain_info.get("ipfs_version", 1)
-                        
-                        # This will delete all previous versions marked as deleted
-                        new_doc_id = await self.asset_service.create_asset(
-                            asset_id=asset_id,
-                            wallet_address=owner_address,
-                            smart_contract_tx_id=blockchain_tx_hash,
-                            ipfs_hash=cid,
-                            critical_metadata=critical_metadata,
-                            non_critical_metadata=non_critical_metadata,
-                            ipfs_version=actual_ipfs_version
-                        )
-                        
-                        # Record transaction
-                        if self.transaction_service:
-                            performed_by = initiator_address if initiator_address.lower() != owner_address.lower() else owner_address
-                            
-                            await self.transaction_service.record_transaction(
-                                asset_id=asset_id,
-                                action="RECREATE_DELETED",
-                                wallet_address=owner_address,
-                                performed_by=performed_by,
-                                metadata={
-                                    "ipfsHash": cid,
-                                    "smartContractTxId": blockchain_tx_hash,
-                                    "versionNumber": 1,
-                                    "ipfsVersion": 1,
-                                    "wasDeleted": True,
-                                    "ownerAddress": owner_address
-                                }
-                            )
-                        
-                        message = "Asset recreated from deleted state with version reset to 1"
-                        
-                        result = {
-                            "asset_id": asset_id,
-                            "status": "success",
-                            "message": message,
-                            "document_id": new_doc_id,
-                            "version": 1,
-                            "ipfs_version": 1,
-                            "ipfs_cid": cid,
-                            "blockchain_tx_hash": blockchain_tx_hash,
-                            "owner_address": owner_address,
-                            "initiator_address": initiator_address
-                        }
-                    else:
-                        # For non-deleted assets, create a new version
-                        # Increment ipfsVersion since critical metadata changed
-                        next_ipfs_version = current_ipfs_version + 1
-                        
-                        version_result = await self.asset_service.create_new_version(
-                            asset_id=asset_id,
-                            wallet_address=owner_address,
-                            smart_contract_tx_id=blockchain_tx_hash,
-                            ipfs_hash=cid,
-                            critical_metadata=critical_metadata,
-                            non_critical_metadata=non_critical_metadata,
-                            ipfs_version=next_ipfs_version,
-                            performed_by=initiator_address
-                        )
-                        
-                        # Extract results
-                        new_doc_id = version_result["document_id"]
-                        version_number = version_result["version_number"]
-                        ipfs_version = version_result.get("ipfs_version", next_ipfs_version)
-                        
-                        # Record transaction
-                        if self.transaction_service:
-                            performed_by = initiator_address if initiator_address.lower() != owner_address.lower() else owner_address
-                            
-                            tx_action = "VERSION_CREATE"
-                            await self.transaction_service.record_transaction(
-                                asset_id=asset_id,
-                                action=tx_action,
-                                wallet_address=owner_address,
-                                performed_by=performed_by,
-                                metadata={
-                                    "ipfsHash": cid,
-                                    "smartContractTxId": blockchain_tx_hash,
-                                    "versionNumber": version_number,
-                                    "ipfsVersion": ipfs_version,
-                                    "ownerAddress": owner_address
-                                }
-                            )
-                        
-                        message = "New version created with updated critical metadata"
-                        
-                        result = {
-                            "asset_id": asset_id,
-                            "status": "success",
-                            "message": message,
-                            "document_id": new_doc_id,
-                            "version": version_number,
-                            "ipfs_version": ipfs_version,
-                            "ipfs_cid": cid,
-                            "blockchain_tx_hash": blockchain_tx_hash,
-                            "owner_address": owner_address,
-                            "initiator_address": initiator_address
-                        }
-                    
-                    if file_info:
-                        result.update(file_info)
-                    return result
+            if not await self._critical_metadata_changed(existing_doc, was_deleted, ipfs_metadata):
+                # Only non-critical metadata changed - just update MongoDB
+                return await self._store_asset_version(
+                    asset_id, owner_address, initiator_address, critical_metadata, non_critical_metadata,
+                    existing_doc, was_deleted, cid=None, blockchain_tx_hash=None, file_info=file_info
+                )
+            
+            # New asset, changed critical metadata or a deleted asset - upload to IPFS and blockchain
+            # 1) Upload to IPFS
+            cid = await self.ipfs_service.store_metadata(ipfs_metadata)
+            
+            # 2) Handle blockchain interaction based on authentication method
+            if self.auth_context and self.auth_context.get("auth_method") == "wallet":
+                # For wallet users, prepare unsigned transaction and return for signing
+                if initiator_address.lower() == owner_address.lower():
+                    # Regular write (owner writing their own asset)
+                    blockchain_result = await self.blockchain_service.store_hash(cid, asset_id, self.auth_context)
                 else:
-                    # Only non-critical metadata changed - just update MongoDB
-                    # Reuse existing IPFS hash and blockchain transaction ID
-                    existing_tx_hash = existing_doc.get("smartContractTxId")
-                    
-                    # Create new version in MongoDB for non-deleted asset
-                    # Keep ipfsVersion the same since critical metadata hasn't changed
-                    version_result = await self.asset_service.create_new_version(
-                        asset_id=asset_id,
-                        wallet_address=owner_address,
-                        smart_contract_tx_id=existing_tx_hash,
-                        ipfs_hash=existing_ipfs_hash,
-                        critical_metadata=critical_metadata,
-                        non_critical_metadata=non_critical_metadata,
-                        ipfs_version=current_ipfs_version,
-                        performed_by=initiator_address
-                    )
-                    
-                    # Extract results
-                    new_doc_id = version_result["document_id"]
-                    version_number = version_result["version_number"]
-                    ipfs_version = version_result.get("ipfs_version", current_ipfs_version)
-                    
-                    # Record transaction
-                    if self.transaction_service:
-                        performed_by = initiator_address if initiator_address.lower() != owner_address.lower() else owner_address
-                        
-                        await self.transaction_service.record_transaction(
-                            asset_id=asset_id,
-                            action="UPDATE",
-                            wallet_address=owner_address,
-                            performed_by=performed_by,
-                            metadata={
-                                "versionNumber": version_number,
-                                "ipfsVersion": ipfs_version,
-                                "ownerAddress": owner_address
-                            }
-                        )
-                    
-                    result = {
-                        "asset_id": asset_id,
-                        "status": "success",
-                        "message": "New version created with updated non-critical metadata only",
-                        "document_id": new_doc_id,
-                        "version": version_number,
-                        "ipfs_version": ipfs_version,
-                        "ipfs_cid": existing_ipfs_hash,
-                        "blockchain_tx_hash": existing_tx_hash,
-                        "owner_address": owner_address,
-                        "initiator_address": initiator_address
-                    }
-                    if file_info:
-                        result.update(file_info)
-                    return result
-            else:
-                # New document - proceed with normal flow
-                # 1) Upload to IPFS
-                cid = await self.ipfs_service.store_metadata(ipfs_metadata)
+                    # Delegate writing on behalf of owner
+                    blockchain_result = await self.blockchain_service.store_hash_for(cid, asset_id, owner_address, self.auth_context)
                 
-                # 2) Handle blockchain interaction based on authentication method
-                if self.auth_context and self.auth_context.get("auth_method") == "wallet":
-                    # For wallet users, prepare unsigned transaction and return for signing
-                    if initiator_address.lower() == owner_address.lower():
-                        # Regular creation (owner creating their own asset)
-                        blockchain_result = await self.blockchain_service.store_hash(cid, asset_id, self.auth_context)
-                    else:
-                        # Admin/delegate creating on behalf of owner
-                        blockchain_result = await self.blockchain_service.store_hash_for(cid, asset_id, owner_address, self.auth_context)
-                    
-                    if not blockchain_result.get("success"):
-                        raise Exception(f"Failed to prepare transaction: {blockchain_result.get('error')}")
-                    
-                    # Store pending transaction state
-                    pending_data = {
-                        "asset_id": asset_id,
-                        "owner_address": owner_address,
-                        "initiator_address": initiator_address,
-                        "ipfs_cid": cid,
-                        "critical_metadata": critical_metadata,
-                        "non_critical_metadata": non_critical_metadata,
-                        "action": "updateIPFS" if initiator_address.lower() == owner_address.lower() else "updateIPFSFor",
-                        "was_deleted": False,
-                        "is_new_document": True,
-                        "transaction": blockchain_result["transaction"],
-                        "file_info": file_info
-                    }
-                    
-                    pending_tx_id = await self.transaction_state_service.store_pending_transaction(
-                        user_address=initiator_address,
-                        transaction_data=pending_data
-                    )
-                    
-                    # Return transaction for frontend to sign
-                    result = {
-                        "asset_id": asset_id,
-                        "status": "pending_signature",
-                        "message": "Transaction prepared for signing",
-                        "pending_tx_id": pending_tx_id,
-                        "ipfs_cid": cid,
-                        "transaction": blockchain_result["transaction"],
-                        "estimated_gas": blockchain_result.get("estimated_gas"),
-                        "gas_price": blockchain_result.get("gas_price"),
-                        "function_name": blockchain_result.get("function_name"),
-                        "owner_address": owner_address,
-                        "initiator_address": initiator_address,
-                        "next_step": "sign_and_broadcast"
-                    }
-                    
-                    if file_info:
-                        result.update(file_info)
-                    return result
+                if not blockchain_result.get("success"):
+                    raise Exception(f"Failed to prepare transaction: {blockchain_result.get('error')}")
                 
+                # Store pending transaction state
+                pending_data = {
+                    "asset_id": asset_id,
+                    "owner_address": owner_address,
+                    "initiator_address": initiator_address,
+                    "ipfs_cid": cid,
+                    "critical_metadata": critical_metadata,
+                    "non_critical_metadata": non_critical_metadata,
+                    "action": "updateIPFS" if initiator_address.lower() == owner_address.lower() else "updateIPFSFor",
+                    "was_deleted": was_deleted,
+                    "transaction": blockchain_result["transaction"],
+                    "file_info": file_info
+                }
+                if existing_doc:
+                    pending_data["current_ipfs_version"] = existing_doc.get("ipfsVersion", existing_doc.get("versionNumber", 1))
                 else:
-                    # For API key users, use existing server-signed logic
-                    if initiator_address.lower() == owner_address.lower():
-                        # Regular creation (owner creating their own asset)
-                        blockchain_result = await self.blockchain_service.store_hash(cid, asset_id)
-                    else:
-                        # Admin/delegate creating on behalf of owner
-                        blockchain_result = await self.blockchain_service.store_hash_for(cid, asset_id, owner_address)
-                    
-                    blockchain_tx_hash = blockchain_result.get("tx_hash")
+                    pending_data["is_new_document"] = True
                 
-                # 3) Insert into MongoDB
-                doc_id = await self.asset_service.create_asset(
-                    asset_id=asset_id,
-                    wallet_address=owner_address,
-                    smart_contract_tx_id=blockchain_tx_hash,
-                    ipfs_hash=cid,
-                    critical_metadata=critical_metadata,
-                    non_critical_metadata=non_critical_metadata,
-                    ipfs_version=1
+                pending_tx_id = await self.transaction_state_service.store_pending_transaction(
+                    user_address=initiator_address,
+                    transaction_data=pending_data
                 )
                 
-                # 4) Record transaction if transaction service is available
-                if self.transaction_service:
-                    performed_by = initiator_address if initiator_address.lower() != owner_address.lower() else owner_address
-                    
-                    await self.transaction_service.record_transaction(
-                        asset_id=asset_id,
-                        action="CREATE",
-                        wallet_address=owner_address,
-                        performed_by=performed_by,
-                        metadata={
-                            "ipfsHash": cid,
-                            "smartContractTxId": blockchain_tx_hash,
-                            "ipfsVersion": 1,
-                            "ownerAddress": owner_address
-                        }
-                    )
-                
+                # Return transaction for frontend to sign
                 result = {
                     "asset_id": asset_id,
-                    "status": "success",
-                    "message": "Document created",
-                    "document_id": doc_id,
-                    "version": 1,
-                    "ipfs_version": 1,
+                    "status": "pending_signature",
+                    "message": "Transaction prepared for signing",
+                    "pending_tx_id": pending_tx_id,
                     "ipfs_cid": cid,
-                    "blockchain_tx_hash": blockchain_tx_hash,
+                    "transaction": blockchain_result["transaction"],
+                    "estimated_gas": blockchain_result.get("estimated_gas"),
+                    "gas_price": blockchain_result.get("gas_price"),
+                    "function_name": blockchain_result.get("function_name"),
                     "owner_address": owner_address,
-                    "initiator_address": initiator_address
+                    "initiator_address": initiator_address,
+                    "next_step": "sign_and_broadcast"
                 }
+                
                 if file_info:
                     result.update(file_info)
                 return result
+            
+            # For API key users, use existing server-signed logic
+            if initiator_address.lower() == owner_address.lower():
+                # Regular write (owner writing their own asset); updateIPFS records the server wallet as owner
+                blockchain_result = await self.blockchain_service.store_hash(cid, asset_id)
+            else:
+                # Admin/delegate writing on behalf of owner
+                blockchain_result = await self.blockchain_service.store_hash_for(cid, asset_id, owner_address)
+            
+            # 3) Store the document in MongoDB
+            return await self._store_asset_version(
+                asset_id, owner_address, initiator_address, critical_metadata, non_critical_metadata,
+                existing_doc, was_deleted, cid=cid, blockchain_tx_hash=blockchain_result.get("tx_hash"),
+                file_info=file_info
+            )
                 
         except Exception as e:
             logger.error(f"Error processing metadata for asset {asset_id}: {str(e)}")
@@ -496,7 +209,187 @@ class UploadHandler:
             if file_info:
                 result.update(file_info)
             return result
-    
+
+    async def _get_existing_asset(self, asset_id: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Find the current document for an asset, including a deleted one.
+
+        Args:
+            asset_id: The asset's unique identifier
+
+        Returns:
+            Tuple of the document (or None) and whether it is deleted
+        """
+        # First check for non-deleted assets
+        existing_doc = await self.asset_service.get_asset(asset_id)
+        if existing_doc:
+            return existing_doc, False
+
+        # If not found, check if there's a deleted asset with this ID
+        deleted_doc = await self.asset_service.get_asset_with_deleted(asset_id)
+        if deleted_doc and deleted_doc.get("isDeleted", False):
+            return deleted_doc, True
+        return None, False
+
+    async def _critical_metadata_changed(
+        self,
+        existing_doc: Optional[Dict[str, Any]],
+        was_deleted: bool,
+        ipfs_metadata: Dict[str, Any]
+    ) -> bool:
+        """
+        Check whether an asset needs new IPFS and blockchain writes.
+
+        Args:
+            existing_doc: The asset's current document, or None for a new asset
+            was_deleted: Whether existing_doc is deleted
+            ipfs_metadata: The metadata that would be stored on IPFS
+
+        Returns:
+            True for a new or deleted asset, or if the metadata's CID differs from the stored one
+        """
+        # Force a blockchain write for deleted assets, even if critical metadata hasn't changed
+        if existing_doc is None or was_deleted:
+            return True
+        # If CIDs match, then critical metadata has NOT changed
+        computed_cid = await self.ipfs_service.compute_cid(ipfs_metadata)
+        return computed_cid != existing_doc.get("ipfsHash")
+
+    async def _store_asset_version(
+        self,
+        asset_id: str,
+        owner_address: str,
+        initiator_address: str,
+        critical_metadata: Dict[str, Any],
+        non_critical_metadata: Dict[str, Any],
+        existing_doc: Optional[Dict[str, Any]],
+        was_deleted: bool,
+        cid: Optional[str],
+        blockchain_tx_hash: Optional[str],
+        file_info: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Store a server-signed write in MongoDB and record it in the audit trail.
+
+        Used by process_metadata once its IPFS upload and transaction are done,
+        and by CSV imports for every row of a batch transaction.
+
+        Args:
+            asset_id: The asset's unique identifier
+            owner_address: The wallet address of the asset owner
+            initiator_address: The wallet address of the user initiating the operation
+            critical_metadata: Core metadata stored on blockchain
+            non_critical_metadata: Additional metadata stored only in MongoDB
+            existing_doc: The asset's current document, or None for a new asset
+            was_deleted: Whether existing_doc is deleted
+            cid: CID of the uploaded critical metadata, or None if only non-critical
+                metadata changed and the existing IPFS hash and transaction are kept
+            blockchain_tx_hash: Hash of the transaction that stored `cid`
+            file_info: Optional information about source file
+
+        Returns:
+            Dict with processing results
+
+        Raises:
+            Exception: If a MongoDB write fails
+        """
+        performed_by = initiator_address if initiator_address.lower() != owner_address.lower() else owner_address
+        current_ipfs_version = existing_doc.get("ipfsVersion", existing_doc.get("versionNumber", 1)) if existing_doc else 0
+
+        if cid is None:
+            # Reuse existing IPFS hash and blockchain transaction ID
+            cid = existing_doc.get("ipfsHash")
+            blockchain_tx_hash = existing_doc.get("smartContractTxId")
+            # Keep ipfsVersion the same since critical metadata hasn't changed
+            version_result = await self.asset_service.create_new_version(
+                asset_id=asset_id,
+                wallet_address=owner_address,
+                smart_contract_tx_id=blockchain_tx_hash,
+                ipfs_hash=cid,
+                critical_metadata=critical_metadata,
+                non_critical_metadata=non_critical_metadata,
+                ipfs_version=current_ipfs_version,
+                performed_by=initiator_address
+            )
+            doc_id = version_result["document_id"]
+            version_number = version_result["version_number"]
+            ipfs_version = version_result.get("ipfs_version", current_ipfs_version)
+            action = "UPDATE"
+            message = "New version created with updated non-critical metadata only"
+            tx_metadata = {"versionNumber": version_number, "ipfsVersion": ipfs_version}
+        elif existing_doc is None or was_deleted:
+            # The contract starts new assets, and deleted ones written again, at ipfsVersion 1;
+            # creating a deleted asset again removes its previous versions
+            doc_id = await self.asset_service.create_asset(
+                asset_id=asset_id,
+                wallet_address=owner_address,
+                smart_contract_tx_id=blockchain_tx_hash,
+                ipfs_hash=cid,
+                critical_metadata=critical_metadata,
+                non_critical_metadata=non_critical_metadata,
+                ipfs_version=1
+            )
+            version_number = 1
+            ipfs_version = 1
+            tx_metadata = {"ipfsHash": cid, "smartContractTxId": blockchain_tx_hash, "ipfsVersion": 1}
+            if was_deleted:
+                action = "RECREATE_DELETED"
+                message = "Asset recreated from deleted state with version reset to 1"
+                tx_metadata.update({"versionNumber": 1, "wasDeleted": True})
+            else:
+                action = "CREATE"
+                message = "Document created"
+        else:
+            # Increment ipfsVersion since critical metadata changed
+            next_ipfs_version = current_ipfs_version + 1
+            version_result = await self.asset_service.create_new_version(
+                asset_id=asset_id,
+                wallet_address=owner_address,
+                smart_contract_tx_id=blockchain_tx_hash,
+                ipfs_hash=cid,
+                critical_metadata=critical_metadata,
+                non_critical_metadata=non_critical_metadata,
+                ipfs_version=next_ipfs_version,
+                performed_by=initiator_address
+            )
+            doc_id = version_result["document_id"]
+            version_number = version_result["version_number"]
+            ipfs_version = version_result.get("ipfs_version", next_ipfs_version)
+            action = "VERSION_CREATE"
+            message = "New version created with updated critical metadata"
+            tx_metadata = {
+                "ipfsHash": cid,
+                "smartContractTxId": blockchain_tx_hash,
+                "versionNumber": version_number,
+                "ipfsVersion": ipfs_version
+            }
+
+        # Record transaction if transaction service is available
+        if self.transaction_service:
+            await self.transaction_service.record_transaction(
+                asset_id=asset_id,
+                action=action,
+                wallet_address=owner_address,
+                performed_by=performed_by,
+                metadata={**tx_metadata, "ownerAddress": owner_address}
+            )
+
+        result = {
+            "asset_id": asset_id,
+            "status": "success",
+            "message": message,
+            "document_id": doc_id,
+            "version": version_number,
+            "ipfs_version": ipfs_version,
+            "ipfs_cid": cid,
+            "blockchain_tx_hash": blockchain_tx_hash,
+            "owner_address": owner_address,
+            "initiator_address": initiator_address
+        }
+        if file_info:
+            result.update(file_info)
+        return result
+
     async def complete_blockchain_upload(
         self,
         pending_tx_id: str,
@@ -756,171 +649,192 @@ class UploadHandler:
         - Each JSON file must have: asset_id, critical_metadata, wallet_address (owner), optional non_critical_metadata
         - Each file represents a single document/asset
         - Duplicate asset_ids are skipped (first occurrence is used)
+        - Up to JSON_UPLOAD_CONCURRENCY files are processed at once; files are read and
+          parsed in order while earlier ones are in their IPFS and blockchain stages
+        - Delegation is checked once per owner across all files
         
         Args:
             files: List of uploaded JSON files
             wallet_address: The wallet address of the initiator
             
         Returns:
-            Dict with processing results for each file
+            Dict with processing results for each file, in the order of `files`
         """
+        import asyncio
+
+        slots = asyncio.Semaphore(max(1, settings.json_upload_concurrency))
         seen_asset_ids = set()
-        results = []
-        
-        for file_obj in files:
-            if not file_obj.filename.lower().endswith(".json"):
-                results.append({
-                    "filename": file_obj.filename,
-                    "status": "error",
-                    "detail": "Not a JSON file. Use .json extension."
-                })
-                continue
-                
+        delegation_checks: Dict[str, asyncio.Task] = {}
+        results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        tasks = []
+
+        async def process(index: int, data: Dict[str, Any], filename: str) -> None:
             try:
-                content = await file_obj.read()
-                try:
-                    data = json.loads(content.decode("utf-8"))
-                except Exception as e:
-                    results.append({
+                results[index] = await self._process_json_asset(data, filename, wallet_address, delegation_checks)
+            finally:
+                slots.release()
+
+        try:
+            for index, file_obj in enumerate(files):
+                if not file_obj.filename.lower().endswith(".json"):
+                    results[index] = {
                         "filename": file_obj.filename,
                         "status": "error",
-                        "detail": f"Invalid JSON file: {str(e)}"
-                    })
+                        "detail": "Not a JSON file. Use .json extension."
+                    }
                     continue
-                
-                # Check required fields
-                asset_id = data.get("asset_id")
-                critical_metadata = data.get("critical_metadata")
-                owner_wallet_address = data.get("wallet_address")
-                non_critical_metadata = data.get("non_critical_metadata", {})
-                
-                if not asset_id or not critical_metadata or not owner_wallet_address:
-                    results.append({
+
+                # Holding a slot while reading keeps at most JSON_UPLOAD_CONCURRENCY files in memory
+                await slots.acquire()
+                started = False
+                try:
+                    content = await file_obj.read()
+                    try:
+                        data = json.loads(content.decode("utf-8"))
+                    except Exception as e:
+                        results[index] = {
+                            "filename": file_obj.filename,
+                            "status": "error",
+                            "detail": f"Invalid JSON file: {str(e)}"
+                        }
+                        continue
+
+                    # Check required fields
+                    asset_id = data.get("asset_id")
+                    if not asset_id or not data.get("critical_metadata") or not data.get("wallet_address"):
+                        results[index] = {
+                            "filename": file_obj.filename,
+                            "status": "error",
+                            "detail": "Missing 'asset_id', 'wallet_address' (owner), or 'critical_metadata' in JSON."
+                        }
+                        continue
+
+                    # Files are claimed in input order, so the first occurrence wins
+                    if asset_id in seen_asset_ids:
+                        results[index] = {
+                            "asset_id": asset_id,
+                            "filename": file_obj.filename,
+                            "status": "skipped",
+                            "detail": "Duplicate asset_id; ignoring subsequent file."
+                        }
+                        continue
+                    seen_asset_ids.add(asset_id)
+
+                    tasks.append(asyncio.create_task(process(index, data, file_obj.filename)))
+                    started = True
+
+                except Exception as e:
+                    results[index] = {
                         "filename": file_obj.filename,
                         "status": "error",
-                        "detail": "Missing 'asset_id', 'wallet_address' (owner), or 'critical_metadata' in JSON."
-                    })
-                    continue
-                
-                # If we have not seen asset_id, proceed; else skip
-                if asset_id in seen_asset_ids:
-                    results.append({
-                        "asset_id": asset_id,
-                        "filename": file_obj.filename,
-                        "status": "skipped",
-                        "detail": "Duplicate asset_id; ignoring subsequent file."
-                    })
-                    continue
-                
-                # Mark it as seen
-                seen_asset_ids.add(asset_id)
-                
-                # SECURITY: For API key auth, validate TWO-STEP delegation permissions
-                if self.auth_context and self.auth_context.get("auth_method") == "api_key":
-                    if owner_wallet_address.lower() != wallet_address.lower():
-                        # User is trying to create assets for a different wallet
-                        # TWO-STEP VALIDATION:
-                        # 1. Target wallet must delegate the API key user (permission layer)
-                        # 2. Target wallet must delegate the server wallet (technical layer)
-                        server_wallet = self.blockchain_service.get_server_wallet_address()
-                        
-                        try:
-                            # Step 1: Check if target wallet delegated the API key user
-                            is_user_delegated = await self.blockchain_service.check_delegation(
-                                owner_address=owner_wallet_address,
-                                delegate_address=wallet_address
-                            )
-                            
-                            # Step 2: Check if target wallet delegated the server wallet
-                            is_server_delegated = await self.blockchain_service.check_delegation(
-                                owner_address=owner_wallet_address,
-                                delegate_address=server_wallet
-                            )
-                            
-                            # Both delegations are required
-                            if not is_user_delegated and not is_server_delegated:
-                                results.append({
-                                    "filename": file_obj.filename,
-                                    "asset_id": asset_id,
-                                    "status": "error",
-                                    "detail": (
-                                        f"Wallet {owner_wallet_address} has not delegated either you ({wallet_address}) "
-                                        f"or the server wallet ({server_wallet}). "
-                                        f"For API key access, both delegations are required. "
-                                        f"Ask {owner_wallet_address} to call: "
-                                        f"setDelegate('{wallet_address}', true) AND "
-                                        f"setDelegate('{server_wallet}', true)"
-                                    )
-                                })
-                                continue
-                            elif not is_user_delegated:
-                                results.append({
-                                    "filename": file_obj.filename,
-                                    "asset_id": asset_id,
-                                    "status": "error",
-                                    "detail": (
-                                        f"Wallet {owner_wallet_address} has not delegated you ({wallet_address}). "
-                                        f"Cannot create assets for this wallet via API key. "
-                                        f"Ask {owner_wallet_address} to call setDelegate('{wallet_address}', true)"
-                                    )
-                                })
-                                continue
-                            elif not is_server_delegated:
-                                results.append({
-                                    "filename": file_obj.filename,
-                                    "asset_id": asset_id,
-                                    "status": "error",
-                                    "detail": (
-                                        f"Wallet {owner_wallet_address} has not delegated the server wallet ({server_wallet}). "
-                                        f"Cannot create assets for this wallet via API key. "
-                                        f"Ask {owner_wallet_address} to call setDelegate('{server_wallet}', true)"
-                                    )
-                                })
-                                continue
-                                
-                        except Exception as e:
-                            if "has not delegated" in str(e):
-                                results.append({
-                                    "filename": file_obj.filename,
-                                    "asset_id": asset_id,
-                                    "status": "error",
-                                    "detail": str(e)
-                                })
-                                continue
-                            else:
-                                results.append({
-                                    "filename": file_obj.filename,
-                                    "asset_id": asset_id,
-                                    "status": "error",
-                                    "detail": f"Unable to verify delegation for {owner_wallet_address}: {str(e)}"
-                                })
-                                continue
-                
-                # Process metadata with file info
-                # Pass both owner address (from JSON) and initiator address (from route parameter)
-                result = await self.process_metadata(
-                    asset_id=asset_id,
-                    owner_address=owner_wallet_address,
-                    initiator_address=wallet_address,
-                    critical_metadata=critical_metadata,
-                    non_critical_metadata=non_critical_metadata,
-                    file_info={"filename": file_obj.filename}
-                )
-                
-                results.append(result)
-                    
-            except Exception as e:
-                results.append({
-                    "filename": file_obj.filename,
-                    "status": "error",
-                    "detail": f"Error processing file: {str(e)}"
-                })
-        
+                        "detail": f"Error processing file: {str(e)}"
+                    }
+                finally:
+                    if not started:
+                        slots.release()
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
         return {
             "upload_count": len(results),
             "results": results
         }
 
+    async def _process_json_asset(
+        self,
+        data: Dict[str, Any],
+        filename: str,
+        wallet_address: str,
+        delegation_checks: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Check delegation for and process the asset from one uploaded JSON file.
+
+        Args:
+            data: Parsed JSON file with asset_id, wallet_address and critical_metadata
+            filename: Name of the uploaded file
+            wallet_address: The wallet address of the initiator
+            delegation_checks: Delegation checks shared by the files of one upload, keyed by owner
+
+        Returns:
+            Result dict for the file
+        """
+        asset_id = data["asset_id"]
+        owner_wallet_address = data["wallet_address"]
+
+        try:
+            # SECURITY: For API key auth, validate TWO-STEP delegation permissions
+            if self.auth_context and self.auth_context.get("auth_method") == "api_key":
+                if owner_wallet_address.lower() != wallet_address.lower():
+                    try:
+                        delegation_error = await self._shared_delegation_check(
+                            owner_wallet_address, wallet_address, delegation_checks
+                        )
+                    except Exception as e:
+                        delegation_error = f"Unable to verify delegation for {owner_wallet_address}: {str(e)}"
+                    if delegation_error:
+                        return {
+                            "filename": filename,
+                            "asset_id": asset_id,
+                            "status": "error",
+                            "detail": delegation_error
+                        }
+
+            # Process metadata with file info
+            # Pass both owner address (from JSON) and initiator address (from route parameter)
+            return await self.process_metadata(
+                asset_id=asset_id,
+                owner_address=owner_wallet_address,
+                initiator_address=wallet_address,
+                critical_metadata=data["critical_metadata"],
+                non_critical_metadata=data.get("non_critical_metadata", {}),
+                file_info={"filename": filename}
+            )
+
+        except Exception as e:
+            return {
+                "filename": filename,
+                "status": "error",
+                "detail": f"Error processing file: {str(e)}"
+            }
+
+    async def _shared_delegation_check(
+        self,
+        owner_address: str,
+        initiator_address: str,
+        delegation_checks: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Run _check_owner_delegation once per owner, sharing the result between concurrent callers.
+
+        A check that fails is dropped from `delegation_checks` so the next caller retries it.
+
+        Args:
+            owner_address: The wallet address of the asset owner
+            initiator_address: The wallet address of the API key user
+            delegation_checks: Checks started so far, keyed by lowercased owner address
+
+        Returns:
+            None if both delegations are in place, otherwise the error detail
+        """
+        import asyncio
+
+        key = owner_address.lower()
+        check = delegation_checks.get(key)
+        if check is None:
+            check = asyncio.ensure_future(self._check_owner_delegation(owner_address, initiator_address))
+            delegation_checks[key] = check
+        try:
+            # One caller being cancelled must not cancel the check for the others
+            return await asyncio.shield(check)
+        except Exception:
+            if delegation_checks.get(key) is check:
+                del delegation_checks[key]
+            raise
+
     async def _process_batch_background(
         self,
         batch_id: str,
@@ -931,9 +845,10 @@ class UploadHandler:
         Background task to handle IPFS uploads and blockchain preparation.
         Updates progress tracker with real-time status.
         """
-        from app.services.progress_service import progress_tracker
+        from app.services.progress_service import get_progress_tracker
         import asyncio
         
+        progress_tracker = get_progress_tracker()
         try:
             # Prepare metadata for concurrent upload
             ipfs_metadata_list = []
@@ -1023,7 +938,7 @@ class UploadHandler:
                     logger.info(f"Blockchain transaction prepared for batch {batch_id}, pending_tx: {pending_tx}")
                     
                     # Update progress tracker with blockchain transaction data
-                    progress_tracker.set_blockchain_prepared(
+                    await progress_tracker.set_blockchain_prepared(
                         batch_id=batch_id,
                         transaction_data={
                             "transaction": blockchain_result["transaction"],
@@ -1141,6 +1056,9 @@ class UploadHandler:
             # Mark all remaining assets as error
             for asset_data in validated_assets:
                 progress_tracker.update_asset_progress(batch_id, asset_data["asset_id"], 0, "error")
+        finally:
+            # Lets progress streams close once the last update is out
+            await progress_tracker.finish_batch(batch_id)
 
     async def process_batch_metadata(
         self,
@@ -1200,13 +1118,15 @@ class UploadHandler:
                                 # Step 1: Check if target wallet delegated the API key user
                                 is_user_delegated = await self.blockchain_service.check_delegation(
                                     owner_address=owner_address,
-                                    delegate_address=initiator_address
+                                    delegate_address=initiator_address,
+                                    strict=settings.delegation_strict_writes
                                 )
                                 
                                 # Step 2: Check if target wallet delegated the server wallet
                                 is_server_delegated = await self.blockchain_service.check_delegation(
                                     owner_address=owner_address,
-                                    delegate_address=server_wallet
+                                    delegate_address=server_wallet,
+                                    strict=settings.delegation_strict_writes
                                 )
                                 
                                 # Both delegations are required
@@ -1280,7 +1200,7 @@ class UploadHandler:
                     }
             
             # Step 2: Setup progress tracking and start background processing
-            from app.services.progress_service import progress_tracker
+            from app.services.progress_service import get_progress_tracker
             import uuid
             
             # Generate unique batch ID  
@@ -1288,7 +1208,7 @@ class UploadHandler:
             asset_ids = [asset_data["asset_id"] for asset_data in validated_assets]
             
             # Initialize progress tracking
-            progress_tracker.create_batch(batch_id, asset_ids, len(validated_assets))
+            await get_progress_tracker().create_batch(batch_id, asset_ids, len(validated_assets))
             
             logger.info(f"Created batch {batch_id} with {len(validated_assets)} assets, starting background processing")
             
@@ -1456,6 +1376,7 @@ class UploadHandler:
                 "asset_count": 0
             }
 
+
     async def process_csv_upload(
         self,
         files: List[UploadFile],
@@ -1469,6 +1390,12 @@ class UploadHandler:
         - Must supply 'critical_metadata_fields' to identify which columns are critical
         - Each row must have an 'asset_id' and 'wallet_address' (owner) column
         - Duplicate asset_ids are skipped (first occurrence is used)
+        - Files are parsed CSV_IMPORT_CHUNK_ROWS rows at a time, and rows are grouped per
+          owner into batches of up to 50 that CSV_IMPORT_WORKERS workers process concurrently.
+          For API key auth each batch is one round of IPFS uploads and one batchUpdateIPFSFor
+          transaction.
+        - Per-row results go to the import result store rather than the response; page
+          through them with GET /upload/csv/{import_id}/results
         
         Args:
             files: List of uploaded CSV files
@@ -1476,187 +1403,340 @@ class UploadHandler:
             critical_metadata_fields: List of column names to treat as critical metadata
             
         Returns:
-            Dict with processing results for each file
+            Dict with the import ID, row counts per status and any file-level errors
         """
-        seen_asset_ids = set()
-        results = []
-        
-        # Helper to parse CSV rows into document dictionaries
-        def parse_csv(file_content: bytes, critical_fields: List[str]) -> List[Dict[str, Any]]:
-            """Parse CSV bytes into a list of asset dictionaries."""
-            csv_df = pd.read_csv(StringIO(file_content.decode("utf-8")))
+        from app.services.import_result_store import get_import_result_store
+        import asyncio
+        import uuid
 
-            if "asset_id" not in csv_df.columns:
-                raise ValueError("CSV file must contain an 'asset_id' column.")
-                
-            if "wallet_address" not in csv_df.columns:
-                raise ValueError("CSV file must contain a 'wallet_address' (owner) column.")
-
-            # Ensure critical fields exist
-            missing = [col for col in critical_fields if col not in csv_df.columns]
-            if missing:
-                raise ValueError(f"Missing critical columns {missing} in CSV.")
-
-            records = []
-            for _, row in csv_df.iterrows():
-                row_dict = row.to_dict()
-
-                asset_id = str(row_dict["asset_id"])
-                owner_address = str(row_dict["wallet_address"])
-                critical_md = {c: row_dict[c] for c in critical_fields}
-                # Everything else is non-critical (besides asset_id and wallet_address)
-                non_critical_md = {
-                    k: v for k, v in row_dict.items()
-                    if k not in critical_fields and k != "asset_id" and k != "wallet_address"
-                }
-                records.append({
-                    "asset_id": asset_id,
-                    "owner_address": owner_address,
-                    "critical_metadata": critical_md,
-                    "non_critical_metadata": non_critical_md
-                })
-            return records
-        
-        for file_obj in files:
-            if not file_obj.filename.lower().endswith(".csv"):
-                results.append({
-                    "filename": file_obj.filename,
-                    "status": "error",
-                    "detail": "Not a CSV file. Use .csv extension."
-                })
-                continue
-                
-            try:
-                content = await file_obj.read()
-                try:
-                    row_docs = parse_csv(content, critical_metadata_fields)
-                except Exception as e:
-                    results.append({
+        result_store = get_import_result_store()
+        import_id = str(uuid.uuid4())
+        await result_store.create_import(import_id, wallet_address)
+
+        is_api_key = bool(self.auth_context and self.auth_context.get("auth_method") == "api_key")
+        seen_asset_ids = AssetIdSet()
+        # Delegation verdict per owner: None when allowed, otherwise the error detail
+        delegation_errors: Dict[str, Optional[str]] = {}
+        # Rows waiting for their owner's batch to fill up
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        file_errors = []
+
+        # Bounded so parsing waits for the workers instead of reading ahead
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.csv_import_workers)
+        workers = [
+            asyncio.create_task(self._csv_import_worker(queue, import_id, wallet_address))
+            for _ in range(settings.csv_import_workers)
+        ]
+
+        try:
+            for file_obj in files:
+                if not file_obj.filename.lower().endswith(".csv"):
+                    file_errors.append({
                         "filename": file_obj.filename,
                         "status": "error",
-                        "detail": f"CSV parse error: {str(e)}"
+                        "detail": "Not a CSV file. Use .csv extension."
                     })
                     continue
-                
-                # Process each row as a separate document
-                for row_doc in row_docs:
-                    asset_id = row_doc["asset_id"]
-                    owner_address = row_doc["owner_address"]
-                    
-                    # Check for duplicates
-                    if asset_id in seen_asset_ids:
-                        results.append({
-                            "asset_id": asset_id,
-                            "filename": file_obj.filename,
-                            "status": "skipped",
-                            "detail": "Duplicate asset_id found in CSV; ignoring this row."
-                        })
-                        continue
-                    
-                    seen_asset_ids.add(asset_id)
-                    
-                    # SECURITY: For API key auth, validate TWO-STEP delegation permissions
-                    if self.auth_context and self.auth_context.get("auth_method") == "api_key":
-                        if owner_address.lower() != wallet_address.lower():
-                            # User is trying to create assets for a different wallet
-                            # TWO-STEP VALIDATION:
-                            # 1. Target wallet must delegate the API key user (permission layer)
-                            # 2. Target wallet must delegate the server wallet (technical layer)
-                            server_wallet = self.blockchain_service.get_server_wallet_address()
-                            
-                            try:
-                                # Step 1: Check if target wallet delegated the API key user
-                                is_user_delegated = await self.blockchain_service.check_delegation(
-                                    owner_address=owner_address,
-                                    delegate_address=wallet_address
-                                )
-                                
-                                # Step 2: Check if target wallet delegated the server wallet
-                                is_server_delegated = await self.blockchain_service.check_delegation(
-                                    owner_address=owner_address,
-                                    delegate_address=server_wallet
-                                )
-                                
-                                # Both delegations are required
-                                if not is_user_delegated and not is_server_delegated:
-                                    results.append({
-                                        "filename": file_obj.filename,
-                                        "asset_id": asset_id,
-                                        "status": "error",
-                                        "detail": (
-                                            f"Wallet {owner_address} has not delegated either you ({wallet_address}) "
-                                            f"or the server wallet ({server_wallet}). "
-                                            f"For API key access, both delegations are required. "
-                                            f"Ask {owner_address} to call: "
-                                            f"setDelegate('{wallet_address}', true) AND "
-                                            f"setDelegate('{server_wallet}', true)"
-                                        )
-                                    })
-                                    continue
-                                elif not is_user_delegated:
-                                    results.append({
-                                        "filename": file_obj.filename,
-                                        "asset_id": asset_id,
-                                        "status": "error",
-                                        "detail": (
-                                            f"Wallet {owner_address} has not delegated you ({wallet_address}). "
-                                            f"Cannot create assets for this wallet via API key. "
-                                            f"Ask {owner_address} to call setDelegate('{wallet_address}', true)"
-                                        )
-                                    })
-                                    continue
-                                elif not is_server_delegated:
-                                    results.append({
-                                        "filename": file_obj.filename,
-                                        "asset_id": asset_id,
-                                        "status": "error",
-                                        "detail": (
-                                            f"Wallet {owner_address} has not delegated the server wallet ({server_wallet}). "
-                                            f"Cannot create assets for this wallet via API key. "
-                                            f"Ask {owner_address} to call setDelegate('{server_wallet}', true)"
+
+                try:
+                    async for rows in iter_csv_chunks(file_obj.file, critical_metadata_fields, settings.csv_import_chunk_rows):
+                        rejected = []
+                        for row in rows:
+                            row["filename"] = file_obj.filename
+                            asset_id = row["asset_id"]
+                            owner_address = row["owner_address"]
+
+                            # Check for duplicates
+                            if not seen_asset_ids.add(asset_id):
+                                rejected.append({
+                                    "asset_id": asset_id,
+                                    "filename": file_obj.filename,
+                                    "status": "skipped",
+                                    "detail": "Duplicate asset_id found in CSV; ignoring this row."
+                                })
+                                continue
+
+                            # SECURITY: For API key auth, validate TWO-STEP delegation permissions
+                            if is_api_key and owner_address.lower() != wallet_address.lower():
+                                owner_key = owner_address.lower()
+                                if owner_key not in delegation_errors:
+                                    try:
+                                        delegation_errors[owner_key] = await self._check_owner_delegation(
+                                            owner_address, wallet_address
                                         )
-                                    })
+                                    except Exception as e:
+                                        # Not remembered, so the next row of this owner retries
+                                        rejected.append(self._csv_row_error(
+                                            row, f"Unable to verify delegation for {owner_address}: {str(e)}"
+                                        ))
+                                        continue
+                                if delegation_errors[owner_key]:
+                                    rejected.append(self._csv_row_error(row, delegation_errors[owner_key]))
                                     continue
-                                    
-                            except Exception as e:
-                                if "has not delegated" in str(e):
-                                    results.append({
-                                        "filename": file_obj.filename,
-                                        "asset_id": asset_id,
-                                        "status": "error",
-                                        "detail": str(e)
-                                    })
-                                    continue
-                                else:
-                                    results.append({
-                                        "filename": file_obj.filename,
-                                        "asset_id": asset_id,
-                                        "status": "error",
-                                        "detail": f"Unable to verify delegation for {owner_address}: {str(e)}"
-                                    })
-                                    continue
-                    
-                    # Process metadata with file info
-                    result = await self.process_metadata(
-                        asset_id=asset_id,
-                        owner_address=owner_address,
-                        initiator_address=wallet_address,
-                        critical_metadata=row_doc["critical_metadata"],
-                        non_critical_metadata=row_doc["non_critical_metadata"],
-                        file_info={"filename": file_obj.filename}
-                    )
-                    
-                    results.append(result)
-                    
-            except Exception as e:
-                results.append({
-                    "filename": file_obj.filename,
-                    "status": "error",
-                    "detail": f"Error processing file: {str(e)}"
-                })
-        
+
+                            group = groups.setdefault(owner_address.lower(), [])
+                            group.append(row)
+                            if len(group) == MAX_BATCH_SIZE:
+                                await queue.put((owner_address, groups.pop(owner_address.lower())))
+
+                        await result_store.add_results(import_id, rejected)
+
+                except Exception as e:
+                    # Rows already queued from this file are still processed
+                    file_errors.append({
+                        "filename": file_obj.filename,
+                        "status": "error",
+                        "detail": f"CSV parse error: {str(e)}" if isinstance(e, ValueError) else f"Error processing file: {str(e)}"
+                    })
+
+            for rows in groups.values():
+                await queue.put((rows[0]["owner_address"], rows))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+        await result_store.finish_import(import_id)
+        summary = await result_store.get_summary(import_id)
+
+        logger.info(
+            f"CSV import {import_id} by {wallet_address} finished: {summary['result_count']} rows, "
+            f"{summary['status_counts']}"
+        )
         return {
-            "upload_count": len(results),
-            "results": results
+            "upload_count": summary["result_count"] + len(file_errors),
+            "results": file_errors,
+            "import_id": import_id,
+            "status_counts": summary["status_counts"]
+        }
+
+    async def _check_owner_delegation(self, owner_address: str, initiator_address: str) -> Optional[str]:
+        """
+        Check that an owner has delegated both the API key user and the server wallet.
+
+        Args:
+            owner_address: The wallet address of the asset owner
+            initiator_address: The wallet address of the API key user
+
+        Returns:
+            None if both delegations are in place, otherwise the error detail for the row
+
+        Raises:
+            Exception: If the delegation status could not be read
+        """
+        # TWO-STEP VALIDATION:
+        # 1. Target wallet must delegate the API key user (permission layer)
+        # 2. Target wallet must delegate the server wallet (technical layer)
+        server_wallet = self.blockchain_service.get_server_wallet_address()
+
+        is_user_delegated = await self.blockchain_service.check_delegation(
+            owner_address=owner_address,
+            delegate_address=initiator_address,
+            strict=settings.delegation_strict_writes
+        )
+        is_server_delegated = await self.blockchain_service.check_delegation(
+            owner_address=owner_address,
+            delegate_address=server_wallet,
+            strict=settings.delegation_strict_writes
+        )
+
+        # Both delegations are required
+        if not is_user_delegated and not is_server_delegated:
+            return (
+                f"Wallet {owner_address} has not delegated either you ({initiator_address}) "
+                f"or the server wallet ({server_wallet}). "
+                f"For API key access, both delegations are required. "
+                f"Ask {owner_address} to call: "
+                f"setDelegate('{initiator_address}', true) AND "
+                f"setDelegate('{server_wallet}', true)"
+            )
+        if not is_user_delegated:
+            return (
+                f"Wallet {owner_address} has not delegated you ({initiator_address}). "
+                f"Cannot create assets for this wallet via API key. "
+                f"Ask {owner_address} to call setDelegate('{initiator_address}', true)"
+            )
+        if not is_server_delegated:
+            return (
+                f"Wallet {owner_address} has not delegated the server wallet ({server_wallet}). "
+                f"Cannot create assets for this wallet via API key. "
+                f"Ask {owner_address} to call setDelegate('{server_wallet}', true)"
+            )
+        return None
+
+    @staticmethod
+    def _csv_row_error(row: Dict[str, Any], detail: str) -> Dict[str, Any]:
+        return {
+            "asset_id": row["asset_id"],
+            "filename": row["filename"],
+            "status": "error",
+            "detail": detail
         }
 
+    async def _csv_import_worker(self, queue, import_id: str, initiator_address: str) -> None:
+        """
+        Take batches of one owner's CSV rows off `queue` until a None sentinel and store their results.
+
+        Args:
+            queue: asyncio.Queue of (owner_address, rows) tuples
+            import_id: Import the results belong to
+            initiator_address: The wallet address of the initiator
+        """
+        from app.services.import_result_store import get_import_result_store
+
+        result_store = get_import_result_store()
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+
+            owner_address, rows = item
+            try:
+                if self.auth_context and self.auth_context.get("auth_method") == "wallet":
+                    # Wallet users sign each transaction themselves, so rows stay one per transaction
+                    results = []
+                    for row in rows:
+                        results.append(await self.process_metadata(
+                            asset_id=row["asset_id"],
+                            owner_address=row["owner_address"],
+                            initiator_address=initiator_address,
+                            critical_metadata=row["critical_metadata"],
+                            non_critical_metadata=row["non_critical_metadata"],
+                            file_info={"filename": row["filename"]}
+                        ))
+                else:
+                    results = await self._process_csv_batch(owner_address, rows, initiator_address)
+            except Exception as e:
+                logger.error(f"Error processing CSV batch of {len(rows)} rows for {owner_address}: {str(e)}")
+                results = [self._csv_row_error(row, f"Error processing metadata: {str(e)}") for row in rows]
+
+            try:
+                await result_store.add_results(import_id, results)
+            except Exception as e:
+                logger.error(f"Error storing results for CSV import {import_id}: {str(e)}")
+
+    async def _process_csv_batch(
+        self,
+        owner_address: str,
+        rows: List[Dict[str, Any]],
+        initiator_address: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Process up to 50 CSV rows of one owner with server-signed writes.
+
+        Rows whose critical metadata is new or changed are uploaded to IPFS
+        concurrently and written in one batch transaction; rows with only
+        non-critical changes skip IPFS and the chain. Each row is then stored
+        like process_metadata stores it. As with process_metadata, the chain
+        records the owner for rows written on their behalf (batchUpdateIPFSFor)
+        and the server wallet for the initiator's own rows (batchUpdateIPFS).
+
+        Args:
+            owner_address: The wallet address owning every row
+            rows: Parsed CSV rows
+            initiator_address: The wallet address of the API key user
+
+        Returns:
+            One result dict per row
+        """
+        import asyncio
+
+        results = []
+        to_write = []
+        unchanged = []
+
+        async def classify(row: Dict[str, Any]) -> bool:
+            existing_doc, was_deleted = await self._get_existing_asset(row["asset_id"])
+            row["existing_doc"] = existing_doc
+            row["was_deleted"] = was_deleted
+            row["ipfs_metadata"] = get_ipfs_metadata({
+                "asset_id": row["asset_id"],
+                "wallet_address": row["owner_address"],
+                "critical_metadata": row["critical_metadata"]
+            })
+            return await self._critical_metadata_changed(existing_doc, was_deleted, row["ipfs_metadata"])
+
+        outcomes = await asyncio.gather(*(classify(row) for row in rows), return_exceptions=True)
+        for row, outcome in zip(rows, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error checking for existing document: {str(outcome)}")
+                results.append(self._csv_row_error(row, f"Error checking for existing document: {str(outcome)}"))
+            elif outcome:
+                to_write.append(row)
+            else:
+                unchanged.append(row)
+
+        blockchain_tx_hash = None
+        if to_write:
+            upload_results = await self.ipfs_service.store_metadata_batch_concurrent(
+                [row["ipfs_metadata"] for row in to_write],
+                max_concurrent=10
+            )
+            upload_results_by_id = {r["asset_id"]: r for r in upload_results}
+
+            uploaded = []
+            for row in to_write:
+                upload_result = upload_results_by_id.get(row["asset_id"])
+                if not upload_result or upload_result["status"] != "completed":
+                    error = upload_result.get("error") if upload_result else "no result"
+                    results.append(self._csv_row_error(row, f"Error processing metadata: IPFS upload failed: {error}"))
+                    continue
+                row["cid"] = upload_result["cid"]
+                uploaded.append(row)
+            to_write = uploaded
+
+        if to_write:
+            try:
+                on_behalf = owner_address.lower() != initiator_address.lower()
+                blockchain_result = await self.blockchain_service.execute_batch_transaction(
+                    asset_ids=[row["asset_id"] for row in to_write],
+                    cids=[row["cid"] for row in to_write],
+                    owner_addresses=[owner_address] * len(to_write) if on_behalf else None
+                )
+                blockchain_tx_hash = blockchain_result.get("tx_hash")
+                if not blockchain_tx_hash:
+                    raise Exception("Blockchain transaction failed - no transaction hash returned")
+            except Exception as e:
+                detail = getattr(e, "detail", None) or str(e)
+                logger.error(f"CSV batch transaction for {owner_address} failed: {detail}")
+                results.extend(self._csv_row_error(row, f"Error processing metadata: {detail}") for row in to_write)
+                to_write = []
+
+        results.extend(await asyncio.gather(
+            *(self._store_csv_row(row, initiator_address, blockchain_tx_hash) for row in to_write),
+            *(self._store_csv_row(row, initiator_address, None) for row in unchanged)
+        ))
+        return results
+
+    async def _store_csv_row(
+        self,
+        row: Dict[str, Any],
+        initiator_address: str,
+        blockchain_tx_hash: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Store a CSV row classified by _process_csv_batch, turning errors into a row result.
+
+        Args:
+            row: Row classified by _process_csv_batch
+            initiator_address: The wallet address of the initiator
+            blockchain_tx_hash: Hash of the batch transaction, or None if only
+                non-critical metadata changed
+
+        Returns:
+            Result dict for the row
+        """
+        try:
+            return await self._store_asset_version(
+                row["asset_id"], row["owner_address"], initiator_address,
+                row["critical_metadata"], row["non_critical_metadata"],
+                row["existing_doc"], row["was_deleted"],
+                cid=row["cid"] if blockchain_tx_hash else None,
+                blockchain_tx_hash=blockchain_tx_hash,
+                file_info={"filename": row["filename"]}
+            )
+        except Exception as e:
+            logger.error(f"Error processing metadata for asset {row['asset_id']}: {str(e)}")
+            return self._csv_row_error(row, f"Error processing metadata: {str(e)}")
@@ -30,6 +30,9 @@ async def lifespan(app: FastAPI):
     from app.repositories.api_key_repo import APIKeyRepository
     from app.repositories.user_repo import UserRepository
     from app.repositories.delegation_repo import DelegationRepository
+    from app.repositories.asset_repo import AssetRepository
+    from app.repositories.transaction_repo import TransactionRepository
+    from app.repositories.chain_event_repo import ChainEventRepository
     from app.config import settings
     
     db_client = get_db_client()
@@ -58,10 +61,56 @@ async def lifespan(app: FastAPI):
         logging.info("Delegation indexes created successfully")
     except Exception as e:
         logging.error(f"Error creating delegation indexes: {e}")
+
+    try:
+        # Initialize asset indexes
+        asset_repo = AssetRepository(db_client)
+        await asset_repo.create_indexes()
+        logging.info("Asset indexes created successfully")
+    except Exception as e:
+        logging.error(f"Error creating asset indexes: {e}")
+
+    try:
+        # Initialize transaction indexes
+        transaction_repo = TransactionRepository(db_client)
+        await transaction_repo.create_indexes()
+        logging.info("Transaction indexes created successfully")
+    except Exception as e:
+        logging.error(f"Error creating transaction indexes: {e}")
+
+    try:
+        # Initialize chain event indexes
+        chain_event_repo = ChainEventRepository(db_client)
+        await chain_event_repo.create_indexes()
+        logging.info("Chain event indexes created successfully")
+    except Exception as e:
+        logging.error(f"Error creating chain event indexes: {e}")
+
+    # Shared services and the background blockchain health probe
+    from app.services.service_container import get_service_container
+    get_service_container().start()
     
     yield
     
     # Shutdown: Clean up resources
+    from app.services.service_container import close_service_container
+    await close_service_container()
+
+    from app.utilities.web3_utils import close_async_providers
+    await close_async_providers()
+
+    from app.utilities.http_client import close_http_client
+    await close_http_client()
+
+    from app.services.progress_service import close_progress_tracker
+    await close_progress_tracker()
+
+    from app.services.import_result_store import close_import_result_store
+    await close_import_result_store()
+
+    from app.utilities.redis_client import close_redis_client
+    await close_redis_client()
+    
     from app.database import db_client
     if db_client:
         db_client.close()
@@ -104,4 +153,15 @@ api_routers = [
 
 # Add all routers to the app
 for router in api_routers:
-    app.include_router(router)
\ No newline at end of file
+    app.include_router(router)
+
+
+@app.get("/health")
+async def health():
+    """Report the result of the latest background blockchain connectivity probe and the event indexer's progress."""
+    from app.services.service_container import get_service_container
+    container = get_service_container()
+    blockchain = container.health()
+    status = "degraded" if blockchain["blockchain_connected"] is False else "ok"
+    indexer = container.event_indexer
+    return {"status": status, "blockchain": blockchain, "event_indexer": indexer.status() if indexer else None}
@@ -1,7 +1,12 @@
-from typing import Dict, Any, List, Optional
-from pymongo import DESCENDING
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
+from datetime import datetime, timezone
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import logging
 
+from app.database import backfill_lowercase_fields, unset_fields
+
 logger = logging.getLogger(__name__)
 
 class AssetRepository:
@@ -18,19 +23,167 @@ class AssetRepository:
             db_client: The MongoDB client with initialized collections
         """
         self.assets_collection = db_client.assets_collection
+        self.db_client = db_client
+
+    async def create_indexes(self):
+        """Create required indexes for the assets collection"""
+        indexes = [
+            # Version lookups ({assetId, versionNumber}), history sorted by version,
+            # and updates/deletes across all versions of an asset
+            IndexModel([("assetId", ASCENDING), ("versionNumber", ASCENDING)], name="assetId_versionNumber"),
+            # Wallet listings filtered on current/deleted and paged by (lastUpdated, _id)
+            IndexModel(
+                [
+                    ("walletAddressLower", ASCENDING), ("isCurrent", ASCENDING), ("isDeleted", ASCENDING),
+                    ("lastUpdated", DESCENDING), ("_id", DESCENDING)
+                ],
+                name="walletAddressLower_isCurrent_isDeleted_lastUpdated_id"
+            )
+        ]
+        await self.assets_collection.create_indexes(indexes)
+
+        # Built on its own so duplicate current versions in existing data do not
+        # stop the query indexes above from being created
+        await self.assets_collection.create_indexes([
+            # At most one current version per asset; also serves {assetId, isCurrent: true} lookups
+            IndexModel(
+                [("assetId", ASCENDING)],
+                name="assetId_current_unique",
+                unique=True,
+                partialFilterExpression={"isCurrent": True}
+            )
+        ])
+        
+    async def run_in_transaction(self, operation: Callable[[Any], Awaitable[Any]]) -> Any:
+        """
+        Run an operation inside a multi-document transaction when the deployment supports one.
+        
+        The operation receives the session to pass to each write, or None when
+        transactions are unavailable (standalone server or the mock database), in
+        which case it runs without one and must handle partial failure itself.
+        Transient transaction errors are retried by the driver.
+        
+        Args:
+            operation: Async callable taking the session (or None)
+            
+        Returns:
+            The operation's result
+        """
+        supports_transactions = getattr(self.db_client, "supports_transactions", None)
+        if supports_transactions is None or not await supports_transactions():
+            return await operation(None)
+        
+        async with await self.db_client.client.start_session() as session:
+            return await session.with_transaction(operation)
+            
+    async def claim_current_version(self, asset_id: str, session=None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically clear isCurrent on an asset's current version and return it.
+        
+        Only one concurrent caller can claim a given version; the others get None
+        until the claimant inserts the next version. The claim time is recorded
+        so a claim whose insert never happened can be told apart from one in
+        progress (see restore_current_version).
         
-    async def insert_asset(self, document: Dict[str, Any]) -> str:
+        Args:
+            asset_id: The asset ID
+            session: Optional client session for transactional use
+            
+        Returns:
+            The claimed version document as it was before the update, or None
+        """
+        try:
+            kwargs = {"session": session} if session is not None else {}
+            asset = await self.assets_collection.find_one_and_update(
+                {"assetId": asset_id, "isCurrent": True},
+                {"$set": {"isCurrent": False, "claimedAt": datetime.now(timezone.utc)}},
+                return_document=ReturnDocument.BEFORE,
+                **kwargs
+            )
+            
+            if asset:
+                asset["_id"] = str(asset["_id"])
+                
+            return asset
+            
+        except Exception as e:
+            logger.error(f"Error claiming current version of asset {asset_id}: {str(e)}")
+            raise
+            
+    async def restore_current_version(self, asset_id: str, claimed_before: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Make the highest version current again if an abandoned claim left the asset without one.
+        
+        Without a transaction, a writer that stops between claiming the current
+        version and inserting the next one leaves no current version behind.
+        The highest version is only restored if nothing is current and it was
+        claimed before `claimed_before`, so writers still between the two
+        steps are left alone; the assetId_current_unique index rejects the
+        restore if one of them inserts meanwhile.
+        
+        Args:
+            asset_id: The asset ID
+            claimed_before: Claims at or after this time count as in progress
+            
+        Returns:
+            The restored version document, or None if nothing was restored
+        """
+        try:
+            if await self.assets_collection.find_one({"assetId": asset_id, "isCurrent": True}):
+                return None
+            
+            latest = await self.assets_collection.find({"assetId": asset_id}).sort(
+                "versionNumber", DESCENDING
+            ).limit(1).to_list(1)
+            if not latest:
+                return None
+            
+            claimed_at = latest[0].get("claimedAt")
+            if isinstance(claimed_at, datetime):
+                if claimed_at.tzinfo is None:
+                    # MongoDB returns naive UTC datetimes
+                    claimed_at = claimed_at.replace(tzinfo=timezone.utc)
+                if claimed_at >= claimed_before:
+                    return None
+            
+            try:
+                restored = await self.assets_collection.find_one_and_update(
+                    {"_id": ObjectId(str(latest[0]["_id"])), "isCurrent": False},
+                    {"$set": {"isCurrent": True}},
+                    return_document=ReturnDocument.AFTER
+                )
+            except DuplicateKeyError:
+                # Another writer inserted a current version meanwhile
+                return None
+            
+            if restored:
+                restored["_id"] = str(restored["_id"])
+                logger.warning(
+                    f"Restored version {restored.get('versionNumber')} of asset {asset_id} as current "
+                    f"after an abandoned version update"
+                )
+            return restored
+            
+        except Exception as e:
+            logger.error(f"Error restoring current version of asset {asset_id}: {str(e)}")
+            raise
+            
+    async def insert_asset(self, document: Dict[str, Any], session=None) -> str:
         """
         Insert a new asset document.
         
         Args:
             document: The document to insert
+            session: Optional client session for transactional use
             
         Returns:
             String ID of the inserted document
         """
         try:
-            result = await self.assets_collection.insert_one(document)
+            if session is not None:
+                result = await self.assets_collection.insert_one(document, session=session)
+            else:
+                result = await self.assets_collection.insert_one(document)
             doc_id = str(result.inserted_id)
             
             logger.info(f"Asset document inserted with ID: {doc_id}")
@@ -91,6 +244,51 @@ class AssetRepository:
             logger.error(f"Error finding assets: {str(e)}")
             raise
             
+    async def find_assets_page(self, query: Dict[str, Any], sort: List[Tuple[str, int]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find assets with a compound sort and an optional limit.
+        
+        Args:
+            query: The query parameters to search by
+            sort: List of (field, direction) pairs
+            limit: Maximum number of documents to return
+            
+        Returns:
+            List of asset documents
+        """
+        try:
+            cursor = self.assets_collection.find(query).sort(sort)
+            if limit:
+                cursor = cursor.limit(limit)
+            assets = await cursor.to_list(length=limit)
+            
+            # Convert ObjectId to string for each asset
+            for asset in assets:
+                asset["_id"] = str(asset["_id"])
+                
+            return assets
+            
+        except Exception as e:
+            logger.error(f"Error finding assets: {str(e)}")
+            raise
+            
+    async def count_assets(self, query: Dict[str, Any]) -> int:
+        """
+        Count assets matching the query.
+        
+        Args:
+            query: The query parameters to count by
+            
+        Returns:
+            Number of matching documents
+        """
+        try:
+            return await self.assets_collection.count_documents(query)
+            
+        except Exception as e:
+            logger.error(f"Error counting assets: {str(e)}")
+            raise
+            
     async def update_asset(self, query: Dict[str, Any], update: Dict[str, Any]) -> bool:
         """
         Update an asset document.
@@ -147,6 +345,45 @@ class AssetRepository:
             logger.error(f"Error deleting asset: {str(e)}")
             raise
 
+    async def backfill_lowercase_fields(self, fields: Dict[str, str], batch_size: int = 1000) -> int:
+        """
+        Add lowercase copies of string fields to documents that lack them.
+
+        Works in batches so the collection stays available while it runs, and
+        can be re-run safely since already migrated documents are skipped.
+
+        Args:
+            fields: Mapping of source field to the lowercase field to write
+            batch_size: Number of documents updated per round trip
+
+        Returns:
+            Number of documents updated
+        """
+        try:
+            return await backfill_lowercase_fields(self.assets_collection, fields, batch_size)
+
+        except Exception as e:
+            logger.error(f"Error backfilling lowercase asset fields: {str(e)}")
+            raise
+
+    async def unset_fields(self, fields: List[str], batch_size: int = 1000) -> int:
+        """
+        Remove fields from every asset document that still has them.
+
+        Args:
+            fields: Names of the fields to remove
+            batch_size: Number of documents updated per round trip
+
+        Returns:
+            Number of documents updated
+        """
+        try:
+            return await unset_fields(self.assets_collection, fields, batch_size)
+
+        except Exception as e:
+            logger.error(f"Error removing asset fields: {str(e)}")
+            raise
+
     async def delete_assets(self, query: Dict[str, Any]) -> int:
         """
         Hard delete multiple assets matching the query.
@@ -0,0 +1,130 @@
+from typing import Dict, Any, List, Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+import logging
+
+logger = logging.getLogger(__name__)
+
+# The indexer keeps a single checkpoint document
+CHECKPOINT_ID = "registry"
+
+class ChainEventRepository:
+    """
+    Repository for registry contract events copied from the chain by the event indexer.
+
+    Each event is stored once under "{transactionHash}:{logIndex}", so indexing
+    a block range again after a restart or reorg overwrites instead of
+    duplicating. The indexer's checkpoint is kept in a separate collection.
+    """
+
+    def __init__(self, db_client):
+        """
+        Initialize with MongoDB client.
+
+        Args:
+            db_client: The MongoDB client with initialized collections
+        """
+        self.chain_events_collection = db_client.chain_events_collection
+        self.chain_indexer_state_collection = db_client.chain_indexer_state_collection
+
+    async def create_indexes(self):
+        """Create required indexes for the chain events collection"""
+        indexes = [
+            # Recovery looks up the newest event of one kind for an owner's asset
+            IndexModel([
+                ("event", ASCENDING),
+                ("owner", ASCENDING),
+                ("assetIdHash", ASCENDING),
+                ("blockNumber", DESCENDING),
+                ("logIndex", DESCENDING)
+            ]),
+            # Reorg rollback removes every event above a block
+            IndexModel([("blockNumber", ASCENDING)])
+        ]
+        await self.chain_events_collection.create_indexes(indexes)
+
+    async def upsert_events(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Store indexed events, replacing any stored under the same ID.
+
+        The whole range goes to MongoDB as one unordered bulk write.
+
+        Args:
+            events: Event documents, each with an "_id" of "{transactionHash}:{logIndex}"
+
+        Returns:
+            Number of events written
+        """
+        if not events:
+            return 0
+        requests = [
+            UpdateOne(
+                {"_id": event["_id"]},
+                {"$set": {key: value for key, value in event.items() if key != "_id"}},
+                upsert=True
+            )
+            for event in events
+        ]
+        await self.chain_events_collection.bulk_write(requests, ordered=False)
+        return len(events)
+
+    async def delete_events_after(self, block_number: int) -> int:
+        """
+        Remove events in blocks above `block_number`.
+
+        Args:
+            block_number: Last block whose events are kept
+
+        Returns:
+            Number of events removed
+        """
+        result = await self.chain_events_collection.delete_many({"blockNumber": {"$gt": block_number}})
+        return result.deleted_count
+
+    async def find_latest_ipfs_update(self, owner_address: str, asset_id_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the most recent IPFSUpdated event for an owner's asset.
+
+        Events are ordered by position in the chain rather than by ipfsVersion,
+        because the version restarts at 1 when a deleted asset is recreated.
+
+        Args:
+            owner_address: The owner's wallet address
+            asset_id_hash: keccak256 of the asset ID as hex, the value of the indexed assetId topic
+
+        Returns:
+            The event document, or None if the asset has no indexed updates
+        """
+        cursor = self.chain_events_collection.find({
+            "event": "IPFSUpdated",
+            "owner": owner_address.lower(),
+            "assetIdHash": asset_id_hash,
+            "isDeleted": False
+        }).sort([("blockNumber", DESCENDING), ("logIndex", DESCENDING)]).limit(1)
+        events = await cursor.to_list(length=1)
+        return events[0] if events else None
+
+    async def get_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the indexer's checkpoint.
+
+        Returns:
+            Dict with start_block, last_block and recent_blocks, or None before the first indexed range
+        """
+        checkpoint = await self.chain_indexer_state_collection.find_one({"_id": CHECKPOINT_ID})
+        if checkpoint is None:
+            return None
+        checkpoint.pop("_id", None)
+        return checkpoint
+
+    async def save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        """
+        Replace the indexer's checkpoint.
+
+        Args:
+            checkpoint: Dict with start_block, last_block and recent_blocks
+        """
+        await self.chain_indexer_state_collection.update_one(
+            {"_id": CHECKPOINT_ID},
+            {"$set": checkpoint},
+            upsert=True
+        )
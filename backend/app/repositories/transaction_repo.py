@@ -1,7 +1,9 @@
 from typing import Dict, Any, List, Optional
-from pymongo import DESCENDING
+from pymongo import ASCENDING, DESCENDING, IndexModel
 import logging
 
+from app.database import backfill_lowercase_fields
+
 logger = logging.getLogger(__name__)
 
 class TransactionRepository:
@@ -18,6 +20,16 @@ class TransactionRepository:
             db_client: The MongoDB client with initialized collections
         """
         self.transaction_collection = db_client.transaction_collection
+
+    async def create_indexes(self):
+        """Create required indexes for the transactions collection"""
+        indexes = [
+            # Each history query filters on one of these fields and sorts newest first
+            IndexModel([("assetId", ASCENDING), ("timestamp", DESCENDING)]),
+            IndexModel([("walletAddressLower", ASCENDING), ("timestamp", DESCENDING)]),
+            IndexModel([("performedByLower", ASCENDING), ("timestamp", DESCENDING)])
+        ]
+        await self.transaction_collection.create_indexes(indexes)
         
     async def insert_transaction(self, transaction_data: Dict[str, Any]) -> str:
         """
@@ -121,6 +133,24 @@ class TransactionRepository:
             logger.error(f"Error updating transaction: {str(e)}")
             raise
             
+    async def backfill_lowercase_fields(self, fields: Dict[str, str], batch_size: int = 1000) -> int:
+        """
+        Add lowercase copies of string fields to transactions that lack them.
+
+        Args:
+            fields: Mapping of source field to the lowercase field to write
+            batch_size: Number of documents updated per round trip
+
+        Returns:
+            Number of documents updated
+        """
+        try:
+            return await backfill_lowercase_fields(self.transaction_collection, fields, batch_size)
+
+        except Exception as e:
+            logger.error(f"Error backfilling lowercase transaction fields: {str(e)}")
+            raise
+
     async def delete_transaction(self, query: Dict[str, Any]) -> bool:
         """
         Delete a transaction.
@@ -40,7 +40,6 @@ class AssetResponse(AssetBase):
     
     # These could be optional since they may not be present in all responses
     previous_version_id: Optional[str] = Field(None, description="ID of the previous version", alias="previousVersionId")
-    document_history: Optional[List] = Field(None, description="History of document IDs", alias="documentHistory")
 
     model_config = {"from_attributes": True, "populate_by_name": True}
         
@@ -64,5 +63,6 @@ class AssetListResponse(BaseModel):
     """Response schema for listing assets."""
     status: str = Field(..., description="Status of the request")
     assets: List[Dict[str, Any]] = Field(..., description="List of assets")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, or null on the last page")
 
     model_config = {"from_attributes": True, "populate_by_name": True}
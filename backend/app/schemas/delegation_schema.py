@@ -138,6 +138,7 @@ class DelegatedAssetsResponse(BaseModel):
     owner_location: Optional[str] = Field(None, description="Location of the asset owner")
     assets: List[Dict[str, Any]]
     total_assets: int
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page of assets, or null on the last page")
 
 class DelegationConfirmRequest(BaseModel):
     transaction_hash: str
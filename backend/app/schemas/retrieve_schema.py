@@ -33,6 +33,10 @@ class MetadataVerificationResult(BaseModel):
     
     # Deletion status tampering flag
     deletion_status_tampered: Optional[bool] = Field(None, description="Whether the deletion status was tampered with", alias="deletionStatusTampered")
+    
+    # Verification cache information
+    cached: bool = Field(False, description="Whether this result was reused from an earlier verification of the same asset state")
+    cache_age: Optional[float] = Field(None, description="Seconds since the reused verification ran", alias="cacheAge")
 
     model_config = {"populate_by_name": True}
 
@@ -51,7 +51,19 @@ class UploadResultItem(BaseModel):
 
 class CsvUploadResponse(BaseModel):
     upload_count: int = Field(..., description="Number of records processed", alias="uploadCount")
-    results: List[Dict[str, Any]] = Field(..., description="Results for each uploaded record")
+    results: List[Dict[str, Any]] = Field(..., description="File-level errors; per-row results are paged from /upload/csv/{import_id}/results")
+    import_id: Optional[str] = Field(None, description="Identifier for fetching per-row results", alias="importId")
+    status_counts: Optional[Dict[str, int]] = Field(None, description="Number of rows per result status", alias="statusCounts")
+
+    model_config = {"populate_by_name": True}
+
+class CsvImportResultsResponse(BaseModel):
+    import_id: str = Field(..., description="Identifier of the CSV import", alias="importId")
+    finished: bool = Field(..., description="Whether every row of the import has been processed")
+    result_count: int = Field(..., description="Number of per-row results stored so far", alias="resultCount")
+    status_counts: Dict[str, int] = Field(..., description="Number of rows per result status", alias="statusCounts")
+    offset: int = Field(..., description="Position of the first result in this page")
+    results: List[Dict[str, Any]] = Field(..., description="Per-row results in completion order")
 
     model_config = {"populate_by_name": True}
 
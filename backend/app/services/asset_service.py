@@ -1,25 +1,87 @@
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple
+from datetime import datetime, timedelta, timezone
+import asyncio
+import base64
+import json
 import logging
+import random
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from app.repositories.asset_repo import AssetRepository
+from app.services.verification_cache import invalidate_verification
 
 logger = logging.getLogger(__name__)
 
+
+class _VersionConflict(Exception):
+    """Another writer holds the current version of the asset."""
+
+
+def encode_asset_cursor(asset: Dict[str, Any]) -> str:
+    """
+    Encode the sort position of an asset as an opaque pagination cursor.
+
+    Args:
+        asset: Asset document (with lastUpdated and _id)
+
+    Returns:
+        URL-safe cursor string
+    """
+    last_updated = asset.get("lastUpdated")
+    if hasattr(last_updated, "isoformat"):
+        last_updated = last_updated.isoformat()
+    payload = json.dumps({"u": last_updated, "id": str(asset["_id"])})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_asset_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Decode a cursor produced by encode_asset_cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Tuple of (lastUpdated, _id) of the last asset on the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["u"]), ObjectId(payload["id"])
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
 class AssetService:
     """
     Service for asset-related operations.
     Handles asset creation, retrieval, updates, and versioning in MongoDB.
     """
     
-    def __init__(self, asset_repository: AssetRepository):
+    def __init__(
+        self,
+        asset_repository: AssetRepository,
+        max_rollover_attempts: int = 8,
+        rollover_backoff: float = 0.005,
+        abandoned_claim_timeout: float = 10.0
+    ):
         """
         Initialize with repository.
         
         Args:
             asset_repository: Repository for asset data access
+            max_rollover_attempts: Attempts at creating a new version when other writers hold the asset
+            rollover_backoff: Base delay in seconds between attempts, doubled after each one
+            abandoned_claim_timeout: Seconds after which a claimed version with no
+                successor counts as abandoned and is made current again
         """
         self.asset_repository = asset_repository
+        self.max_rollover_attempts = max_rollover_attempts
+        self.rollover_backoff = rollover_backoff
+        self.abandoned_claim_timeout = abandoned_claim_timeout
         
     async def create_asset(
         self, 
@@ -88,15 +150,16 @@ class AssetService:
                         "versionNumber": 1,
                         "ipfsVersion": ipfs_version or 1,
                         "walletAddress": wallet_address,
+                        "walletAddressLower": wallet_address.lower(),
                         "smartContractTxId": smart_contract_tx_id,
                         "ipfsHash": ipfs_hash,
                         "lastVerified": datetime.now(timezone.utc),
                         "lastUpdated": datetime.now(timezone.utc),
+                        "createdAt": datetime.now(timezone.utc),
                         "criticalMetadata": critical_metadata,
                         "nonCriticalMetadata": non_critical_metadata or {},
                         "isCurrent": True,
-                        "isDeleted": False,
-                        "documentHistory": []
+                        "isDeleted": False
                     }
                     
                     # Insert into MongoDB
@@ -114,15 +177,16 @@ class AssetService:
                 "versionNumber": 1,
                 "ipfsVersion": ipfs_version or 1,
                 "walletAddress": wallet_address,
+                "walletAddressLower": wallet_address.lower(),
                 "smartContractTxId": smart_contract_tx_id,
                 "ipfsHash": ipfs_hash,
                 "lastVerified": datetime.now(timezone.utc),
                 "lastUpdated": datetime.now(timezone.utc),
+                "createdAt": datetime.now(timezone.utc),
                 "criticalMetadata": critical_metadata,
                 "nonCriticalMetadata": non_critical_metadata or {},
                 "isCurrent": True,
-                "isDeleted": False,
-                "documentHistory": []
+                "isDeleted": False
             }
             
             # Insert into MongoDB
@@ -134,6 +198,9 @@ class AssetService:
         except Exception as e:
             logger.error(f"Error creating asset: {str(e)}")
             raise
+        finally:
+            # Cached verifications of the asset no longer describe it, even after a partial write
+            invalidate_verification(asset_id)
             
     async def get_asset(
         self, 
@@ -215,8 +282,8 @@ class AssetService:
             List of asset documents
         """
         try:
-            # Build query
-            query = {"walletAddress": wallet_address}
+            # Build query on the normalized field so checksummed and lowercase addresses both match
+            query = {"walletAddressLower": wallet_address.lower()}
             
             if not include_deleted:
                 query["isDeleted"] = False
@@ -231,6 +298,47 @@ class AssetService:
             logger.error(f"Error getting documents by wallet: {str(e)}")
             raise
             
+    async def migrate_address_fields(self, batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Backfill walletAddressLower/performedByLower on assets created before those fields existed.
+        
+        Args:
+            batch_size: Number of documents updated per round trip
+            
+        Returns:
+            Migration summary
+        """
+        try:
+            migrated = await self.asset_repository.backfill_lowercase_fields(
+                {"walletAddress": "walletAddressLower", "performedBy": "performedByLower"},
+                batch_size=batch_size
+            )
+            logger.info(f"Backfilled lowercase address fields on {migrated} assets")
+            return {"status": "completed", "migrated": migrated}
+            
+        except Exception as e:
+            logger.error(f"Error migrating asset address fields: {str(e)}")
+            raise
+            
+    async def migrate_version_history(self, batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Remove the documentHistory arrays that older versions stored.
+        
+        Args:
+            batch_size: Number of documents updated per round trip
+            
+        Returns:
+            Migration summary
+        """
+        try:
+            migrated = await self.asset_repository.unset_fields(["documentHistory"], batch_size=batch_size)
+            logger.info(f"Removed documentHistory from {migrated} asset versions")
+            return {"status": "completed", "migrated": migrated}
+            
+        except Exception as e:
+            logger.error(f"Error migrating asset version history: {str(e)}")
+            raise
+            
     async def get_user_assets(self, wallet_address: str) -> List[Dict[str, Any]]:
         """
         Get all assets owned by a specific wallet address.
@@ -244,101 +352,177 @@ class AssetService:
             List of assets owned by the wallet
         """
         try:
-            logger.info(f"Getting assets for wallet: {wallet_address}")
-            
-            # Updated query to support case-insensitive address matching
-            # Some wallet addresses might be stored with different capitalization
-            normalized_address = wallet_address.lower()
-            
-            # Create a query that matches regardless of case
-            # MongoDB regex with options 'i' for case-insensitive
-            query = {
-                "$or": [
-                    {"walletAddress": normalized_address},
-                    {"walletAddress": {"$regex": f"^{normalized_address}$", "$options": "i"}}
-                ]
-            }
-            
-            # Also ensure we're only getting current and non-deleted assets
-            query["isCurrent"] = True
-            query["isDeleted"] = False
-            
-            # Find assets directly with the query instead of using get_documents_by_wallet
-            assets = await self.asset_repository.find_assets(query)
-
-            # Log asset count for monitoring
-            if len(assets) > 0:
-                logger.debug(f"Found {len(assets)} assets from DB for wallet: {wallet_address}")
-            
-            # Format assets for frontend compatibility
-            formatted_assets = []
-            for asset in assets:
-                # Get creation time from version 1 of this asset
-                asset_id_val = asset.get("assetId")
-                try:
-                    first_version = await self.asset_repository.find_asset({
-                        "assetId": asset_id_val,
-                        "versionNumber": 1
-                    })
-                    
-                    if first_version:
-                        # Handle case where _id might be a string (convert to ObjectId)
-                        version_id = first_version["_id"]
-                        if isinstance(version_id, str):
-                            try:
-                                version_id = ObjectId(version_id)
-                            except Exception:
-                                version_id = None
-                        
-                        if version_id and hasattr(version_id, 'generation_time'):
-                            created_at = version_id.generation_time.isoformat()
-                        else:
-                            created_at = asset.get("lastUpdated", "")
-                    else:
-                        created_at = asset.get("lastUpdated", "")
-                except Exception as e:
-                    logger.warning(f"Could not find version 1 for asset {asset_id_val}: {e}")
-                    # Fallback to current document's ObjectId or lastUpdated
-                    if hasattr(asset["_id"], 'generation_time'):
-                        created_at = asset["_id"].generation_time.isoformat()
-                    else:
-                        created_at = asset.get("lastUpdated", "")
-                
-                # Convert datetime objects to ISO strings if needed
-                if hasattr(created_at, 'isoformat'):
-                    # Ensure timezone consistency - if timezone-naive, assume UTC
-                    if created_at.tzinfo is None:
-                        created_at = created_at.replace(tzinfo=timezone.utc)
-                    created_at = created_at.isoformat()
-                
-                # Handle updated_at conversion
-                updated_at = asset.get("lastUpdated", "")
-                if hasattr(updated_at, 'isoformat'):
-                    # Ensure timezone consistency - if timezone-naive, assume UTC
-                    if updated_at.tzinfo is None:
-                        updated_at = updated_at.replace(tzinfo=timezone.utc)
-                    updated_at = updated_at.isoformat()
-                
-                # Format the asset data to match frontend expectations
-                formatted_asset = {
-                    "_id": asset["_id"],
-                    "assetId": asset.get("assetId", ""),
-                    "walletAddress": asset.get("walletAddress", ""),
-                    "criticalMetadata": asset.get("criticalMetadata", {}),
-                    "nonCriticalMetadata": asset.get("nonCriticalMetadata", {}),
-                    "ipfsCid": asset.get("ipfsHash", ""),
-                    "versionNumber": asset.get("versionNumber", 1),
-                    "createdAt": created_at,
-                    "updatedAt": updated_at
-                }
-                formatted_assets.append(formatted_asset)
-            
-            return formatted_assets
+            page = await self.get_user_assets_page(wallet_address)
+            return page["assets"]
             
         except Exception as e:
             logger.error(f"Error getting user assets: {str(e)}")
             # Return empty list on error to prevent frontend crashes
             return []
+
+    async def get_user_assets_page(
+        self,
+        wallet_address: str,
+        limit: Optional[int] = None,
+        after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get one page of a wallet's current, non-deleted assets, newest first.
+        
+        Args:
+            wallet_address: The wallet address to get assets for
+            limit: Maximum number of assets to return, or None for all
+            after: Cursor returned as next_cursor by the previous page
+            
+        Returns:
+            Dict with the formatted assets and next_cursor (None on the last page)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        logger.info(f"Getting assets for wallet: {wallet_address}")
+        
+        # Exact match on the normalized address field, which the
+        # walletAddressLower index serves; a case-insensitive regex cannot use an index
+        query: Dict[str, Any] = {
+            "walletAddressLower": wallet_address.lower(),
+            "isCurrent": True,
+            "isDeleted": False
+        }
+        
+        if after:
+            last_updated, last_id = decode_asset_cursor(after)
+            # Keyset pagination on (lastUpdated, _id), matching the sort order
+            query["$or"] = [
+                {"lastUpdated": {"$lt": last_updated}},
+                {"lastUpdated": last_updated, "_id": {"$lt": last_id}}
+            ]
+        
+        # Fetch one extra document to learn whether another page exists
+        assets = await self.asset_repository.find_assets_page(
+            query,
+            sort=[("lastUpdated", -1), ("_id", -1)],
+            limit=limit + 1 if limit else None
+        )
+        
+        next_cursor = None
+        if limit and len(assets) > limit:
+            assets = assets[:limit]
+            next_cursor = encode_asset_cursor(assets[-1])
+        
+        # Log asset count for monitoring
+        if len(assets) > 0:
+            logger.debug(f"Found {len(assets)} assets from DB for wallet: {wallet_address}")
+        
+        return {
+            "assets": await self._format_user_assets(assets),
+            "next_cursor": next_cursor
+        }
+
+    async def count_user_assets(self, wallet_address: str) -> int:
+        """
+        Count a wallet's current, non-deleted assets.
+        
+        Args:
+            wallet_address: The wallet address to count assets for
+            
+        Returns:
+            Number of assets
+        """
+        return await self.asset_repository.count_assets({
+            "walletAddressLower": wallet_address.lower(),
+            "isCurrent": True,
+            "isDeleted": False
+        })
+
+    async def _get_creation_times(self, assets: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Look up creation times for assets written before createdAt was stored.
+
+        Uses a single $in query for the version 1 documents instead of one query per asset.
+
+        Args:
+            assets: Current asset documents
+
+        Returns:
+            Dict mapping assetId to creation time
+        """
+        missing = [asset.get("assetId") for asset in assets if not asset.get("createdAt")]
+        if not missing:
+            return {}
+        
+        try:
+            first_versions = await self.asset_repository.find_assets({
+                "assetId": {"$in": missing},
+                "versionNumber": 1
+            })
+        except Exception as e:
+            logger.warning(f"Could not find version 1 documents for {len(missing)} assets: {e}")
+            return {}
+        
+        creation_times = {}
+        for first_version in first_versions:
+            # Handle case where _id might be a string (convert to ObjectId)
+            version_id = first_version["_id"]
+            if isinstance(version_id, str):
+                try:
+                    version_id = ObjectId(version_id)
+                except Exception:
+                    continue
+            if hasattr(version_id, 'generation_time'):
+                creation_times[first_version.get("assetId")] = version_id.generation_time
+        return creation_times
+
+    async def _format_user_assets(self, assets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Format asset documents to match frontend expectations.
+
+        Args:
+            assets: Current asset documents
+
+        Returns:
+            List of formatted assets
+        """
+        creation_times = await self._get_creation_times(assets)
+        
+        formatted_assets = []
+        for asset in assets:
+            created_at = (
+                asset.get("createdAt")
+                or creation_times.get(asset.get("assetId"))
+                or asset.get("lastUpdated", "")
+            )
+            
+            # Convert datetime objects to ISO strings if needed
+            if hasattr(created_at, 'isoformat'):
+                # Ensure timezone consistency - if timezone-naive, assume UTC
+                if created_at.tzinfo is None:
+                    created_at = created_at.replace(tzinfo=timezone.utc)
+                created_at = created_at.isoformat()
+            
+            # Handle updated_at conversion
+            updated_at = asset.get("lastUpdated", "")
+            if hasattr(updated_at, 'isoformat'):
+                # Ensure timezone consistency - if timezone-naive, assume UTC
+                if updated_at.tzinfo is None:
+                    updated_at = updated_at.replace(tzinfo=timezone.utc)
+                updated_at = updated_at.isoformat()
+            
+            # Format the asset data to match frontend expectations
+            formatted_asset = {
+                "_id": asset["_id"],
+                "assetId": asset.get("assetId", ""),
+                "walletAddress": asset.get("walletAddress", ""),
+                "criticalMetadata": asset.get("criticalMetadata", {}),
+                "nonCriticalMetadata": asset.get("nonCriticalMetadata", {}),
+                "ipfsCid": asset.get("ipfsHash", ""),
+                "versionNumber": asset.get("versionNumber", 1),
+                "createdAt": created_at,
+                "updatedAt": updated_at
+            }
+            formatted_assets.append(formatted_asset)
+        
+        return formatted_assets
             
     async def create_new_version(
         self,
@@ -371,74 +555,148 @@ class AssetService:
             ValueError: If asset not found
         """
         try:
-            # Find current version, including deleted ones
-            current_asset = await self.asset_repository.find_asset(
-                {"assetId": asset_id, "isCurrent": True}
-            )
-            
-            if not current_asset:
-                raise ValueError(f"Asset not found: {asset_id}")
-                
-            # Get current version number and increment
-            new_version_number = current_asset.get("versionNumber", 1) + 1
-            
-            # Check if the asset is currently deleted
-            was_deleted = current_asset.get("isDeleted", False)
-            
-            # Determine the ipfsVersion to use
-            if ipfs_version is None:
-                current_ipfs_version = current_asset.get("ipfsVersion", current_asset.get("versionNumber", 1))
-                ipfs_version = new_version_number
-                
-                # If blockchain_tx_id is the same, this is likely just a non-critical update
-                if smart_contract_tx_id == current_asset.get("smartContractTxId"):
-                    ipfs_version = current_ipfs_version
-            
-            # Mark current version as not current first
-            await self.asset_repository.update_asset(
-                {"_id": ObjectId(current_asset["_id"])},
-                {"$set": {"isCurrent": False}}
-            )
+            for attempt in range(self.max_rollover_attempts):
+                try:
+                    return await self.asset_repository.run_in_transaction(
+                        lambda session: self._rollover_version(
+                            session,
+                            asset_id,
+                            wallet_address,
+                            smart_contract_tx_id,
+                            ipfs_hash,
+                            critical_metadata,
+                            non_critical_metadata,
+                            ipfs_version,
+                            performed_by
+                        )
+                    )
+                except _VersionConflict:
+                    # A writer that crashed between claim and insert (no transaction)
+                    # leaves no current version; repair it rather than wait on it
+                    claimed_before = datetime.now(timezone.utc) - timedelta(seconds=self.abandoned_claim_timeout)
+                    if await self.asset_repository.restore_current_version(asset_id, claimed_before):
+                        continue
+                    # Another update holds the asset; back off with jitter and try again
+                    delay = self.rollover_backoff * (2 ** attempt)
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+            
+            raise RuntimeError(f"Could not create a new version of asset {asset_id}: too many concurrent updates")
             
-            # Create new version document
-            new_doc = {
-                "assetId": asset_id,
-                "versionNumber": new_version_number,
-                "ipfsVersion": ipfs_version,
-                "walletAddress": wallet_address,  # This preserves the original owner
-                "smartContractTxId": smart_contract_tx_id,
-                "ipfsHash": ipfs_hash,
-                "lastVerified": datetime.now(timezone.utc),
-                "lastUpdated": datetime.now(timezone.utc),
-                "criticalMetadata": critical_metadata,
-                "nonCriticalMetadata": non_critical_metadata or {},
-                "isCurrent": True,
-                "isDeleted": False,
-                "previousVersionId": current_asset["_id"],
-                "documentHistory": [*current_asset.get("documentHistory", []), current_asset["_id"]]
-            }
+        except Exception as e:
+            logger.error(f"Error creating new version: {str(e)}")
+            raise
+        finally:
+            invalidate_verification(asset_id)
             
-            # Add delegation audit trail if action was performed by someone else
-            if performed_by and performed_by.lower() != wallet_address.lower():
-                new_doc["performedBy"] = performed_by
-                new_doc["isDelegatedAction"] = True
-            else:
-                new_doc["isDelegatedAction"] = False
+    async def _rollover_version(
+        self,
+        session,
+        asset_id: str,
+        wallet_address: str,
+        smart_contract_tx_id: str,
+        ipfs_hash: str,
+        critical_metadata: Dict[str, Any],
+        non_critical_metadata: Optional[Dict[str, Any]],
+        ipfs_version: Optional[int],
+        performed_by: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Replace the current version of an asset with a new one.
+        
+        The current version (including a deleted one) is claimed and marked not
+        current in one atomic find_one_and_update, so concurrent writers cannot
+        both build on it. With a session the insert commits together with the
+        claim; without one a failed insert hands the claim back.
+        
+        Args:
+            session: Client session of the enclosing transaction, or None
+            (remaining arguments as for create_new_version)
             
-            # Insert new version
-            new_doc_id = await self.asset_repository.insert_asset(new_doc)
+        Returns:
+            Dict containing new document ID and version number
             
-            logger.info(f"New version created for asset {asset_id}: {new_doc_id}")
-            return {
-                "document_id": new_doc_id,
-                "version_number": new_version_number,
-                "ipfs_version": ipfs_version,
-                "was_deleted": was_deleted
-            }
+        Raises:
+            ValueError: If asset not found
+            _VersionConflict: If another writer holds the current version
+        """
+        current_asset = await self.asset_repository.claim_current_version(asset_id, session=session)
+        
+        if not current_asset:
+            # Either the asset does not exist or another update claimed it and
+            # has not inserted its version yet
+            if not await self.asset_repository.find_asset({"assetId": asset_id}):
+                raise ValueError(f"Asset not found: {asset_id}")
+            raise _VersionConflict(asset_id)
             
+        # Get current version number and increment
+        new_version_number = current_asset.get("versionNumber", 1) + 1
+        
+        # Check if the asset is currently deleted
+        was_deleted = current_asset.get("isDeleted", False)
+        
+        # Determine the ipfsVersion to use
+        if ipfs_version is None:
+            current_ipfs_version = current_asset.get("ipfsVersion", current_asset.get("versionNumber", 1))
+            ipfs_version = new_version_number
+            
+            # If blockchain_tx_id is the same, this is likely just a non-critical update
+            if smart_contract_tx_id == current_asset.get("smartContractTxId"):
+                ipfs_version = current_ipfs_version
+        
+        # Create new version document
+        new_doc = {
+            "assetId": asset_id,
+            "versionNumber": new_version_number,
+            "ipfsVersion": ipfs_version,
+            "walletAddress": wallet_address,  # This preserves the original owner
+            "walletAddressLower": wallet_address.lower(),
+            "smartContractTxId": smart_contract_tx_id,
+            "ipfsHash": ipfs_hash,
+            "lastVerified": datetime.now(timezone.utc),
+            "lastUpdated": datetime.now(timezone.utc),
+            "criticalMetadata": critical_metadata,
+            "nonCriticalMetadata": non_critical_metadata or {},
+            "isCurrent": True,
+            "isDeleted": False,
+            # Lineage is the previousVersionId chain plus the (assetId, versionNumber)
+            # index; copying every earlier ID into each version grew quadratically
+            "previousVersionId": current_asset["_id"]
+        }
+        
+        # Carry the creation time forward so listings never need to look up version 1
+        if current_asset.get("createdAt"):
+            new_doc["createdAt"] = current_asset["createdAt"]
+
+        # Add delegation audit trail if action was performed by someone else
+        if performed_by and performed_by.lower() != wallet_address.lower():
+            new_doc["performedBy"] = performed_by
+            new_doc["performedByLower"] = performed_by.lower()
+            new_doc["isDelegatedAction"] = True
+        else:
+            new_doc["isDelegatedAction"] = False
+        
+        # Insert new version
+        try:
+            new_doc_id = await self.asset_repository.insert_asset(new_doc, session=session)
         except Exception as e:
-            logger.error(f"Error creating new version: {str(e)}")
+            if session is None:
+                # No transaction to abort: give the current flag back to the claimed version
+                await self.asset_repository.update_asset(
+                    {"_id": ObjectId(current_asset["_id"])},
+                    {"$set": {"isCurrent": True}}
+                )
+            if isinstance(e, DuplicateKeyError):
+                # The assetId_current_unique index saw another current version
+                raise _VersionConflict(asset_id) from e
             raise
+        
+        logger.info(f"New version created for asset {asset_id}: {new_doc_id}")
+        return {
+            "document_id": new_doc_id,
+            "version_number": new_version_number,
+            "ipfs_version": ipfs_version,
+            "was_deleted": was_deleted
+        }
             
     async def update_non_critical_metadata(
         self, 
@@ -467,6 +725,8 @@ class AssetService:
         except Exception as e:
             logger.error(f"Error updating non-critical metadata: {str(e)}")
             raise
+        finally:
+            invalidate_verification(asset_id)
             
     async def soft_delete(self, asset_id: str, deleted_by: str) -> bool:
         """
@@ -500,6 +760,8 @@ class AssetService:
         except Exception as e:
             logger.error(f"Error soft deleting asset: {str(e)}")
             raise
+        finally:
+            invalidate_verification(asset_id)
             
     async def get_version_history(self, asset_id: str, include_deleted: bool = False) -> List[Dict[str, Any]]:
         """
@@ -1,10 +1,16 @@
+import asyncio
 import logging
 from web3 import Web3
-from typing import Any, Dict, Optional
+from web3.exceptions import BlockNotFound
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from fastapi import HTTPException
 
 from app.config import settings
+from app.services.contract_reader import ContractReader
+from app.services.nonce_manager import TransactionSender
 from app.services.transaction_builder_service import TransactionBuilderService
+from app.utilities.log_scan import scan_block_ranges
+from app.utilities.web3_utils import create_web3, maybe_await
 
 logger = logging.getLogger(__name__)
 
@@ -311,9 +317,19 @@ class BlockchainService:
             }
         ]
 
-        self.web3 = Web3(Web3.HTTPProvider(self.provider_url))
-
-        if not self.web3.is_connected():
+        # Async mode shares a pooled, non-blocking provider across all instances.
+        # The synchronous provider is kept for tooling and as an opt-out.
+        self.use_async = settings.blockchain_async_provider
+        self.web3 = create_web3(
+            self.provider_url,
+            use_async=self.use_async,
+            pool_size=settings.blockchain_rpc_pool_size,
+            request_timeout=settings.blockchain_rpc_timeout
+        )
+
+        # Connectivity can only be checked synchronously here; async clients
+        # surface connection errors on their first call instead
+        if not self.use_async and not self.web3.is_connected():
             logger.error("Unable to connect to Alchemy Sepolia network.")
             raise HTTPException(status_code=500, detail="Blockchain connection error")
 
@@ -322,12 +338,76 @@ class BlockchainService:
                 address=Web3.to_checksum_address(self.contract_address),
                 abi=self.contract_abi
             )
+            # View calls issued together share one multicall or JSON-RPC batch
+            self.contract_reader = ContractReader(
+                self.web3,
+                multicall_address=settings.blockchain_multicall_address or None,
+                max_batch_size=settings.blockchain_read_batch_size
+            )
             # Initialize transaction builder service
             self.transaction_builder = TransactionBuilderService(self.web3, self.contract)
+            # Server-signed transactions share one nonce counter per wallet
+            self.transaction_sender = TransactionSender(
+                self.web3,
+                self.wallet_address,
+                self.private_key,
+                replace_after=settings.blockchain_tx_replace_after,
+                max_replacements=settings.blockchain_tx_max_replacements
+            )
         except Exception as e:
             logger.error(f"Error setting up contract: {str(e)}")
             raise
 
+    async def is_connected(self) -> bool:
+        """
+        Check connectivity to the blockchain RPC endpoint without blocking the event loop.
+        
+        Returns:
+            True if the provider responds, False otherwise
+        """
+        try:
+            if not self.use_async:
+                # The synchronous provider blocks on the HTTP request
+                return bool(await asyncio.to_thread(self.web3.is_connected))
+            return bool(await self.web3.is_connected())
+        except Exception as e:
+            logger.error(f"Blockchain connectivity check failed: {str(e)}")
+            return False
+
+    async def _send_server_transaction(self, contract_function: Any, gas: Optional[int] = 2000000) -> Any:
+        """
+        Sign and send a contract call from the server wallet and wait for it to be mined.
+        
+        The nonce is assigned by the shared nonce manager, so concurrent calls
+        are broadcast back to back and confirmed in parallel instead of racing
+        for the same nonce.
+        
+        Args:
+            contract_function: Bound contract function to call
+            gas: Gas limit for the transaction, or None to estimate it (a call
+                that would revert then fails before anything is sent)
+            
+        Returns:
+            The receipt of the successful transaction
+            
+        Raises:
+            TransactionReverted: If the transaction was mined but reverted
+        """
+        gas_price = await maybe_await(self.web3.eth.gas_price)
+        if gas is None:
+            estimated_gas = await maybe_await(contract_function.estimate_gas({
+                'from': self.wallet_address,
+                'gasPrice': gas_price
+            }))
+            # Add 20% buffer to gas estimate
+            gas = int(estimated_gas * 1.2)
+        tx = await maybe_await(contract_function.build_transaction({
+            'from': self.wallet_address,
+            'gasPrice': gas_price,
+            'gas': gas,
+        }))
+        return await self.transaction_sender.send(tx)
+
     async def store_hash(self, cid: str, asset_id: str, auth_context: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Store a CID hash on the blockchain for a specific asset.
@@ -372,34 +452,11 @@ class BlockchainService:
             HTTPException: If blockchain transaction fails
         """
         try:
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.wallet_address)
-            tx = self.contract.functions.updateIPFS(
+            # Sign and send through the shared server wallet nonce manager
+            receipt = await self._send_server_transaction(self.contract.functions.updateIPFS(
                 asset_id,
                 cid
-            ).build_transaction({
-                'from': self.wallet_address,
-                'nonce': nonce,
-                'gasPrice': self.web3.eth.gas_price,
-                'gas': 2000000,
-            })
-
-            # Sign transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-
-            # Different versions of Web3.py use different attribute names
-            if hasattr(signed_tx, 'rawTransaction'):
-                raw_tx = signed_tx.rawTransaction
-            elif hasattr(signed_tx, 'raw_transaction'):
-                raw_tx = signed_tx.raw_transaction
-            else:
-                raw_tx = bytes(signed_tx)
-
-            # Send transaction
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-
-            # Wait for transaction receipt
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            ))
 
             logger.info(f"CID successfully stored on blockchain for asset {asset_id}. Transaction hash: {receipt.transactionHash.hex()}")
 
@@ -436,10 +493,33 @@ class BlockchainService:
                 cid=cid,
                 from_address=auth_context.get("wallet_address")
             )
+        elif settings.blockchain_write_batching:
+            # Coalesce with concurrent writes for the same owner into one batchUpdateIPFSFor
+            from app.services.service_container import get_write_batcher
+            return await get_write_batcher().submit(
+                "update", owner_address, asset_id, cid,
+                send_batch=self._store_hash_for_batch,
+                send_single=lambda owner, aid, c: self._store_hash_for_signed(c, aid, owner)
+            )
         else:
             # Existing server-signed logic for API keys
             return await self._store_hash_for_signed(cid, asset_id, owner_address)
     
+    async def _store_hash_for_batch(self, owner_address: str, items: list) -> Dict[str, Any]:
+        """
+        Send coalesced updates for one owner as a single batchUpdateIPFSFor transaction.
+        
+        Args:
+            owner_address: The address of the owner
+            items: List of (asset_id, cid) pairs
+            
+        Returns:
+            Dict containing transaction hash
+        """
+        asset_ids = [asset_id for asset_id, _ in items]
+        cids = [cid for _, cid in items]
+        return await self.execute_batch_transaction(asset_ids, cids, [owner_address] * len(items))
+
     async def _store_hash_for_signed(self, cid: str, asset_id: str, owner_address: str) -> Dict[str, Any]:
         """
         Store a CID hash on the blockchain for another owner using server wallet signature.
@@ -456,31 +536,12 @@ class BlockchainService:
             HTTPException: If blockchain transaction fails
         """
         try:
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.wallet_address)
-            tx = self.contract.functions.updateIPFSFor(
+            # Sign and send through the shared server wallet nonce manager
+            receipt = await self._send_server_transaction(self.contract.functions.updateIPFSFor(
                 Web3.to_checksum_address(owner_address),
                 asset_id,
                 cid
-            ).build_transaction({
-                'from': self.wallet_address,
-                'nonce': nonce,
-                'gasPrice': self.web3.eth.gas_price,
-                'gas': 2000000,
-            })
-
-            # Sign and send the transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-            
-            if hasattr(signed_tx, 'rawTransaction'):
-                raw_tx = signed_tx.rawTransaction
-            elif hasattr(signed_tx, 'raw_transaction'):
-                raw_tx = signed_tx.raw_transaction
-            else:
-                raw_tx = bytes(signed_tx)
-
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            ))
 
             logger.info(f"CID successfully stored on blockchain for asset {asset_id} owned by {owner_address}. Transaction hash: {receipt.transactionHash.hex()}")
 
@@ -531,27 +592,8 @@ class BlockchainService:
             HTTPException: If blockchain transaction fails
         """
         try:
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.wallet_address)
-            tx = self.contract.functions.deleteAsset(asset_id).build_transaction({
-                'from': self.wallet_address,
-                'nonce': nonce,
-                'gasPrice': self.web3.eth.gas_price,
-                'gas': 2000000,
-            })
-
-            # Sign and send the transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-            
-            if hasattr(signed_tx, 'rawTransaction'):
-                raw_tx = signed_tx.rawTransaction
-            elif hasattr(signed_tx, 'raw_transaction'):
-                raw_tx = signed_tx.raw_transaction
-            else:
-                raw_tx = bytes(signed_tx)
-
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            # Sign and send through the shared server wallet nonce manager
+            receipt = await self._send_server_transaction(self.contract.functions.deleteAsset(asset_id))
 
             logger.info(f"Asset {asset_id} marked as deleted on blockchain. Transaction hash: {receipt.transactionHash.hex()}")
 
@@ -586,10 +628,31 @@ class BlockchainService:
                 asset_id=asset_id,
                 from_address=auth_context.get("wallet_address")
             )
+        elif settings.blockchain_write_batching:
+            # Coalesce with concurrent deletes for the same owner into one batchDeleteAssetsFor
+            from app.services.service_container import get_write_batcher
+            return await get_write_batcher().submit(
+                "delete", owner_address, asset_id, None,
+                send_batch=self._delete_asset_for_batch,
+                send_single=lambda owner, aid, _: self._delete_asset_for_signed(aid, owner)
+            )
         else:
             # Existing server-signed logic for API keys
             return await self._delete_asset_for_signed(asset_id, owner_address)
     
+    async def _delete_asset_for_batch(self, owner_address: str, items: list) -> Dict[str, Any]:
+        """
+        Send coalesced deletes for one owner as a single batchDeleteAssetsFor transaction.
+        
+        Args:
+            owner_address: The address of the owner
+            items: List of (asset_id, cid) pairs; the CIDs are unused
+            
+        Returns:
+            Dict containing transaction hash
+        """
+        return await self._batch_delete_assets_for_signed([asset_id for asset_id, _ in items], owner_address)
+
     async def _delete_asset_for_signed(self, asset_id: str, owner_address: str) -> Dict[str, Any]:
         """
         Mark an asset as deleted on the blockchain for another owner using server wallet signature.
@@ -605,30 +668,11 @@ class BlockchainService:
             HTTPException: If blockchain transaction fails
         """
         try:
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.wallet_address)
-            tx = self.contract.functions.deleteAssetFor(
+            # Sign and send through the shared server wallet nonce manager
+            receipt = await self._send_server_transaction(self.contract.functions.deleteAssetFor(
                 Web3.to_checksum_address(owner_address),
                 asset_id
-            ).build_transaction({
-                'from': self.wallet_address,
-                'nonce': nonce,
-                'gasPrice': self.web3.eth.gas_price,
-                'gas': 2000000,
-            })
-
-            # Sign and send the transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-            
-            if hasattr(signed_tx, 'rawTransaction'):
-                raw_tx = signed_tx.rawTransaction
-            elif hasattr(signed_tx, 'raw_transaction'):
-                raw_tx = signed_tx.raw_transaction
-            else:
-                raw_tx = bytes(signed_tx)
-
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            ))
 
             logger.info(f"Asset {asset_id} owned by {owner_address} marked as deleted on blockchain. Transaction hash: {receipt.transactionHash.hex()}")
 
@@ -659,7 +703,7 @@ class BlockchainService:
                 tx_hash_bytes = Web3.to_bytes(hexstr=f"0x{tx_hash}")
                 
             # Get transaction data
-            tx_data = self.web3.eth.get_transaction(tx_hash_bytes)
+            tx_data = await maybe_await(self.web3.eth.get_transaction(tx_hash_bytes))
             
             if not tx_data:
                 raise ValueError(f"Transaction with hash {tx_hash} not found on blockchain")
@@ -741,25 +785,52 @@ class BlockchainService:
             Dict containing IPFS version information
         """
         try:
-            result = self.contract.functions.getIPFSInfo(
+            result = await maybe_await(self.contract.functions.getIPFSInfo(
                 asset_id,
                 Web3.to_checksum_address(owner_address)
-            ).call()
+            ).call())
             
-            # Parse the result tuple
-            ipfs_version, cid_hash, last_updated, created_at, is_deleted = result
-            
-            return {
-                "ipfs_version": ipfs_version,
-                "cid_hash": "0x" + cid_hash.hex(),
-                "last_updated": last_updated,
-                "created_at": created_at,
-                "is_deleted": is_deleted
-            }
+            return self._format_ipfs_info(result)
         except Exception as e:
             logger.error(f"Error getting IPFS info: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Failed to get IPFS info: {str(e)}")
 
+    async def get_ipfs_info_many(self, assets: Sequence[Tuple[str, str]]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Get IPFS version information for many assets in one or two RPC round-trips.
+        
+        Args:
+            assets: (asset_id, owner_address) pairs
+            
+        Returns:
+            One entry per pair, in order: the dict get_ipfs_info returns, or the exception its call failed with
+            
+        Raises:
+            HTTPException: If the calls cannot be sent
+        """
+        try:
+            results = await self.call_views([
+                self.contract.functions.getIPFSInfo(asset_id, Web3.to_checksum_address(owner_address))
+                for asset_id, owner_address in assets
+            ])
+            return [result if isinstance(result, Exception) else self._format_ipfs_info(result) for result in results]
+        except Exception as e:
+            logger.error(f"Error getting IPFS info for {len(assets)} assets: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to get IPFS info: {str(e)}")
+
+    @staticmethod
+    def _format_ipfs_info(result: Sequence[Any]) -> Dict[str, Any]:
+        # Parse the result tuple
+        ipfs_version, cid_hash, last_updated, created_at, is_deleted = result
+        
+        return {
+            "ipfs_version": ipfs_version,
+            "cid_hash": "0x" + cid_hash.hex(),
+            "last_updated": last_updated,
+            "created_at": created_at,
+            "is_deleted": is_deleted
+        }
+
     async def verify_cid_on_chain(self, asset_id: str, owner_address: str, cid: str, claimed_version: int) -> Dict[str, Any]:
         """
         Verify a CID against blockchain records.
@@ -774,12 +845,12 @@ class BlockchainService:
             Dict containing verification results
         """
         try:
-            result = self.contract.functions.verifyCID(
+            result = await maybe_await(self.contract.functions.verifyCID(
                 asset_id,
                 Web3.to_checksum_address(owner_address),
                 cid,
                 claimed_version
-            ).call()
+            ).call())
             
             # Parse the result tuple
             is_valid, message, actual_version, is_deleted = result
@@ -806,10 +877,10 @@ class BlockchainService:
             Dict containing existence and deletion status
         """
         try:
-            result = self.contract.functions.assetExists(
+            result = await maybe_await(self.contract.functions.assetExists(
                 asset_id,
                 Web3.to_checksum_address(owner_address)
-            ).call()
+            ).call())
             
             exists, is_deleted = result
             
@@ -821,6 +892,32 @@ class BlockchainService:
             logger.error(f"Error checking if asset exists: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Failed to check if asset exists: {str(e)}")
 
+    async def check_asset_exists_many(self, assets: Sequence[Tuple[str, str]]) -> List[Union[Dict[str, bool], Exception]]:
+        """
+        Check whether many assets exist on the blockchain in one or two RPC round-trips.
+        
+        Args:
+            assets: (asset_id, owner_address) pairs
+            
+        Returns:
+            One entry per pair, in order: the dict check_asset_exists returns, or the exception its call failed with
+            
+        Raises:
+            HTTPException: If the calls cannot be sent
+        """
+        try:
+            results = await self.call_views([
+                self.contract.functions.assetExists(asset_id, Web3.to_checksum_address(owner_address))
+                for asset_id, owner_address in assets
+            ])
+            return [
+                result if isinstance(result, Exception) else {"exists": result[0], "is_deleted": result[1]}
+                for result in results
+            ]
+        except Exception as e:
+            logger.error(f"Error checking if {len(assets)} assets exist: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to check if assets exist: {str(e)}")
+
     async def set_admin(self, account_address: str, is_admin: bool) -> Dict[str, Any]:
         """
         Set or remove an admin.
@@ -833,30 +930,11 @@ class BlockchainService:
             Dict containing transaction hash
         """
         try:
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.wallet_address)
-            tx = self.contract.functions.setAdmin(
+            # Sign and send through the shared server wallet nonce manager
+            receipt = await self._send_server_transaction(self.contract.functions.setAdmin(
                 Web3.to_checksum_address(account_address),
                 is_admin
-            ).build_transaction({
-                'from': self.wallet_address,
-                'nonce': nonce,
-                'gasPrice': self.web3.eth.gas_price,
-                'gas': 2000000,
-            })
-
-            # Sign and send the transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-            
-            if hasattr(signed_tx, 'rawTransaction'):
-                raw_tx = signed_tx.rawTransaction
-            elif hasattr(signed_tx, 'raw_transaction'):
-                raw_tx = signed_tx.raw_transaction
-            else:
-                raw_tx = bytes(signed_tx)
-
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            ))
 
             action = "set" if is_admin else "removed"
             logger.info(f"Admin status {action} for {account_address}. Transaction hash: {receipt.transactionHash.hex()}")
@@ -879,30 +957,11 @@ class BlockchainService:
             Dict containing transaction hash
         """
         try:
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.wallet_address)
-            tx = self.contract.functions.setDelegate(
+            # Sign and send through the shared server wallet nonce manager
+            receipt = await self._send_server_transaction(self.contract.functions.setDelegate(
                 Web3.to_checksum_address(delegate_address),
                 status
-            ).build_transaction({
-                'from': self.wallet_address,
-                'nonce': nonce,
-                'gasPrice': self.web3.eth.gas_price,
-                'gas': 2000000,
-            })
-
-            # Sign and send the transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-            
-            if hasattr(signed_tx, 'rawTransaction'):
-                raw_tx = signed_tx.rawTransaction
-            elif hasattr(signed_tx, 'raw_transaction'):
-                raw_tx = signed_tx.raw_transaction
-            else:
-                raw_tx = bytes(signed_tx)
-
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            ))
 
             action = "added" if status else "removed"
             logger.info(f"Delegate {delegate_address} {action}. Transaction hash: {receipt.transactionHash.hex()}")
@@ -925,30 +984,11 @@ class BlockchainService:
             Dict containing transaction hash
         """
         try:
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.wallet_address)
-            tx = self.contract.functions.initiateTransfer(
+            # Sign and send through the shared server wallet nonce manager
+            receipt = await self._send_server_transaction(self.contract.functions.initiateTransfer(
                 asset_id,
                 Web3.to_checksum_address(new_owner)
-            ).build_transaction({
-                'from': self.wallet_address,
-                'nonce': nonce,
-                'gasPrice': self.web3.eth.gas_price,
-                'gas': 2000000,
-            })
-
-            # Sign and send the transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-            
-            if hasattr(signed_tx, 'rawTransaction'):
-                raw_tx = signed_tx.rawTransaction
-            elif hasattr(signed_tx, 'raw_transaction'):
-                raw_tx = signed_tx.raw_transaction
-            else:
-                raw_tx = bytes(signed_tx)
-
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            ))
 
             logger.info(f"Transfer initiated for asset {asset_id} to {new_owner}. Transaction hash: {receipt.transactionHash.hex()}")
 
@@ -970,30 +1010,11 @@ class BlockchainService:
             Dict containing transaction hash
         """
         try:
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.wallet_address)
-            tx = self.contract.functions.acceptTransfer(
+            # Sign and send through the shared server wallet nonce manager
+            receipt = await self._send_server_transaction(self.contract.functions.acceptTransfer(
                 asset_id,
                 Web3.to_checksum_address(previous_owner)
-            ).build_transaction({
-                'from': self.wallet_address,
-                'nonce': nonce,
-                'gasPrice': self.web3.eth.gas_price,
-                'gas': 2000000,
-            })
-
-            # Sign and send the transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-            
-            if hasattr(signed_tx, 'rawTransaction'):
-                raw_tx = signed_tx.rawTransaction
-            elif hasattr(signed_tx, 'raw_transaction'):
-                raw_tx = signed_tx.raw_transaction
-            else:
-                raw_tx = bytes(signed_tx)
-
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            ))
 
             logger.info(f"Transfer accepted for asset {asset_id} from {previous_owner}. Transaction hash: {receipt.transactionHash.hex()}")
 
@@ -1014,27 +1035,8 @@ class BlockchainService:
             Dict containing transaction hash
         """
         try:
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.wallet_address)
-            tx = self.contract.functions.cancelTransfer(asset_id).build_transaction({
-                'from': self.wallet_address,
-                'nonce': nonce,
-                'gasPrice': self.web3.eth.gas_price,
-                'gas': 2000000,
-            })
-
-            # Sign and send the transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-            
-            if hasattr(signed_tx, 'rawTransaction'):
-                raw_tx = signed_tx.rawTransaction
-            elif hasattr(signed_tx, 'raw_transaction'):
-                raw_tx = signed_tx.raw_transaction
-            else:
-                raw_tx = bytes(signed_tx)
-
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            # Sign and send through the shared server wallet nonce manager
+            receipt = await self._send_server_transaction(self.contract.functions.cancelTransfer(asset_id))
 
             logger.info(f"Transfer cancelled for asset {asset_id}. Transaction hash: {receipt.transactionHash.hex()}")
 
@@ -1056,16 +1058,56 @@ class BlockchainService:
             Address the asset is pending transfer to, or zero address if none
         """
         try:
-            pending_to = self.contract.functions.getPendingTransfer(
+            pending_to = await maybe_await(self.contract.functions.getPendingTransfer(
                 asset_id,
                 Web3.to_checksum_address(owner_address)
-            ).call()
+            ).call())
             
             return pending_to
             
         except Exception as e:
             logger.error(f"Error getting pending transfer: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Failed to get pending transfer: {str(e)}")
+
+    async def get_pending_transfer_many(self, assets: Sequence[Tuple[str, str]]) -> List[Union[str, Exception]]:
+        """
+        Get the pending transfer address of many assets in one or two RPC round-trips.
+        
+        Args:
+            assets: (asset_id, owner_address) pairs
+            
+        Returns:
+            One entry per pair, in order: the address the asset is pending transfer to
+            (zero address if none), or the exception its call failed with
+            
+        Raises:
+            HTTPException: If the calls cannot be sent
+        """
+        try:
+            return await self.call_views([
+                self.contract.functions.getPendingTransfer(asset_id, Web3.to_checksum_address(owner_address))
+                for asset_id, owner_address in assets
+            ])
+        except Exception as e:
+            logger.error(f"Error getting pending transfers for {len(assets)} assets: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to get pending transfers: {str(e)}")
+
+    async def call_views(self, calls: Sequence[Any]) -> List[Any]:
+        """
+        Run many contract view calls in as few RPC round-trips as possible.
+
+        Calls go out as Multicall3 aggregate3 calls where it is deployed and
+        as JSON-RPC batch requests elsewhere, BLOCKCHAIN_READ_BATCH_SIZE calls
+        at a time.
+        
+        Args:
+            calls: Contract function calls with positional arguments, e.g.
+                self.contract.functions.getIPFSInfo(asset_id, owner)
+            
+        Returns:
+            One entry per call, in order: what its `.call()` would return, or the exception it failed with
+        """
+        return await self.contract_reader.call(calls)
             
     async def broadcast_signed_transaction(self, signed_transaction: str) -> Dict[str, Any]:
         """
@@ -1091,10 +1133,10 @@ class BlockchainService:
                 signed_tx_bytes = signed_transaction
             
             # Send transaction
-            tx_hash = self.web3.eth.send_raw_transaction(signed_tx_bytes)
+            tx_hash = await maybe_await(self.web3.eth.send_raw_transaction(signed_tx_bytes))
             
             # Wait for transaction receipt
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await maybe_await(self.web3.eth.wait_for_transaction_receipt(tx_hash))
             
             logger.info(f"Signed transaction broadcasted successfully. Transaction hash: {receipt.transactionHash.hex()}")
             
@@ -1140,7 +1182,7 @@ class BlockchainService:
             
             for attempt in range(max_retries):
                 try:
-                    receipt = self.web3.eth.get_transaction_receipt(tx_hash_bytes)
+                    receipt = await maybe_await(self.web3.eth.get_transaction_receipt(tx_hash_bytes))
                     if receipt:
                         break
                 except Exception as e:
@@ -1159,7 +1201,7 @@ class BlockchainService:
             
             if not receipt:
                 # Still no receipt after all retries
-                chain_id = self.web3.eth.chain_id
+                chain_id = await maybe_await(self.web3.eth.chain_id)
                 network_name = "Sepolia" if chain_id == 11155111 else f"Chain {chain_id}"
                 raise ValueError(
                     f"Transaction with hash '{tx_hash}' not found on {network_name} after {max_retries} attempts. "
@@ -1184,10 +1226,10 @@ class BlockchainService:
             if not success:
                 try:
                     # Get the transaction data
-                    tx_data = self.web3.eth.get_transaction(tx_hash_bytes)
+                    tx_data = await maybe_await(self.web3.eth.get_transaction(tx_hash_bytes))
                     
                     # Try to call the transaction to get revert reason
-                    call_result = self.web3.eth.call(
+                    call_result = await maybe_await(self.web3.eth.call(
                         {
                             'to': tx_data['to'],
                             'from': tx_data['from'],
@@ -1197,7 +1239,7 @@ class BlockchainService:
                             'value': tx_data['value']
                         },
                         receipt.blockNumber - 1  # Call at block before the failed transaction
-                    )
+                    ))
                 except Exception as revert_error:
                     revert_reason = str(revert_error)
                     if "execution reverted" in revert_reason.lower():
@@ -1224,23 +1266,34 @@ class BlockchainService:
             else:
                 raise HTTPException(status_code=500, detail=f"Failed to verify transaction: {str(e)}")
     
-    async def check_delegation(self, owner_address: str, delegate_address: str) -> bool:
+    async def check_delegation(self, owner_address: str, delegate_address: str, strict: bool = False) -> bool:
         """
         Check if an address has been delegated by the owner.
+
+        Results are served from the delegation cache when it is enabled.
         
         Args:
             owner_address: The address of the owner
             delegate_address: The address to check delegation for
+            strict: Read the chain even if the pair is cached; for security-critical writes
             
         Returns:
             True if delegated, False otherwise
         """
-        try:
+        async def read_delegation() -> bool:
             # Call the delegates mapping on the contract
-            is_delegated = self.contract.functions.delegates(
+            return await maybe_await(self.contract.functions.delegates(
                 Web3.to_checksum_address(owner_address),
                 Web3.to_checksum_address(delegate_address)
-            ).call()
+            ).call())
+
+        try:
+            from app.services.service_container import get_delegation_cache
+            cache = get_delegation_cache()
+            if cache is None:
+                is_delegated = await read_delegation()
+            else:
+                is_delegated = await cache.get_or_load(owner_address, delegate_address, read_delegation, strict=strict)
             
             logger.debug(
                 f"Delegation check: {owner_address} -> {delegate_address} = {is_delegated}"
@@ -1255,6 +1308,101 @@ class BlockchainService:
                 detail=f"Failed to check delegation: {str(e)}"
             )
 
+    async def get_latest_block_number(self) -> int:
+        """
+        Get the number of the latest block.
+
+        Returns:
+            Latest block number
+        """
+        return await maybe_await(self.web3.eth.block_number)
+
+    async def get_delegate_status_changes(self, from_block: int, to_block: int) -> List[Dict[str, Any]]:
+        """
+        Get DelegateStatusChanged events in a block range.
+
+        Args:
+            from_block: First block to search (inclusive)
+            to_block: Last block to search (inclusive)
+
+        Returns:
+            List of dicts with owner, delegate, status and block_number
+        """
+        logs = await maybe_await(self.contract.events.DelegateStatusChanged.get_logs(
+            from_block=from_block,
+            to_block=to_block
+        ))
+        return [
+            {
+                "owner": log["args"]["owner"],
+                "delegate": log["args"]["delegate"],
+                "status": log["args"]["status"],
+                "block_number": log["blockNumber"]
+            }
+            for log in logs
+        ]
+
+    async def get_block_hash(self, block_number: int) -> Optional[str]:
+        """
+        Get the hash of a block.
+
+        Args:
+            block_number: Number of the block
+
+        Returns:
+            Block hash as hex, or None if the chain has no block with that number
+        """
+        try:
+            block = await maybe_await(self.web3.eth.get_block(block_number))
+        except BlockNotFound:
+            return None
+        return block["hash"].hex()
+
+    async def get_contract_events(self, from_block: int, to_block: int, event_names: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Get registry events of several kinds in a block range with a single eth_getLogs call.
+
+        Args:
+            from_block: First block to search (inclusive)
+            to_block: Last block to search (inclusive)
+            event_names: Names of the contract events to return
+
+        Returns:
+            List of dicts with event, block_number, block_hash, transaction_hash,
+            log_index and args, in chain order. Indexed string arguments such as
+            assetId are only available as their keccak256 hash, returned as hex.
+        """
+        events_by_topic = {
+            getattr(self.contract.events, name).topic: getattr(self.contract.events, name)
+            for name in event_names
+        }
+        logs = await maybe_await(self.web3.eth.get_logs({
+            "address": self.contract.address,
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "topics": [list(events_by_topic)]
+        }))
+
+        events = []
+        for log in logs:
+            event = events_by_topic.get(Web3.to_hex(log["topics"][0]))
+            if event is None:
+                continue
+            decoded = event().process_log(log)
+            events.append({
+                "event": decoded["event"],
+                "block_number": decoded["blockNumber"],
+                "block_hash": decoded["blockHash"].hex(),
+                "transaction_hash": decoded["transactionHash"].hex(),
+                "log_index": decoded["logIndex"],
+                "args": {
+                    key: value.hex() if isinstance(value, bytes) else value
+                    for key, value in decoded["args"].items()
+                }
+            })
+        events.sort(key=lambda e: (e["block_number"], e["log_index"]))
+        return events
+
     async def check_server_delegation(self, user_address: str) -> bool:
         """
         Check if the user has delegated the server wallet for API key usage.
@@ -1342,25 +1490,25 @@ class BlockchainService:
             contract_function = self.contract.functions.batchUpdateIPFS(asset_ids, cids)
             
             # Build transaction
-            nonce = self.web3.eth.get_transaction_count(Web3.to_checksum_address(from_address))
-            gas_price = self.web3.eth.gas_price
+            nonce = await maybe_await(self.web3.eth.get_transaction_count(Web3.to_checksum_address(from_address)))
+            gas_price = await maybe_await(self.web3.eth.gas_price)
             
             # Estimate gas
-            estimated_gas = contract_function.estimate_gas({
+            estimated_gas = await maybe_await(contract_function.estimate_gas({
                 'from': Web3.to_checksum_address(from_address),
                 'gasPrice': gas_price
-            })
+            }))
             
             # Add 20% buffer to gas estimate
             gas_limit = int(estimated_gas * 1.2)
             
             # Build the unsigned transaction
-            transaction = contract_function.build_transaction({
+            transaction = await maybe_await(contract_function.build_transaction({
                 'from': Web3.to_checksum_address(from_address),
                 'nonce': nonce,
                 'gasPrice': gas_price,
                 'gas': gas_limit,
-            })
+            }))
             
             logger.info(f"Prepared batch transaction for {len(asset_ids)} assets from {from_address}")
             
@@ -1433,43 +1581,8 @@ class BlockchainService:
                 contract_function = self.contract.functions.batchUpdateIPFS(asset_ids, cids)
                 logger.warning(f"Executing batch transaction with server as owner - this may not be intended")
             
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.wallet_address)
-            gas_price = self.web3.eth.gas_price
-            
-            # Estimate gas
-            estimated_gas = contract_function.estimate_gas({
-                'from': self.wallet_address,
-                'gasPrice': gas_price
-            })
-            
-            # Add 20% buffer to gas estimate
-            gas_limit = int(estimated_gas * 1.2)
-            
-            # Build and sign transaction
-            tx = contract_function.build_transaction({
-                'from': self.wallet_address,
-                'nonce': nonce,
-                'gasPrice': gas_price,
-                'gas': gas_limit,
-            })
-            
-            # Sign transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-            
-            # Handle different Web3.py versions
-            if hasattr(signed_tx, 'rawTransaction'):
-                raw_tx = signed_tx.rawTransaction
-            elif hasattr(signed_tx, 'raw_transaction'):
-                raw_tx = signed_tx.raw_transaction
-            else:
-                raw_tx = bytes(signed_tx)
-            
-            # Send transaction
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-            
-            # Wait for transaction receipt
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            # Sign and send through the shared server wallet nonce manager, estimating gas first
+            receipt = await self._send_server_transaction(contract_function, gas=None)
             
             tx_hash_hex = receipt.transactionHash.hex()
             logger.info(f"Batch transaction successful. {len(asset_ids)} assets processed. Transaction hash: {tx_hash_hex}")
@@ -1483,7 +1596,7 @@ class BlockchainService:
             
         except Exception as e:
             logger.error(f"Error executing batch transaction: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Batch transaction failed: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Batch transaction failed: {str(e)}") from e
 
     async def batch_delete_assets(
         self,
@@ -1536,31 +1649,8 @@ class BlockchainService:
             if len(asset_ids) > 50:  # MAX_BATCH_SIZE from contract
                 raise ValueError("Batch size cannot exceed 50 assets")
                 
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.wallet_address)
-            tx = self.contract.functions.batchDeleteAssets(asset_ids).build_transaction({
-                'from': self.wallet_address,
-                'nonce': nonce,
-                'gasPrice': self.web3.eth.gas_price,
-                'gas': 2000000,
-            })
-
-            # Sign transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-
-            # Different versions of Web3.py use different attribute names
-            if hasattr(signed_tx, 'rawTransaction'):
-                raw_tx = signed_tx.rawTransaction
-            elif hasattr(signed_tx, 'raw_transaction'):
-                raw_tx = signed_tx.raw_transaction
-            else:
-                raw_tx = bytes(signed_tx)
-
-            # Send transaction
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-
-            # Wait for transaction receipt
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            # Sign and send through the shared server wallet nonce manager
+            receipt = await self._send_server_transaction(self.contract.functions.batchDeleteAssets(asset_ids), gas=None)
 
             logger.info(f"Batch deleted {len(asset_ids)} assets. Transaction hash: {receipt.transactionHash.hex()}")
 
@@ -1625,30 +1715,12 @@ class BlockchainService:
             if len(asset_ids) > 50:  # MAX_BATCH_SIZE from contract
                 raise ValueError("Batch size cannot exceed 50 assets")
                 
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(self.wallet_address)
-            tx = self.contract.functions.batchDeleteAssetsFor(
+            # Sign and send through the shared server wallet nonce manager
+            # Estimated, so one already deleted or unknown asset fails the batch before it is sent
+            receipt = await self._send_server_transaction(self.contract.functions.batchDeleteAssetsFor(
                 Web3.to_checksum_address(owner_address),
                 asset_ids
-            ).build_transaction({
-                'from': self.wallet_address,
-                'nonce': nonce,
-                'gasPrice': self.web3.eth.gas_price,
-                'gas': 2000000,
-            })
-
-            # Sign and send the transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-            
-            if hasattr(signed_tx, 'rawTransaction'):
-                raw_tx = signed_tx.rawTransaction
-            elif hasattr(signed_tx, 'raw_transaction'):
-                raw_tx = signed_tx.raw_transaction
-            else:
-                raw_tx = bytes(signed_tx)
-
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            ), gas=None)
 
             logger.info(f"Batch deleted {len(asset_ids)} assets for owner {owner_address}. Transaction hash: {receipt.transactionHash.hex()}")
 
@@ -1656,16 +1728,17 @@ class BlockchainService:
 
         except Exception as e:
             logger.error(f"Blockchain error batch deleting assets for another owner: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Blockchain transaction failed: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Blockchain transaction failed: {str(e)}") from e
 
     async def recover_data_from_events(self, asset_id: str, owner_address: str) -> dict:
         """
-        Fallback recovery: Get CID and transaction hash from blockchain event logs with tiered search.
+        Fallback recovery: Get CID and transaction hash from blockchain event logs.
         
-        This method uses an intelligent search strategy:
-        1. Search recent blocks first (most likely to contain the event)
-        2. If not found, expand search to older blocks
-        3. Use chunked queries to avoid RPC provider limits
+        When the chain event indexer is enabled and has caught up, this is one
+        lookup in the indexed events plus a query over the few blocks the
+        indexer has not reached yet. Otherwise the logs are scanned from the
+        head back to EVENT_INDEXER_START_BLOCK (the registry deployment block)
+        in concurrent chunks, stopping at the most recent update.
         
         Args:
             asset_id: The asset ID to recover data for
@@ -1680,47 +1753,35 @@ class BlockchainService:
             ValueError: If no valid events are found
             HTTPException: If blockchain query fails
         """
+        if settings.event_indexer_enabled:
+            try:
+                recovered = await self._recover_from_event_index(asset_id, owner_address)
+                if recovered is not None:
+                    return recovered
+            except ValueError:
+                raise
+            except Exception as e:
+                logger.warning(f"Event index lookup failed for asset {asset_id}, scanning logs instead: {str(e)}")
+
         try:
-            latest_block = self.web3.eth.get_block('latest')['number']
-            
-            # Tiered search strategy - start recent, expand if needed
-            search_ranges = [
-                50000,   # ~7 days (most likely)
-                200000,  # ~1 month  
-                500000,  # ~2.5 months
-                1000000, # ~5 months
-                latest_block  # Full history (last resort)
-            ]
+            latest_block = (await maybe_await(self.web3.eth.get_block('latest')))['number']
             
-            for max_blocks in search_ranges:
-                from_block = max(0, latest_block - max_blocks)
-                
-                logger.info(f"Searching for CID in events for asset {asset_id} from block {from_block} to {latest_block}")
-                
-                try:
-                    # Use chunked queries for large ranges to avoid RPC limits
-                    events = await self._query_events_chunked(
-                        asset_id, owner_address, from_block, latest_block
-                    )
-                    
-                    if events:
-                        # Filter out deletion events and get valid updates
-                        update_events = [e for e in events if not e['args']['isDeleted']]
-                        
-                        if update_events:
-                            # Get event with highest ipfsVersion (latest update)
-                            latest_event = max(update_events, key=lambda e: e['args']['ipfsVersion'])
-                            authentic_cid = latest_event['args']['cid']
-                            correct_tx_hash = latest_event['transactionHash'].hex()
-                            
-                            logger.info(f"Successfully recovered CID from events: {authentic_cid} for asset {asset_id}, correct TX hash: {correct_tx_hash}")
-                            return {"cid": authentic_cid, "tx_hash": correct_tx_hash}
-                
-                except Exception as e:
-                    logger.warning(f"Search range {from_block}-{latest_block} failed: {str(e)}")
-                    continue
-            
-            # If we get here, no events were found in any range
+            from_block = min(settings.event_indexer_start_block, latest_block)
+            logger.info(f"Searching for CID in events for asset {asset_id} from block {latest_block} back to {from_block}")
+
+            events = await self._query_events_chunked(
+                asset_id, owner_address, from_block, latest_block, newest_only=True
+            )
+            update_events = [e for e in events if not e['args']['isDeleted']]
+            if update_events:
+                # The version restarts at 1 when a deleted asset is recreated, so go by chain position
+                latest_event = max(update_events, key=lambda e: (e['blockNumber'], e['logIndex']))
+                authentic_cid = latest_event['args']['cid']
+                correct_tx_hash = latest_event['transactionHash'].hex()
+
+                logger.info(f"Successfully recovered CID from events: {authentic_cid} for asset {asset_id}, correct TX hash: {correct_tx_hash}")
+                return {"cid": authentic_cid, "tx_hash": correct_tx_hash}
+
             raise ValueError(f"No IPFSUpdated events found for asset {asset_id} in entire blockchain history")
             
         except ValueError:
@@ -1733,47 +1794,106 @@ class BlockchainService:
                 detail=f"Failed to recover CID from events: {str(e)}"
             )
     
-    async def _query_events_chunked(self, asset_id: str, owner_address: str, from_block: int, to_block: int) -> list:
+    async def _recover_from_event_index(self, asset_id: str, owner_address: str) -> Optional[dict]:
+        """
+        Recover the latest CID and transaction hash from the chain event index.
+
+        Blocks after the indexer's checkpoint are queried directly, which is a
+        single small range while the indexer keeps up.
+
+        Args:
+            asset_id: The asset ID to recover data for
+            owner_address: The owner's address
+
+        Returns:
+            Dict with "cid" and "tx_hash", or None if the index cannot answer
+            because the indexer has not started or is too far behind
+
+        Raises:
+            ValueError: If the asset has no IPFSUpdated events
+        """
+        from app.database import get_db_client
+        from app.repositories.chain_event_repo import ChainEventRepository
+
+        repository = ChainEventRepository(get_db_client())
+        checkpoint = await repository.get_checkpoint()
+        if checkpoint is None:
+            return None
+
+        latest_block = await self.get_latest_block_number()
+        indexed_through = checkpoint["last_block"]
+        if latest_block - indexed_through > settings.event_indexer_max_block_range:
+            logger.info(f"Event index is at block {indexed_through} of {latest_block}, not using it for recovery")
+            return None
+
+        if latest_block > indexed_through:
+            recent_events = [
+                e for e in await self._query_events_chunked(asset_id, owner_address, indexed_through + 1, latest_block)
+                if not e['args']['isDeleted']
+            ]
+            if recent_events:
+                latest_event = max(recent_events, key=lambda e: (e['blockNumber'], e['logIndex']))
+                logger.info(f"Recovered CID for asset {asset_id} from unindexed block {latest_event['blockNumber']}")
+                return {"cid": latest_event['args']['cid'], "tx_hash": latest_event['transactionHash'].hex()}
+
+        event = await repository.find_latest_ipfs_update(owner_address, Web3.keccak(text=asset_id).hex())
+        if event is None:
+            raise ValueError(f"No IPFSUpdated events found for asset {asset_id} in entire blockchain history")
+
+        logger.info(f"Recovered CID from event index: {event['cid']} for asset {asset_id}, correct TX hash: {event['transactionHash']}")
+        return {"cid": event["cid"], "tx_hash": event["transactionHash"]}
+
+    async def _query_events_chunked(
+        self,
+        asset_id: str,
+        owner_address: str,
+        from_block: int,
+        to_block: int,
+        newest_only: bool = False
+    ) -> list:
         """
-        Query events in chunks to avoid RPC provider limits.
+        Query an asset's IPFSUpdated events with concurrent, adaptively sized eth_getLogs calls.
+        
+        The node filters on the indexed owner and assetId topics, so each chunk
+        is a single call. Chunks start at LOG_SCAN_CHUNK_SIZE blocks, shrink
+        when the provider rejects a range and grow again as calls succeed;
+        other failures are retried rather than skipped.
         
         Args:
             asset_id: The asset ID to search for
             owner_address: The owner's address
             from_block: Starting block number
             to_block: Ending block number
+            newest_only: Scan from to_block backwards and stop at the newest chunk with an update
             
         Returns:
-            List of matching events from all chunks
-        """
-        CHUNK_SIZE = 10000  # Conservative chunk size for most RPC providers
-        all_events = []
-        
-        current_from = from_block
-        while current_from <= to_block:
-            current_to = min(current_from + CHUNK_SIZE - 1, to_block)
+            List of matching events from all scanned chunks
             
-            try:
-                # Create event filter for this chunk
-                event_filter = self.contract.events.IPFSUpdated.create_filter(
-                    from_block=current_from,
-                    to_block=current_to,
-                    argument_filters={
-                        'owner': Web3.to_checksum_address(owner_address),
-                        'assetId': asset_id
-                    }
-                )
-                
-                # Get events for this chunk
-                chunk_events = event_filter.get_all_entries()
-                all_events.extend(chunk_events)
-                
-                logger.debug(f"Chunk {current_from}-{current_to}: found {len(chunk_events)} events")
-                
-            except Exception as e:
-                logger.warning(f"Failed to query chunk {current_from}-{current_to}: {str(e)}")
-                # Continue with next chunk instead of failing entirely
-            
-            current_from = current_to + 1
-        
-        return all_events
+        Raises:
+            LogScanError: If a chunk cannot be fetched after retrying
+        """
+        event = self.contract.events.IPFSUpdated
+        owner_topic = "0x" + "00" * 12 + Web3.to_checksum_address(owner_address)[2:].lower()
+        asset_topic = Web3.to_hex(Web3.keccak(text=asset_id))
+
+        async def fetch(start: int, end: int) -> list:
+            logs = await maybe_await(self.web3.eth.get_logs({
+                "address": self.contract.address,
+                "fromBlock": start,
+                "toBlock": end,
+                "topics": [event.topic, owner_topic, asset_topic]
+            }))
+            logger.debug(f"Chunk {start}-{end}: found {len(logs)} events")
+            return [event().process_log(log) for log in logs]
+
+        return await scan_block_ranges(
+            fetch,
+            from_block,
+            to_block,
+            chunk_size=settings.log_scan_chunk_size,
+            max_chunk_size=settings.log_scan_max_chunk_size,
+            concurrency=settings.log_scan_concurrency,
+            retries=settings.log_scan_retries,
+            newest_first=newest_only,
+            stop_when=(lambda events: any(not e['args']['isDeleted'] for e in events)) if newest_only else None
+        )
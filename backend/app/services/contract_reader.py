@@ -0,0 +1,185 @@
+import asyncio
+import logging
+from typing import Any, List, Optional, Sequence, Tuple
+
+from eth_abi import decode
+from eth_utils import function_abi_to_4byte_selector, get_abi_input_types, get_abi_output_types
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import ContractLogicError, Web3RPCError
+
+from app.utilities.web3_utils import maybe_await
+
+logger = logging.getLogger(__name__)
+
+# Multicall3 is deployed at this address on Ethereum mainnet, Sepolia and most other chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
+# Selector of Error(string), the payload of require() and revert("...") failures
+ERROR_SELECTOR = bytes.fromhex("08c379a0")
+
+
+class ContractReader:
+    """
+    Runs many contract view calls in as few RPC round-trips as possible.
+
+    When Multicall3 is deployed on the connected chain, each chunk of up to
+    `max_batch_size` calls is one eth_call to its aggregate3 function.
+    Otherwise each chunk is one JSON-RPC batch request of eth_calls, and if
+    the provider rejects batches the calls are sent concurrently one by one.
+    Chunks are sent concurrently. Calls succeed or fail independently: a call
+    that reverts yields its exception in place of a result.
+    """
+
+    def __init__(self, web3: Any, multicall_address: Optional[str] = MULTICALL3_ADDRESS, max_batch_size: int = 100):
+        """
+        Initialize the reader.
+
+        Args:
+            web3: Web3 or AsyncWeb3 client to call through
+            multicall_address: Multicall3 contract address, or None to always use JSON-RPC batches
+            max_batch_size: Most calls sent in one multicall or batch request
+        """
+        self.web3 = web3
+        self.max_batch_size = max(1, max_batch_size)
+        self.multicall = None
+        if multicall_address:
+            self.multicall = web3.eth.contract(address=Web3.to_checksum_address(multicall_address), abi=MULTICALL3_ABI)
+        # Whether Multicall3 has code on this chain; None until checked
+        self._multicall_deployed: Optional[bool] = None if self.multicall else False
+
+    async def call(self, calls: Sequence[Any]) -> List[Any]:
+        """
+        Run contract view calls and return their results in order.
+
+        Args:
+            calls: Contract function calls with positional arguments,
+                e.g. contract.functions.getIPFSInfo(asset_id, owner)
+
+        Returns:
+            One entry per call: the result as the call's `.call()` would return it,
+            or the exception the call failed with
+        """
+        if not calls:
+            return []
+
+        payloads = [(call.address, self._encode(call)) for call in calls]
+        use_multicall = await self._use_multicall()
+        chunks = [range(i, min(i + self.max_batch_size, len(calls))) for i in range(0, len(calls), self.max_batch_size)]
+        results = await asyncio.gather(*(
+            self._call_chunk(calls[chunk.start:chunk.stop], payloads[chunk.start:chunk.stop], use_multicall)
+            for chunk in chunks
+        ))
+        return [result for chunk_results in results for result in chunk_results]
+
+    async def _use_multicall(self) -> bool:
+        if self._multicall_deployed is None:
+            try:
+                code = await maybe_await(self.web3.eth.get_code(self.multicall.address))
+            except Exception as e:
+                # Checked again on the next call
+                logger.warning(f"Could not look up Multicall3, using JSON-RPC batches: {str(e)}")
+                return False
+            self._multicall_deployed = len(code) > 0
+            logger.info(
+                f"Multicall3 {'found' if self._multicall_deployed else 'not deployed'} at {self.multicall.address}"
+            )
+        return self._multicall_deployed
+
+    async def _call_chunk(self, calls: Sequence[Any], payloads: Sequence[Tuple[str, bytes]], use_multicall: bool) -> List[Any]:
+        if use_multicall:
+            try:
+                return await self._aggregate(calls, payloads)
+            except Exception as e:
+                logger.warning(f"Multicall of {len(calls)} view calls failed, sending a JSON-RPC batch instead: {str(e)}")
+        if len(calls) > 1:
+            try:
+                return await self._batch(calls, payloads)
+            except Exception as e:
+                logger.warning(f"JSON-RPC batch of {len(calls)} view calls failed, sending them one by one: {str(e)}")
+        return list(await asyncio.gather(*(maybe_await(call.call()) for call in calls), return_exceptions=True))
+
+    async def _aggregate(self, calls: Sequence[Any], payloads: Sequence[Tuple[str, bytes]]) -> List[Any]:
+        responses = await maybe_await(self.multicall.functions.aggregate3(
+            [(address, True, data) for address, data in payloads]
+        ).call())
+        return [
+            self._decode(call, data) if success else self._revert_error(data)
+            for call, (success, data) in zip(calls, responses)
+        ]
+
+    async def _batch(self, calls: Sequence[Any], payloads: Sequence[Tuple[str, bytes]]) -> List[Any]:
+        responses = await maybe_await(self.web3.provider.make_batch_request([
+            ("eth_call", [{"to": address, "data": Web3.to_hex(data)}, "latest"]) for address, data in payloads
+        ]))
+        if not isinstance(responses, list):
+            # Providers without batch support answer with a single error
+            raise Web3RPCError(str(responses.get("error", responses)))
+        results = []
+        for call, response in zip(calls, responses):
+            error = response.get("error")
+            if error:
+                message = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+                results.append(Web3RPCError(message, rpc_response=response))
+            else:
+                results.append(self._decode(call, HexBytes(response["result"])))
+        return results
+
+    def _encode(self, call: Any) -> bytes:
+        return function_abi_to_4byte_selector(call.abi) + self.web3.codec.encode(
+            get_abi_input_types(call.abi), call.args
+        )
+
+    def _decode(self, call: Any, data: bytes) -> Any:
+        output_types = get_abi_output_types(call.abi)
+        try:
+            values = self.web3.codec.decode(output_types, data)
+        except Exception as e:
+            # Typically a target without code, which returns nothing instead of reverting
+            return ContractLogicError(f"Could not decode {call.fn_name} result: {str(e)}")
+        # web3 returns checksummed addresses from calls
+        values = [
+            Web3.to_checksum_address(value) if output_type == "address" else value
+            for output_type, value in zip(output_types, values)
+        ]
+        return values[0] if len(values) == 1 else values
+
+    @staticmethod
+    def _revert_error(data: bytes) -> ContractLogicError:
+        if data[:4] == ERROR_SELECTOR:
+            try:
+                return ContractLogicError(f"execution reverted: {decode(['string'], data[4:])[0]}", data=Web3.to_hex(data))
+            except Exception:
+                pass
+        return ContractLogicError("execution reverted", data=Web3.to_hex(data))
@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.utilities.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class DelegationCache:
+    """
+    Cache of `delegates(owner, delegate)` results keyed by the address pair.
+
+    Entries are bounded by a TTL and dropped early when a DelegateStatusChanged
+    event for the pair is seen. Concurrent misses for the same pair share one
+    chain read, as do concurrent strict reads. A read that was in flight when
+    any pair was invalidated is returned to its caller but not cached, so a
+    result that predates a revocation can never be stored after it.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid
+            max_entries: Upper bound on cached pairs; least recently used are evicted
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[bool, float]]" = OrderedDict()
+        self._flights: SingleFlight[bool] = SingleFlight()
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.strict_reads = 0
+        self.invalidations = 0
+        self.discarded_fills = 0
+
+    @staticmethod
+    def _key(owner_address: str, delegate_address: str) -> Tuple[str, str]:
+        return owner_address.lower(), delegate_address.lower()
+
+    def get(self, owner_address: str, delegate_address: str) -> Optional[bool]:
+        """
+        Look up a cached delegation status.
+
+        Args:
+            owner_address: The address of the owner
+            delegate_address: The address of the delegate
+
+        Returns:
+            The cached status, or None on a miss
+        """
+        key = self._key(owner_address, delegate_address)
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.expired += 1
+        self.misses += 1
+        return None
+
+    def put(self, owner_address: str, delegate_address: str, is_delegated: bool, epoch: Optional[int] = None) -> bool:
+        """
+        Store a delegation status read from the chain.
+
+        Args:
+            owner_address: The address of the owner
+            delegate_address: The address of the delegate
+            is_delegated: The status read from the chain
+            epoch: Value of `epoch` taken before the read; the entry is not
+                stored if an invalidation happened since
+
+        Returns:
+            True if the entry was stored
+        """
+        if epoch is not None and epoch != self._epoch:
+            self.discarded_fills += 1
+            return False
+
+        key = self._key(owner_address, delegate_address)
+        self._entries[key] = (is_delegated, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    @property
+    def epoch(self) -> int:
+        """Counter bumped on every invalidation."""
+        return self._epoch
+
+    def invalidate(self, owner_address: str, delegate_address: str) -> None:
+        """
+        Drop a pair whose delegation status may have changed.
+
+        Args:
+            owner_address: The address of the owner
+            delegate_address: The address of the delegate
+        """
+        self._epoch += 1
+        self.invalidations += 1
+        self._entries.pop(self._key(owner_address, delegate_address), None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._epoch += 1
+        self._entries.clear()
+
+    async def get_or_load(
+        self,
+        owner_address: str,
+        delegate_address: str,
+        loader: Callable[[], Awaitable[bool]],
+        strict: bool = False
+    ) -> bool:
+        """
+        Return the cached status, reading it with `loader` on a miss.
+
+        Args:
+            owner_address: The address of the owner
+            delegate_address: The address of the delegate
+            loader: Coroutine function that reads the status from the chain
+            strict: Read from the chain instead of the cache (only joining a strict
+                read already in flight); the result still refreshes the cache
+
+        Returns:
+            True if delegated, False otherwise
+        """
+        key = self._key(owner_address, delegate_address)
+
+        async def load() -> bool:
+            epoch = self._epoch
+            value = await loader()
+            self.put(owner_address, delegate_address, value, epoch)
+            return value
+
+        if strict:
+            self.strict_reads += 1
+            return await self._flights.run(("strict", key), load)
+
+        cached = self.get(owner_address, delegate_address)
+        if cached is not None:
+            return cached
+        return await self._flights.run(key, load)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with hit/miss counters, hit rate and size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "coalesced": self._flights.coalesced,
+            "strict_reads": self.strict_reads,
+            "invalidations": self.invalidations,
+            "discarded_fills": self.discarded_fills,
+            "entries": len(self._entries),
+            "ttl": self.ttl,
+        }
+
+
+class DelegationEventWatcher:
+    """
+    Polls DelegateStatusChanged events and invalidates the affected cache entries.
+
+    Starts at the chain head when first polled and then follows every block,
+    so entries are dropped within one poll interval of a delegation change.
+    If polling fails, the missed range is picked up on the next successful
+    poll; the cache TTL bounds staleness in the meantime.
+    """
+
+    def __init__(self, blockchain_service, cache: DelegationCache, poll_interval: float = 15.0, max_block_range: int = 2000):
+        """
+        Initialize the watcher.
+
+        Args:
+            blockchain_service: BlockchainService used to read blocks and events
+            cache: Cache to invalidate
+            poll_interval: Seconds between polls
+            max_block_range: Largest block range requested in one getLogs call
+        """
+        self.blockchain_service = blockchain_service
+        self.cache = cache
+        self.poll_interval = poll_interval
+        self.max_block_range = max_block_range
+        self._last_block: Optional[int] = None
+        self._last_polled: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+        self._events_seen = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def poll_once(self) -> int:
+        """
+        Process events in blocks after the last processed block.
+
+        Returns:
+            Number of DelegateStatusChanged events processed
+        """
+        latest = await self.blockchain_service.get_latest_block_number()
+        if self._last_block is None:
+            # History is not needed once entries cached before this point are gone
+            self._last_block = latest
+            self.cache.clear()
+            return 0
+
+        processed = 0
+        while self._last_block < latest:
+            from_block = self._last_block + 1
+            to_block = min(latest, from_block + self.max_block_range - 1)
+            events = await self.blockchain_service.get_delegate_status_changes(from_block, to_block)
+            for event in events:
+                self.cache.invalidate(event["owner"], event["delegate"])
+                logger.debug(
+                    f"Delegation changed at block {event['block_number']}: "
+                    f"{event['owner']} -> {event['delegate']} = {event['status']}"
+                )
+            processed += len(events)
+            self._last_block = to_block
+
+        self._events_seen += processed
+        return processed
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+                self._last_error = None
+            except Exception as e:
+                if self._last_error is None:
+                    logger.warning(f"Delegation event polling failed: {str(e)}")
+                self._last_error = str(e)
+            self._last_polled = datetime.now(timezone.utc)
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        """Start polling in the background if not already running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get the watcher's progress.
+
+        Returns:
+            Dict with the last processed block, events seen, last poll time and last error
+        """
+        return {
+            "last_block": self._last_block,
+            "events_seen": self._events_seen,
+            "last_polled": self._last_polled.isoformat() if self._last_polled else None,
+            "last_error": self._last_error,
+        }
+
+    async def close(self) -> None:
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,249 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Registry events copied into the chain_events collection
+INDEXED_EVENTS = (
+    "IPFSUpdated",
+    "AssetDeleted",
+    "DelegateStatusChanged",
+    "TransferInitiated",
+    "TransferCompleted",
+    "TransferCancelled",
+)
+# Address arguments are stored lowercase so lookups don't depend on checksum casing
+ADDRESS_ARGS = ("owner", "delegate", "from", "to")
+# Range ends remembered in the checkpoint for finding where a reorg forked
+REORG_HISTORY = 64
+
+
+class ChainEventIndexer:
+    """
+    Follows the registry's events into MongoDB so they can be looked up instead of scanned.
+
+    Blocks are indexed from start_block (the registry deployment block) up to
+    `confirmations` blocks behind the head, one eth_getLogs call per range of
+    at most max_block_range blocks. After each range the checkpoint records
+    the range's last block and its hash. Each poll first checks the newest
+    recorded hash against the chain; if a reorg replaced that block, the
+    index is rolled back to the newest recorded block that is still on the
+    chain and re-indexed from there. Listeners added with add_listener are
+    called with the documents of every indexed range.
+    """
+
+    def __init__(
+        self,
+        blockchain_service,
+        repository,
+        start_block: int = 0,
+        confirmations: int = 12,
+        max_block_range: int = 2000,
+        poll_interval: float = 15.0
+    ):
+        """
+        Initialize the indexer.
+
+        Args:
+            blockchain_service: BlockchainService used to read blocks and events
+            repository: ChainEventRepository storing events and the checkpoint
+            start_block: First block to index, normally the registry deployment block
+            confirmations: Blocks behind the head left unindexed until they are unlikely to be reorganized
+            max_block_range: Largest block range requested in one getLogs call
+            poll_interval: Seconds between polls
+        """
+        self.blockchain_service = blockchain_service
+        self.repository = repository
+        self.start_block = start_block
+        self.confirmations = confirmations
+        self.max_block_range = max_block_range
+        self.poll_interval = poll_interval
+        self._last_block: Optional[int] = None
+        self._head_block: Optional[int] = None
+        self._last_polled: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+        self._events_indexed = 0
+        self._reorgs = 0
+        self._listeners: List[Callable[[List[Dict[str, Any]]], Any]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def to_document(event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert an event from BlockchainService.get_contract_events to its stored form.
+
+        Args:
+            event: Dict with event, block_number, block_hash, transaction_hash, log_index and args
+
+        Returns:
+            Document keyed by "{transactionHash}:{logIndex}" with the event arguments as
+            top-level fields and the indexed assetId stored as assetIdHash
+        """
+        document = {
+            "_id": f"{event['transaction_hash']}:{event['log_index']}",
+            "event": event["event"],
+            "blockNumber": event["block_number"],
+            "blockHash": event["block_hash"],
+            "transactionHash": event["transaction_hash"],
+            "logIndex": event["log_index"],
+        }
+        for name, value in event["args"].items():
+            if name == "assetId":
+                document["assetIdHash"] = value
+            elif name in ADDRESS_ARGS:
+                document[name] = value.lower()
+            else:
+                document[name] = value
+        return document
+
+    def add_listener(self, listener: Callable[[List[Dict[str, Any]]], Any]) -> None:
+        """
+        Register a function called with the stored documents of each indexed range.
+
+        Args:
+            listener: Function taking a list of event documents; its errors are logged and ignored
+        """
+        self._listeners.append(listener)
+
+    async def poll_once(self) -> int:
+        """
+        Index confirmed blocks after the checkpoint, rolling back first if a reorg is detected.
+
+        Returns:
+            Number of events indexed
+        """
+        checkpoint = await self.repository.get_checkpoint()
+        if checkpoint is None:
+            checkpoint = {"start_block": self.start_block, "last_block": self.start_block - 1, "recent_blocks": []}
+        else:
+            await self._rewind_reorganized_blocks(checkpoint)
+
+        self._head_block = await self.blockchain_service.get_latest_block_number()
+        target = self._head_block - self.confirmations
+
+        indexed = 0
+        while checkpoint["last_block"] < target:
+            from_block = checkpoint["last_block"] + 1
+            to_block = min(target, from_block + self.max_block_range - 1)
+            events = await self.blockchain_service.get_contract_events(from_block, to_block, INDEXED_EVENTS)
+            block_hash = await self.blockchain_service.get_block_hash(to_block)
+            documents = [self.to_document(event) for event in events]
+            await self.repository.upsert_events(documents)
+            for listener in self._listeners:
+                try:
+                    listener(documents)
+                except Exception as e:
+                    logger.warning(f"Event listener failed for blocks {from_block}-{to_block}: {str(e)}")
+
+            checkpoint["last_block"] = to_block
+            checkpoint["recent_blocks"] = (
+                checkpoint["recent_blocks"] + [{"number": to_block, "hash": block_hash}]
+            )[-REORG_HISTORY:]
+            await self.repository.save_checkpoint(checkpoint)
+            self._last_block = to_block
+            indexed += len(events)
+
+        self._last_block = checkpoint["last_block"]
+        self._events_indexed += indexed
+        return indexed
+
+    async def _rewind_reorganized_blocks(self, checkpoint: Dict[str, Any]) -> None:
+        """
+        Roll the index back to the newest recorded block that is still on the chain.
+
+        A block hash commits to every block before it, so only the newest
+        recorded range end has to match for everything indexed to be canonical.
+
+        Args:
+            checkpoint: The stored checkpoint, updated in place and saved if rolled back
+        """
+        recent: List[Dict[str, Any]] = checkpoint["recent_blocks"]
+        while recent:
+            newest = recent[-1]
+            if await self.blockchain_service.get_block_hash(newest["number"]) == newest["hash"]:
+                break
+            recent.pop()
+
+        if recent and recent[-1]["number"] == checkpoint["last_block"]:
+            return
+
+        # With no recorded block left on the chain the reorg is deeper than the history; start over
+        fork_block = recent[-1]["number"] if recent else checkpoint["start_block"] - 1
+        removed = await self.repository.delete_events_after(fork_block)
+        logger.warning(
+            f"Chain reorganization below block {checkpoint['last_block']}: "
+            f"re-indexing from block {fork_block + 1}, removed {removed} events"
+        )
+        checkpoint["last_block"] = fork_block
+        await self.repository.save_checkpoint(checkpoint)
+        self._reorgs += 1
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+                self._last_error = None
+            except Exception as e:
+                if self._last_error is None:
+                    logger.warning(f"Chain event indexing failed: {str(e)}")
+                self._last_error = str(e)
+            self._last_polled = datetime.now(timezone.utc)
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        """Start indexing in the background if not already running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get the indexer's progress.
+
+        Returns:
+            Dict with the last indexed block, the chain head at the last poll,
+            events indexed, reorgs handled, last poll time and last error
+        """
+        return {
+            "last_block": self._last_block,
+            "head_block": self._head_block,
+            "events_indexed": self._events_indexed,
+            "reorgs": self._reorgs,
+            "last_polled": self._last_polled.isoformat() if self._last_polled else None,
+            "last_error": self._last_error,
+        }
+
+    async def close(self) -> None:
+        """Stop indexing."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def create_chain_event_indexer(blockchain_service) -> ChainEventIndexer:
+    """
+    Build an indexer from settings that stores events in the application database.
+
+    Args:
+        blockchain_service: BlockchainService used to read blocks and events
+
+    Returns:
+        A ChainEventIndexer that has not been started
+    """
+    from app.config import settings
+    from app.database import get_db_client
+    from app.repositories.chain_event_repo import ChainEventRepository
+
+    return ChainEventIndexer(
+        blockchain_service,
+        ChainEventRepository(get_db_client()),
+        start_block=settings.event_indexer_start_block,
+        confirmations=settings.event_indexer_confirmations,
+        max_block_range=settings.event_indexer_max_block_range,
+        poll_interval=settings.event_indexer_poll_interval
+    )
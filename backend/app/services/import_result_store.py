@@ -0,0 +1,278 @@
+import json
+import time
+import logging
+from typing import Dict, Any, List, Optional, Union
+
+import redis.asyncio as redis
+from app.utilities.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis hash per import: initiator, created_at, finished and one `status:{status}` counter per row status
+IMPORT_KEY_PREFIX = "csv_import:"
+STATUS_FIELD_PREFIX = "status:"
+# Redis list per import holding the JSON-encoded per-row results in completion order
+RESULTS_KEY_PREFIX = "csv_import_results:"
+
+def _count_statuses(results: List[Dict[str, Any]]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for result in results:
+        status = result.get("status", "unknown")
+        counts[status] = counts.get(status, 0) + 1
+    return counts
+
+class ImportResultStore:
+    """
+    In-memory store for the per-row results of CSV imports.
+
+    GET /upload/csv/{import_id}/results is answered from this process's
+    memory, so with several workers a request routed to another worker than
+    the one running the import gets a 404. Set CSV_IMPORT_RESULT_BACKEND=redis
+    for those deployments.
+    """
+
+    def __init__(self, ttl: int = 86400):
+        """
+        Initialize the store.
+
+        Args:
+            ttl: Seconds an import's results are kept after it starts
+        """
+        self.ttl = ttl
+        # import ID -> initiator, created_at, finished and status counters; kept oldest first
+        self._imports: Dict[str, Dict[str, Any]] = {}
+        self._results: Dict[str, List[Dict[str, Any]]] = {}
+
+    async def create_import(self, import_id: str, initiator_address: str) -> None:
+        """Start collecting results for a new import."""
+        self.cleanup_old_imports(self.ttl)
+
+        self._imports[import_id] = {
+            "initiator_address": initiator_address,
+            "created_at": time.time(),
+            "finished": False,
+            "status_counts": {}
+        }
+        self._results[import_id] = []
+
+    async def add_results(self, import_id: str, results: List[Dict[str, Any]]) -> None:
+        """Append per-row results to an import."""
+        if import_id not in self._imports or not results:
+            return
+
+        self._results[import_id].extend(results)
+        counts = self._imports[import_id]["status_counts"]
+        for status, count in _count_statuses(results).items():
+            counts[status] = counts.get(status, 0) + count
+
+    async def finish_import(self, import_id: str) -> None:
+        """Mark an import as done; no further results will follow."""
+        if import_id in self._imports:
+            self._imports[import_id]["finished"] = True
+
+    async def get_summary(self, import_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an import's status without its results.
+
+        Returns:
+            Dict with initiator_address, created_at, finished, result_count and
+            status_counts, or None if the import is unknown or expired
+        """
+        if import_id not in self._imports:
+            return None
+
+        metadata = self._imports[import_id]
+        return {
+            "import_id": import_id,
+            "initiator_address": metadata["initiator_address"],
+            "created_at": metadata["created_at"],
+            "finished": metadata["finished"],
+            "result_count": len(self._results[import_id]),
+            "status_counts": dict(metadata["status_counts"])
+        }
+
+    async def get_results(self, import_id: str, offset: int = 0, limit: int = 100) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get a page of an import's per-row results.
+
+        Returns:
+            Up to `limit` results starting at `offset`, or None if the import is unknown or expired
+        """
+        if import_id not in self._results:
+            return None
+        return self._results[import_id][offset:offset + limit]
+
+    def cleanup_old_imports(self, max_age_seconds: int = 86400) -> None:
+        """
+        Drop imports older than `max_age_seconds`.
+
+        Imports are stored in creation order, so this stops at the first
+        import that is still young instead of scanning every import.
+        """
+        cutoff = time.time() - max_age_seconds
+        expired_imports = []
+
+        for import_id, metadata in self._imports.items():
+            if metadata["created_at"] > cutoff:
+                break
+            expired_imports.append(import_id)
+
+        for import_id in expired_imports:
+            self._imports.pop(import_id, None)
+            self._results.pop(import_id, None)
+
+        if expired_imports:
+            logger.info(f"Cleaned up {len(expired_imports)} expired CSV imports")
+
+    async def close(self) -> None:
+        """Nothing to release; results stay until they expire."""
+
+class RedisImportResultStore:
+    """
+    Redis-backed import result store, so any worker can page through an import's results.
+
+    Each import is a hash of counters plus a list of JSON-encoded results,
+    both expiring `ttl` seconds after the import starts. Results are
+    appended and counted in one pipeline per call.
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None, ttl: int = 86400):
+        """
+        Initialize the store.
+
+        Args:
+            redis_client: Optional asyncio Redis client. If None, the shared client is used.
+            ttl: Seconds an import's results are kept after it starts
+        """
+        self._redis_client = redis_client
+        self.ttl = ttl
+
+    @property
+    def redis(self) -> redis.Redis:
+        """Client holding the import hashes and result lists."""
+        return self._redis_client or get_redis_client()
+
+    @staticmethod
+    def _import_key(import_id: str) -> str:
+        return f"{IMPORT_KEY_PREFIX}{import_id}"
+
+    @staticmethod
+    def _results_key(import_id: str) -> str:
+        return f"{RESULTS_KEY_PREFIX}{import_id}"
+
+    async def create_import(self, import_id: str, initiator_address: str) -> None:
+        """Start collecting results for a new import."""
+        key = self._import_key(import_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                "initiator_address": json.dumps(initiator_address),
+                "created_at": json.dumps(time.time()),
+                "finished": json.dumps(False)
+            })
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def add_results(self, import_id: str, results: List[Dict[str, Any]]) -> None:
+        """Append per-row results to an import."""
+        if not results:
+            return
+
+        key = self._import_key(import_id)
+        results_key = self._results_key(import_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(results_key, *(json.dumps(result, default=str) for result in results))
+            for status, count in _count_statuses(results).items():
+                pipe.hincrby(key, f"{STATUS_FIELD_PREFIX}{status}", count)
+            # The list is created by the first append, so its TTL is set here
+            pipe.expire(results_key, self.ttl, nx=True)
+            await pipe.execute()
+
+    async def finish_import(self, import_id: str) -> None:
+        """Mark an import as done; no further results will follow."""
+        key = self._import_key(import_id)
+        if await self.redis.exists(key):
+            await self.redis.hset(key, mapping={"finished": json.dumps(True)})
+
+    async def get_summary(self, import_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an import's status without its results.
+
+        Returns:
+            Dict with initiator_address, created_at, finished, result_count and
+            status_counts, or None if the import is unknown or expired
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._import_key(import_id))
+            pipe.llen(self._results_key(import_id))
+            fields, result_count = await pipe.execute()
+
+        if "created_at" not in fields:
+            return None
+
+        return {
+            "import_id": import_id,
+            "initiator_address": json.loads(fields["initiator_address"]),
+            "created_at": json.loads(fields["created_at"]),
+            "finished": json.loads(fields["finished"]),
+            "result_count": result_count,
+            "status_counts": {
+                field[len(STATUS_FIELD_PREFIX):]: int(value)
+                for field, value in fields.items()
+                if field.startswith(STATUS_FIELD_PREFIX)
+            }
+        }
+
+    async def get_results(self, import_id: str, offset: int = 0, limit: int = 100) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get a page of an import's per-row results.
+
+        Returns:
+            Up to `limit` results starting at `offset`, or None if the import is unknown or expired
+        """
+        if not await self.redis.exists(self._import_key(import_id)):
+            return None
+        if limit <= 0:
+            return []
+        page = await self.redis.lrange(self._results_key(import_id), offset, offset + limit - 1)
+        return [json.loads(result) for result in page]
+
+    def cleanup_old_imports(self, max_age_seconds: int = 86400) -> None:
+        """Nothing to do: both keys of an import carry its TTL."""
+
+    async def close(self) -> None:
+        """Nothing to release; the Redis client belongs to the caller or the app."""
+
+ResultStore = Union[ImportResultStore, RedisImportResultStore]
+
+_import_result_store: Optional[ResultStore] = None
+
+def get_import_result_store() -> ResultStore:
+    """
+    Get the shared import result store for the configured CSV_IMPORT_RESULT_BACKEND.
+
+    Returns:
+        ImportResultStore for "memory" (the default), RedisImportResultStore for "redis"
+    """
+    global _import_result_store
+    if _import_result_store is None:
+        from app.config import settings
+
+        backend = settings.csv_import_result_backend.lower()
+        if backend == "redis":
+            _import_result_store = RedisImportResultStore(ttl=settings.csv_import_result_ttl)
+        else:
+            if backend != "memory":
+                logger.warning(f"Unknown CSV_IMPORT_RESULT_BACKEND '{settings.csv_import_result_backend}', using memory")
+            _import_result_store = ImportResultStore(ttl=settings.csv_import_result_ttl)
+        logger.info(f"CSV import result store initialized with {type(_import_result_store).__name__}")
+    return _import_result_store
+
+async def close_import_result_store() -> None:
+    """Release the shared import result store. Call on application shutdown."""
+    global _import_result_store
+    if _import_result_store is not None:
+        try:
+            await _import_result_store.close()
+        except Exception as e:
+            logger.error(f"Error closing import result store: {str(e)}")
+        _import_result_store = None
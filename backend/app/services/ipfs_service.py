@@ -5,15 +5,39 @@ import asyncio
 from typing import Dict, Any, List, Callable, Optional
 from fastapi import UploadFile, HTTPException
 from app.utilities.format import format_json, get_ipfs_metadata
+from app.utilities.cid_utils import compute_cid as compute_local_cid
+from app.utilities.gateway_fetch import get_gateway_tracker, hedged_fetch
+from app.utilities.http_client import get_http_client
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Payloads above this size are hashed in a worker thread
+LOCAL_CID_INLINE_LIMIT = 256 * 1024
+
 class IPFSService:
     def __init__(self):
         self.storage_service_url = settings.web3_storage_service_url
         logger.info(f"Using Web3 Storage service at: {self.storage_service_url}")
 
+    async def _cache_content(self, cid: str, content: Any) -> None:
+        """
+        Add content to the CID cache. Failures are logged and never raised.
+
+        Args:
+            cid: Content identifier
+            content: Content bytes, or an httpx response whose body is used
+        """
+        if not settings.ipfs_cache_enabled:
+            return
+        try:
+            if isinstance(content, httpx.Response):
+                content = content.content
+            from app.services.service_container import get_cid_cache
+            await get_cid_cache().put(cid, content)
+        except Exception as e:
+            logger.warning(f"Could not cache content for CID {cid}: {str(e)}")
+
     async def store_metadata(self, metadata: Dict[str, Any]) -> str:
         """
         Store metadata on IPFS.
@@ -29,9 +53,9 @@ class IPFSService:
 
             files = {"files": ("metadata.json", formatted_metadata, "application/json")}
 
-            async with httpx.AsyncClient(timeout=90.0) as client:
-                response = await client.post(f"{self.storage_service_url}/upload", files=files)
-                response.raise_for_status()
+            client = get_http_client()
+            response = await client.post(f"{self.storage_service_url}/upload", files=files)
+            response.raise_for_status()
 
             # Get the response JSON and log it for debugging
             response_json = response.json()
@@ -50,6 +74,9 @@ class IPFSService:
             if not cid:
                 raise ValueError(f"Unable to extract CID from response: {response_json}")
 
+            # We already hold the exact bytes, so the first read needs no fetch
+            await self._cache_content(cid, formatted_metadata)
+
             logger.info(f"Successfully stored metadata on IPFS. CID: {cid}")
             return cid
 
@@ -60,6 +87,66 @@ class IPFSService:
             logger.error(f"General error uploading metadata to IPFS: {str(e)}")
             raise
 
+    async def _fetch_sequential(self, client: httpx.AsyncClient, cid: str) -> httpx.Response:
+        """
+        Fetch CID content from the storage service, then each gateway in turn.
+
+        Args:
+            client: HTTP client to use
+            cid: Content identifier to fetch
+
+        Returns:
+            The first successful response
+        """
+        try:
+            # Try using the storage service URL first
+            response = await client.get(f"{self.storage_service_url}/file/{cid}/contents")
+            response.raise_for_status()
+            return response
+        except httpx.HTTPStatusError as exc:
+            # If the storage service fails, try the configured IPFS gateways in order
+            gateway_errors = []
+            for template in settings.ipfs_gateway_list:
+                url = template.format(cid=cid)
+                logger.info(f"Storage service failed, trying gateway: {url}")
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    return response
+                except Exception as gateway_error:
+                    logger.info(f"Gateway {url} failed: {str(gateway_error)}")
+                    gateway_errors.append(str(gateway_error))
+            # If every gateway fails, re-raise the original exception
+            logger.error(f"All IPFS gateways failed. Storage service error: {exc}, gateway errors: {gateway_errors}")
+            raise exc
+
+    async def _fetch_hedged(self, client: httpx.AsyncClient, cid: str) -> httpx.Response:
+        """
+        Fetch CID content with hedged requests across the storage service and gateways.
+
+        Sources are tried fastest-first according to their latency EWMA.
+
+        Args:
+            client: HTTP client to use
+            cid: Content identifier to fetch
+
+        Returns:
+            The first response whose content matches the CID
+        """
+        sources = {"storage-service": f"{self.storage_service_url}/file/{cid}/contents"}
+        for template in settings.ipfs_gateway_list:
+            sources[template] = template.format(cid=cid)
+
+        tracker = get_gateway_tracker()
+        return await hedged_fetch(
+            client,
+            cid,
+            [(name, sources[name]) for name in tracker.order(list(sources))],
+            hedge_delay=settings.ipfs_gateway_hedge_delay,
+            timeout=settings.ipfs_gateway_timeout,
+            tracker=tracker
+        )
+
     async def retrieve_metadata(self, cid: str) -> Dict[str, Any]:
         """
         Retrieve metadata from IPFS by CID.
@@ -71,60 +158,56 @@ class IPFSService:
             Dict containing the metadata
         """
         try:
-            async with httpx.AsyncClient(timeout=90.0) as client:
-                try:
-                    # Try using the storage service URL first
-                    response = await client.get(f"{self.storage_service_url}/file/{cid}/contents")
-                    response.raise_for_status()
-                except httpx.HTTPStatusError as exc:
-                    # If the storage service fails, try using the specified IPFS gateways
-                    # Primary gateway: w3s.link
+            if settings.ipfs_cache_enabled:
+                from app.services.service_container import get_cid_cache
+                cached = await get_cid_cache().get(cid)
+                if cached is not None:
                     try:
-                        w3s_url = f"https://{cid}.ipfs.w3s.link"
-                        logger.info(f"Storage service failed, trying W3S gateway: {w3s_url}")
-                        response = await client.get(w3s_url)
-                        response.raise_for_status()
-                    except Exception as w3s_error:
-                        # Fallback gateway: dweb.link
-                        logger.info(f"W3S gateway failed: {str(w3s_error)}, trying dweb.link")
-                        dweb_url = f"https://{cid}.ipfs.dweb.link"
-                        try:
-                            response = await client.get(dweb_url)
-                            response.raise_for_status()
-                        except Exception as dweb_error:
-                            # If both gateways fail, re-raise the original exception
-                            logger.error(f"All IPFS gateways failed. Storage service error: {exc}, W3S error: {w3s_error}, Dweb error: {dweb_error}")
-                            raise exc
+                        metadata = json.loads(cached)
+                        logger.info(f"Retrieved metadata for CID {cid} from cache")
+                        return metadata
+                    except json.JSONDecodeError:
+                        # Verified but not JSON; let the recovery path below handle it
+                        pass
+
+            client = get_http_client()
+            if settings.ipfs_gateway_hedging:
+                response = await self._fetch_hedged(client, cid)
+            else:
+                response = await self._fetch_sequential(client, cid)
+
+            # Only content that hashes to the CID is kept, so corrupted responses are never cached
+            await self._cache_content(cid, response)
                 
-                # Try to parse as JSON
+            # Try to parse as JSON
+            try:
+                metadata = response.json()
+            except json.JSONDecodeError:
+                # If it's not valid JSON, try to handle it as text
+                text_content = response.text
                 try:
-                    metadata = response.json()
+                    metadata = json.loads(text_content)
                 except json.JSONDecodeError:
-                    # If it's not valid JSON, try to handle it as text
-                    text_content = response.text
-                    try:
-                        metadata = json.loads(text_content)
-                    except json.JSONDecodeError:
-                        # Try to fix common corruption patterns (e.g., trailing garbage)
-                        logger.warning(f"Retrieved content is not valid JSON: {text_content[:100]}...")
+                    # Try to fix common corruption patterns (e.g., trailing garbage)
+                    logger.warning(f"Retrieved content is not valid JSON: {text_content[:100]}...")
                         
-                        import re
-                        # Attempt to fix trailing garbage by removing extra characters after the final }
-                        fixed_content = re.sub(r'\}[^}]*\}*$', '}', text_content)
+                    import re
+                    # Attempt to fix trailing garbage by removing extra characters after the final }
+                    fixed_content = re.sub(r'\}[^}]*\}*$', '}', text_content)
                         
-                        try:
-                            metadata = json.loads(fixed_content)
-                            logger.info(f"Successfully recovered corrupted JSON for CID: {cid}")
-                        except json.JSONDecodeError:
-                            # If all else fails, use fallback but log the full content for debugging
-                            logger.error(f"Cannot recover corrupted JSON. Full content: {text_content}")
-                            metadata = {
-                                "critical_metadata": {"recovered_content": text_content[:500]},
-                                "retrieval_error": "Content is not valid JSON"
-                            }
+                    try:
+                        metadata = json.loads(fixed_content)
+                        logger.info(f"Successfully recovered corrupted JSON for CID: {cid}")
+                    except json.JSONDecodeError:
+                        # If all else fails, use fallback but log the full content for debugging
+                        logger.error(f"Cannot recover corrupted JSON. Full content: {text_content}")
+                        metadata = {
+                            "critical_metadata": {"recovered_content": text_content[:500]},
+                            "retrieval_error": "Content is not valid JSON"
+                        }
                 
-                logger.info(f"Successfully retrieved metadata from IPFS with CID: {cid}")
-                return metadata
+            logger.info(f"Successfully retrieved metadata from IPFS with CID: {cid}")
+            return metadata
 
         except httpx.HTTPError as exc:
             logger.error(f"HTTP error retrieving from IPFS: {str(exc)}")
@@ -152,12 +235,12 @@ class IPFSService:
                     ("files", (file.filename, file_content, file.content_type))
                 )
             
-            async with httpx.AsyncClient(timeout=90.0) as client:
-                response = await client.post(
-                    f"{self.storage_service_url}/upload",
-                    files=multipart_data
-                )
-                response.raise_for_status()
+            client = get_http_client()
+            response = await client.post(
+                f"{self.storage_service_url}/upload",
+                files=multipart_data
+            )
+            response.raise_for_status()
 
             result = response.json()
             logger.info(f"Successfully uploaded {len(files)} files to IPFS")
@@ -181,9 +264,9 @@ class IPFSService:
             Dict containing the URL information
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.storage_service_url}/file/{cid}")
-                response.raise_for_status()
+            client = get_http_client()
+            response = await client.get(f"{self.storage_service_url}/file/{cid}", timeout=5.0)
+            response.raise_for_status()
                 
             result = response.json()
             return result
@@ -207,9 +290,9 @@ class IPFSService:
             The file contents in the specified format
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.storage_service_url}/file/{cid}/contents")
-                response.raise_for_status()
+            client = get_http_client()
+            response = await client.get(f"{self.storage_service_url}/file/{cid}/contents", timeout=5.0)
+            response.raise_for_status()
                 
             if response_type == "json":
                 return response.json()
@@ -227,7 +310,11 @@ class IPFSService:
     
     async def compute_cid(self, metadata: Dict[str, Any]) -> str:
         """
-        Compute CID from given metadata by interacting with IPFS Node service.
+        Compute CID from given metadata.
+        
+        The CID is computed in-process with the same UnixFS encoding the storage
+        service uses, unless IPFS_LOCAL_CID is disabled, in which case the IPFS
+        Node service's /calculate-cid endpoint is used.
         
         Args:
             metadata: Metadata to compute CID for
@@ -241,31 +328,49 @@ class IPFSService:
         try:
             # Format the metadata using the consistent format_json utility
             formatted_metadata = format_json(metadata)
-            
-            # Create a file content for direct multipart upload
-            files = {
-                "file": ("metadata.json", formatted_metadata, "application/json")
-            }
-
-            async with httpx.AsyncClient(timeout=90.0) as client:
-                response = await client.post(
-                    f"{self.storage_service_url}/calculate-cid",
-                    files=files
-                )
-                response.raise_for_status()
 
-            result = response.json()
-            computed_cid = result.get("computed_cid")
+            if settings.ipfs_local_cid:
+                if len(formatted_metadata) > LOCAL_CID_INLINE_LIMIT:
+                    # Keep the event loop free while hashing large payloads
+                    return await asyncio.to_thread(compute_local_cid, formatted_metadata)
+                return compute_local_cid(formatted_metadata)
             
-            if not computed_cid:
-                raise ValueError("No CID returned from IPFS service")
-                
-            return computed_cid
+            return await self._compute_cid_remote(formatted_metadata)
 
         except Exception as e:
             logger.error(f"Error computing CID: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def _compute_cid_remote(self, formatted_metadata: bytes) -> str:
+        """
+        Compute CID by posting the formatted metadata to the IPFS Node service.
+        
+        Args:
+            formatted_metadata: Metadata already serialized with format_json
+            
+        Returns:
+            Computed CID string
+        """
+        # Create a file content for direct multipart upload
+        files = {
+            "file": ("metadata.json", formatted_metadata, "application/json")
+        }
+
+        client = get_http_client()
+        response = await client.post(
+            f"{self.storage_service_url}/calculate-cid",
+            files=files
+        )
+        response.raise_for_status()
+
+        result = response.json()
+        computed_cid = result.get("computed_cid")
+        
+        if not computed_cid:
+            raise ValueError("No CID returned from IPFS service")
+            
+        return computed_cid
+
     async def verify_cid(self, metadata: Dict[str, Any], provided_cid: str) -> bool:
         """
         Compares provided CID against computed CID from metadata.
@@ -0,0 +1,386 @@
+import asyncio
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from hexbytes import HexBytes
+from web3 import AsyncWeb3, Web3
+from web3.exceptions import TransactionNotFound
+
+from app.utilities.web3_utils import maybe_await
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Node error fragments meaning the nonce we used no longer matches the chain
+NONCE_ERRORS = ("nonce too low", "nonce too high", "invalid nonce", "invalid transaction nonce")
+# Node error fragments meaning the transaction was already accepted
+KNOWN_TX_ERRORS = ("already known", "known transaction")
+
+
+class TransactionReverted(Exception):
+    """A transaction was mined but reverted (receipt status 0)."""
+
+    def __init__(self, receipt: Any):
+        tx_hash = receipt["transactionHash"]
+        super().__init__(f"Transaction {tx_hash.hex() if hasattr(tx_hash, 'hex') else tx_hash} reverted")
+        self.receipt = receipt
+
+
+def _error_matches(error: Exception, fragments: Tuple[str, ...]) -> bool:
+    message = str(error).lower()
+    return any(fragment in message for fragment in fragments)
+
+
+class NonceManager:
+    """
+    Process-wide nonce allocator for a single sending wallet.
+
+    Nonces are handed out locally from a counter that is synced with the node's
+    `pending` transaction count on first use and whenever the node rejects a
+    nonce. Nonce assignment, signing and broadcasting happen under one lock so
+    transactions reach the node in nonce order and a failed send never leaves a
+    gap; receipt confirmation happens outside the lock, so many transactions can
+    be in flight at once.
+    """
+
+    def __init__(self, web3: Union[Web3, AsyncWeb3], address: str):
+        """
+        Initialize the nonce manager.
+
+        Args:
+            web3: Web3 client used to query the pending transaction count
+            address: Address of the sending wallet
+        """
+        self.web3 = web3
+        self.address = Web3.to_checksum_address(address)
+        self._next_nonce: Optional[int] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            # asyncio locks are bound to the loop they are first used in
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def _sync(self) -> int:
+        pending = await maybe_await(self.web3.eth.get_transaction_count(self.address, "pending"))
+        if self._next_nonce is not None and pending != self._next_nonce:
+            logger.warning(f"Nonce for {self.address} resynced from {self._next_nonce} to {pending}")
+        self._next_nonce = pending
+        return pending
+
+    async def resync(self) -> int:
+        """
+        Reset the local counter to the node's pending transaction count.
+
+        Returns:
+            The next nonce that will be allocated
+        """
+        async with self._get_lock():
+            return await self._sync()
+
+    async def _resync_after_error(self, nonce: int) -> None:
+        try:
+            if await self._sync() > nonce:
+                logger.warning(f"Send with nonce {nonce} failed for {self.address} but the node accepted it")
+        except Exception as e:
+            # Sync again on the next submit instead of reusing a nonce that may be taken
+            logger.warning(f"Could not resync nonce for {self.address}: {str(e)}")
+            self._next_nonce = None
+
+    async def submit(self, send: Callable[[int], Awaitable[T]]) -> T:
+        """
+        Allocate the next nonce and broadcast a transaction with it.
+
+        If the node rejects the nonce, the counter is resynced with `pending`
+        and the send is retried once. Any other error may have come after the
+        node accepted the transaction (a timeout on the response, say), so the
+        counter is resynced with `pending` rather than assuming the nonce is
+        still free.
+
+        Args:
+            send: Coroutine function that signs and broadcasts a transaction with the given nonce
+
+        Returns:
+            Whatever `send` returns
+
+        Raises:
+            Exception: Any error raised by `send`
+        """
+        async with self._get_lock():
+            if self._next_nonce is None:
+                await self._sync()
+
+            for attempt in range(2):
+                nonce = self._next_nonce
+                try:
+                    result = await send(nonce)
+                except Exception as e:
+                    if attempt == 0 and _error_matches(e, NONCE_ERRORS):
+                        logger.warning(f"Nonce {nonce} rejected for {self.address}: {str(e)}")
+                        await self._sync()
+                        continue
+                    await self._resync_after_error(nonce)
+                    raise
+                self._next_nonce = nonce + 1
+                return result
+
+
+# One manager per (endpoint, wallet) so every service instance shares the counter
+_nonce_managers: Dict[Tuple[Any, str], NonceManager] = {}
+
+
+def get_nonce_manager(web3: Union[Web3, AsyncWeb3], address: str) -> NonceManager:
+    """
+    Get the shared nonce manager for a wallet, creating it if needed.
+
+    Args:
+        web3: Web3 client for the chain the wallet sends on
+        address: Address of the sending wallet
+
+    Returns:
+        The shared NonceManager instance
+    """
+    endpoint = getattr(web3.provider, "endpoint_uri", None) or id(web3.provider)
+    key = (str(endpoint), Web3.to_checksum_address(address))
+    manager = _nonce_managers.get(key)
+    if manager is None:
+        manager = NonceManager(web3, address)
+        _nonce_managers[key] = manager
+    return manager
+
+
+@dataclass
+class SubmittedTransaction:
+    """A broadcast transaction and any replacements sent for the same nonce."""
+    nonce: int
+    tx: Dict[str, Any]
+    tx_hashes: List[HexBytes] = field(default_factory=list)
+
+    @property
+    def tx_hash(self) -> HexBytes:
+        return self.tx_hashes[-1]
+
+
+class TransactionSender:
+    """
+    Signs and sends transactions from a server wallet with pipelined submission.
+
+    `submit` returns as soon as the node accepts the transaction and
+    `wait_for_receipt` confirms it separately, replacing the transaction with a
+    higher gas price if it is not mined in time.
+    """
+
+    def __init__(
+        self,
+        web3: Union[Web3, AsyncWeb3],
+        address: str,
+        private_key: str,
+        nonce_manager: Optional[NonceManager] = None,
+        replace_after: float = 60.0,
+        max_replacements: int = 2,
+        gas_bump: float = 1.125,
+        poll_interval: float = 0.5
+    ):
+        """
+        Initialize the sender.
+
+        Args:
+            web3: Web3 client
+            address: Address of the sending wallet
+            private_key: Private key of the sending wallet
+            nonce_manager: Nonce manager to use, defaults to the shared one for the wallet
+            replace_after: Seconds to wait for a receipt before replacing the transaction
+            max_replacements: Maximum number of replacements before giving up
+            gas_bump: Gas price multiplier for replacements (nodes require at least 10%)
+            poll_interval: Seconds between receipt polls
+        """
+        self.web3 = web3
+        self.address = Web3.to_checksum_address(address)
+        self.private_key = private_key
+        self.nonce_manager = nonce_manager or get_nonce_manager(web3, address)
+        self.replace_after = replace_after
+        self.max_replacements = max_replacements
+        self.gas_bump = gas_bump
+        self.poll_interval = poll_interval
+
+    async def _sign_and_send(self, tx: Dict[str, Any]) -> HexBytes:
+        signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
+
+        # Different versions of Web3.py use different attribute names
+        if hasattr(signed_tx, 'rawTransaction'):
+            raw_tx = signed_tx.rawTransaction
+        elif hasattr(signed_tx, 'raw_transaction'):
+            raw_tx = signed_tx.raw_transaction
+        else:
+            raw_tx = bytes(signed_tx)
+
+        try:
+            return HexBytes(await maybe_await(self.web3.eth.send_raw_transaction(raw_tx)))
+        except Exception as e:
+            if _error_matches(e, KNOWN_TX_ERRORS):
+                return HexBytes(signed_tx.hash)
+            raise
+
+    async def submit(self, tx: Dict[str, Any]) -> SubmittedTransaction:
+        """
+        Assign a nonce to a transaction, sign it and broadcast it.
+
+        Args:
+            tx: Transaction fields without a nonce (from, to, data, gas, gasPrice, ...)
+
+        Returns:
+            The submitted transaction
+        """
+        tx = dict(tx)
+        tx.setdefault('from', self.address)
+        if 'gasPrice' not in tx and 'maxFeePerGas' not in tx:
+            tx['gasPrice'] = await maybe_await(self.web3.eth.gas_price)
+
+        async def send(nonce: int) -> SubmittedTransaction:
+            tx['nonce'] = nonce
+            tx_hash = await self._sign_and_send(tx)
+            return SubmittedTransaction(nonce=nonce, tx=tx, tx_hashes=[tx_hash])
+
+        return await self.nonce_manager.submit(send)
+
+    async def _find_receipt(self, tx_hashes: List[HexBytes]) -> Optional[Any]:
+        for tx_hash in tx_hashes:
+            try:
+                receipt = await maybe_await(self.web3.eth.get_transaction_receipt(tx_hash))
+            except TransactionNotFound:
+                receipt = None
+            if receipt is not None:
+                return receipt
+        return None
+
+    async def _poll_receipt(self, tx_hashes: List[HexBytes], timeout: float) -> Optional[Any]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            receipt = await self._find_receipt(tx_hashes)
+            if receipt is not None or loop.time() >= deadline:
+                return receipt
+            await asyncio.sleep(self.poll_interval)
+
+    async def _bump_fees(self, tx: Dict[str, Any]) -> Dict[str, Any]:
+        tx = dict(tx)
+        current_price = await maybe_await(self.web3.eth.gas_price)
+        if 'maxFeePerGas' in tx:
+            tx['maxFeePerGas'] = max(math.ceil(tx['maxFeePerGas'] * self.gas_bump), current_price)
+            tx['maxPriorityFeePerGas'] = math.ceil(tx['maxPriorityFeePerGas'] * self.gas_bump)
+        else:
+            tx['gasPrice'] = max(math.ceil(tx['gasPrice'] * self.gas_bump), current_price)
+        return tx
+
+    async def _replace(self, submitted: SubmittedTransaction) -> None:
+        tx = await self._bump_fees(submitted.tx)
+
+        try:
+            tx_hash = await self._sign_and_send(tx)
+        except Exception as e:
+            # The original may have been mined meanwhile; keep waiting on what we have
+            logger.warning(f"Failed to replace transaction with nonce {submitted.nonce}: {str(e)}")
+            return
+
+        submitted.tx = tx
+        submitted.tx_hashes.append(tx_hash)
+        logger.info(f"Replaced stuck transaction with nonce {submitted.nonce}: {tx_hash.hex()}")
+
+    async def _fill_gap(self, submitted: SubmittedTransaction) -> bool:
+        """
+        Send a zero-value transfer to ourselves with a nonce the node no longer has.
+
+        Transactions pipelined after a dropped one are queued behind its nonce
+        and would never be mined until something else takes it.
+
+        Args:
+            submitted: The dropped transaction
+
+        Returns:
+            True if the no-op was sent, False if the nonce was still pending or the send failed
+        """
+        pending = await maybe_await(self.web3.eth.get_transaction_count(self.address, "pending"))
+        if pending > submitted.nonce:
+            return False
+
+        fees = await self._bump_fees(submitted.tx)
+        noop = {
+            key: fees[key] for key in ('gasPrice', 'maxFeePerGas', 'maxPriorityFeePerGas', 'chainId') if key in fees
+        }
+        noop.update({'from': self.address, 'to': self.address, 'value': 0, 'gas': 21000, 'nonce': submitted.nonce})
+        try:
+            tx_hash = await self._sign_and_send(noop)
+        except Exception as e:
+            logger.warning(f"Failed to fill nonce gap at {submitted.nonce}: {str(e)}")
+            # The next submit takes the free nonce instead
+            await self.nonce_manager.resync()
+            return False
+
+        logger.warning(f"Transaction with nonce {submitted.nonce} was dropped; filled the gap with {tx_hash.hex()}")
+        return True
+
+    async def wait_for_receipt(self, submitted: SubmittedTransaction) -> Any:
+        """
+        Wait until a submitted transaction (or one of its replacements) is mined.
+
+        If it is still not mined after every replacement and the node no
+        longer holds a transaction with its nonce, the nonce is taken by a
+        no-op transfer so transactions sent after it are not stuck behind it.
+
+        Args:
+            submitted: Transaction returned by `submit`
+
+        Returns:
+            The transaction receipt
+
+        Raises:
+            TimeoutError: If no receipt is found after all replacements
+        """
+        for attempt in range(self.max_replacements + 1):
+            receipt = await self._poll_receipt(submitted.tx_hashes, self.replace_after)
+            if receipt is not None:
+                return receipt
+
+            mined_nonce = await maybe_await(self.web3.eth.get_transaction_count(self.address, "latest"))
+            if mined_nonce > submitted.nonce:
+                # Something with our nonce was mined; give the receipt a last chance to show up
+                receipt = await self._poll_receipt(submitted.tx_hashes, self.poll_interval)
+                if receipt is not None:
+                    return receipt
+                await self.nonce_manager.resync()
+                raise TimeoutError(f"Nonce {submitted.nonce} was consumed by another transaction")
+
+            if attempt < self.max_replacements:
+                await self._replace(submitted)
+
+        if await self._fill_gap(submitted):
+            raise TimeoutError(f"Transaction {submitted.tx_hash.hex()} was dropped before being mined")
+        raise TimeoutError(
+            f"Transaction {submitted.tx_hash.hex()} not mined after {self.max_replacements} replacements"
+        )
+
+    async def send(self, tx: Dict[str, Any]) -> Any:
+        """
+        Submit a transaction and wait for its receipt.
+
+        Args:
+            tx: Transaction fields without a nonce
+
+        Returns:
+            The receipt of the successful transaction
+
+        Raises:
+            TransactionReverted: If the transaction was mined but reverted
+        """
+        submitted = await self.submit(tx)
+        receipt = await self.wait_for_receipt(submitted)
+        if receipt["status"] == 0:
+            raise TransactionReverted(receipt)
+        return receipt
@@ -1,10 +1,22 @@
+import asyncio
+import json
 import time
 import logging
-from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, AsyncIterator, Union
 from dataclasses import dataclass, asdict
 
+import redis.asyncio as redis
+from app.utilities.redis_client import get_redis_client
+
 logger = logging.getLogger(__name__)
 
+# Redis hash per batch: metadata fields plus one `asset:{asset_id}` field per asset
+BATCH_KEY_PREFIX = "batch_progress:"
+ASSET_FIELD_PREFIX = "asset:"
+# Pub/sub channel per batch carrying progress events
+CHANNEL_PREFIX = "batch_progress_events:"
+
 @dataclass
 class AssetProgress:
     asset_id: str
@@ -13,23 +25,59 @@ class AssetProgress:
     ipfs_cid: Optional[str] = None
     error: Optional[str] = None
     updated_at: float = None
-    
+
     def __post_init__(self):
         if self.updated_at is None:
             self.updated_at = time.time()
 
+def _assets_event(batch_id: str, assets: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {"type": "assets", "batch_id": batch_id, "assets": assets}
+
+def _blockchain_event(batch_id: str, transaction_data: Dict[str, Any], pending_tx_id: str) -> Dict[str, Any]:
+    return {
+        "type": "blockchain_prepared",
+        "batch_id": batch_id,
+        "transaction_data": transaction_data,
+        "pending_tx_id": pending_tx_id
+    }
+
+def _finished_event(batch_id: str) -> Dict[str, Any]:
+    return {"type": "finished", "batch_id": batch_id}
+
 class BatchProgressTracker:
     """
     In-memory progress tracker for batch uploads.
-    In production, this could be replaced with Redis for persistence.
+
+    Only suitable for a single process: batches created by one worker are
+    invisible to the others. Use RedisBatchProgressTracker when running
+    several workers.
+
+    Progress events ({"type": "assets", ...}, {"type": "blockchain_prepared", ...}
+    and {"type": "finished", ...}) are delivered to subscribers of the batch as
+    they happen.
     """
-    
-    def __init__(self):
+
+    def __init__(self, batch_ttl: int = 3600):
+        """
+        Initialize the tracker.
+
+        Args:
+            batch_ttl: Seconds a batch is kept after creation
+        """
+        self.batch_ttl = batch_ttl
+        # Insertion order is creation order, which keeps cleanup_old_batches cheap
         self._batch_progress: Dict[str, Dict[str, AssetProgress]] = {}
         self._batch_metadata: Dict[str, Dict[str, Any]] = {}
-    
-    def create_batch(self, batch_id: str, asset_ids: list, total_assets: int) -> None:
+        self._subscribers: Dict[str, set] = {}
+
+    def _publish(self, batch_id: str, event: Dict[str, Any]) -> None:
+        for queue in self._subscribers.get(batch_id, ()):
+            queue.put_nowait(event)
+
+    async def create_batch(self, batch_id: str, asset_ids: list, total_assets: int) -> None:
         """Initialize progress tracking for a new batch."""
+        self.cleanup_old_batches(self.batch_ttl)
+
         self._batch_progress[batch_id] = {}
         self._batch_metadata[batch_id] = {
             "total_assets": total_assets,
@@ -38,9 +86,10 @@ class BatchProgressTracker:
             "created_at": time.time(),
             "blockchain_prepared": False,
             "transaction_data": None,
-            "pending_tx_id": None
+            "pending_tx_id": None,
+            "finished": False
         }
-        
+
         # Initialize all assets as pending
         for asset_id in asset_ids:
             self._batch_progress[batch_id][asset_id] = AssetProgress(
@@ -48,100 +97,435 @@ class BatchProgressTracker:
                 status="pending",
                 progress=0
             )
-        
+
         logger.info(f"Created batch progress tracking for {batch_id} with {total_assets} assets")
-    
-    def update_asset_progress(self, batch_id: str, asset_id: str, progress: int, status: str, 
+
+    def update_asset_progress(self, batch_id: str, asset_id: str, progress: int, status: str,
                             ipfs_cid: Optional[str] = None, error: Optional[str] = None) -> None:
-        """Update progress for a specific asset in a batch."""
+        """
+        Update progress for a specific asset in a batch.
+
+        Synchronous so it can be used directly as an upload progress callback.
+        """
         if batch_id not in self._batch_progress:
             logger.warning(f"Batch {batch_id} not found in progress tracker")
             return
-        
+
         if asset_id not in self._batch_progress[batch_id]:
             logger.warning(f"Asset {asset_id} not found in batch {batch_id}")
             return
-        
+
         # Update asset progress
         old_status = self._batch_progress[batch_id][asset_id].status
-        self._batch_progress[batch_id][asset_id] = AssetProgress(
+        asset_progress = AssetProgress(
             asset_id=asset_id,
             status=status,
             progress=progress,
             ipfs_cid=ipfs_cid,
             error=error
         )
-        
+        self._batch_progress[batch_id][asset_id] = asset_progress
+
         # Update batch metadata counters
         if old_status != "completed" and status == "completed":
             self._batch_metadata[batch_id]["completed_count"] += 1
         elif old_status != "error" and status == "error":
             self._batch_metadata[batch_id]["error_count"] += 1
-        
+
+        self._publish(batch_id, _assets_event(batch_id, {asset_id: asdict(asset_progress)}))
         logger.debug(f"Updated progress for {batch_id}/{asset_id}: {status} ({progress}%)")
-    
-    def set_blockchain_prepared(self, batch_id: str, transaction_data: Dict[str, Any], pending_tx_id: str) -> None:
+
+    async def set_blockchain_prepared(self, batch_id: str, transaction_data: Dict[str, Any], pending_tx_id: str) -> None:
         """Mark blockchain transaction as prepared and store transaction data."""
         if batch_id not in self._batch_metadata:
             logger.warning(f"Batch {batch_id} not found when setting blockchain data")
             return
-        
+
         self._batch_metadata[batch_id]["blockchain_prepared"] = True
         self._batch_metadata[batch_id]["transaction_data"] = transaction_data
         self._batch_metadata[batch_id]["pending_tx_id"] = pending_tx_id
-        
+
+        self._publish(batch_id, _blockchain_event(batch_id, transaction_data, pending_tx_id))
         logger.info(f"Blockchain transaction prepared for batch {batch_id}, pending_tx: {pending_tx_id}")
-    
-    def get_batch_progress(self, batch_id: str) -> Optional[Dict[str, Any]]:
+
+    async def finish_batch(self, batch_id: str) -> None:
+        """Mark background processing of a batch as done; no further updates will follow."""
+        if batch_id not in self._batch_metadata:
+            return
+
+        self._batch_metadata[batch_id]["finished"] = True
+        self._publish(batch_id, _finished_event(batch_id))
+
+    async def flush(self) -> None:
+        """Write out buffered updates. Updates are applied immediately in memory."""
+
+    async def get_batch_progress(self, batch_id: str) -> Optional[Dict[str, Any]]:
         """Get current progress for a batch."""
         if batch_id not in self._batch_progress:
             return None
-        
+
         # Convert AssetProgress objects to dictionaries
         assets_progress = {
-            asset_id: asdict(progress) 
+            asset_id: asdict(progress)
             for asset_id, progress in self._batch_progress[batch_id].items()
         }
-        
+
         return {
             "batch_id": batch_id,
             **self._batch_metadata[batch_id],
             "assets": assets_progress
         }
-    
-    def is_batch_complete(self, batch_id: str) -> bool:
+
+    async def is_batch_complete(self, batch_id: str) -> bool:
         """Check if all assets in a batch are completed or errored."""
         if batch_id not in self._batch_progress:
             return False
-        
+
         total = self._batch_metadata[batch_id]["total_assets"]
         completed = self._batch_metadata[batch_id]["completed_count"]
         errors = self._batch_metadata[batch_id]["error_count"]
-        
+
         return (completed + errors) >= total
-    
-    def cleanup_batch(self, batch_id: str, max_age_seconds: int = 3600) -> None:
+
+    @asynccontextmanager
+    async def subscribe(self, batch_id: str) -> AsyncIterator[AsyncIterator[Dict[str, Any]]]:
+        """
+        Subscribe to progress events for a batch.
+
+        The subscription is active once the context is entered, so a snapshot
+        read inside the block misses no events.
+
+        Args:
+            batch_id: Batch to follow
+
+        Yields:
+            Async iterator of progress events
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(batch_id, set()).add(queue)
+
+        async def events():
+            while True:
+                yield await queue.get()
+
+        try:
+            yield events()
+        finally:
+            subscribers = self._subscribers.get(batch_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[batch_id]
+
+    async def cleanup_batch(self, batch_id: str) -> None:
         """Remove batch progress data (call after completion or timeout)."""
-        if batch_id in self._batch_progress:
-            del self._batch_progress[batch_id]
-        if batch_id in self._batch_metadata:
-            del self._batch_metadata[batch_id]
+        self._batch_progress.pop(batch_id, None)
+        self._batch_metadata.pop(batch_id, None)
         logger.info(f"Cleaned up progress tracking for batch {batch_id}")
-    
+
     def cleanup_old_batches(self, max_age_seconds: int = 3600) -> None:
-        """Clean up old batch progress data."""
-        current_time = time.time()
+        """
+        Clean up old batch progress data.
+
+        Batches are stored in creation order, so this stops at the first
+        batch that is still young instead of scanning every batch.
+        """
+        cutoff = time.time() - max_age_seconds
         expired_batches = []
-        
+
         for batch_id, metadata in self._batch_metadata.items():
-            if current_time - metadata["created_at"] > max_age_seconds:
-                expired_batches.append(batch_id)
-        
+            if metadata["created_at"] > cutoff:
+                break
+            expired_batches.append(batch_id)
+
         for batch_id in expired_batches:
-            self.cleanup_batch(batch_id)
-        
+            self._batch_progress.pop(batch_id, None)
+            self._batch_metadata.pop(batch_id, None)
+
         if expired_batches:
             logger.info(f"Cleaned up {len(expired_batches)} expired batches")
 
-# Global instance
-progress_tracker = BatchProgressTracker()
\ No newline at end of file
+    async def close(self) -> None:
+        """Release resources. Nothing to do for the in-memory tracker."""
+
+class RedisBatchProgressTracker:
+    """
+    Redis-backed progress tracker shared by every worker.
+
+    Each batch is a Redis hash that expires `batch_ttl` seconds after
+    creation, so no cleanup scan is needed. Asset updates from the upload
+    progress callback are buffered, coalesced per asset and written every
+    `flush_interval` seconds in one pipeline, which also publishes them on
+    the batch's pub/sub channel so any worker can stream them.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        batch_ttl: int = 3600,
+        flush_interval: float = 0.1
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            redis_client: Optional asyncio Redis client. If None, the shared client is used.
+            batch_ttl: Seconds a batch is kept after creation
+            flush_interval: Seconds to buffer asset updates before writing them
+        """
+        self._redis_client = redis_client
+        self.batch_ttl = batch_ttl
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[str, AssetProgress]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @property
+    def redis(self) -> redis.Redis:
+        """The injected client, or the shared client for the running event loop."""
+        return self._redis_client or get_redis_client()
+
+    @staticmethod
+    def _batch_key(batch_id: str) -> str:
+        return f"{BATCH_KEY_PREFIX}{batch_id}"
+
+    @staticmethod
+    def _channel(batch_id: str) -> str:
+        return f"{CHANNEL_PREFIX}{batch_id}"
+
+    async def create_batch(self, batch_id: str, asset_ids: list, total_assets: int) -> None:
+        """Initialize progress tracking for a new batch."""
+        fields = {
+            "total_assets": json.dumps(total_assets),
+            "created_at": json.dumps(time.time()),
+            "blockchain_prepared": json.dumps(False),
+            "transaction_data": json.dumps(None),
+            "pending_tx_id": json.dumps(None),
+            "finished": json.dumps(False),
+            # Keeps the asset listing in upload order
+            "asset_ids": json.dumps(list(asset_ids))
+        }
+        for asset_id in asset_ids:
+            pending = AssetProgress(asset_id=asset_id, status="pending", progress=0)
+            fields[f"{ASSET_FIELD_PREFIX}{asset_id}"] = json.dumps(asdict(pending))
+
+        key = self._batch_key(batch_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, self.batch_ttl)
+            await pipe.execute()
+
+        logger.info(f"Created batch progress tracking for {batch_id} with {total_assets} assets")
+
+    def update_asset_progress(self, batch_id: str, asset_id: str, progress: int, status: str,
+                            ipfs_cid: Optional[str] = None, error: Optional[str] = None) -> None:
+        """
+        Buffer a progress update for a specific asset in a batch.
+
+        Synchronous so it can be used directly as an upload progress callback.
+        Only the latest update per asset is kept until the next flush.
+        """
+        self._pending.setdefault(batch_id, {})[asset_id] = AssetProgress(
+            asset_id=asset_id,
+            status=status,
+            progress=progress,
+            ipfs_cid=ipfs_cid,
+            error=error
+        )
+
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+            except RuntimeError:
+                # No loop to flush on; the update goes out with the next flush
+                logger.debug(f"Buffered progress for {batch_id}/{asset_id} outside an event loop")
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write buffered asset updates and publish them, in one round trip."""
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for batch_id, updates in pending.items():
+                    key = self._batch_key(batch_id)
+                    assets = {asset_id: asdict(update) for asset_id, update in updates.items()}
+                    pipe.hset(key, mapping={
+                        f"{ASSET_FIELD_PREFIX}{asset_id}": json.dumps(data)
+                        for asset_id, data in assets.items()
+                    })
+                    # Never leave a batch without a TTL if it expired meanwhile
+                    pipe.expire(key, self.batch_ttl, nx=True)
+                    pipe.publish(self._channel(batch_id), json.dumps(_assets_event(batch_id, assets)))
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Error flushing batch progress: {str(e)}")
+            # Put the updates back unless newer ones have arrived since
+            for batch_id, updates in pending.items():
+                buffered = self._pending.setdefault(batch_id, {})
+                for asset_id, update in updates.items():
+                    buffered.setdefault(asset_id, update)
+
+    async def set_blockchain_prepared(self, batch_id: str, transaction_data: Dict[str, Any], pending_tx_id: str) -> None:
+        """Mark blockchain transaction as prepared and store transaction data."""
+        # Asset updates buffered before this point must not arrive after it
+        await self.flush()
+
+        key = self._batch_key(batch_id)
+        if not await self.redis.exists(key):
+            logger.warning(f"Batch {batch_id} not found when setting blockchain data")
+            return
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                "blockchain_prepared": json.dumps(True),
+                "transaction_data": json.dumps(transaction_data, default=str),
+                "pending_tx_id": json.dumps(pending_tx_id)
+            })
+            pipe.publish(
+                self._channel(batch_id),
+                json.dumps(_blockchain_event(batch_id, transaction_data, pending_tx_id), default=str)
+            )
+            await pipe.execute()
+
+        logger.info(f"Blockchain transaction prepared for batch {batch_id}, pending_tx: {pending_tx_id}")
+
+    async def finish_batch(self, batch_id: str) -> None:
+        """Mark background processing of a batch as done; no further updates will follow."""
+        await self.flush()
+
+        key = self._batch_key(batch_id)
+        if not await self.redis.exists(key):
+            return
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={"finished": json.dumps(True)})
+            pipe.publish(self._channel(batch_id), json.dumps(_finished_event(batch_id)))
+            await pipe.execute()
+
+    async def get_batch_progress(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Get current progress for a batch."""
+        # Let this worker read its own buffered writes
+        if batch_id in self._pending:
+            await self.flush()
+
+        fields = await self.redis.hgetall(self._batch_key(batch_id))
+        if "total_assets" not in fields:
+            return None
+
+        assets: Dict[str, Dict[str, Any]] = {}
+        for asset_id in json.loads(fields.get("asset_ids", "[]")):
+            data = fields.get(f"{ASSET_FIELD_PREFIX}{asset_id}")
+            if data:
+                assets[asset_id] = json.loads(data)
+
+        statuses = [asset["status"] for asset in assets.values()]
+        return {
+            "batch_id": batch_id,
+            "total_assets": json.loads(fields["total_assets"]),
+            "completed_count": statuses.count("completed"),
+            "error_count": statuses.count("error"),
+            "created_at": json.loads(fields["created_at"]),
+            "blockchain_prepared": json.loads(fields["blockchain_prepared"]),
+            "transaction_data": json.loads(fields["transaction_data"]),
+            "pending_tx_id": json.loads(fields["pending_tx_id"]),
+            "finished": json.loads(fields.get("finished", "false")),
+            "assets": assets
+        }
+
+    async def is_batch_complete(self, batch_id: str) -> bool:
+        """Check if all assets in a batch are completed or errored."""
+        batch = await self.get_batch_progress(batch_id)
+        if batch is None:
+            return False
+        return (batch["completed_count"] + batch["error_count"]) >= batch["total_assets"]
+
+    @asynccontextmanager
+    async def subscribe(self, batch_id: str) -> AsyncIterator[AsyncIterator[Dict[str, Any]]]:
+        """
+        Subscribe to progress events for a batch, published by any worker.
+
+        The subscription is active once the context is entered, so a snapshot
+        read inside the block misses no events.
+
+        Args:
+            batch_id: Batch to follow
+
+        Yields:
+            Async iterator of progress events
+        """
+        channel = self._channel(batch_id)
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(channel)
+
+        async def events():
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    yield json.loads(message["data"])
+
+        try:
+            yield events()
+        finally:
+            try:
+                await pubsub.unsubscribe(channel)
+                await pubsub.aclose()
+            except Exception as e:
+                logger.error(f"Error closing progress subscription for {batch_id}: {str(e)}")
+
+    async def cleanup_batch(self, batch_id: str) -> None:
+        """Remove batch progress data (call after completion or timeout)."""
+        self._pending.pop(batch_id, None)
+        await self.redis.delete(self._batch_key(batch_id))
+        logger.info(f"Cleaned up progress tracking for batch {batch_id}")
+
+    def cleanup_old_batches(self, max_age_seconds: int = 3600) -> None:
+        """No-op: Redis expires batches on its own."""
+
+    async def close(self) -> None:
+        """Flush buffered updates. Call on application shutdown."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+        await self.flush()
+
+ProgressTracker = Union[BatchProgressTracker, RedisBatchProgressTracker]
+
+_progress_tracker: Optional[ProgressTracker] = None
+
+def get_progress_tracker() -> ProgressTracker:
+    """
+    Get the shared progress tracker for the configured PROGRESS_BACKEND.
+
+    Returns:
+        BatchProgressTracker for "memory" (the default), RedisBatchProgressTracker for "redis"
+    """
+    global _progress_tracker
+    if _progress_tracker is None:
+        from app.config import settings
+
+        backend = settings.progress_backend.lower()
+        if backend == "redis":
+            _progress_tracker = RedisBatchProgressTracker(
+                batch_ttl=settings.progress_batch_ttl,
+                flush_interval=settings.progress_flush_interval
+            )
+        else:
+            if backend != "memory":
+                logger.warning(f"Unknown PROGRESS_BACKEND '{settings.progress_backend}', using memory")
+            _progress_tracker = BatchProgressTracker(batch_ttl=settings.progress_batch_ttl)
+        logger.info(f"Batch progress tracker initialized with {type(_progress_tracker).__name__}")
+    return _progress_tracker
+
+async def close_progress_tracker() -> None:
+    """Flush and release the shared progress tracker. Call on application shutdown."""
+    global _progress_tracker
+    if _progress_tracker is not None:
+        try:
+            await _progress_tracker.close()
+        except Exception as e:
+            logger.error(f"Error closing progress tracker: {str(e)}")
+        _progress_tracker = None
@@ -0,0 +1,313 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.services.blockchain_service import BlockchainService
+from app.services.delegation_cache import DelegationCache, DelegationEventWatcher
+from app.services.event_indexer import ChainEventIndexer, create_chain_event_indexer
+from app.services.ipfs_service import IPFSService
+from app.services.session_cache import SessionCache
+from app.services.transaction_state_service import TransactionStateService
+from app.services.verification_cache import VerificationCache
+from app.services.write_batcher import BlockchainWriteBatcher
+from app.utilities.cid_cache import CIDCache
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """
+    Process-wide holder for the services and caches shared across requests.
+
+    Building a BlockchainService parses the contract ABI and, with the synchronous
+    provider, pings the RPC endpoint; doing that per request added a round trip to
+    every call. The container builds each service once on first use and checks
+    RPC connectivity from a background task instead. When delegation caching is
+    on, it also runs the watcher that invalidates cached delegations on
+    DelegateStatusChanged events, and when enabled, the chain event indexer,
+    whose IPFSUpdated events invalidate cached retrieve verifications.
+    """
+
+    def __init__(
+        self,
+        health_check_interval: float = 30.0,
+        delegation_poll_interval: Optional[float] = None,
+        index_events: bool = False
+    ):
+        """
+        Initialize the container.
+
+        Args:
+            health_check_interval: Seconds between blockchain connectivity probes
+            delegation_poll_interval: Seconds between DelegateStatusChanged polls,
+                or None to not watch delegation events
+            index_events: Whether to run the chain event indexer
+        """
+        self.health_check_interval = health_check_interval
+        self.delegation_poll_interval = delegation_poll_interval
+        self.index_events = index_events
+        self._delegation_watcher: Optional[DelegationEventWatcher] = None
+        self._event_indexer: Optional[ChainEventIndexer] = None
+        self._blockchain_service: Optional[BlockchainService] = None
+        self._ipfs_service: Optional[IPFSService] = None
+        self._transaction_state_service: Optional[TransactionStateService] = None
+        self._verification_cache: Optional[VerificationCache] = None
+        self._delegation_cache: Optional[DelegationCache] = None
+        self._session_cache: Optional[SessionCache] = None
+        self._cid_cache: Optional[CIDCache] = None
+        self._write_batcher: Optional[BlockchainWriteBatcher] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._blockchain_connected: Optional[bool] = None
+        self._last_checked: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+
+    @property
+    def blockchain_service(self) -> BlockchainService:
+        """The shared BlockchainService; construction errors propagate and are retried on next use."""
+        if self._blockchain_service is None:
+            self._blockchain_service = BlockchainService()
+        return self._blockchain_service
+
+    @property
+    def ipfs_service(self) -> IPFSService:
+        """The shared IPFSService."""
+        if self._ipfs_service is None:
+            self._ipfs_service = IPFSService()
+        return self._ipfs_service
+
+    @property
+    def transaction_state_service(self) -> TransactionStateService:
+        """The shared TransactionStateService."""
+        if self._transaction_state_service is None:
+            self._transaction_state_service = TransactionStateService()
+        return self._transaction_state_service
+
+    @property
+    def verification_cache(self) -> Optional[VerificationCache]:
+        """The shared VerificationCache, or None when VERIFICATION_CACHE_ENABLED is false."""
+        if not settings.verification_cache_enabled:
+            return None
+        if self._verification_cache is None:
+            self._verification_cache = VerificationCache(
+                max_age=settings.verification_cache_max_age,
+                max_entries=settings.verification_cache_max_entries
+            )
+        return self._verification_cache
+
+    @property
+    def delegation_cache(self) -> Optional[DelegationCache]:
+        """The shared DelegationCache, or None when DELEGATION_CACHE_ENABLED is false."""
+        if not settings.delegation_cache_enabled:
+            return None
+        if self._delegation_cache is None:
+            self._delegation_cache = DelegationCache(
+                ttl=settings.delegation_cache_ttl,
+                max_entries=settings.delegation_cache_max_entries
+            )
+        return self._delegation_cache
+
+    @property
+    def session_cache(self) -> Optional[SessionCache]:
+        """The shared SessionCache, or None when SESSION_CACHE_ENABLED is false."""
+        if not settings.session_cache_enabled:
+            return None
+        if self._session_cache is None:
+            self._session_cache = SessionCache(
+                ttl=settings.session_cache_ttl,
+                max_entries=settings.session_cache_max_entries,
+                negative_ttl=settings.session_cache_negative_ttl,
+                redis_ttl=settings.session_cache_redis_ttl if settings.session_cache_redis else None
+            )
+        return self._session_cache
+
+    @property
+    def cid_cache(self) -> CIDCache:
+        """The shared CIDCache for IPFS metadata."""
+        if self._cid_cache is None:
+            self._cid_cache = CIDCache(
+                max_memory_bytes=settings.ipfs_cache_memory_bytes,
+                disk_dir=settings.ipfs_cache_dir
+            )
+        return self._cid_cache
+
+    @property
+    def write_batcher(self) -> BlockchainWriteBatcher:
+        """The shared BlockchainWriteBatcher for server-signed writes."""
+        if self._write_batcher is None:
+            self._write_batcher = BlockchainWriteBatcher(
+                window=settings.blockchain_write_batch_window,
+                max_batch_size=settings.blockchain_write_batch_max_size
+            )
+        return self._write_batcher
+
+    async def check_health(self) -> bool:
+        """
+        Probe blockchain RPC connectivity and record the result.
+
+        Returns:
+            True if the RPC endpoint responded, False otherwise
+        """
+        try:
+            connected = await self.blockchain_service.is_connected()
+            self._last_error = None if connected else "RPC endpoint did not respond"
+        except Exception as e:
+            connected = False
+            self._last_error = str(e)
+
+        if connected != self._blockchain_connected:
+            if connected:
+                logger.info("Blockchain RPC endpoint is reachable")
+            else:
+                logger.warning(f"Blockchain RPC endpoint is unreachable: {self._last_error}")
+
+        self._blockchain_connected = connected
+        self._last_checked = datetime.now(timezone.utc)
+        return connected
+
+    async def _health_loop(self) -> None:
+        while True:
+            await self.check_health()
+            await asyncio.sleep(self.health_check_interval)
+
+    def start(self) -> None:
+        """Start the background health probe, event indexer and delegation watcher if they are not already running."""
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_loop())
+
+        if self.index_events:
+            if self._event_indexer is None:
+                try:
+                    self._event_indexer = create_chain_event_indexer(self.blockchain_service)
+                except Exception as e:
+                    logger.error(f"Chain event indexer not started: {str(e)}")
+                else:
+                    verification_cache = self.verification_cache
+                    if verification_cache is not None:
+                        self._event_indexer.add_listener(verification_cache.invalidate_events)
+            if self._event_indexer is not None:
+                self._event_indexer.start()
+
+        cache = self.delegation_cache
+        if self.delegation_poll_interval is not None and cache is not None:
+            if self._delegation_watcher is None:
+                try:
+                    self._delegation_watcher = DelegationEventWatcher(
+                        self.blockchain_service, cache, poll_interval=self.delegation_poll_interval
+                    )
+                except Exception as e:
+                    logger.error(f"Delegation event watcher not started: {str(e)}")
+                    return
+            self._delegation_watcher.start()
+
+    @property
+    def delegation_watcher(self) -> Optional[DelegationEventWatcher]:
+        """The delegation event watcher, once started."""
+        return self._delegation_watcher
+
+    @property
+    def event_indexer(self) -> Optional[ChainEventIndexer]:
+        """The chain event indexer, once started."""
+        return self._event_indexer
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Get the result of the most recent health probe.
+
+        Returns:
+            Dict with blockchain_connected (None before the first probe),
+            last_checked and last_error
+        """
+        return {
+            "blockchain_connected": self._blockchain_connected,
+            "last_checked": self._last_checked.isoformat() if self._last_checked else None,
+            "last_error": self._last_error
+        }
+
+    async def close(self) -> None:
+        """Flush the write batcher, then stop the health probe, the event indexer and the delegation watcher."""
+        if self._write_batcher is not None:
+            await self._write_batcher.close()
+            self._write_batcher = None
+        if self._delegation_watcher is not None:
+            await self._delegation_watcher.close()
+            self._delegation_watcher = None
+        if self._event_indexer is not None:
+            await self._event_indexer.close()
+            self._event_indexer = None
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+
+_service_container: Optional[ServiceContainer] = None
+
+
+def get_service_container() -> ServiceContainer:
+    """
+    Get the process-wide service container, creating it from settings if needed.
+
+    Returns:
+        The shared ServiceContainer instance
+    """
+    global _service_container
+    if _service_container is None:
+        _service_container = ServiceContainer(
+            health_check_interval=settings.blockchain_health_check_interval,
+            delegation_poll_interval=settings.delegation_event_poll_interval,
+            index_events=settings.event_indexer_enabled
+        )
+    return _service_container
+
+
+async def close_service_container() -> None:
+    """Close and drop the process-wide service container."""
+    global _service_container
+    if _service_container is not None:
+        await _service_container.close()
+        _service_container = None
+
+
+def get_blockchain_service() -> BlockchainService:
+    """Dependency to get the shared blockchain service."""
+    return get_service_container().blockchain_service
+
+
+def get_ipfs_service() -> IPFSService:
+    """Dependency to get the shared IPFS service."""
+    return get_service_container().ipfs_service
+
+
+def get_transaction_state_service() -> TransactionStateService:
+    """Dependency to get the shared transaction state service."""
+    return get_service_container().transaction_state_service
+
+
+def get_delegation_cache() -> Optional[DelegationCache]:
+    """Dependency to get the shared delegation cache, or None when it is off."""
+    return get_service_container().delegation_cache
+
+
+def get_session_cache() -> Optional[SessionCache]:
+    """Dependency to get the shared session cache, or None when it is off."""
+    return get_service_container().session_cache
+
+
+def get_cid_cache() -> CIDCache:
+    """Dependency to get the shared CID cache."""
+    return get_service_container().cid_cache
+
+
+def get_write_batcher() -> BlockchainWriteBatcher:
+    """Dependency to get the shared write batcher."""
+    return get_service_container().write_batcher
+
+
+def get_verification_cache() -> Optional[VerificationCache]:
+    """Dependency to get the shared verification cache, or None when it is off."""
+    return get_service_container().verification_cache
@@ -0,0 +1,261 @@
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import redis.asyncio as redis
+
+from app.utilities.redis_client import get_redis_client
+from app.utilities.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+SESSION_KEY_PREFIX = "session_cache:"
+# Stored in place of a session after logout or extension; fills never overwrite it
+INVALIDATED_MARKER = "invalidated"
+# Session IDs are secrets.token_hex(32); anything else cannot exist
+SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _encode(session: Dict[str, Any]) -> str:
+    def default(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return {"$date": value.isoformat()}
+        return str(value)
+    return json.dumps(session, default=default)
+
+
+def _decode(data: str) -> Dict[str, Any]:
+    def object_hook(value: Dict[str, Any]) -> Any:
+        if len(value) == 1 and "$date" in value:
+            return datetime.fromisoformat(value["$date"])
+        return value
+    return json.loads(data, object_hook=object_hook)
+
+
+def _expiry_timestamp(session: Dict[str, Any]) -> Optional[float]:
+    expires_at = session.get("expiresAt")
+    if not isinstance(expires_at, datetime):
+        return None
+    if expires_at.tzinfo is None:
+        # MongoDB returns naive UTC datetimes
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at.timestamp()
+
+
+class SessionCache:
+    """
+    Two-tier cache of active wallet sessions keyed by session ID.
+
+    The first tier is an in-process LRU with a short TTL. The optional second
+    tier is Redis, shared by every worker. No entry outlives the session's
+    own expiresAt. IDs that are malformed are rejected without a lookup, and
+    IDs MongoDB does not know are remembered for `negative_ttl` seconds in a
+    separate in-process LRU, so repeated bad cookies cost nothing and random
+    guesses cannot evict real sessions.
+
+    invalidate() drops a session from both tiers and stores a marker in
+    Redis that fills never overwrite, so a lookup racing a logout cannot put
+    the old session back. Other workers' in-process entries are not reached
+    and stay usable for up to `ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 5.0,
+        max_entries: int = 10000,
+        negative_ttl: float = 30.0,
+        max_negative_entries: int = 10000,
+        redis_ttl: Optional[int] = None,
+        redis_client: Optional[redis.Redis] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a session stays in the in-process tier
+            max_entries: Upper bound on sessions held in process; least recently used are evicted
+            negative_ttl: Seconds an unknown session ID is remembered
+            max_negative_entries: Upper bound on unknown session IDs remembered
+            redis_ttl: Seconds a session stays in Redis, or None to not use Redis
+            redis_client: Optional asyncio Redis client. If None, the shared client is used.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self.max_negative_entries = max_negative_entries
+        self.redis_ttl = redis_ttl
+        self._redis_client = redis_client
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._unknown: "OrderedDict[str, float]" = OrderedDict()
+        self._flights: SingleFlight[Optional[Dict[str, Any]]] = SingleFlight()
+        self._epoch = 0
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.negative_hits = 0
+        self.rejected = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.redis_errors = 0
+
+    @property
+    def redis(self) -> redis.Redis:
+        """Client for the session tier shared by every worker, when redis_ttl is set."""
+        return self._redis_client or get_redis_client()
+
+    @staticmethod
+    def _redis_key(session_id: str) -> str:
+        return f"{SESSION_KEY_PREFIX}{session_id}"
+
+    def _remember(self, session_id: str, session: Dict[str, Any]) -> None:
+        expires_at = time.monotonic() + self.ttl
+        session_expiry = _expiry_timestamp(session)
+        if session_expiry is not None:
+            expires_at = min(expires_at, time.monotonic() + session_expiry - time.time())
+        self._entries[session_id] = (dict(session), expires_at)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _remember_unknown(self, session_id: str) -> None:
+        self._unknown[session_id] = time.monotonic() + self.negative_ttl
+        self._unknown.move_to_end(session_id)
+        while len(self._unknown) > self.max_negative_entries:
+            self._unknown.popitem(last=False)
+
+    def _lookup_memory(self, session_id: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        now = time.monotonic()
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            session, expires_at = entry
+            if expires_at > now:
+                self._entries.move_to_end(session_id)
+                self.memory_hits += 1
+                # Callers get their own copy to annotate
+                return True, dict(session)
+            del self._entries[session_id]
+        unknown_until = self._unknown.get(session_id)
+        if unknown_until is not None:
+            if unknown_until > now:
+                self.negative_hits += 1
+                return True, None
+            del self._unknown[session_id]
+        return False, None
+
+    async def _lookup_redis(self, session_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            data = await self.redis.get(self._redis_key(session_id))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Session cache Redis read failed, using MongoDB: {str(e)}")
+            return None
+        if not data or data == INVALIDATED_MARKER:
+            return None
+        session = _decode(data)
+        session_expiry = _expiry_timestamp(session)
+        if session_expiry is not None and session_expiry <= time.time():
+            return None
+        self.redis_hits += 1
+        return session
+
+    async def _store_redis(self, session_id: str, session: Dict[str, Any]) -> None:
+        ttl = self.redis_ttl
+        session_expiry = _expiry_timestamp(session)
+        if session_expiry is not None:
+            ttl = min(ttl, int(session_expiry - time.time()))
+        if ttl <= 0:
+            return
+        try:
+            # nx: an invalidation marker or a fresher fill wins
+            await self.redis.set(self._redis_key(session_id), _encode(session), ex=ttl, nx=True)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Session cache Redis write failed: {str(e)}")
+
+    async def get_or_load(
+        self,
+        session_id: str,
+        loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the active session, loading it with `loader` on a miss.
+
+        Args:
+            session_id: The session ID from the request cookie
+            loader: Coroutine function returning the active session from MongoDB, or None.
+                Errors propagate and are not cached.
+
+        Returns:
+            The session document, or None if the session is unknown, inactive or expired
+        """
+        if not SESSION_ID_PATTERN.match(session_id):
+            self.rejected += 1
+            return None
+
+        found, session = self._lookup_memory(session_id)
+        if found:
+            return session
+
+        async def load() -> Optional[Dict[str, Any]]:
+            epoch = self._epoch
+            session = await self._lookup_redis(session_id) if self.redis_ttl else None
+            from_redis = session is not None
+            if session is None:
+                self.misses += 1
+                session = await loader()
+            if epoch == self._epoch:
+                if session is None:
+                    self._remember_unknown(session_id)
+                else:
+                    self._remember(session_id, session)
+                    if self.redis_ttl and not from_redis:
+                        await self._store_redis(session_id, session)
+            return session
+
+        session = await self._flights.run(session_id, load)
+        # Callers get their own copy to annotate
+        return dict(session) if session is not None else None
+
+    async def invalidate(self, session_id: str) -> None:
+        """
+        Drop a session that was logged out or changed from every tier.
+
+        Args:
+            session_id: The session ID
+        """
+        self._epoch += 1
+        self.invalidations += 1
+        self._entries.pop(session_id, None)
+        self._unknown.pop(session_id, None)
+        if self.redis_ttl:
+            try:
+                await self.redis.set(self._redis_key(session_id), INVALIDATED_MARKER, ex=self.redis_ttl)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Session cache Redis invalidation failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with hit/miss counters, hit rate and size
+        """
+        hits = self.memory_hits + self.redis_hits + self.negative_hits + self.rejected
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "negative_hits": self.negative_hits,
+            "rejected": self.rejected,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "coalesced": self._flights.coalesced,
+            "invalidations": self.invalidations,
+            "redis_errors": self.redis_errors,
+            "entries": len(self._entries),
+            "unknown_entries": len(self._unknown),
+        }
@@ -1,14 +1,16 @@
-from typing import Dict, Any, Optional
-from web3 import Web3
+from typing import Dict, Any, Optional, Union
+from web3 import Web3, AsyncWeb3
 from eth_utils import to_checksum_address
 import logging
 
+from app.utilities.web3_utils import maybe_await
+
 logger = logging.getLogger(__name__)
 
 class TransactionBuilderService:
     """Service for building unsigned blockchain transactions."""
     
-    def __init__(self, web3: Web3, contract):
+    def __init__(self, web3: Union[Web3, AsyncWeb3], contract):
         self.web3 = web3
         self.contract = contract
     
@@ -33,11 +35,12 @@ class TransactionBuilderService:
         """
         try:
             from_address = to_checksum_address(from_address)
-            nonce = self.web3.eth.get_transaction_count(from_address)
-            gas_price = self.web3.eth.gas_price
+            nonce = await maybe_await(self.web3.eth.get_transaction_count(from_address))
+            gas_price = await maybe_await(self.web3.eth.gas_price)
+            chain_id = await maybe_await(self.web3.eth.chain_id)
             
             # Build transaction
-            tx = self.contract.functions.updateIPFS(
+            tx = await maybe_await(self.contract.functions.updateIPFS(
                 asset_id,
                 cid
             ).build_transaction({
@@ -45,8 +48,8 @@ class TransactionBuilderService:
                 'nonce': nonce,
                 'gasPrice': gas_price,
                 'gas': gas_limit or 2000000,
-                'chainId': self.web3.eth.chain_id
-            })
+                'chainId': chain_id
+            }))
             
             # Remove fields that will be added during signing
             tx.pop('maxFeePerGas', None)
@@ -93,11 +96,12 @@ class TransactionBuilderService:
         try:
             from_address = to_checksum_address(from_address)
             owner_address = to_checksum_address(owner_address)
-            nonce = self.web3.eth.get_transaction_count(from_address)
-            gas_price = self.web3.eth.gas_price
+            nonce = await maybe_await(self.web3.eth.get_transaction_count(from_address))
+            gas_price = await maybe_await(self.web3.eth.gas_price)
+            chain_id = await maybe_await(self.web3.eth.chain_id)
             
             # Build transaction
-            tx = self.contract.functions.updateIPFSFor(
+            tx = await maybe_await(self.contract.functions.updateIPFSFor(
                 owner_address,
                 asset_id,
                 cid
@@ -106,8 +110,8 @@ class TransactionBuilderService:
                 'nonce': nonce,
                 'gasPrice': gas_price,
                 'gas': gas_limit or 2000000,
-                'chainId': self.web3.eth.chain_id
-            })
+                'chainId': chain_id
+            }))
             
             # Remove fields that will be added during signing
             tx.pop('maxFeePerGas', None)
@@ -149,17 +153,18 @@ class TransactionBuilderService:
         """
         try:
             from_address = to_checksum_address(from_address)
-            nonce = self.web3.eth.get_transaction_count(from_address)
-            gas_price = self.web3.eth.gas_price
+            nonce = await maybe_await(self.web3.eth.get_transaction_count(from_address))
+            gas_price = await maybe_await(self.web3.eth.gas_price)
+            chain_id = await maybe_await(self.web3.eth.chain_id)
             
             # Build transaction
-            tx = self.contract.functions.deleteAsset(asset_id).build_transaction({
+            tx = await maybe_await(self.contract.functions.deleteAsset(asset_id).build_transaction({
                 'from': from_address,
                 'nonce': nonce,
                 'gasPrice': gas_price,
                 'gas': gas_limit or 2000000,
-                'chainId': self.web3.eth.chain_id
-            })
+                'chainId': chain_id
+            }))
             
             # Remove fields that will be added during signing
             tx.pop('maxFeePerGas', None)
@@ -204,11 +209,12 @@ class TransactionBuilderService:
         try:
             from_address = to_checksum_address(from_address)
             owner_address = to_checksum_address(owner_address)
-            nonce = self.web3.eth.get_transaction_count(from_address)
-            gas_price = self.web3.eth.gas_price
+            nonce = await maybe_await(self.web3.eth.get_transaction_count(from_address))
+            gas_price = await maybe_await(self.web3.eth.gas_price)
+            chain_id = await maybe_await(self.web3.eth.chain_id)
             
             # Build transaction
-            tx = self.contract.functions.deleteAssetFor(
+            tx = await maybe_await(self.contract.functions.deleteAssetFor(
                 owner_address,
                 asset_id
             ).build_transaction({
@@ -216,8 +222,8 @@ class TransactionBuilderService:
                 'nonce': nonce,
                 'gasPrice': gas_price,
                 'gas': gas_limit or 2000000,
-                'chainId': self.web3.eth.chain_id
-            })
+                'chainId': chain_id
+            }))
             
             # Remove fields that will be added during signing
             tx.pop('maxFeePerGas', None)
@@ -261,30 +267,30 @@ class TransactionBuilderService:
             from_address = to_checksum_address(from_address)
             
             if function_name == "updateIPFS":
-                gas_estimate = self.contract.functions.updateIPFS(
+                gas_estimate = await maybe_await(self.contract.functions.updateIPFS(
                     kwargs['asset_id'],
                     kwargs['cid']
-                ).estimate_gas({'from': from_address})
+                ).estimate_gas({'from': from_address}))
                 
             elif function_name == "updateIPFSFor":
                 owner_address = to_checksum_address(kwargs['owner_address'])
-                gas_estimate = self.contract.functions.updateIPFSFor(
+                gas_estimate = await maybe_await(self.contract.functions.updateIPFSFor(
                     owner_address,
                     kwargs['asset_id'],
                     kwargs['cid']
-                ).estimate_gas({'from': from_address})
+                ).estimate_gas({'from': from_address}))
                 
             elif function_name == "deleteAsset":
-                gas_estimate = self.contract.functions.deleteAsset(
+                gas_estimate = await maybe_await(self.contract.functions.deleteAsset(
                     kwargs['asset_id']
-                ).estimate_gas({'from': from_address})
+                ).estimate_gas({'from': from_address}))
                 
             elif function_name == "deleteAssetFor":
                 owner_address = to_checksum_address(kwargs['owner_address'])
-                gas_estimate = self.contract.functions.deleteAssetFor(
+                gas_estimate = await maybe_await(self.contract.functions.deleteAssetFor(
                     owner_address,
                     kwargs['asset_id']
-                ).estimate_gas({'from': from_address})
+                ).estimate_gas({'from': from_address}))
                 
             elif function_name == "batchDeleteAssets":
                 asset_ids = kwargs['asset_ids']
@@ -292,9 +298,9 @@ class TransactionBuilderService:
                     raise ValueError("Must provide at least one asset ID")
                 if len(asset_ids) > 50:
                     raise ValueError("Batch size cannot exceed 50 assets")
-                gas_estimate = self.contract.functions.batchDeleteAssets(
+                gas_estimate = await maybe_await(self.contract.functions.batchDeleteAssets(
                     asset_ids
-                ).estimate_gas({'from': from_address})
+                ).estimate_gas({'from': from_address}))
                 
             elif function_name == "batchDeleteAssetsFor":
                 owner_address = to_checksum_address(kwargs['owner_address'])
@@ -303,15 +309,15 @@ class TransactionBuilderService:
                     raise ValueError("Must provide at least one asset ID")
                 if len(asset_ids) > 50:
                     raise ValueError("Batch size cannot exceed 50 assets")
-                gas_estimate = self.contract.functions.batchDeleteAssetsFor(
+                gas_estimate = await maybe_await(self.contract.functions.batchDeleteAssetsFor(
                     owner_address,
                     asset_ids
-                ).estimate_gas({'from': from_address})
+                ).estimate_gas({'from': from_address}))
                 
             else:
                 raise ValueError(f"Unknown function: {function_name}")
             
-            gas_price = self.web3.eth.gas_price
+            gas_price = await maybe_await(self.web3.eth.gas_price)
             estimated_cost = gas_estimate * gas_price
             
             logger.info(f"Gas estimation for {function_name}: {gas_estimate} gas")
@@ -362,7 +368,7 @@ class TransactionBuilderService:
             # Estimate gas if not provided
             if not gas_limit:
                 try:
-                    gas_limit = function.estimate_gas({'from': from_address})
+                    gas_limit = await maybe_await(function.estimate_gas({'from': from_address}))
                     # Add 10% buffer
                     gas_limit = int(gas_limit * 1.1)
                 except Exception as e:
@@ -370,18 +376,19 @@ class TransactionBuilderService:
                     gas_limit = 150000
             
             # Get current gas price
-            gas_price = self.web3.eth.gas_price
+            gas_price = await maybe_await(self.web3.eth.gas_price)
+            chain_id = await maybe_await(self.web3.eth.chain_id)
             
             # Build transaction
-            nonce = self.web3.eth.get_transaction_count(from_address)
+            nonce = await maybe_await(self.web3.eth.get_transaction_count(from_address))
             
-            transaction = function.build_transaction({
+            transaction = await maybe_await(function.build_transaction({
                 'from': from_address,
                 'nonce': nonce,
                 'gas': gas_limit,
                 'gasPrice': gas_price,
-                'chainId': self.web3.eth.chain_id
-            })
+                'chainId': chain_id
+            }))
             
             # Remove 'from' field as it's not needed for signing
             transaction.pop('from', None)
@@ -431,8 +438,9 @@ class TransactionBuilderService:
                 raise ValueError("Batch size cannot exceed 50 assets")
             
             from_address = to_checksum_address(from_address)
-            nonce = self.web3.eth.get_transaction_count(from_address)
-            gas_price = self.web3.eth.gas_price
+            nonce = await maybe_await(self.web3.eth.get_transaction_count(from_address))
+            gas_price = await maybe_await(self.web3.eth.gas_price)
+            chain_id = await maybe_await(self.web3.eth.chain_id)
             
             # Build transaction
             contract_function = self.contract.functions.batchDeleteAssets(asset_ids)
@@ -440,23 +448,23 @@ class TransactionBuilderService:
             # Estimate gas if not provided
             if not gas_limit:
                 try:
-                    gas_limit = contract_function.estimate_gas({
+                    gas_limit = await maybe_await(contract_function.estimate_gas({
                         'from': from_address,
                         'gasPrice': gas_price
-                    })
+                    }))
                     # Add 20% buffer
                     gas_limit = int(gas_limit * 1.2)
                 except Exception as e:
                     logger.warning(f"Gas estimation failed, using default: {e}")
                     gas_limit = 2000000
             
-            tx = contract_function.build_transaction({
+            tx = await maybe_await(contract_function.build_transaction({
                 'from': from_address,
                 'nonce': nonce,
                 'gasPrice': gas_price,
                 'gas': gas_limit,
-                'chainId': self.web3.eth.chain_id
-            })
+                'chainId': chain_id
+            }))
             
             # Remove fields that will be added during signing
             tx.pop('maxFeePerGas', None)
@@ -508,8 +516,9 @@ class TransactionBuilderService:
             
             from_address = to_checksum_address(from_address)
             owner_address = to_checksum_address(owner_address)
-            nonce = self.web3.eth.get_transaction_count(from_address)
-            gas_price = self.web3.eth.gas_price
+            nonce = await maybe_await(self.web3.eth.get_transaction_count(from_address))
+            gas_price = await maybe_await(self.web3.eth.gas_price)
+            chain_id = await maybe_await(self.web3.eth.chain_id)
             
             # Build transaction
             contract_function = self.contract.functions.batchDeleteAssetsFor(
@@ -520,23 +529,23 @@ class TransactionBuilderService:
             # Estimate gas if not provided
             if not gas_limit:
                 try:
-                    gas_limit = contract_function.estimate_gas({
+                    gas_limit = await maybe_await(contract_function.estimate_gas({
                         'from': from_address,
                         'gasPrice': gas_price
-                    })
+                    }))
                     # Add 20% buffer
                     gas_limit = int(gas_limit * 1.2)
                 except Exception as e:
                     logger.warning(f"Gas estimation failed, using default: {e}")
                     gas_limit = 2000000
             
-            tx = contract_function.build_transaction({
+            tx = await maybe_await(contract_function.build_transaction({
                 'from': from_address,
                 'nonce': nonce,
                 'gasPrice': gas_price,
                 'gas': gas_limit,
-                'chainId': self.web3.eth.chain_id
-            })
+                'chainId': chain_id
+            }))
             
             # Remove fields that will be added during signing
             tx.pop('maxFeePerGas', None)
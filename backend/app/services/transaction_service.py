@@ -89,13 +89,11 @@ class TransactionService:
             # Normalize wallet address for case-insensitive matching
             normalized_address = wallet_address.lower()
             
-            # Build query with case insensitivity - include both owned assets and delegated actions
+            # Match the normalized fields exactly - include both owned assets and delegated actions
             query = {
                 "$or": [
-                    {"walletAddress": normalized_address},
-                    {"walletAddress": {"$regex": f"^{normalized_address}$", "$options": "i"}},
-                    {"performedBy": normalized_address},
-                    {"performedBy": {"$regex": f"^{normalized_address}$", "$options": "i"}}
+                    {"walletAddressLower": normalized_address},
+                    {"performedByLower": normalized_address}
                 ]
             }
             
@@ -180,7 +178,9 @@ class TransactionService:
                 "assetId": asset_id,
                 "action": action,
                 "walletAddress": wallet_address,
+                "walletAddressLower": wallet_address.lower(),
                 "performedBy": performed_by,
+                "performedByLower": performed_by.lower() if performed_by else None,
                 "timestamp": datetime.now(timezone.utc)
             }
             
@@ -197,6 +197,28 @@ class TransactionService:
             logger.error(f"Error recording transaction: {str(e)}")
             raise
             
+    async def migrate_address_fields(self, batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Backfill walletAddressLower/performedByLower on transactions recorded before those fields existed.
+        
+        Args:
+            batch_size: Number of documents updated per round trip
+            
+        Returns:
+            Migration summary
+        """
+        try:
+            migrated = await self.transaction_repository.backfill_lowercase_fields(
+                {"walletAddress": "walletAddressLower", "performedBy": "performedByLower"},
+                batch_size=batch_size
+            )
+            logger.info(f"Backfilled lowercase address fields on {migrated} transactions")
+            return {"status": "completed", "migrated": migrated}
+            
+        except Exception as e:
+            logger.error(f"Error migrating transaction address fields: {str(e)}")
+            raise
+            
     async def get_transaction_by_id(self, transaction_id: str) -> Optional[Dict[str, Any]]:
         """
         Get details for a specific transaction.
@@ -240,7 +262,7 @@ class TransactionService:
         try:
             # Get all transactions for the wallet
             transactions = await self.transaction_repository.find_transactions(
-                {"walletAddress": wallet_address}
+                {"walletAddressLower": wallet_address.lower()}
             )
             
             # Initialize default values
@@ -1,39 +1,105 @@
 from typing import Dict, Any, Optional, List
 import json
+import math
+import time
 import uuid
 import logging
 from datetime import datetime, timezone, timedelta
-import redis
-from app.config import settings
+import redis.asyncio as redis
+from app.utilities.redis_client import get_redis_client
 
 logger = logging.getLogger(__name__)
 
+# Sorted sets of pending transaction IDs scored by expiry time (unix seconds):
+# one per user for listings, one global for stats and cleanup
+USER_INDEX_PREFIX = "pending_tx_index:"
+ALL_INDEX_KEY = "pending_tx_index:all"
+
+# Maximum number of keys fetched per MGET
+MGET_BATCH_SIZE = 500
+
 class TransactionStateService:
     """
     Manages pending transactions waiting for user signatures.
     Uses Redis for temporary storage with TTL expiration.
+
+    Transaction data lives under `pending_tx:{user}:{uuid}` keys. Sorted-set
+    indexes of those keys are maintained on store and remove so listings,
+    stats and cleanup never have to scan the keyspace.
     """
-    
+
     def __init__(self, redis_client: Optional[redis.Redis] = None):
         """
         Initialize the transaction state service.
-        
+
         Args:
-            redis_client: Optional Redis client. If None, will create from settings.
+            redis_client: Optional asyncio Redis client. If None, the shared client is used.
         """
-        if redis_client:
-            self.redis = redis_client
-        else:
-            # Create Redis client from settings
-            if hasattr(settings, 'redis_url') and settings.redis_url:
-                self.redis = redis.from_url(settings.redis_url)
-            else:
-                # Fallback to local Redis
-                self.redis = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
-        
+        self._redis_client = redis_client
+
         # Default TTL for pending transactions (5 minutes)
         self.default_ttl = 300
-    
+
+    @property
+    def redis(self) -> redis.Redis:
+        """Client holding the pending transactions and their per-user and global indexes."""
+        return self._redis_client or get_redis_client()
+
+    @staticmethod
+    def _user_index_key(user_address: str) -> str:
+        return f"{USER_INDEX_PREFIX}{user_address.lower()}"
+
+    @staticmethod
+    def _user_from_tx_id(tx_id: str) -> Optional[str]:
+        parts = tx_id.split(":")
+        return parts[1] if len(parts) == 3 and parts[0] == "pending_tx" else None
+
+    def _index(self, pipe, tx_id: str, user_address: str, ttl: int) -> None:
+        """
+        Queue index updates for a transaction that expires in `ttl` seconds.
+
+        Args:
+            pipe: Redis pipeline to queue the commands on
+            tx_id: Transaction ID
+            user_address: Owner of the transaction
+            ttl: Seconds until the transaction expires
+        """
+        now = time.time()
+        expires_at = now + ttl
+        user_index = self._user_index_key(user_address)
+        for index in (user_index, ALL_INDEX_KEY):
+            pipe.zadd(index, {tx_id: expires_at})
+            pipe.zremrangebyscore(index, "-inf", now)
+        # The user index lives as long as its longest-lived member
+        pipe.expireat(user_index, math.ceil(expires_at), nx=True)
+        pipe.expireat(user_index, math.ceil(expires_at), gt=True)
+
+    async def _mget_json(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fetch and decode JSON values for many keys with batched MGETs.
+
+        Args:
+            keys: Keys to fetch
+
+        Returns:
+            Decoded values in key order; None for missing or invalid entries
+        """
+        values = []
+        for start in range(0, len(keys), MGET_BATCH_SIZE):
+            values.extend(await self.redis.mget(keys[start:start + MGET_BATCH_SIZE]))
+
+        decoded = []
+        for key, value in zip(keys, values):
+            if value is None:
+                decoded.append(None)
+                continue
+            try:
+                decoded.append(json.loads(value))
+            except (json.JSONDecodeError, TypeError):
+                logger.warning(f"Invalid JSON data for key {key}")
+                decoded.append(None)
+        return decoded
+
     async def store_pending_transaction(
         self,
         user_address: str,
@@ -42,19 +108,19 @@ class TransactionStateService:
     ) -> str:
         """
         Store pending transaction data temporarily.
-        
+
         Args:
             user_address: The wallet address of the user
             transaction_data: Transaction data to store
             ttl: Time to live in seconds (default: 5 minutes)
-            
+
         Returns:
             Transaction ID for retrieval
         """
         try:
             # Generate unique transaction ID
             tx_id = f"pending_tx:{user_address.lower()}:{uuid.uuid4()}"
-            
+
             # Add metadata to transaction data
             enhanced_data = {
                 **transaction_data,
@@ -62,35 +128,34 @@ class TransactionStateService:
                 "created_at": datetime.now(timezone.utc).isoformat(),
                 "tx_id": tx_id
             }
-            
-            # Store in Redis with TTL
+
+            # Store in Redis with TTL and index it, in one round trip
             ttl_seconds = ttl or self.default_ttl
-            self.redis.setex(
-                tx_id,
-                ttl_seconds,
-                json.dumps(enhanced_data, default=str)
-            )
-            
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.set(tx_id, json.dumps(enhanced_data, default=str), ex=ttl_seconds)
+                self._index(pipe, tx_id, user_address, ttl_seconds)
+                await pipe.execute()
+
             logger.info(f"Stored pending transaction {tx_id} for user {user_address} with TTL {ttl_seconds}s")
-            
+
             return tx_id
-            
+
         except Exception as e:
             logger.error(f"Error storing pending transaction: {str(e)}")
             raise
-    
+
     async def get_pending_transaction(self, tx_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve pending transaction data.
-        
+
         Args:
             tx_id: Transaction ID to retrieve
-            
+
         Returns:
             Transaction data if found, None otherwise
         """
         try:
-            data = self.redis.get(tx_id)
+            data = await self.redis.get(tx_id)
             if data:
                 parsed_data = json.loads(data)
                 logger.info(f"Retrieved pending transaction {tx_id}")
@@ -98,11 +163,11 @@ class TransactionStateService:
             else:
                 logger.warning(f"Pending transaction {tx_id} not found or expired")
                 return None
-                
+
         except Exception as e:
             logger.error(f"Error retrieving pending transaction {tx_id}: {str(e)}")
             return None
-    
+
     async def update_pending_transaction(
         self,
         tx_id: str,
@@ -111,12 +176,12 @@ class TransactionStateService:
     ) -> bool:
         """
         Update existing pending transaction data.
-        
+
         Args:
             tx_id: Transaction ID to update
             update_data: Data to merge with existing data
             extend_ttl: Optional new TTL in seconds
-            
+
         Returns:
             True if updated successfully, False otherwise
         """
@@ -125,178 +190,170 @@ class TransactionStateService:
             existing_data = await self.get_pending_transaction(tx_id)
             if not existing_data:
                 return False
-            
+
             # Merge with update data
             updated_data = {
                 **existing_data,
                 **update_data,
                 "updated_at": datetime.now(timezone.utc).isoformat()
             }
-            
-            # Update in Redis
+            payload = json.dumps(updated_data, default=str)
+
+            # Update in Redis; XX leaves a transaction that expired meanwhile deleted
             if extend_ttl:
-                self.redis.setex(
-                    tx_id,
-                    extend_ttl,
-                    json.dumps(updated_data, default=str)
-                )
+                user_address = existing_data.get("user_address") or self._user_from_tx_id(tx_id)
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.set(tx_id, payload, ex=extend_ttl, xx=True)
+                    if user_address:
+                        self._index(pipe, tx_id, user_address, extend_ttl)
+                    results = await pipe.execute()
+                updated = bool(results[0])
             else:
                 # Keep existing TTL
-                current_ttl = self.redis.ttl(tx_id)
-                if current_ttl > 0:
-                    self.redis.setex(
-                        tx_id,
-                        current_ttl,
-                        json.dumps(updated_data, default=str)
-                    )
-                else:
-                    # TTL expired or not set, use default
-                    self.redis.setex(
-                        tx_id,
-                        self.default_ttl,
-                        json.dumps(updated_data, default=str)
-                    )
-            
+                updated = bool(await self.redis.set(tx_id, payload, keepttl=True, xx=True))
+
+            if not updated:
+                logger.warning(f"Pending transaction {tx_id} expired before it could be updated")
+                return False
+
             logger.info(f"Updated pending transaction {tx_id}")
             return True
-            
+
         except Exception as e:
             logger.error(f"Error updating pending transaction {tx_id}: {str(e)}")
             return False
-    
+
     async def remove_pending_transaction(self, tx_id: str) -> bool:
         """
         Remove a pending transaction from storage.
-        
+
         Args:
             tx_id: Transaction ID to remove
-            
+
         Returns:
             True if removed, False if not found
         """
         try:
-            result = self.redis.delete(tx_id)
-            if result:
+            user_address = self._user_from_tx_id(tx_id)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(tx_id)
+                pipe.zrem(ALL_INDEX_KEY, tx_id)
+                if user_address:
+                    pipe.zrem(self._user_index_key(user_address), tx_id)
+                results = await pipe.execute()
+
+            if results[0]:
                 logger.info(f"Removed pending transaction {tx_id}")
                 return True
             else:
                 logger.warning(f"Pending transaction {tx_id} not found for removal")
                 return False
-                
+
         except Exception as e:
             logger.error(f"Error removing pending transaction {tx_id}: {str(e)}")
             return False
-    
+
     async def get_user_pending_transactions(self, user_address: str) -> List[Dict[str, Any]]:
         """
         Get all pending transactions for a user.
-        
+
         Args:
             user_address: The wallet address of the user
-            
+
         Returns:
             List of pending transactions
         """
         try:
-            # Search for all transactions for this user
-            pattern = f"pending_tx:{user_address.lower()}:*"
-            keys = self.redis.keys(pattern)
-            
-            transactions = []
-            for key in keys:
-                data = self.redis.get(key)
-                if data:
-                    try:
-                        parsed_data = json.loads(data)
-                        transactions.append(parsed_data)
-                    except json.JSONDecodeError:
-                        logger.warning(f"Invalid JSON data for key {key}")
-                        continue
-            
+            # Drop expired entries and read the live ones from the user's index
+            user_index = self._user_index_key(user_address)
+            now = time.time()
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.zremrangebyscore(user_index, "-inf", now)
+                pipe.zrangebyscore(user_index, now, "+inf")
+                _, tx_ids = await pipe.execute()
+
+            transactions = [data for data in await self._mget_json(tx_ids) if data]
+
             logger.info(f"Found {len(transactions)} pending transactions for user {user_address}")
             return transactions
-            
+
         except Exception as e:
             logger.error(f"Error getting user pending transactions: {str(e)}")
             return []
-    
+
     async def cleanup_expired_transactions(self) -> int:
         """
         Clean up expired transactions (Redis should handle this automatically, but this is a manual cleanup).
-        
+
+        Removes index entries whose transactions have expired, and deletes
+        transactions that are invalid or older than 10 minutes (double the default TTL).
+
         Returns:
             Number of transactions cleaned up
         """
         try:
-            # Get all pending transaction keys
-            pattern = "pending_tx:*"
-            keys = self.redis.keys(pattern)
-            
-            cleaned_count = 0
-            for key in keys:
-                # Check if key exists and has valid data
-                if not self.redis.exists(key):
-                    cleaned_count += 1
-                    continue
-                
+            now = time.time()
+
+            # Entries past their expiry: Redis has already dropped the data keys
+            expired_ids = await self.redis.zrangebyscore(ALL_INDEX_KEY, "-inf", now)
+
+            # Live entries that are invalid or unexpectedly old
+            live_ids = await self.redis.zrangebyscore(ALL_INDEX_KEY, now, "+inf")
+            stale_ids = []
+            for tx_id, data in zip(live_ids, await self._mget_json(live_ids)):
                 try:
-                    data = self.redis.get(key)
-                    if not data:
-                        self.redis.delete(key)
-                        cleaned_count += 1
-                        continue
-                    
-                    parsed_data = json.loads(data)
-                    created_at = datetime.fromisoformat(parsed_data.get("created_at", ""))
-                    
-                    # Check if older than 10 minutes (double the default TTL)
-                    if datetime.now(timezone.utc) - created_at > timedelta(minutes=10):
-                        self.redis.delete(key)
-                        cleaned_count += 1
-                        
-                except (json.JSONDecodeError, ValueError, TypeError):
-                    # Invalid data, remove it
-                    self.redis.delete(key)
-                    cleaned_count += 1
-            
+                    created_at = datetime.fromisoformat(data.get("created_at", "")) if data else None
+                except (ValueError, TypeError):
+                    created_at = None
+                if created_at is None or datetime.now(timezone.utc) - created_at > timedelta(minutes=10):
+                    stale_ids.append(tx_id)
+
+            removed_ids = expired_ids + stale_ids
+            if removed_ids:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    if stale_ids:
+                        pipe.delete(*stale_ids)
+                    pipe.zrem(ALL_INDEX_KEY, *removed_ids)
+                    for tx_id in removed_ids:
+                        user_address = self._user_from_tx_id(tx_id)
+                        if user_address:
+                            pipe.zrem(self._user_index_key(user_address), tx_id)
+                    await pipe.execute()
+
+            cleaned_count = len(removed_ids)
             if cleaned_count > 0:
                 logger.info(f"Cleaned up {cleaned_count} expired/invalid pending transactions")
-            
+
             return cleaned_count
-            
+
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
             return 0
-    
+
     async def get_transaction_stats(self) -> Dict[str, Any]:
         """
         Get statistics about pending transactions.
-        
+
         Returns:
             Dictionary with transaction statistics
         """
         try:
-            pattern = "pending_tx:*"
-            keys = self.redis.keys(pattern)
-            
-            total_count = len(keys)
+            tx_ids = await self.redis.zrangebyscore(ALL_INDEX_KEY, time.time(), "+inf")
+
+            total_count = 0
             user_counts = {}
             action_counts = {}
-            
-            for key in keys:
-                try:
-                    data = self.redis.get(key)
-                    if data:
-                        parsed_data = json.loads(data)
-                        user_address = parsed_data.get("user_address", "unknown")
-                        action = parsed_data.get("action", "unknown")
-                        
-                        user_counts[user_address] = user_counts.get(user_address, 0) + 1
-                        action_counts[action] = action_counts.get(action, 0) + 1
-                        
-                except (json.JSONDecodeError, TypeError):
+
+            for parsed_data in await self._mget_json(tx_ids):
+                if not parsed_data:
                     continue
-            
+                total_count += 1
+                user_address = parsed_data.get("user_address", "unknown")
+                action = parsed_data.get("action", "unknown")
+
+                user_counts[user_address] = user_counts.get(user_address, 0) + 1
+                action_counts[action] = action_counts.get(action, 0) + 1
+
             return {
                 "total_pending": total_count,
                 "unique_users": len(user_counts),
@@ -304,7 +361,7 @@ class TransactionStateService:
                 "action_distribution": action_counts,
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
-            
+
         except Exception as e:
             logger.error(f"Error getting transaction stats: {str(e)}")
             return {
@@ -313,4 +370,4 @@ class TransactionStateService:
                 "user_distribution": {},
                 "action_distribution": {},
                 "error": str(e)
-            }
\ No newline at end of file
+            }
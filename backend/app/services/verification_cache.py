@@ -0,0 +1,255 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from web3 import Web3
+
+from app.schemas.retrieve_schema import MetadataVerificationResult
+
+logger = logging.getLogger(__name__)
+
+# Registry events after which an asset's cached verifications no longer describe the chain
+INVALIDATING_EVENTS = ("IPFSUpdated", "AssetDeleted")
+
+
+class VerificationCache:
+    """
+    Cache of successful retrieve verifications keyed by asset version and state.
+
+    An entry is found by asset ID and version number and only used if the
+    document still has the ipfsHash, ipfsVersion, lastUpdated, owner,
+    transaction hash, deletion flag and critical metadata it was verified
+    with, so a document changed behind the application's back (tampering
+    included) is always verified again. On-chain state is covered by
+    invalidation: writes through AssetService and indexed IPFSUpdated or
+    AssetDeleted events drop every entry of the asset, and entries older than
+    the caller's staleness bound are not used. A verification that was in
+    flight when its asset was invalidated is not stored.
+
+    The cache and its invalidation are per process: a write through another
+    worker, or an event indexed by another worker, does not reach it, so
+    max_age is what bounds staleness in multi-worker deployments.
+    """
+
+    def __init__(self, max_age: float = 30.0, max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            max_age: Seconds an entry can be used at most
+            max_entries: Upper bound on cached assets; least recently used are evicted
+        """
+        self.max_age = max_age
+        self.max_entries = max_entries
+        # asset ID -> version number -> (state fingerprint, result, monotonic time stored)
+        self._entries: "OrderedDict[str, Dict[int, Tuple[str, MetadataVerificationResult, float]]]" = OrderedDict()
+        # keccak256 of the asset ID, as events carry it, -> asset ID
+        self._asset_ids_by_hash: Dict[str, str] = {}
+        # Invalidation counters of recently invalidated assets; the global
+        # counter moves on clear() and when a per-asset counter is dropped
+        self._asset_epochs: "OrderedDict[str, int]" = OrderedDict()
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.changed = 0
+        self.invalidations = 0
+        self.discarded_fills = 0
+
+    @staticmethod
+    def _normalize_hash(asset_id_hash: str) -> str:
+        asset_id_hash = asset_id_hash.lower()
+        return asset_id_hash[2:] if asset_id_hash.startswith("0x") else asset_id_hash
+
+    @staticmethod
+    def fingerprint(document: Dict[str, Any]) -> str:
+        """
+        Digest of the document fields a verification depends on.
+
+        Args:
+            document: Asset document from MongoDB
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        state = {
+            "ipfsHash": document.get("ipfsHash"),
+            "ipfsVersion": document.get("ipfsVersion", document.get("versionNumber", 1)),
+            "lastUpdated": document.get("lastUpdated"),
+            "walletAddress": (document.get("walletAddress") or "").lower(),
+            "smartContractTxId": document.get("smartContractTxId"),
+            "isDeleted": document.get("isDeleted", False),
+            "isCurrent": document.get("isCurrent", False),
+            "criticalMetadata": document.get("criticalMetadata", {}),
+        }
+        encoded = json.dumps(state, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def epoch(self, asset_id: str) -> Tuple[int, int]:
+        """
+        Invalidation counter to take before verifying an asset and pass to put().
+
+        Args:
+            asset_id: The asset's unique identifier
+
+        Returns:
+            Opaque counter value
+        """
+        return self._epoch, self._asset_epochs.get(asset_id, 0)
+
+    def get(
+        self,
+        asset_id: str,
+        document: Dict[str, Any],
+        max_age: Optional[float] = None
+    ) -> Optional[Tuple[MetadataVerificationResult, float]]:
+        """
+        Look up the verification of a document.
+
+        Args:
+            asset_id: The asset's unique identifier
+            document: The asset document being retrieved
+            max_age: Oldest entry in seconds the caller accepts; capped at the cache's max_age
+
+        Returns:
+            A copy of the cached result and its age in seconds, or None on a miss
+        """
+        limit = self.max_age if max_age is None else min(max_age, self.max_age)
+        versions = self._entries.get(asset_id)
+        entry = versions.get(document.get("versionNumber", 1)) if versions else None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        fingerprint, result, stored_at = entry
+        age = time.monotonic() - stored_at
+        if fingerprint != self.fingerprint(document):
+            self.changed += 1
+            self.misses += 1
+            return None
+        if age > limit:
+            if age > self.max_age:
+                del versions[document.get("versionNumber", 1)]
+            self.expired += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(asset_id)
+        self.hits += 1
+        return result.model_copy(), age
+
+    def put(
+        self,
+        asset_id: str,
+        document: Dict[str, Any],
+        result: MetadataVerificationResult,
+        epoch: Optional[Tuple[int, int]] = None
+    ) -> bool:
+        """
+        Store a successful verification.
+
+        Args:
+            asset_id: The asset's unique identifier
+            document: The asset document that was verified
+            result: The verification result; only verified results are stored
+            epoch: Value of epoch(asset_id) taken before verifying; the result
+                is not stored if the asset was invalidated since
+
+        Returns:
+            True if the result was stored
+        """
+        if not result.verified:
+            return False
+        if epoch is not None and epoch != self.epoch(asset_id):
+            self.discarded_fills += 1
+            return False
+
+        versions = self._entries.setdefault(asset_id, {})
+        versions[document.get("versionNumber", 1)] = (self.fingerprint(document), result.model_copy(), time.monotonic())
+        self._entries.move_to_end(asset_id)
+        self._asset_ids_by_hash[self._normalize_hash(Web3.keccak(text=asset_id).hex())] = asset_id
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._asset_ids_by_hash.pop(self._normalize_hash(Web3.keccak(text=evicted).hex()), None)
+        return True
+
+    def invalidate(self, asset_id: str) -> None:
+        """
+        Drop every cached version of an asset whose state may have changed.
+
+        Args:
+            asset_id: The asset's unique identifier
+        """
+        self.invalidations += 1
+        self._asset_epochs[asset_id] = self._asset_epochs.get(asset_id, 0) + 1
+        self._asset_epochs.move_to_end(asset_id)
+        if len(self._asset_epochs) > self.max_entries:
+            # Verifications in flight for the forgotten asset must still be discarded
+            self._asset_epochs.popitem(last=False)
+            self._epoch += 1
+        if self._entries.pop(asset_id, None) is not None:
+            self._asset_ids_by_hash.pop(self._normalize_hash(Web3.keccak(text=asset_id).hex()), None)
+
+    def invalidate_events(self, events: Iterable[Dict[str, Any]]) -> int:
+        """
+        Drop the assets named by indexed registry events.
+
+        Args:
+            events: Event documents as stored by ChainEventIndexer, with event and assetIdHash fields
+
+        Returns:
+            Number of cached assets dropped
+        """
+        dropped = 0
+        for event in events:
+            if event.get("event") not in INVALIDATING_EVENTS or not event.get("assetIdHash"):
+                continue
+            asset_id = self._asset_ids_by_hash.get(self._normalize_hash(event["assetIdHash"]))
+            if asset_id is not None and asset_id in self._entries:
+                logger.debug(f"{event['event']} at block {event.get('blockNumber')} invalidated cached verification of {asset_id}")
+                self.invalidate(asset_id)
+                dropped += 1
+        return dropped
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._epoch += 1
+        self._entries.clear()
+        self._asset_ids_by_hash.clear()
+        self._asset_epochs.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with hit/miss counters, hit rate and size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "changed": self.changed,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "discarded_fills": self.discarded_fills,
+            "assets": len(self._entries),
+            "max_age": self.max_age,
+        }
+
+
+def invalidate_verification(asset_id: str) -> None:
+    """
+    Drop an asset's cached verifications, if verification caching is on.
+
+    Args:
+        asset_id: The asset's unique identifier
+    """
+    from app.services.service_container import get_verification_cache
+    cache = get_verification_cache()
+    if cache is not None:
+        cache.invalidate(asset_id)
@@ -8,6 +8,7 @@ from web3 import Web3
 from app.repositories.auth_repo import AuthRepository
 from app.repositories.user_repo import UserRepository
 from app.schemas.auth_schema import NonceResponse
+from app.services.service_container import get_session_cache
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -217,10 +218,31 @@ class WalletAuthProvider:
             logger.error(f"Error creating session: {str(e)}")
             return None
             
+    async def _load_active_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load an active, unexpired session from MongoDB.
+        
+        Args:
+            session_id: The session ID to load
+            
+        Returns:
+            Session data if active, None otherwise
+        """
+        current_time = datetime.now(timezone.utc)
+        
+        return await self.auth_repository.get_session({
+            "sessionId": session_id,
+            "expiresAt": {"$gt": current_time},
+            "isActive": True
+        })
+        
     async def validate_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
         Validate a session.
         
+        Served from the session cache when it is enabled, so most requests
+        do not query MongoDB.
+        
         Args:
             session_id: The session ID to validate
             
@@ -228,15 +250,11 @@ class WalletAuthProvider:
             Session data if valid, None otherwise
         """
         try:
-            current_time = datetime.now(timezone.utc)
-            
-            session = await self.auth_repository.get_session({
-                "sessionId": session_id,
-                "expiresAt": {"$gt": current_time},
-                "isActive": True
-            })
+            cache = get_session_cache()
+            if cache is None:
+                return await self._load_active_session(session_id)
             
-            return session
+            return await cache.get_or_load(session_id, lambda: self._load_active_session(session_id))
             
         except Exception as e:
             logger.error(f"Error validating session: {str(e)}")
@@ -261,6 +279,9 @@ class WalletAuthProvider:
         except Exception as e:
             logger.error(f"Error logging out: {str(e)}")
             return False
+        
+        finally:
+            await self._invalidate_cached_session(session_id)
             
     async def extend_session(self, session_id: str, duration: int = None) -> bool:
         """
@@ -293,4 +314,18 @@ class WalletAuthProvider:
             
         except Exception as e:
             logger.error(f"Error extending session: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+        
+        finally:
+            await self._invalidate_cached_session(session_id)
+            
+    async def _invalidate_cached_session(self, session_id: str) -> None:
+        """
+        Drop a session from the session cache after it changed in MongoDB.
+        
+        Args:
+            session_id: The session ID that changed
+        """
+        cache = get_session_cache()
+        if cache is not None:
+            await cache.invalidate(session_id)
\ No newline at end of file
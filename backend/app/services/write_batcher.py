@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from web3.exceptions import ContractLogicError
+
+from app.services.nonce_manager import TransactionReverted
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of assets per batch call, mirrors MAX_BATCH_SIZE in FuseVaultRegistry.sol
+MAX_BATCH_SIZE = 50
+
+# Sends one batch transaction for an owner; items are (asset_id, cid) pairs
+BatchSender = Callable[[str, List[Tuple[str, Optional[str]]]], Awaitable[Dict[str, Any]]]
+# Sends a single-asset transaction, used when a batch reverts
+SingleSender = Callable[[str, str, Optional[str]], Awaitable[Dict[str, Any]]]
+
+
+def _rejected_by_contract(error: BaseException) -> bool:
+    """
+    Whether a failed batch certainly changed nothing on chain.
+
+    True when the error, or one it was raised from, is a mined revert or a
+    ContractLogicError from estimating gas before anything was sent. Other
+    failures (receipt timeouts, nonce or "already known" errors) may still
+    see the batch mined.
+
+    Args:
+        error: Exception raised by the batch sender
+
+    Returns:
+        True if the items can safely be sent again one by one
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, (TransactionReverted, ContractLogicError)):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
+
+@dataclass
+class _PendingBatch:
+    send_batch: BatchSender
+    send_single: SingleSender
+    items: List[Tuple[str, Optional[str]]] = field(default_factory=list)
+    futures: List[asyncio.Future] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+    # Send of the previous batch for the same key, which must be mined first
+    after: Optional[asyncio.Task] = None
+
+
+class BlockchainWriteBatcher:
+    """
+    Micro-batching queue for server-signed single-asset writes.
+
+    Writes are grouped per (operation, owner) for up to `window` seconds or
+    `max_batch_size` items, then sent as one batch transaction. Every caller
+    receives the shared transaction hash. If the batch reverts or fails gas
+    estimation, each item is retried on its own so one bad asset does not
+    fail the others. Any other failure is passed to every caller, since the
+    batch may still be mined and a retry would apply each write twice.
+
+    An asset appears at most once per batch: a second delete would revert the
+    batch and a second update would bump its ipfsVersion twice. A write
+    identical to one already queued shares its outcome, and a different write
+    to a queued asset starts the next batch, which is sent only after the
+    current one.
+    """
+
+    def __init__(self, window: float = 0.2, max_batch_size: int = MAX_BATCH_SIZE):
+        """
+        Initialize the batcher.
+
+        Args:
+            window: Seconds to wait for more writes after the first one in a batch
+            max_batch_size: Flush as soon as a batch reaches this many items
+        """
+        self.window = window
+        self.max_batch_size = min(max_batch_size, MAX_BATCH_SIZE)
+        self._pending: Dict[Tuple[str, str], _PendingBatch] = {}
+        self._tasks: set = set()
+
+    async def submit(
+        self,
+        operation: str,
+        owner_address: str,
+        asset_id: str,
+        cid: Optional[str],
+        send_batch: BatchSender,
+        send_single: SingleSender
+    ) -> Dict[str, Any]:
+        """
+        Queue a write and wait for the batch it lands in to be mined.
+
+        Args:
+            operation: Kind of write, e.g. "update" or "delete"; only like writes are batched
+            owner_address: Owner of the asset
+            asset_id: The asset ID
+            cid: The IPFS CID for updates, None for deletes
+            send_batch: Coroutine that sends a batch for (owner_address, items)
+            send_single: Coroutine that sends one item for (owner_address, asset_id, cid)
+
+        Returns:
+            Dict containing the transaction hash and the size of the batch
+
+        Raises:
+            Exception: Whatever the underlying send raised for this item
+        """
+        key = (operation, owner_address.lower())
+        after = None
+        batch = self._pending.get(key)
+        if batch is not None:
+            for (queued_id, queued_cid), queued in zip(batch.items, batch.futures):
+                if queued_id != asset_id:
+                    continue
+                if queued_cid == cid:
+                    return await asyncio.shield(queued)
+                after = self._flush(key)
+                batch = None
+                break
+        if batch is None:
+            batch = _PendingBatch(send_batch=send_batch, send_single=send_single, after=after)
+            self._pending[key] = batch
+            batch.timer = asyncio.get_running_loop().call_later(self.window, self._flush, key)
+
+        future = asyncio.get_running_loop().create_future()
+        batch.items.append((asset_id, cid))
+        batch.futures.append(future)
+
+        if len(batch.items) >= self.max_batch_size:
+            self._flush(key)
+
+        # Shielded: a cancelled caller must not cancel an outcome other callers share
+        return await asyncio.shield(future)
+
+    def _flush(self, key: Tuple[str, str]) -> Optional[asyncio.Task]:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return None
+        if batch.timer:
+            batch.timer.cancel()
+        task = asyncio.create_task(self._send(key[1], batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _send(self, owner_address: str, batch: _PendingBatch) -> None:
+        if batch.after is not None:
+            await asyncio.wait([batch.after])
+        try:
+            if len(batch.items) == 1:
+                asset_id, cid = batch.items[0]
+                result = await batch.send_single(owner_address, asset_id, cid)
+            else:
+                result = await batch.send_batch(owner_address, batch.items)
+            logger.info(f"Coalesced {len(batch.items)} writes for {owner_address} into tx {result.get('tx_hash')}")
+            for future in batch.futures:
+                if not future.done():
+                    future.set_result({"tx_hash": result.get("tx_hash"), "batch_size": len(batch.items)})
+            return
+        except Exception as e:
+            if len(batch.items) == 1 or not _rejected_by_contract(e):
+                if len(batch.items) > 1:
+                    logger.error(f"Batch of {len(batch.items)} writes for {owner_address} failed and may still be mined: {str(e)}")
+                for future in batch.futures:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            logger.warning(f"Batch of {len(batch.items)} writes for {owner_address} failed, retrying individually: {str(e)}")
+
+        results = await asyncio.gather(
+            *(batch.send_single(owner_address, asset_id, cid) for asset_id, cid in batch.items),
+            return_exceptions=True
+        )
+        for future, result in zip(batch.futures, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result({"tx_hash": result.get("tx_hash"), "batch_size": 1})
+
+    async def close(self) -> None:
+        """Flush all queued writes and wait for them to finish. Call on application shutdown."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
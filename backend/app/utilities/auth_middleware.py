@@ -40,6 +40,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
             "/users/register",
             "/api-keys/status",  # API keys status endpoint is public
             "/delegation/server-info",  # Delegation server info is public
+            "/health",  # Health probe results for load balancers
         ]
         
         # Routes that start with these prefixes are public
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.utilities.cid_utils import content_matches_cid, is_cid_string
+
+logger = logging.getLogger(__name__)
+
+
+class CIDCache:
+    """
+    Two-tier cache of IPFS content keyed by CID.
+
+    Content behind a CID never changes, so entries need no invalidation. Every
+    entry is checked against its CID before it is stored, which also means a
+    corrupted gateway response can never be cached. The first tier is an LRU
+    bounded by total bytes; the optional second tier is a directory of files
+    named by CID that survives restarts. Only well-formed CID strings are
+    looked up or stored, since the disk tier builds file paths from them.
+    """
+
+    def __init__(self, max_memory_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_memory_bytes: Upper bound on the size of content held in memory
+            disk_dir: Directory for the on-disk tier, or None to disable it
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.rejected = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, cid: str) -> str:
+        # Shard by the tail of the CID; prefixes are shared by every CID of a kind
+        return os.path.join(self.disk_dir, cid[-2:], cid)
+
+    def _remember(self, cid: str, content: bytes) -> None:
+        if len(content) > self.max_memory_bytes:
+            return
+        if cid in self._memory:
+            self._memory.move_to_end(cid)
+            return
+        self._memory[cid] = content
+        self._memory_bytes += len(content)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _read_disk(self, cid: str) -> Optional[bytes]:
+        try:
+            with open(self._disk_path(cid), "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        if not content_matches_cid(content, cid):
+            logger.warning(f"Discarding corrupted cache file for CID {cid}")
+            os.remove(self._disk_path(cid))
+            return None
+        return content
+
+    def _write_disk(self, cid: str, content: bytes) -> None:
+        path = self._disk_path(cid)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    async def get(self, cid: str) -> Optional[bytes]:
+        """
+        Look up content by CID.
+
+        Args:
+            cid: Content identifier
+
+        Returns:
+            The content bytes, or None on a miss or a malformed CID
+        """
+        if not is_cid_string(cid):
+            self.misses += 1
+            return None
+
+        content = self._memory.get(cid)
+        if content is not None:
+            self._memory.move_to_end(cid)
+            self.memory_hits += 1
+            return content
+
+        if self.disk_dir:
+            try:
+                content = await asyncio.to_thread(self._read_disk, cid)
+            except Exception as e:
+                logger.warning(f"Error reading CID cache file for {cid}: {str(e)}")
+                content = None
+            if content is not None:
+                self.disk_hits += 1
+                self._remember(cid, content)
+                return content
+
+        self.misses += 1
+        return None
+
+    async def put(self, cid: str, content: bytes) -> bool:
+        """
+        Store content under its CID after verifying that it hashes to that CID.
+
+        Args:
+            cid: Content identifier
+            content: Content bytes
+
+        Returns:
+            True if the content was cached, False if the CID is malformed or
+            the content did not match it
+        """
+        if not is_cid_string(cid):
+            self.rejected += 1
+            logger.warning(f"Not caching content for malformed CID {cid!r}")
+            return False
+
+        if cid in self._memory:
+            self._memory.move_to_end(cid)
+            return True
+
+        # Hashing large content would block the event loop
+        if not await asyncio.to_thread(content_matches_cid, content, cid):
+            self.rejected += 1
+            logger.warning(f"Not caching content for CID {cid}: content does not match CID")
+            return False
+
+        self._remember(cid, content)
+        self.inserts += 1
+
+        if self.disk_dir:
+            try:
+                await asyncio.to_thread(self._write_disk, cid, content)
+            except Exception as e:
+                logger.warning(f"Error writing CID cache file for {cid}: {str(e)}")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with hit/miss counters, hit rate and memory usage
+        """
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "inserts": self.inserts,
+            "rejected": self.rejected,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_enabled": bool(self.disk_dir),
+        }
@@ -0,0 +1,233 @@
+"""
+In-process IPFS CID computation.
+
+Reproduces the UnixFS file encoding used by the web3-storage-service so CIDs can
+be computed without a round trip to the Node service. Two profiles are provided:
+
+- "web3storage": @web3-storage/upload-client's `UnixFS.encodeFile` settings
+  (@ipld/unixfs with raw leaves, 1 MiB fixed chunks, balanced layout of width
+  1024, CIDv1 base32). This is what the service's /upload and /calculate-cid
+  endpoints produce.
+- "ipfs-only-hash": js-ipfs-unixfs-importer defaults used by ipfs-only-hash and
+  `ipfs add` (dag-pb leaves, 256 KiB chunks, balanced layout of width 174,
+  CIDv0 base58btc).
+"""
+
+import hashlib
+import re
+from base64 import b32encode
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+# Multicodec and multihash codes
+CODEC_RAW = 0x55
+CODEC_DAG_PB = 0x70
+SHA2_256 = 0x12
+
+# UnixFS Data.DataType
+UNIXFS_FILE = 2
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+# CIDv0 (base58btc sha2-256 multihash) or CIDv1 in multibase base32 ("b") or base58btc ("z")
+CID_PATTERN = re.compile(
+    rf"^(?:Qm[{BASE58_ALPHABET}]{{44}}|b[a-z2-7]{{20,256}}|z[{BASE58_ALPHABET}]{{20,256}})$"
+)
+
+
+@dataclass(frozen=True)
+class UnixFSProfile:
+    """Importer settings that determine the CID of a file."""
+    chunk_size: int
+    max_children: int
+    raw_leaves: bool
+    cid_version: int
+    # @ipld/unixfs omits the Name field on file links, the js importer sets it to ""
+    named_links: bool
+
+
+CID_PROFILES: Dict[str, UnixFSProfile] = {
+    "web3storage": UnixFSProfile(
+        chunk_size=1024 * 1024,
+        max_children=1024,
+        raw_leaves=True,
+        cid_version=1,
+        named_links=False
+    ),
+    "ipfs-only-hash": UnixFSProfile(
+        chunk_size=256 * 1024,
+        max_children=174,
+        raw_leaves=False,
+        cid_version=0,
+        named_links=True
+    ),
+}
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _pb_varint_field(field_number: int, value: int) -> bytes:
+    return _varint(field_number << 3) + _varint(value)
+
+
+def _pb_bytes_field(field_number: int, value: bytes) -> bytes:
+    return _varint((field_number << 3) | 2) + _varint(len(value)) + value
+
+
+def _base58btc(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    encoded = ""
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = BASE58_ALPHABET[remainder] + encoded
+    leading_zeros = len(data) - len(data.lstrip(b"\x00"))
+    return "1" * leading_zeros + encoded
+
+
+def _multihash(block: bytes) -> bytes:
+    digest = hashlib.sha256(block).digest()
+    return bytes([SHA2_256, len(digest)]) + digest
+
+
+def _cid_bytes(codec: int, block: bytes, cid_version: int) -> bytes:
+    if cid_version == 0:
+        return _multihash(block)
+    return _varint(1) + _varint(codec) + _multihash(block)
+
+
+def encode_cid(cid: bytes) -> str:
+    """
+    Encode binary CID bytes as a string.
+
+    Args:
+        cid: Binary CID (a bare multihash for CIDv0)
+
+    Returns:
+        base58btc string for CIDv0, multibase base32 ("b" prefix) for CIDv1
+    """
+    if cid[0] == SHA2_256:
+        return _base58btc(cid)
+    return "b" + b32encode(cid).decode("ascii").lower().rstrip("=")
+
+
+def _unixfs_file_data(data: bytes, filesize: int, blocksizes: List[int]) -> bytes:
+    out = _pb_varint_field(1, UNIXFS_FILE)
+    if data:
+        out += _pb_bytes_field(2, data)
+    out += _pb_varint_field(3, filesize)
+    for size in blocksizes:
+        out += _pb_varint_field(4, size)
+    return out
+
+
+def _dag_pb_node(links: List[Tuple[bytes, int]], data: bytes, named_links: bool) -> bytes:
+    # dag-pb canonical form puts Links (field 2) before Data (field 1)
+    out = b""
+    for cid, tsize in links:
+        link = _pb_bytes_field(1, cid)
+        if named_links:
+            link += _pb_bytes_field(2, b"")
+        link += _pb_varint_field(3, tsize)
+        out += _pb_bytes_field(2, link)
+    return out + _pb_bytes_field(1, data)
+
+
+# (cid bytes, content size, cumulative DAG size)
+_Node = Tuple[bytes, int, int]
+
+
+def _leaf(chunk: bytes, profile: UnixFSProfile) -> _Node:
+    if profile.raw_leaves:
+        return _cid_bytes(CODEC_RAW, chunk, profile.cid_version), len(chunk), len(chunk)
+    block = _dag_pb_node([], _unixfs_file_data(chunk, len(chunk), []), profile.named_links)
+    return _cid_bytes(CODEC_DAG_PB, block, profile.cid_version), len(chunk), len(block)
+
+
+def _parent(children: List[_Node], profile: UnixFSProfile) -> _Node:
+    blocksizes = [content_size for _, content_size, _ in children]
+    filesize = sum(blocksizes)
+    data = _unixfs_file_data(b"", filesize, blocksizes)
+    block = _dag_pb_node([(cid, dag_size) for cid, _, dag_size in children], data, profile.named_links)
+    dag_size = len(block) + sum(dag_size for _, _, dag_size in children)
+    return _cid_bytes(CODEC_DAG_PB, block, profile.cid_version), filesize, dag_size
+
+
+def compute_cid_bytes(content: bytes, profile: str = "web3storage") -> bytes:
+    """
+    Compute the binary CID of a file's content.
+
+    Args:
+        content: File content
+        profile: Name of the importer profile in CID_PROFILES
+
+    Returns:
+        Binary CID
+    """
+    settings = CID_PROFILES[profile]
+    chunks = [content[i:i + settings.chunk_size] for i in range(0, len(content), settings.chunk_size)] or [b""]
+
+    nodes = [_leaf(chunk, settings) for chunk in chunks]
+    # A file that fits in one chunk is its own root
+    while len(nodes) > 1:
+        nodes = [
+            _parent(nodes[i:i + settings.max_children], settings)
+            for i in range(0, len(nodes), settings.max_children)
+        ]
+    return nodes[0][0]
+
+
+def compute_cid(content: bytes, profile: str = "web3storage") -> str:
+    """
+    Compute the IPFS CID of a file's content without contacting any IPFS service.
+
+    Args:
+        content: File content
+        profile: Name of the importer profile in CID_PROFILES
+
+    Returns:
+        CID string, matching what the corresponding Node importer returns
+    """
+    return encode_cid(compute_cid_bytes(content, profile))
+
+
+def is_cid_string(cid: str) -> bool:
+    """
+    Check that a string is shaped like a CID: a known multibase prefix and
+    only characters of its alphabet, so no separators or dots.
+
+    Args:
+        cid: Untrusted CID string
+
+    Returns:
+        True if the string is a well-formed CIDv0 or base32/base58btc CIDv1
+    """
+    return isinstance(cid, str) and CID_PATTERN.match(cid) is not None
+
+
+def content_matches_cid(content: bytes, cid: str) -> bool:
+    """
+    Check that content hashes to the given CID.
+
+    CIDv0 strings are checked with the ipfs-only-hash profile and CIDv1 strings
+    with the web3storage profile. Content imported with other settings will not
+    match even if it is genuine, so a False result means "not verifiable here".
+
+    Args:
+        content: File content
+        cid: CID string to check against
+
+    Returns:
+        True if the content produces exactly this CID
+    """
+    profile = "ipfs-only-hash" if cid.startswith("Qm") else "web3storage"
+    return compute_cid(content, profile) == cid
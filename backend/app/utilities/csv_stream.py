@@ -0,0 +1,111 @@
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, BinaryIO, Dict, List
+
+import pandas as pd
+
+# Columns every CSV upload must have besides its critical metadata columns
+REQUIRED_COLUMNS = ("asset_id", "wallet_address")
+
+
+class AssetIdSet:
+    """
+    Set of asset IDs seen during an import, stored as 16-byte digests.
+
+    Memory per entry does not depend on the length of the asset ID, and a
+    128-bit digest makes a false "already seen" practically impossible.
+    """
+
+    def __init__(self):
+        self._digests: set = set()
+
+    @staticmethod
+    def _digest(asset_id: str) -> bytes:
+        return hashlib.blake2b(asset_id.encode("utf-8"), digest_size=16).digest()
+
+    def add(self, asset_id: str) -> bool:
+        """
+        Record an asset ID.
+
+        Args:
+            asset_id: The asset ID to record
+
+        Returns:
+            True if the asset ID had not been seen before
+        """
+        digest = self._digest(asset_id)
+        if digest in self._digests:
+            return False
+        self._digests.add(digest)
+        return True
+
+    def __contains__(self, asset_id: str) -> bool:
+        return self._digest(asset_id) in self._digests
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+
+def _read_columns(file: BinaryIO) -> List[str]:
+    columns = list(pd.read_csv(file, nrows=0).columns)
+    file.seek(0)
+    return columns
+
+
+async def iter_csv_chunks(
+    file: BinaryIO,
+    critical_fields: List[str],
+    chunk_rows: int = 1000
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Parse an uploaded CSV file into asset records, `chunk_rows` rows at a time.
+
+    Only one chunk is held in memory at a time, and parsing runs in a worker
+    thread so a large file does not block the event loop.
+
+    Args:
+        file: Seekable binary file object positioned at the start of the CSV
+        critical_fields: Column names to treat as critical metadata
+        chunk_rows: Number of rows parsed per chunk
+
+    Yields:
+        Lists of dicts with asset_id, owner_address, critical_metadata and non_critical_metadata
+
+    Raises:
+        ValueError: If the header is missing a required or critical column, or the CSV is malformed
+    """
+    columns = await asyncio.to_thread(_read_columns, file)
+
+    if "asset_id" not in columns:
+        raise ValueError("CSV file must contain an 'asset_id' column.")
+
+    if "wallet_address" not in columns:
+        raise ValueError("CSV file must contain a 'wallet_address' (owner) column.")
+
+    missing = [col for col in critical_fields if col not in columns]
+    if missing:
+        raise ValueError(f"Missing critical columns {missing} in CSV.")
+
+    critical = set(critical_fields)
+    reader = await asyncio.to_thread(pd.read_csv, file, chunksize=chunk_rows)
+    try:
+        while True:
+            chunk = await asyncio.to_thread(next, reader, None)
+            if chunk is None:
+                break
+
+            records = []
+            for row in chunk.to_dict("records"):
+                records.append({
+                    "asset_id": str(row["asset_id"]),
+                    "owner_address": str(row["wallet_address"]),
+                    "critical_metadata": {c: row[c] for c in critical_fields},
+                    # Everything else is non-critical (besides asset_id and wallet_address)
+                    "non_critical_metadata": {
+                        k: v for k, v in row.items()
+                        if k not in critical and k not in REQUIRED_COLUMNS
+                    }
+                })
+            yield records
+    finally:
+        reader.close()
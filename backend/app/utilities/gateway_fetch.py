@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.utilities.cid_utils import content_matches_cid
+
+logger = logging.getLogger(__name__)
+
+
+class GatewayLatencyTracker:
+    """
+    Exponentially weighted moving average of response time per gateway.
+
+    Failures are recorded as a fixed penalty so a gateway that errors quickly
+    does not look fast. Gateways without samples sort first, so every gateway
+    gets measured before the order settles. A request cancelled because
+    another gateway won counts its elapsed time as a sample.
+    """
+
+    def __init__(self, alpha: float = 0.3, failure_penalty: float = 30.0):
+        """
+        Initialize the tracker.
+
+        Args:
+            alpha: Weight of the newest sample
+            failure_penalty: Latency in seconds recorded for a failed request
+        """
+        self.alpha = alpha
+        self.failure_penalty = failure_penalty
+        self._ewma: Dict[str, float] = {}
+
+    def record(self, gateway: str, latency: float) -> None:
+        previous = self._ewma.get(gateway)
+        if previous is None:
+            self._ewma[gateway] = latency
+        else:
+            self._ewma[gateway] = self.alpha * latency + (1 - self.alpha) * previous
+
+    def record_failure(self, gateway: str) -> None:
+        self.record(gateway, self.failure_penalty)
+
+    def order(self, gateways: List[str]) -> List[str]:
+        """
+        Sort gateways by expected latency, keeping configured order for ties.
+
+        Args:
+            gateways: Gateway names in configured order
+
+        Returns:
+            Gateway names, fastest first
+        """
+        return sorted(gateways, key=lambda g: self._ewma.get(g, 0.0))
+
+    def stats(self) -> Dict[str, float]:
+        return dict(self._ewma)
+
+
+async def hedged_fetch(
+    client: httpx.AsyncClient,
+    cid: str,
+    gateways: List[Tuple[str, str]],
+    hedge_delay: float,
+    timeout: float,
+    tracker: Optional[GatewayLatencyTracker] = None,
+    verify: Callable[[bytes, str], bool] = content_matches_cid
+) -> httpx.Response:
+    """
+    Fetch content for a CID from several gateways with hedged requests.
+
+    The first gateway is requested straight away. Each time hedge_delay passes
+    without a usable response, or a request fails, the next gateway is started.
+    The first response whose bytes hash to the CID wins and the rest are
+    cancelled. If every gateway answers but none verifies (the content may have
+    been imported with settings we cannot reproduce), the first successful
+    response is returned instead.
+
+    Args:
+        client: HTTP client to use
+        cid: Content identifier being fetched
+        gateways: (name, url) pairs, already in the preferred order
+        hedge_delay: Seconds to wait before starting the next gateway; 0 starts all at once
+        timeout: Per-request timeout in seconds
+        tracker: Latency tracker to update, if any
+        verify: Function checking content against the CID
+
+    Returns:
+        The winning response
+
+    Raises:
+        httpx.HTTPError: The first gateway's error if no gateway answered successfully
+    """
+    async def fetch(name: str, url: str) -> Tuple[str, httpx.Response, bool]:
+        start = time.perf_counter()
+        try:
+            response = await client.get(url, timeout=timeout)
+            response.raise_for_status()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            if tracker:
+                tracker.record_failure(name)
+            raise
+        try:
+            verified = verify(response.content, cid)
+        except Exception:
+            verified = False
+        if tracker:
+            if verified:
+                tracker.record(name, time.perf_counter() - start)
+            else:
+                tracker.record_failure(name)
+        return name, response, verified
+
+    pending_gateways = list(gateways)
+    running: Dict[asyncio.Task, str] = {}
+    started: Dict[asyncio.Task, float] = {}
+    errors: Dict[str, BaseException] = {}
+    unverified: List[httpx.Response] = []
+
+    def launch_next() -> None:
+        name, url = pending_gateways.pop(0)
+        task = asyncio.create_task(fetch(name, url))
+        running[task] = name
+        started[task] = time.perf_counter()
+
+    launch_next()
+    if hedge_delay <= 0:
+        while pending_gateways:
+            launch_next()
+
+    try:
+        while running:
+            wait_for = hedge_delay if pending_gateways else None
+            done, _ = await asyncio.wait(set(running), timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                # Nobody answered within the hedge delay; bring in the next gateway
+                logger.info(f"No response for CID {cid} after {hedge_delay}s, hedging to next gateway")
+                launch_next()
+                continue
+
+            for task in done:
+                name = running.pop(task)
+                try:
+                    _, response, verified = task.result()
+                except Exception as e:
+                    logger.info(f"Gateway {name} failed for CID {cid}: {str(e)}")
+                    errors[name] = e
+                else:
+                    if verified:
+                        logger.info(f"Gateway {name} served verified content for CID {cid}")
+                        return response
+                    logger.warning(f"Gateway {name} returned content that does not match CID {cid}")
+                    unverified.append(response)
+                # Replace a failed gateway right away instead of waiting out the delay
+                if pending_gateways:
+                    launch_next()
+    finally:
+        for task, name in running.items():
+            task.cancel()
+            if tracker:
+                # A loser was at least this slow; without a sample it would keep sorting first
+                tracker.record(name, time.perf_counter() - started[task])
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    if unverified:
+        logger.warning(f"No gateway returned content matching CID {cid}; using unverified response")
+        return unverified[0]
+
+    logger.error(f"All IPFS gateways failed for CID {cid}: " + "; ".join(f"{n}: {e}" for n, e in errors.items()))
+    raise next(errors[name] for name, _ in gateways if name in errors)
+
+
+_gateway_tracker: Optional[GatewayLatencyTracker] = None
+
+
+def get_gateway_tracker() -> GatewayLatencyTracker:
+    """
+    Get the process-wide gateway latency tracker.
+
+    Returns:
+        The shared GatewayLatencyTracker
+    """
+    global _gateway_tracker
+    if _gateway_tracker is None:
+        from app.config import settings
+        _gateway_tracker = GatewayLatencyTracker(failure_penalty=settings.ipfs_gateway_timeout)
+    return _gateway_tracker
@@ -0,0 +1,135 @@
+import asyncio
+import importlib.util
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees its host slot once the body is consumed or closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, semaphore: asyncio.Semaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._semaphore.release()
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        finally:
+            self.release()
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self.release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper that caps concurrent requests per host.
+
+    httpx only limits connections for the whole pool, so one slow gateway could
+    take every connection. A slot is held until the response body is closed.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        """
+        Initialize the transport.
+
+        Args:
+            transport: Underlying transport that owns the connection pool
+            max_per_host: Maximum number of in-flight requests per host
+        """
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = self._semaphores.get(request.url.host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._max_per_host)
+            self._semaphores[request.url.host] = semaphore
+
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        stream = _ReleasingStream(response.stream, semaphore)
+        if response.is_closed:
+            # Body was already read into memory; nothing left to wait for
+            stream.release()
+        response.stream = stream
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared pooled HTTP client, creating it on first use.
+
+    The client keeps connections alive across calls, negotiates HTTP/2 with
+    servers that support it (when the `h2` package is installed) and caps
+    in-flight requests per host. Limits come from the IPFS_HTTP_* settings.
+
+    Returns:
+        The shared httpx.AsyncClient
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is not None and not _http_client.is_closed and _http_client_loop is loop:
+        return _http_client
+
+    from app.config import settings
+
+    http2 = settings.ipfs_http2 and importlib.util.find_spec("h2") is not None
+    if settings.ipfs_http2 and not http2:
+        logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+
+    limits = httpx.Limits(
+        max_connections=settings.ipfs_http_max_connections,
+        max_keepalive_connections=settings.ipfs_http_max_keepalive,
+        keepalive_expiry=settings.ipfs_http_keepalive_expiry
+    )
+    transport = HostLimitedTransport(
+        httpx.AsyncHTTPTransport(http2=http2, limits=limits),
+        max_per_host=settings.ipfs_http_max_per_host
+    )
+    # Connections belong to the loop that opened them; a new loop gets a new pool
+    _http_client = httpx.AsyncClient(transport=transport, timeout=90.0)
+    _http_client_loop = loop
+    logger.info(
+        f"Shared HTTP client created (max connections: {settings.ipfs_http_max_connections}, "
+        f"per host: {settings.ipfs_http_max_per_host}, http2: {http2})"
+    )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client. Call on application shutdown."""
+    global _http_client, _http_client_loop
+    if _http_client is not None:
+        try:
+            await _http_client.aclose()
+        except Exception as e:
+            logger.error(f"Error closing shared HTTP client: {str(e)}")
+        _http_client = None
+        _http_client_loop = None
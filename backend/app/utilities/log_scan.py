@@ -0,0 +1,210 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fragments of the errors RPC providers return when a getLogs range is too wide
+# or would return too many results; these ranges are split instead of retried
+RANGE_ERROR_MARKERS = (
+    "block range",
+    "range is too",
+    "range too",
+    "too many results",
+    "more than",
+    "response size",
+    "exceed",
+)
+# Rate limiting is retried with backoff even though its messages can look alike
+RATE_LIMIT_MARKERS = ("rate limit", "too many requests", "429", "capacity")
+
+
+def is_range_error(error: Exception) -> bool:
+    """Whether an RPC error asks for a smaller getLogs block range."""
+    message = str(error).lower()
+    if any(marker in message for marker in RATE_LIMIT_MARKERS):
+        return False
+    return any(marker in message for marker in RANGE_ERROR_MARKERS)
+
+
+class LogScanError(Exception):
+    """A block range could not be fetched after splitting or retrying it."""
+
+
+async def scan_block_ranges(
+    fetch: Callable[[int, int], Awaitable[List[Any]]],
+    from_block: int,
+    to_block: int,
+    chunk_size: int = 10000,
+    max_chunk_size: int = 100000,
+    concurrency: int = 4,
+    retries: int = 3,
+    retry_delay: float = 0.5,
+    newest_first: bool = False,
+    stop_when: Optional[Callable[[List[Any]], bool]] = None
+) -> List[Any]:
+    """
+    Fetch logs for a block range in chunks, several at a time, adapting the chunk size.
+
+    Chunks are handed out in block order (newest first if requested) to at
+    most `concurrency` concurrent fetches. Until the provider rejects a chunk
+    as too wide or too large, each success doubles the chunk size, up to
+    max_chunk_size. After that the size bisects between the widest accepted
+    and the narrowest rejected chunk, settling just under the provider's
+    limit, and rejected chunks are fetched again in pieces of the new size.
+    Any other failure is retried with exponential backoff.
+
+    With stop_when, the scan stops as soon as a chunk's logs satisfy it and
+    every chunk nearer the starting end has finished, so scanning newest first
+    stops at the newest matching chunk. Chunks still in flight further along
+    are cancelled.
+
+    Args:
+        fetch: Coroutine function returning the logs for an inclusive (from_block, to_block) range
+        from_block: First block to scan (inclusive)
+        to_block: Last block to scan (inclusive)
+        chunk_size: Blocks per getLogs call at the start of the scan
+        max_chunk_size: Largest chunk the scan grows to
+        concurrency: Maximum concurrent fetches
+        retries: Retries of a chunk that fails for a reason other than its size
+        retry_delay: Seconds before the first retry, doubled on each further retry
+        newest_first: Hand out chunks from to_block downwards
+        stop_when: Predicate over one chunk's logs that ends the scan early
+
+    Returns:
+        Logs from every completed chunk, in no particular order
+
+    Raises:
+        LogScanError: If a chunk keeps failing after its retries, or a single block is too large to fetch
+    """
+    if to_block < from_block:
+        return []
+
+    size = max(1, min(chunk_size, max_chunk_size))
+    # Widest chunk the provider accepted and narrowest it rejected
+    accepted = 0
+    rejected: Optional[int] = None
+    # Next block not yet handed out, moving away from the starting end
+    cursor = to_block if newest_first else from_block
+    # Split or failed chunks waiting to be fetched again: (start, end, attempt)
+    pending: List[Tuple[int, int, int]] = []
+    running: Dict[asyncio.Task, Tuple[int, int, int]] = {}
+    completed: Dict[Tuple[int, int], List[Any]] = {}
+    # Matching chunk nearest the starting end; chunks before it still have to finish
+    stop_at: Optional[Tuple[int, int]] = None
+
+    def order_key(chunk: Tuple[int, ...]) -> int:
+        return -chunk[1] if newest_first else chunk[0]
+
+    def is_before(chunk: Tuple[int, ...], other: Tuple[int, ...]) -> bool:
+        return order_key(chunk) < order_key(other)
+
+    def next_size() -> int:
+        if rejected is None:
+            return min(max_chunk_size, 2 * accepted)
+        if not accepted:
+            return max(1, rejected // 2)
+        if rejected - accepted <= accepted // 4:
+            # Close enough to the limit that probing further costs more calls than it saves
+            return accepted
+        return (accepted + rejected) // 2
+
+    def next_chunk() -> Optional[Tuple[int, int, int]]:
+        nonlocal cursor
+        if pending:
+            pending.sort(key=order_key)
+            if stop_at is None or is_before(pending[0], stop_at):
+                start, end, attempt = pending.pop(0)
+                if rejected is None or end - start + 1 < rejected:
+                    return (start, end, attempt)
+                # Hand out a piece the provider may accept, nearest the starting end
+                if newest_first:
+                    pending.append((start, end - size, attempt))
+                    return (end - size + 1, end, attempt)
+                pending.append((start + size, end, attempt))
+                return (start, start + size - 1, attempt)
+        if stop_at is not None:
+            # Everything not yet handed out lies beyond the matching chunk
+            return None
+        if newest_first and cursor >= from_block:
+            start = max(from_block, cursor - size + 1)
+            chunk = (start, cursor, 0)
+            cursor = start - 1
+            return chunk
+        if not newest_first and cursor <= to_block:
+            end = min(to_block, cursor + size - 1)
+            chunk = (cursor, end, 0)
+            cursor = end + 1
+            return chunk
+        return None
+
+    async def fetch_chunk(chunk: Tuple[int, int, int]) -> List[Any]:
+        start, end, attempt = chunk
+        if attempt:
+            await asyncio.sleep(retry_delay * 2 ** (attempt - 1))
+        return await fetch(start, end)
+
+    cancelled: List[asyncio.Task] = []
+    try:
+        while True:
+            while len(running) < concurrency:
+                chunk = next_chunk()
+                if chunk is None:
+                    break
+                running[asyncio.create_task(fetch_chunk(chunk))] = chunk
+
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                start, end, attempt = running.pop(task)
+                try:
+                    logs = task.result()
+                except Exception as e:
+                    if is_range_error(e):
+                        if start == end:
+                            raise LogScanError(f"Logs for block {start} cannot be fetched: {str(e)}") from e
+                        span = end - start + 1
+                        rejected = span if rejected is None else min(rejected, span)
+                        if accepted >= rejected:
+                            # Result limits depend on log density, so an earlier success may not hold here
+                            accepted = 0
+                        size = next_size()
+                        # Refetch in equal pieces rather than leaving a sliver at the end
+                        pieces = -(-span // size)
+                        for i in range(pieces):
+                            pending.append((start + span * i // pieces, start + span * (i + 1) // pieces - 1, 0))
+                        logger.debug(f"Blocks {start}-{end} rejected as too large, chunk size now {size}")
+                    elif attempt < retries:
+                        pending.append((start, end, attempt + 1))
+                        logger.warning(f"Fetching logs for blocks {start}-{end} failed, retrying: {str(e)}")
+                    else:
+                        raise LogScanError(
+                            f"Fetching logs for blocks {start}-{end} failed after {retries} retries: {str(e)}"
+                        ) from e
+                    continue
+
+                completed[(start, end)] = logs
+                accepted = max(accepted, end - start + 1)
+                size = max(size, next_size())
+                if stop_when is not None and logs and stop_when(logs):
+                    if stop_at is None or is_before((start, end), stop_at):
+                        stop_at = (start, end)
+
+            if stop_at is not None:
+                # Chunks beyond the matching one can no longer change the answer
+                pending[:] = [chunk for chunk in pending if is_before(chunk, stop_at)]
+                for task, chunk in list(running.items()):
+                    if not is_before(chunk, stop_at):
+                        task.cancel()
+                        running.pop(task)
+                        cancelled.append(task)
+    finally:
+        for task in running:
+            task.cancel()
+        cancelled.extend(running)
+        if cancelled:
+            await asyncio.gather(*cancelled, return_exceptions=True)
+
+    return [log for logs in completed.values() for log in logs]
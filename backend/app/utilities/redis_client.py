@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from typing import Optional
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+_redis_client: Optional[redis.Redis] = None
+_redis_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_redis_client() -> redis.Redis:
+    """
+    Get the shared asyncio Redis client, creating it on first use.
+
+    All services share one connection pool instead of opening their own per
+    instance. The URL comes from REDIS_URL, falling back to a local server.
+
+    Returns:
+        The shared redis.asyncio.Redis client
+    """
+    global _redis_client, _redis_client_loop
+    loop = asyncio.get_running_loop()
+    if _redis_client is not None and _redis_client_loop is loop:
+        return _redis_client
+
+    from app.config import settings
+
+    # Connections belong to the loop that opened them; a new loop gets a new pool
+    url = settings.redis_url or "redis://localhost:6379/0"
+    _redis_client = redis.from_url(url, decode_responses=True)
+    _redis_client_loop = loop
+    logger.info("Shared Redis client created")
+    return _redis_client
+
+
+async def close_redis_client() -> None:
+    """Close the shared Redis client. Call on application shutdown."""
+    global _redis_client, _redis_client_loop
+    if _redis_client is not None:
+        try:
+            await _redis_client.aclose()
+        except Exception as e:
+            logger.error(f"Error closing shared Redis client: {str(e)}")
+        _redis_client = None
+        _redis_client_loop = None
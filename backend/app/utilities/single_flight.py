@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent loads of the same key into one call.
+
+    The first caller for a key runs the load; callers arriving while it is
+    in flight wait for its result or exception instead of loading again. A
+    waiter is not cancelled when the leading caller is: it starts a load of
+    its own. Nothing is remembered once a load finishes, so caching stays
+    with the caller (typically inside the load function, where it runs once).
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `load` for a key, or wait for the run already in flight.
+
+        Args:
+            key: Identifies what is being loaded
+            load: Coroutine function producing the value
+
+        Returns:
+            The value produced by whichever caller ran the load
+
+        Raises:
+            Exception: Whatever the load raised
+        """
+        while True:
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The leading load was cancelled, not this caller: load again
+                if not pending.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await load()
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; don't warn when there are none
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
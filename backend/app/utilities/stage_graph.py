@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class StageSkipped(Exception):
+    """A stage did not run because a stage it depends on failed."""
+
+
+@dataclass
+class Stage:
+    """
+    One step of a stage graph.
+
+    Attributes:
+        run: Coroutine function called with the results finished so far, keyed by stage name
+        depends_on: Stages that must finish before this one starts
+    """
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: Sequence[str] = ()
+
+
+# Called as each stage finishes; returns the names of stages to cancel, if any
+StageCallback = Callable[[str, Any], Awaitable[Optional[Iterable[str]]]]
+
+
+async def run_stages(stages: Dict[str, Stage], on_complete: Optional[StageCallback] = None) -> Dict[str, Any]:
+    """
+    Run a graph of stages, each as soon as its dependencies have finished.
+
+    Stages without a dependency between them run concurrently. A stage that
+    raises records the exception as its result, and stages depending on it
+    are skipped with StageSkipped. After each stage finishes, on_complete is
+    awaited with its name and result. It can return stage names to cancel;
+    they and the stages depending on them are left out of the results. If
+    on_complete raises, every unfinished stage is cancelled and the
+    exception propagates.
+
+    Args:
+        stages: Stages by name
+        on_complete: Coroutine called with (name, result) as each stage finishes or is skipped
+
+    Returns:
+        Result or exception of every stage that was not cancelled, by name
+
+    Raises:
+        ValueError: If a stage depends on an unknown stage or the dependencies form a cycle
+    """
+    for name, stage in stages.items():
+        unknown = [dependency for dependency in stage.depends_on if dependency not in stages]
+        if unknown:
+            raise ValueError(f"Stage {name} depends on unknown stages: {', '.join(unknown)}")
+
+    results: Dict[str, Any] = {}
+    waiting = dict(stages)
+    running: Dict[asyncio.Task, str] = {}
+    cancelled_tasks = []
+
+    def cancel(name: str) -> None:
+        waiting.pop(name, None)
+        for task, task_name in list(running.items()):
+            if task_name == name:
+                task.cancel()
+                running.pop(task)
+                cancelled_tasks.append(task)
+        # Stages that needed the cancelled one can no longer run either
+        for dependent, stage in list(waiting.items()):
+            if name in stage.depends_on:
+                cancel(dependent)
+
+    async def finish(name: str, result: Any) -> None:
+        results[name] = result
+        cancelled = await on_complete(name, result) if on_complete else None
+        for cancelled_name in cancelled or ():
+            if cancelled_name not in results:
+                logger.debug(f"Stage {cancelled_name} cancelled after {name}")
+                cancel(cancelled_name)
+
+    try:
+        while True:
+            ready = [name for name, stage in waiting.items() if all(d in results for d in stage.depends_on)]
+            for name in ready:
+                stage = waiting.pop(name, None)
+                if stage is None:
+                    continue
+                failed = [d for d in stage.depends_on if isinstance(results[d], Exception)]
+                if failed:
+                    await finish(name, StageSkipped(f"Stage {name} skipped: {', '.join(failed)} failed"))
+                else:
+                    running[asyncio.create_task(stage.run(results))] = name
+
+            if not running:
+                if any(all(d in results for d in stage.depends_on) for stage in waiting.values()):
+                    # A skipped stage unblocked others
+                    continue
+                if waiting:
+                    raise ValueError(f"Stages {', '.join(waiting)} depend on each other")
+                return results
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task, None)
+                if name is None:
+                    # Cancelled by an earlier stage in this batch
+                    continue
+                try:
+                    result = task.result()
+                except Exception as e:
+                    result = e
+                await finish(name, result)
+    finally:
+        for task in running:
+            task.cancel()
+        cancelled_tasks.extend(running)
+        if cancelled_tasks:
+            await asyncio.gather(*cancelled_tasks, return_exceptions=True)
@@ -0,0 +1,161 @@
+import asyncio
+import inspect
+import logging
+from typing import Any, Dict, Optional, Union
+
+import aiohttp
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
+
+logger = logging.getLogger(__name__)
+
+
+async def maybe_await(value: Any) -> Any:
+    """
+    Resolve the result of a Web3 call made against either provider mode.
+
+    AsyncWeb3 returns coroutines from `eth.*` calls, properties and contract
+    calls, while the synchronous Web3 client returns plain values. Wrapping every
+    call site with this helper lets services run unchanged on both.
+
+    Args:
+        value: A value or awaitable returned by a Web3 call
+
+    Returns:
+        The resolved value
+    """
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class PooledAsyncHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider backed by a keep-alive aiohttp session with a bounded pool.
+
+    The stock provider creates sessions with `force_close=True`, so every RPC call
+    pays a fresh TCP/TLS handshake. This provider installs its own session on first
+    use in each event loop and reuses connections across all requests.
+    """
+
+    def __init__(self, endpoint_uri: str, pool_size: int = 20, request_timeout: float = 30.0):
+        """
+        Initialize the provider.
+
+        Args:
+            endpoint_uri: JSON-RPC endpoint URL
+            pool_size: Maximum number of concurrent connections to the endpoint
+            request_timeout: Total timeout for a single RPC request in seconds
+        """
+        super().__init__(
+            endpoint_uri,
+            request_kwargs={"timeout": aiohttp.ClientTimeout(total=request_timeout)},
+            # AsyncWeb3 re-validates chainId around contract calls; it never changes
+            cache_allowed_requests=True,
+            cacheable_requests={"eth_chainId"}
+        )
+        self.pool_size = pool_size
+        self.request_timeout = request_timeout
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session_lock: Optional[asyncio.Lock] = None
+        self._session_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _ensure_pooled_session(self) -> None:
+        """Install the pooled session for the running event loop if not already done."""
+        loop = asyncio.get_running_loop()
+        if self._session_loop is loop:
+            return
+
+        if self._session_lock_loop is not loop:
+            self._session_lock = asyncio.Lock()
+            self._session_lock_loop = loop
+
+        async with self._session_lock:
+            if self._session_loop is loop:
+                return
+
+            if self._session_loop is not None:
+                # Sessions bound to a previous loop cannot be reused
+                try:
+                    await self.disconnect()
+                except Exception as e:
+                    logger.debug(f"Error discarding stale RPC session: {str(e)}")
+
+            session = aiohttp.ClientSession(
+                raise_for_status=True,
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_size,
+                    limit_per_host=self.pool_size,
+                    enable_cleanup_closed=True
+                )
+            )
+            await self.cache_async_session(session)
+            self._session_loop = loop
+            logger.info(f"Pooled RPC session created for {self.endpoint_uri} (pool size: {self.pool_size})")
+
+    async def make_request(self, method, params):
+        await self._ensure_pooled_session()
+        return await super().make_request(method, params)
+
+    async def make_batch_request(self, batch_requests):
+        await self._ensure_pooled_session()
+        return await super().make_batch_request(batch_requests)
+
+    async def disconnect(self) -> None:
+        await super().disconnect()
+        self._session_loop = None
+
+
+# Providers are shared per endpoint so every service instance reuses one pool
+_async_providers: Dict[str, PooledAsyncHTTPProvider] = {}
+
+
+def get_async_provider(endpoint_uri: str, pool_size: int = 20, request_timeout: float = 30.0) -> PooledAsyncHTTPProvider:
+    """
+    Get the shared pooled async provider for an endpoint, creating it if needed.
+
+    Args:
+        endpoint_uri: JSON-RPC endpoint URL
+        pool_size: Maximum number of concurrent connections (used on creation only)
+        request_timeout: Request timeout in seconds (used on creation only)
+
+    Returns:
+        The shared PooledAsyncHTTPProvider instance
+    """
+    provider = _async_providers.get(endpoint_uri)
+    if provider is None:
+        provider = PooledAsyncHTTPProvider(endpoint_uri, pool_size=pool_size, request_timeout=request_timeout)
+        _async_providers[endpoint_uri] = provider
+    return provider
+
+
+def create_web3(
+    endpoint_uri: str,
+    use_async: bool = True,
+    pool_size: int = 20,
+    request_timeout: float = 30.0
+) -> Union[Web3, AsyncWeb3]:
+    """
+    Create a Web3 client for the given endpoint.
+
+    Args:
+        endpoint_uri: JSON-RPC endpoint URL
+        use_async: Whether to create a non-blocking AsyncWeb3 client
+        pool_size: Connection pool size for the async provider
+        request_timeout: Request timeout in seconds
+
+    Returns:
+        AsyncWeb3 instance on the shared pooled provider, or a synchronous Web3 instance
+    """
+    if use_async:
+        return AsyncWeb3(get_async_provider(endpoint_uri, pool_size, request_timeout))
+    return Web3(Web3.HTTPProvider(endpoint_uri, request_kwargs={"timeout": request_timeout}))
+
+
+async def close_async_providers() -> None:
+    """Close all pooled RPC sessions. Call on application shutdown."""
+    for endpoint_uri, provider in list(_async_providers.items()):
+        try:
+            await provider.disconnect()
+        except Exception as e:
+            logger.error(f"Error closing RPC provider for {endpoint_uri}: {str(e)}")
+    _async_providers.clear()
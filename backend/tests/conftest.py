@@ -1,4 +1,8 @@
 # conftest.py
+import asyncio
+import json
+import time
+
 import pytest
 import pytest_asyncio
 from unittest.mock import MagicMock, AsyncMock
@@ -40,6 +44,13 @@ def mock_asset_repo():
     repo.update_asset = AsyncMock()
     repo.update_assets = AsyncMock()
     repo.delete_asset = AsyncMock()
+    repo.claim_current_version = AsyncMock()
+    repo.restore_current_version = AsyncMock(return_value=None)
+
+    async def run_in_transaction(operation):
+        return await operation(None)
+
+    repo.run_in_transaction = AsyncMock(side_effect=run_in_transaction)
     return repo
 
 @pytest.fixture
@@ -322,4 +333,176 @@ def client():
     """Create test client for FastAPI app."""
     from fastapi.testclient import TestClient
     from app.main import app
-    return TestClient(app)
\ No newline at end of file
+    return TestClient(app)
+
+# Redis Fake
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio commands the services use.
+
+    Counts round trips so tests can check batching: a pipeline is one round
+    trip however many commands it queues.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.zsets = {}
+        self.expires = {}
+        self.published = []
+        self.channels = {}
+        self.round_trips = 0
+        self.in_pipeline = False
+
+    def _round_trip(self):
+        if not self.in_pipeline:
+            self.round_trips += 1
+
+    def _alive(self, key):
+        if key in self.expires and self.expires[key] <= time.time():
+            for store in (self.values, self.hashes, self.zsets):
+                store.pop(key, None)
+            self.expires.pop(key)
+        return key in self.values or key in self.hashes or key in self.zsets
+
+    def keys(self, pattern):
+        raise AssertionError("KEYS must not be used")
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def get(self, key):
+        self._round_trip()
+        return self.values.get(key) if self._alive(key) else None
+
+    async def mget(self, keys):
+        self._round_trip()
+        return [self.values.get(key) if self._alive(key) else None for key in keys]
+
+    async def set(self, key, value, ex=None, nx=False, xx=False, keepttl=False):
+        self._round_trip()
+        if (nx and self._alive(key)) or (xx and not self._alive(key)):
+            return None
+        self.values[key] = value
+        if ex:
+            self.expires[key] = time.time() + ex
+        elif not keepttl:
+            self.expires.pop(key, None)
+        return True
+
+    async def exists(self, key):
+        self._round_trip()
+        return int(self._alive(key))
+
+    async def delete(self, *keys):
+        self._round_trip()
+        deleted = 0
+        for key in keys:
+            if self._alive(key):
+                deleted += 1
+            for store in (self.values, self.hashes, self.zsets):
+                store.pop(key, None)
+        return deleted
+
+    async def expire(self, key, seconds, nx=False):
+        return await self.expireat(key, time.time() + seconds, nx=nx)
+
+    async def expireat(self, key, when, nx=False, gt=False):
+        self._round_trip()
+        current = self.expires.get(key)
+        if (nx and current is not None) or (gt and (current is None or when <= current)):
+            return False
+        self.expires[key] = when
+        return True
+
+    async def hset(self, key, mapping):
+        self._round_trip()
+        self._alive(key)
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def hgetall(self, key):
+        self._round_trip()
+        return dict(self.hashes.get(key, {})) if self._alive(key) else {}
+
+    async def zadd(self, key, mapping):
+        self._round_trip()
+        self._alive(key)
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zrem(self, key, *members):
+        self._round_trip()
+        zset = self.zsets.get(key, {})
+        removed = sum(1 for m in members if zset.pop(m, None) is not None)
+        if key in self.zsets and not zset:
+            del self.zsets[key]
+        return removed
+
+    async def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        doomed = [m for m, score in zset.items() if float(low) <= score <= float(high)]
+        return await self.zrem(key, *doomed) if doomed else 0
+
+    async def zrangebyscore(self, key, low, high):
+        self._round_trip()
+        zset = self.zsets.get(key, {}) if self._alive(key) else {}
+        return [m for m, score in sorted(zset.items(), key=lambda i: i[1]) if float(low) <= score <= float(high)]
+
+    async def publish(self, channel, message):
+        self._round_trip()
+        self.published.append((channel, json.loads(message)))
+        for queue in self.channels.get(channel, ()):
+            queue.put_nowait({"type": "message", "channel": channel, "data": message})
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        # Every queued command shares one round trip
+        self.redis.round_trips += 1
+        self.redis.in_pipeline = True
+        try:
+            return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        finally:
+            self.redis.in_pipeline = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.redis.channels.setdefault(channel, []).append(self.queue)
+
+    async def unsubscribe(self, channel):
+        self.redis.channels[channel].remove(self.queue)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def redis_client():
+    """Create an in-memory FakeRedis shared by everything in one test."""
+    return FakeRedis()
@@ -0,0 +1,125 @@
+"""
+Address Query Test: case-insensitive regex vs. normalized lowercase fields
+
+Seeds a scratch database with asset documents whose walletAddress values use
+mixed capitalization, as stored by the API before walletAddressLower existed.
+It then compares the old dashboard query ($or of exact and case-insensitive
+regex matches) with the exact match on walletAddressLower. The backfill is
+timed too. Both queries run with the indexes the API creates at startup.
+
+Requires a MongoDB server (MONGODB_URI, default mongodb://localhost:27017).
+The scratch database is dropped afterwards unless --keep is given.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.address_query_test [--docs 1000000] [--wallets 10000] [--queries 50]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.database import backfill_lowercase_fields
+from app.repositories.asset_repo import AssetRepository
+
+
+def random_wallet():
+    address = "".join(random.choice("0123456789abcdef") for _ in range(40))
+    # Mimic checksummed addresses: random capitalization of the hex letters
+    return "0x" + "".join(c.upper() if random.random() < 0.5 else c for c in address)
+
+
+async def seed(collection, docs: int, wallets):
+    now = datetime.now(timezone.utc)
+    batch = []
+    for i in range(docs):
+        batch.append({
+            "assetId": f"addr-bench-{i}",
+            "versionNumber": 1,
+            "walletAddress": random.choice(wallets),
+            "ipfsHash": "bafkreibench",
+            "lastUpdated": now - timedelta(seconds=i),
+            "criticalMetadata": {"name": f"Asset {i}"},
+            "isCurrent": True,
+            "isDeleted": False,
+        })
+        if len(batch) == 10000:
+            await collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+
+
+async def time_query(collection, queries):
+    latencies = []
+    examined = []
+    for query in queries:
+        start = time.perf_counter()
+        await collection.find(query).sort("lastUpdated", -1).to_list(length=None)
+        latencies.append(time.perf_counter() - start)
+        stats = await collection.find(query).sort("lastUpdated", -1).explain()
+        examined.append(stats["executionStats"]["totalDocsExamined"])
+    return statistics.median(latencies) * 1000, max(latencies) * 1000, statistics.mean(examined)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare regex and lowercase-field wallet queries")
+    parser.add_argument("--docs", type=int, default=1_000_000, help="Asset documents to seed")
+    parser.add_argument("--wallets", type=int, default=10_000, help="Distinct wallets")
+    parser.add_argument("--queries", type=int, default=50, help="Wallets to query per mode")
+    parser.add_argument("--db", default="fusevault_address_bench", help="Scratch database name")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+    db = client[args.db]
+    collection = db["assets"]
+    await collection.drop()
+
+    wallets = [random_wallet() for _ in range(args.wallets)]
+    print(f"Seeding {args.docs} assets across {args.wallets} wallets...")
+    start = time.perf_counter()
+    await seed(collection, args.docs, wallets)
+    print(f"Seeded in {time.perf_counter() - start:.1f}s")
+
+    await AssetRepository(SimpleNamespace(assets_collection=collection)).create_indexes()
+
+    sample = [w.lower() for w in random.sample(wallets, min(args.queries, len(wallets)))]
+    regex_queries = [
+        {
+            "$or": [
+                {"walletAddress": w},
+                {"walletAddress": {"$regex": f"^{w}$", "$options": "i"}},
+            ],
+            "isCurrent": True,
+            "isDeleted": False,
+        }
+        for w in sample
+    ]
+    regex_result = await time_query(collection, regex_queries)
+
+    start = time.perf_counter()
+    migrated = await backfill_lowercase_fields(collection, {"walletAddress": "walletAddressLower"}, batch_size=5000)
+    backfill_s = time.perf_counter() - start
+
+    exact_queries = [{"walletAddressLower": w, "isCurrent": True, "isDeleted": False} for w in sample]
+    exact_result = await time_query(collection, exact_queries)
+
+    if not args.keep:
+        await client.drop_database(args.db)
+    client.close()
+
+    print(f"\nBackfilled {migrated} documents in {backfill_s:.1f}s")
+    print(f"{'query':<18}{'p50 (ms)':>12}{'max (ms)':>12}{'docs examined':>16}")
+    for name, (p50, worst, docs_examined) in (("regex $or", regex_result), ("walletAddressLower", exact_result)):
+        print(f"{name:<18}{p50:>12.2f}{worst:>12.2f}{docs_examined:>16.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
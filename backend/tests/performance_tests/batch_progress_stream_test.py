@@ -0,0 +1,134 @@
+"""
+Batch Progress Stream Test: client polling vs. Server-Sent Events
+
+Runs concurrent clients that each follow one batch upload while a simulated
+background task moves the batch's assets through uploading -> completed,
+prepares the blockchain transaction and finishes the batch.
+
+- poll: GET /upload/batch/{batch_id}/progress every --interval seconds until
+  blockchain_prepared, as the frontend does. Every poll returns the full asset map.
+- stream: one GET /upload/batch/{batch_id}/stream that receives a snapshot,
+  then only the changes, and closes when the batch finishes.
+
+Reports requests, response bytes and process CPU time for each mode. Requests
+go through the upload router in-process (httpx ASGI transport) with a stub
+auth middleware, so the real per-request session or API key lookup is not
+included; polling costs more than shown here in production.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.batch_progress_stream_test [--clients 50] [--assets 50] [--duration 5] [--interval 0.5]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.api import upload_routes
+from app.services import progress_service
+from app.services.progress_service import BatchProgressTracker
+
+WALLET = "0x2c7536E3605D9C16a7a3D7b1898e529396a65c23"
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(upload_routes.router)
+
+    @app.middleware("http")
+    async def authenticate(request, call_next):
+        request.state.user = {"walletAddress": WALLET}
+        request.state.auth_context = {"wallet_address": WALLET, "auth_method": "wallet", "permissions": ["read"]}
+        return await call_next(request)
+
+    return app
+
+
+async def simulate_batch(tracker: BatchProgressTracker, batch_id: str, assets: int, duration: float, rng: random.Random):
+    """Move every asset through uploading -> completed within `duration` seconds, then prepare and finish."""
+    asset_ids = [f"{batch_id}-asset-{i}" for i in range(assets)]
+    await tracker.create_batch(batch_id, asset_ids, assets)
+
+    async def upload(asset_id: str):
+        await asyncio.sleep(rng.uniform(0, duration * 0.3))
+        tracker.update_asset_progress(batch_id, asset_id, 0, "uploading")
+        await asyncio.sleep(rng.uniform(0, duration * 0.6))
+        tracker.update_asset_progress(batch_id, asset_id, 100, "completed")
+
+    await asyncio.gather(*(upload(asset_id) for asset_id in asset_ids))
+    await asyncio.sleep(duration * 0.1)
+    await tracker.set_blockchain_prepared(batch_id, {"transaction": {"to": "0x" + "22" * 20, "data": "0x"}}, f"pending_tx:{batch_id}")
+    await tracker.finish_batch(batch_id)
+
+
+async def poll_client(client: httpx.AsyncClient, batch_id: str, interval: float, stats: dict):
+    while True:
+        response = await client.get(f"/upload/batch/{batch_id}/progress")
+        stats["requests"] += 1
+        stats["bytes"] += len(response.content)
+        if response.json().get("blockchain_prepared"):
+            return
+        await asyncio.sleep(interval)
+
+
+async def stream_client(client: httpx.AsyncClient, batch_id: str, interval: float, stats: dict):
+    response = await client.get(f"/upload/batch/{batch_id}/stream")
+    stats["requests"] += 1
+    stats["bytes"] += len(response.content)
+    stats["messages"] += response.text.count("data: ")
+
+
+async def run_mode(mode: str, clients: int, assets: int, duration: float, interval: float, seed: int):
+    tracker = BatchProgressTracker()
+    progress_service.get_progress_tracker = lambda: tracker
+    rng = random.Random(seed)
+    stats = {"requests": 0, "bytes": 0, "messages": 0}
+    follow = poll_client if mode == "poll" else stream_client
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=build_app()), base_url="http://bench") as client:
+        batch_ids = [f"batch-{i}" for i in range(clients)]
+        # Create batches up front so clients never see a 404
+        for batch_id in batch_ids:
+            await tracker.create_batch(batch_id, [], 0)
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        await asyncio.gather(
+            *(simulate_batch(tracker, batch_id, assets, duration, rng) for batch_id in batch_ids),
+            *(follow(client, batch_id, interval, stats) for batch_id in batch_ids)
+        )
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+
+    return {"mode": mode, **stats, "cpu_s": cpu, "wall_s": wall}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare batch progress polling with the SSE stream")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent clients, one batch each")
+    parser.add_argument("--assets", type=int, default=50, help="Assets per batch")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds each simulated batch takes")
+    parser.add_argument("--interval", type=float, default=0.5, help="Polling interval in seconds")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for upload timings")
+    args = parser.parse_args()
+
+    results = [
+        await run_mode(mode, args.clients, args.assets, args.duration, args.interval, args.seed)
+        for mode in ("poll", "stream")
+    ]
+
+    print(f"\n{args.clients} clients x {args.assets} assets, {args.duration}s per batch, polling every {args.interval}s")
+    print(f"{'mode':<8}{'requests':>10}{'KB sent':>10}{'CPU (s)':>10}{'wall (s)':>10}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['requests']:>10}{r['bytes'] / 1024:>10.1f}{r['cpu_s']:>10.2f}{r['wall_s']:>10.2f}")
+    poll, stream = results
+    print(f"\nstream: {poll['requests'] / stream['requests']:.0f}x fewer requests, "
+          f"{poll['bytes'] / max(stream['bytes'], 1):.1f}x fewer bytes, "
+          f"{stream['messages']} SSE messages")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
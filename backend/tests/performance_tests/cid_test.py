@@ -0,0 +1,96 @@
+"""
+CID Computation Test: in-process vs. web3-storage-service /calculate-cid
+
+Computes CIDs for the IPFS payloads built from test_data/json (the same bytes
+the retrieve and re-upload paths hash) with the local UnixFS encoder and, if
+the Node storage service is reachable, through its /calculate-cid endpoint.
+Reports per-call latency for both and checks that they agree.
+
+Usage (from the backend directory, storage service running for the HTTP column):
+    python -m tests.performance_tests.cid_test [--iterations 50] [--service-url http://localhost:8080]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+import httpx
+
+from app.utilities.cid_utils import compute_cid
+from app.utilities.format import format_json, get_ipfs_metadata
+
+TEST_DATA = Path(__file__).resolve().parents[3] / "test_data" / "json"
+
+
+def load_payloads():
+    payloads = []
+    for path in sorted(TEST_DATA.glob("*.json")):
+        data = json.loads(path.read_text())
+        metadata = {
+            "asset_id": data.get("asset_id", data.get("assetId")),
+            "wallet_address": data.get("wallet_address", data.get("walletAddress")),
+            "critical_metadata": data.get("critical_metadata", data.get("criticalMetadata")),
+        }
+        try:
+            payloads.append((path.name, format_json(get_ipfs_metadata(metadata))))
+        except ValueError:
+            continue
+    return payloads
+
+
+def time_calls(fn, payloads, iterations):
+    latencies = []
+    results = {}
+    for _ in range(iterations):
+        for name, payload in payloads:
+            start = time.perf_counter()
+            results[name] = fn(payload)
+            latencies.append(time.perf_counter() - start)
+    return latencies, results
+
+
+def summarize(label, latencies):
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+    print(f"{label:<10}{statistics.mean(latencies) * 1e6:>14.1f}{statistics.median(latencies) * 1e6:>14.1f}{p99 * 1e6:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare local CID computation with the /calculate-cid HTTP path")
+    parser.add_argument("--iterations", type=int, default=50, help="Passes over the payload corpus")
+    parser.add_argument("--service-url", default="http://localhost:8080", help="web3-storage-service base URL")
+    args = parser.parse_args()
+
+    payloads = load_payloads()
+    print(f"{len(payloads)} payloads from {TEST_DATA}, {args.iterations} iterations")
+
+    local_latencies, local_cids = time_calls(compute_cid, payloads, args.iterations)
+
+    remote_latencies = None
+    with httpx.Client(timeout=30.0) as client:
+        def remote(payload):
+            response = client.post(
+                f"{args.service_url}/calculate-cid",
+                files={"file": ("metadata.json", payload, "application/json")}
+            )
+            response.raise_for_status()
+            return response.json()["computed_cid"]
+
+        try:
+            remote_latencies, remote_cids = time_calls(remote, payloads, args.iterations)
+        except httpx.HTTPError as e:
+            print(f"Storage service unavailable at {args.service_url} ({e}); reporting local timings only")
+
+    print(f"\n{'path':<10}{'mean (us)':>14}{'p50 (us)':>14}{'p99 (us)':>14}")
+    summarize("local", local_latencies)
+    if remote_latencies:
+        summarize("http", remote_latencies)
+        mismatches = [name for name in local_cids if local_cids[name] != remote_cids.get(name)]
+        print(f"\nSpeedup (mean): {statistics.mean(remote_latencies) / statistics.mean(local_latencies):.0f}x")
+        print(f"CID mismatches: {len(mismatches)}" + (f" ({', '.join(mismatches)})" if mismatches else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Contract Read Test: one eth_call per asset vs. batched view calls
+
+Reads the pending transfer of every asset a wallet owns, as
+TransferHandler.get_pending_transfers does, and the on-chain state of a
+50-asset batch deletion, as DeleteHandler.prepare_batch_deletion does.
+
+- single: the previous behaviour; one getPendingTransfer / assetExists
+  eth_call per asset, awaited one after another
+- batch: the *_many methods with Multicall3 missing from the chain; each
+  chunk of BLOCKCHAIN_READ_BATCH_SIZE calls is one JSON-RPC batch request
+- multicall: the *_many methods with Multicall3 deployed; each chunk is one
+  aggregate3 eth_call
+
+The chain is a local stub JSON-RPC server with injected latency per HTTP
+request, so a JSON-RPC batch costs one round-trip.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.contract_read_test [--assets 200] [--batch-size 100] [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.config import settings
+from app.services.blockchain_service import BlockchainService
+from app.utilities.web3_utils import close_async_providers
+from tests.performance_tests.stubs import StubRPCServer
+
+OWNER = "0x" + "66" * 20
+
+
+async def read_single(service: BlockchainService, method: str, assets):
+    single = service.get_pending_transfer if method == "pending" else service.check_asset_exists
+    return [await single(asset_id, owner) for asset_id, owner in assets]
+
+
+async def read_many(service: BlockchainService, method: str, assets):
+    many = service.get_pending_transfer_many if method == "pending" else service.check_asset_exists_many
+    return await many(assets)
+
+
+async def run_mode(mode: str, latency: float, assets: int):
+    rpc = StubRPCServer(latency=latency, multicall=mode == "multicall").start()
+    settings.alchemy_sepolia_url = rpc.url
+    rows = {}
+    try:
+        service = BlockchainService()
+        workloads = {
+            "pending": [(f"asset-{i}", OWNER) for i in range(assets)],
+            "exists": [(f"asset-{i}", OWNER) for i in range(50)],
+        }
+        # Warm up chain ID lookup and the Multicall3 code check
+        await read_many(service, "exists", workloads["exists"][:1])
+        for method, items in workloads.items():
+            round_trips = rpc.round_trips
+            start = time.perf_counter()
+            results = await (read_single if mode == "single" else read_many)(service, method, items)
+            assert len(results) == len(items) and not any(isinstance(r, Exception) for r in results)
+            rows[method] = {"round_trips": rpc.round_trips - round_trips, "seconds": time.perf_counter() - start}
+    finally:
+        await close_async_providers()
+        rpc.stop()
+    return rows
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare per-asset view calls with batched reads")
+    parser.add_argument("--assets", type=int, default=200, help="Assets owned by the wallet for the pending transfer read")
+    parser.add_argument("--batch-size", type=int, default=100, help="BLOCKCHAIN_READ_BATCH_SIZE")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub RPC latency per HTTP request in seconds")
+    args = parser.parse_args()
+
+    settings.blockchain_read_batch_size = args.batch_size
+    results = {mode: await run_mode(mode, args.latency, args.assets) for mode in ("single", "batch", "multicall")}
+
+    print(f"\nLatency {args.latency * 1000:.0f} ms per round-trip, read batch size {args.batch_size}")
+    print(f"{'read':<34}{'mode':<11}{'round-trips':>12}{'seconds':>9}")
+    labels = {"pending": f"pending transfers ({args.assets} assets)", "exists": "batch deletion check (50 assets)"}
+    for method, label in labels.items():
+        for mode, rows in results.items():
+            r = rows[method]
+            print(f"{label:<34}{mode:<11}{r['round_trips']:>12}{r['seconds']:>9.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
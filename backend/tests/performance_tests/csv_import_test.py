@@ -0,0 +1,137 @@
+"""
+CSV Import Test: row-at-a-time processing vs. the streaming batch pipeline
+
+Imports the same generated CSV as an API key user uploading on behalf of
+several owner wallets.
+
+- per_row: the previous process_csv_upload loop; the file is parsed in one go
+  and every row is awaited through process_metadata, i.e. one IPFS upload and
+  one server-signed updateIPFSFor transaction after another
+- pipeline: process_csv_upload; the file is parsed in chunks and rows are
+  grouped per owner into 50-asset batchUpdateIPFSFor transactions processed
+  by CSV_IMPORT_WORKERS concurrent workers
+
+The chain and web3-storage-service are local stubs with injected latency;
+MongoDB is replaced by an in-memory asset service.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.csv_import_test [--rows 50] [--owners 2] [--workers 4] [--mining-delay 0.2]
+"""
+
+import argparse
+import asyncio
+import io
+import time
+
+import pandas as pd
+from starlette.datastructures import UploadFile
+
+from app.config import settings
+from app.handlers.upload_handler import UploadHandler
+from app.services.blockchain_service import BlockchainService
+from app.services.ipfs_service import IPFSService
+from app.services.service_container import close_service_container
+from app.utilities.http_client import close_http_client
+from app.utilities.web3_utils import close_async_providers
+from tests.performance_tests.stubs import MemoryAssetService, StubRPCServer, StubStorageService
+
+API_KEY_USER = "0x" + "33" * 20
+
+
+def make_csv(rows: int, owners: int) -> bytes:
+    lines = ["asset_id,wallet_address,name,serial,notes"]
+    for i in range(rows):
+        owner = f"0x{(i % owners) + 1:040x}"
+        lines.append(f"csv-import-{i},{owner},Asset {i},SN-{i:06d},imported row {i}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def per_row(handler: UploadHandler, content: bytes):
+    """The previous implementation: whole-file parse, one awaited row at a time."""
+    df = pd.read_csv(io.StringIO(content.decode("utf-8")))
+    results = []
+    for _, row in df.iterrows():
+        row_dict = row.to_dict()
+        owner_address = str(row_dict["wallet_address"])
+        if await handler._check_owner_delegation(owner_address, API_KEY_USER):
+            continue
+        results.append(await handler.process_metadata(
+            asset_id=str(row_dict["asset_id"]),
+            owner_address=owner_address,
+            initiator_address=API_KEY_USER,
+            critical_metadata={"name": row_dict["name"], "serial": row_dict["serial"]},
+            non_critical_metadata={"notes": row_dict["notes"]},
+            file_info={"filename": "import.csv"}
+        ))
+    return {"success": sum(1 for r in results if r["status"] == "success")}
+
+
+async def pipeline(handler: UploadHandler, content: bytes):
+    upload = UploadFile(file=io.BytesIO(content), filename="import.csv")
+    result = await handler.process_csv_upload([upload], API_KEY_USER, ["name", "serial"])
+    return result["status_counts"]
+
+
+async def run_mode(mode, rpc: StubRPCServer, storage: StubStorageService, content: bytes):
+    await close_service_container()
+    handler = UploadHandler(
+        asset_service=MemoryAssetService(),
+        ipfs_service=IPFSService(),
+        blockchain_service=BlockchainService(),
+        auth_context={"auth_method": "api_key", "wallet_address": API_KEY_USER}
+    )
+
+    rpc_before = rpc.request_count
+    sent_before = len(rpc._sent_at)
+    storage_before = storage.request_count
+    start = time.perf_counter()
+    counts = await (per_row if mode == "per_row" else pipeline)(handler, content)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "succeeded": counts.get("success", 0),
+        "transactions": len(rpc._sent_at) - sent_before,
+        "rpc_calls": rpc.request_count - rpc_before,
+        "ipfs_calls": storage.request_count - storage_before,
+        "seconds": elapsed,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare row-at-a-time CSV import with the batch pipeline")
+    parser.add_argument("--rows", type=int, default=50, help="Rows in the generated CSV")
+    parser.add_argument("--owners", type=int, default=2, help="Distinct owner wallets across the rows")
+    parser.add_argument("--workers", type=int, default=4, help="CSV_IMPORT_WORKERS for the pipeline")
+    parser.add_argument("--latency", type=float, default=0.01, help="Stub RPC and storage latency per call in seconds")
+    parser.add_argument("--mining-delay", type=float, default=0.2, help="Seconds before a transaction has a receipt")
+    args = parser.parse_args()
+
+    rpc = StubRPCServer(latency=args.latency, mining_delay=args.mining_delay).start()
+    storage = StubStorageService(latency=args.latency, handshake=0.0).start()
+    settings.alchemy_sepolia_url = rpc.url
+    settings.web3_storage_service_url = storage.url
+    # Sequential per-row writes never share a batch, so don't make them wait for one
+    settings.blockchain_write_batching = False
+    settings.csv_import_workers = args.workers
+
+    content = make_csv(args.rows, args.owners)
+    try:
+        results = [await run_mode(mode, rpc, storage, content) for mode in ("per_row", "pipeline")]
+    finally:
+        await close_async_providers()
+        await close_http_client()
+        rpc.stop()
+        storage.stop()
+
+    print(f"\n{args.rows} rows over {args.owners} owner(s), {args.workers} workers, "
+          f"latency {args.latency * 1000:.0f} ms, mining {args.mining_delay:.1f} s")
+    print(f"{'mode':<10}{'ok':>6}{'txs':>6}{'RPC calls':>11}{'IPFS calls':>12}{'seconds':>9}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['succeeded']:>6}{r['transactions']:>6}{r['rpc_calls']:>11}"
+              f"{r['ipfs_calls']:>12}{r['seconds']:>9.2f}")
+    print(f"\npipeline: {results[0]['seconds'] / results[1]['seconds']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
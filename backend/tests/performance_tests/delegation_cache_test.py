@@ -0,0 +1,85 @@
+"""
+Delegation Cache Test: per-row delegates() calls vs. the delegation cache
+
+Replays the two-step delegation check that process_csv_upload,
+handle_json_files, process_batch_metadata and prepare_batch_deletion run for
+every row of an API key upload on behalf of another wallet: one
+delegates(owner, api_key_user) and one delegates(owner, server_wallet) call
+per row.
+
+- uncached: DELEGATION_CACHE_ENABLED=false, every check is an eth_call
+- cached: DELEGATION_STRICT_WRITES=false, checks after the first per pair are served from the cache
+- strict: DELEGATION_STRICT_WRITES=true (the default), write checks read the chain;
+  concurrent identical checks share one call
+
+The chain is a local stub JSON-RPC server with injected latency.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.delegation_cache_test [--rows 200] [--owners 1] [--latency 0.005]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.config import settings
+from app.services.blockchain_service import BlockchainService
+from app.services.service_container import close_service_container, get_delegation_cache
+from app.utilities.web3_utils import close_async_providers
+from tests.performance_tests.stubs import StubRPCServer
+
+API_KEY_USER = "0x" + "33" * 20
+
+
+async def run_mode(mode: str, rpc: StubRPCServer, rows: int, owners: int):
+    settings.delegation_cache_enabled = mode != "uncached"
+    settings.delegation_strict_writes = mode == "strict"
+    await close_service_container()
+
+    service = BlockchainService()
+    server_wallet = service.get_server_wallet_address()
+    owner_addresses = [f"0x{i + 1:040x}" for i in range(owners)]
+
+    requests_before = rpc.request_count
+    start = time.perf_counter()
+    for row in range(rows):
+        owner = owner_addresses[row % owners]
+        await service.check_delegation(owner, API_KEY_USER, strict=settings.delegation_strict_writes)
+        await service.check_delegation(owner, server_wallet, strict=settings.delegation_strict_writes)
+    elapsed = time.perf_counter() - start
+
+    cache = get_delegation_cache()
+    return {
+        "mode": mode,
+        "checks": rows * 2,
+        "rpc_calls": rpc.request_count - requests_before,
+        "seconds": elapsed,
+        "hit_rate": cache.stats()["hit_rate"] if cache else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Measure RPC calls saved by the delegation cache")
+    parser.add_argument("--rows", type=int, default=200, help="Rows in the simulated upload")
+    parser.add_argument("--owners", type=int, default=1, help="Distinct owner wallets across the rows")
+    parser.add_argument("--latency", type=float, default=0.005, help="Stub RPC latency per call in seconds")
+    args = parser.parse_args()
+
+    rpc = StubRPCServer(latency=args.latency).start()
+    settings.alchemy_sepolia_url = rpc.url
+    settings.blockchain_write_batching = False
+
+    try:
+        results = [await run_mode(mode, rpc, args.rows, args.owners) for mode in ("uncached", "cached", "strict")]
+    finally:
+        await close_async_providers()
+        rpc.stop()
+
+    print(f"\n{args.rows} rows over {args.owners} owner(s), RPC latency {args.latency * 1000:.0f} ms")
+    print(f"{'mode':<10}{'checks':>8}{'RPC calls':>11}{'hit rate':>10}{'seconds':>9}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['checks']:>8}{r['rpc_calls']:>11}{r['hit_rate']:>10.1%}{r['seconds']:>9.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
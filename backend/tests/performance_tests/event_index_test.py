@@ -0,0 +1,126 @@
+"""
+Event Index Test: log scan vs. the chain event index for tamper recovery
+
+Recovers the latest CID of an asset whose only IPFSUpdated event sits near
+the registry deployment block, far behind the chain head, as
+RetrieveHandler does when it detects tampering.
+
+- scan: EVENT_INDEXER_ENABLED=false; recover_data_from_events scans the
+  chain newest first with concurrent, adaptively sized eth_getLogs calls
+- index: the ChainEventIndexer backfills the registry's events once, then
+  each recovery is one indexed lookup plus a query over the blocks the
+  indexer has not confirmed yet
+
+The chain is a local stub JSON-RPC server with injected latency that serves
+the asset's log. MongoDB is replaced by the in-memory mock collections, so
+the lookup itself costs less here than against a real database.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.event_index_test [--history 300000] [--recoveries 2] [--latency 0.002]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from eth_abi import encode
+from web3 import Web3
+
+from app.config import settings
+from app.database import MockCollection
+from app.repositories.chain_event_repo import ChainEventRepository
+from app.services.blockchain_service import BlockchainService
+from app.services.event_indexer import ChainEventIndexer
+from app.utilities.web3_utils import close_async_providers
+from tests.performance_tests.stubs import StubRPCServer
+
+OWNER = "0x" + "44" * 20
+ASSET_ID = "event-index-asset"
+CID = "bafkreievent"
+DEPLOY_BLOCK = 1000
+
+
+def add_asset_update(rpc: StubRPCServer, service: BlockchainService, block_number: int) -> None:
+    rpc.add_log(
+        service.contract.address,
+        block_number,
+        [
+            bytes.fromhex(service.contract.events.IPFSUpdated.topic[2:]),
+            bytes(12) + bytes.fromhex(OWNER[2:]),
+            Web3.keccak(text=ASSET_ID),
+        ],
+        encode(["uint32", "string", "bool"], [1, CID, False])
+    )
+
+
+async def timed_recoveries(service: BlockchainService, rpc: StubRPCServer, recoveries: int):
+    rpc_before = rpc.request_count
+    start = time.perf_counter()
+    for _ in range(recoveries):
+        recovered = await service.recover_data_from_events(ASSET_ID, OWNER)
+        assert recovered["cid"] == CID
+    elapsed = time.perf_counter() - start
+    return {
+        "rpc_calls": (rpc.request_count - rpc_before) / recoveries,
+        "seconds": elapsed / recoveries,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare log scans with the chain event index for recovery")
+    parser.add_argument("--history", type=int, default=300_000, help="Blocks between the registry deployment and the head")
+    parser.add_argument("--recoveries", type=int, default=2, help="Recoveries timed per mode")
+    parser.add_argument("--latency", type=float, default=0.002, help="Stub RPC latency per call in seconds")
+    parser.add_argument("--block-range", type=int, default=10000, help="EVENT_INDEXER_MAX_BLOCK_RANGE for the backfill")
+    args = parser.parse_args()
+
+    logging.getLogger("app.services.blockchain_service").setLevel(logging.WARNING)
+    rpc = StubRPCServer(latency=args.latency, head_block=DEPLOY_BLOCK + args.history).start()
+    settings.alchemy_sepolia_url = rpc.url
+    settings.event_indexer_max_block_range = args.block_range
+    db_client = SimpleNamespace(
+        chain_events_collection=MockCollection("chain_events"),
+        chain_indexer_state_collection=MockCollection("chain_indexer_state")
+    )
+
+    try:
+        service = BlockchainService()
+        add_asset_update(rpc, service, DEPLOY_BLOCK + 500)
+
+        settings.event_indexer_enabled = False
+        scan = await timed_recoveries(service, rpc, args.recoveries)
+
+        indexer = ChainEventIndexer(
+            service,
+            ChainEventRepository(db_client),
+            start_block=DEPLOY_BLOCK,
+            confirmations=12,
+            max_block_range=args.block_range
+        )
+        rpc_before = rpc.request_count
+        start = time.perf_counter()
+        indexed_events = await indexer.poll_once()
+        backfill = {"rpc_calls": rpc.request_count - rpc_before, "seconds": time.perf_counter() - start}
+
+        settings.event_indexer_enabled = True
+        with patch("app.database.get_db_client", return_value=db_client):
+            index = await timed_recoveries(service, rpc, args.recoveries)
+    finally:
+        await close_async_providers()
+        rpc.stop()
+
+    print(f"\nAsset updated {args.history - 500:,} blocks behind the head, latency {args.latency * 1000:.0f} ms, "
+          f"{args.recoveries} recoveries per mode")
+    print(f"{'mode':<8}{'RPC calls/recovery':>20}{'seconds/recovery':>18}")
+    for mode, r in (("scan", scan), ("index", index)):
+        print(f"{mode:<8}{r['rpc_calls']:>20.0f}{r['seconds']:>18.3f}")
+    print(f"\nOne-off backfill of {args.history:,} blocks: {backfill['rpc_calls']} RPC calls, "
+          f"{backfill['seconds']:.1f} s, {indexed_events} event(s) indexed")
+    print(f"index: {scan['seconds'] / index['seconds']:.0f}x faster per recovery")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""
+Gateway Hedging Test: sequential fallback vs. hedged gateway fetching
+
+Serves the same metadata from three local stub gateways: a degraded primary
+storage service that answers slowly, and two healthy gateways. Measures
+IPFSService.retrieve_metadata latency with the old sequential fallback and with
+hedged requests. The metadata cache is disabled so every call hits the network.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.gateway_hedge_test [--primary-latency 2.0] [--hedge-delay 0.2] [--requests 10]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from app.config import settings
+from app.services.ipfs_service import IPFSService
+from app.utilities.http_client import close_http_client
+from tests.performance_tests.stubs import StubStorageService
+
+
+async def run_mode(hedging: bool, cids, requests: int):
+    settings.ipfs_gateway_hedging = hedging
+    service = IPFSService()
+
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        await service.retrieve_metadata(cids[i % len(cids)])
+        latencies.append(time.perf_counter() - start)
+
+    await close_http_client()
+    return {
+        "mode": "hedged" if hedging else "sequential",
+        "p50_ms": statistics.median(latencies) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and hedged IPFS gateway fetching")
+    parser.add_argument("--primary-latency", type=float, default=2.0, help="Degraded storage service latency in seconds")
+    parser.add_argument("--gateway-latency", type=float, default=0.05, help="Healthy gateway latency in seconds")
+    parser.add_argument("--hedge-delay", type=float, default=0.2, help="IPFS_GATEWAY_HEDGE_DELAY for the hedged run")
+    parser.add_argument("--requests", type=int, default=10, help="Retrievals per mode")
+    args = parser.parse_args()
+
+    primary = StubStorageService(latency=args.primary_latency, handshake=0).start()
+    gateways = [StubStorageService(latency=args.gateway_latency * (i + 1), handshake=0).start() for i in range(2)]
+
+    cids = []
+    for i in range(args.requests):
+        content = json.dumps({"asset_id": f"hedge-{i}", "critical_metadata": {"name": f"Asset {i}"}}).encode()
+        for stub in [primary, *gateways]:
+            cid = stub.put(content)
+        cids.append(cid)
+
+    settings.web3_storage_service_url = primary.url
+    settings.ipfs_gateways = ",".join(f"{g.url}/ipfs/{{cid}}" for g in gateways)
+    settings.ipfs_gateway_hedge_delay = args.hedge_delay
+    settings.ipfs_cache_enabled = False
+
+    try:
+        results = [await run_mode(hedging, cids, args.requests) for hedging in (False, True)]
+    finally:
+        for stub in [primary, *gateways]:
+            stub.stop()
+
+    print(f"\nPrimary latency {args.primary_latency * 1000:.0f} ms, gateways "
+          f"{args.gateway_latency * 1000:.0f}/{args.gateway_latency * 2000:.0f} ms, hedge delay {args.hedge_delay * 1000:.0f} ms")
+    print(f"{'mode':<12}{'p50 (ms)':>12}{'max (ms)':>12}")
+    for r in results:
+        print(f"{r['mode']:<12}{r['p50_ms']:>12.1f}{r['max_ms']:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
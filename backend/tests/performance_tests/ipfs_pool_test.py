@@ -0,0 +1,101 @@
+"""
+IPFS Connection Pool Test: per-call httpx clients vs. the shared pooled client
+
+Runs the 50-asset batch path (IPFSService.store_metadata_batch_concurrent)
+against a local stub of web3-storage-service that charges a delay for every new
+connection, standing in for TCP/TLS handshakes. The "per-call" mode recreates
+the old behaviour of opening a fresh httpx.AsyncClient for every request.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.ipfs_pool_test [--assets 50] [--concurrency 10] [--handshake 0.05] [--runs 3]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+import app.services.ipfs_service as ipfs_service_module
+from app.config import settings
+from app.services.ipfs_service import IPFSService
+from app.utilities.http_client import close_http_client, get_http_client
+from tests.performance_tests.stubs import StubStorageService
+
+WALLET = "0xa87a09e1c8E5F2256CDCAF96B2c3Dbff231D7D7f"
+
+
+def make_assets(count, run):
+    return [
+        {
+            "asset_id": f"pool-test-{run}-{i}",
+            "wallet_address": WALLET,
+            "critical_metadata": {"name": f"Asset {i}", "run": run, "payload": "x" * 512},
+        }
+        for i in range(count)
+    ]
+
+
+async def run_mode(pooled: bool, stub: StubStorageService, assets: int, concurrency: int, runs: int):
+    per_call_clients = []
+
+    def per_call_client():
+        # Old behaviour: a fresh client, and so a fresh connection, for every request
+        client = httpx.AsyncClient(timeout=90.0)
+        per_call_clients.append(client)
+        return client
+
+    ipfs_service_module.get_http_client = get_http_client if pooled else per_call_client
+    service = IPFSService()
+    connections_before = stub.connection_count
+
+    durations = []
+    for run in range(runs):
+        start = time.perf_counter()
+        results = await service.store_metadata_batch_concurrent(make_assets(assets, run), max_concurrent=concurrency)
+        durations.append(time.perf_counter() - start)
+        failed = [r for r in results if r["status"] != "completed"]
+        if failed:
+            raise RuntimeError(f"{len(failed)} uploads failed: {failed[0]['error']}")
+
+    for client in per_call_clients:
+        await client.aclose()
+    await close_http_client()
+
+    return {
+        "mode": "pooled" if pooled else "per-call",
+        "mean_s": statistics.mean(durations),
+        "best_s": min(durations),
+        "connections": stub.connection_count - connections_before,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare per-call and pooled HTTP clients on the batch IPFS upload path")
+    parser.add_argument("--assets", type=int, default=50, help="Assets per batch")
+    parser.add_argument("--concurrency", type=int, default=10, help="max_concurrent passed to the batch upload")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub response latency in seconds")
+    parser.add_argument("--handshake", type=float, default=0.05, help="Stub cost of a new connection in seconds")
+    parser.add_argument("--runs", type=int, default=3, help="Batches per mode")
+    args = parser.parse_args()
+
+    stub = StubStorageService(latency=args.latency, handshake=args.handshake).start()
+    settings.web3_storage_service_url = stub.url
+    try:
+        results = [
+            await run_mode(pooled, stub, args.assets, args.concurrency, args.runs)
+            for pooled in (False, True)
+        ]
+    finally:
+        stub.stop()
+
+    print(f"\n{args.assets}-asset batch, concurrency {args.concurrency}, "
+          f"{args.latency * 1000:.0f} ms latency, {args.handshake * 1000:.0f} ms per new connection")
+    print(f"{'mode':<10}{'mean (s)':>12}{'best (s)':>12}{'connections':>14}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['mean_s']:>12.3f}{r['best_s']:>12.3f}{r['connections']:>14}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+"""
+JSON Upload Test: one file at a time vs. concurrent JSON ingestion
+
+Uploads the sample assets in test_data/json through
+UploadHandler.handle_json_files as an API key user. The samples are
+repeated --copies times with distinct asset IDs, and camelCase samples are
+converted to the snake_case fields the endpoint expects. The edge-case
+samples stay in and fail validation, as they would in a real upload.
+
+- sequential: JSON_UPLOAD_CONCURRENCY=1, the previous behaviour
+- concurrent: JSON_UPLOAD_CONCURRENCY=--concurrency
+
+Write batching is off in both modes so the difference comes from
+concurrency alone. The chain and web3-storage-service are local stubs with
+injected latency; MongoDB is replaced by an in-memory asset service.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.json_upload_test [--copies 4] [--concurrency 8] [--mining-delay 0.2]
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import time
+from pathlib import Path
+
+from starlette.datastructures import UploadFile
+
+from app.config import settings
+from app.handlers.upload_handler import UploadHandler
+from app.services.blockchain_service import BlockchainService
+from app.services.ipfs_service import IPFSService
+from app.services.service_container import close_service_container
+from app.utilities.http_client import close_http_client
+from app.utilities.web3_utils import close_async_providers
+from tests.performance_tests.stubs import MemoryAssetService, StubRPCServer, StubStorageService
+
+TEST_DATA_DIR = Path(__file__).resolve().parents[3] / "test_data" / "json"
+API_KEY_USER = "0x" + "33" * 20
+FIELD_NAMES = {
+    "assetId": "asset_id",
+    "walletAddress": "wallet_address",
+    "criticalMetadata": "critical_metadata",
+    "nonCriticalMetadata": "non_critical_metadata",
+}
+
+
+def load_samples(copies: int):
+    """Return (filename, bytes) pairs for every sample, repeated with distinct asset IDs."""
+    samples = []
+    for path in sorted(TEST_DATA_DIR.glob("*.json")):
+        data = {FIELD_NAMES.get(k, k): v for k, v in json.loads(path.read_text()).items()}
+        samples.append((path.stem, data))
+
+    files = []
+    for copy in range(copies):
+        for stem, data in samples:
+            if data.get("asset_id"):
+                data = {**data, "asset_id": f"{data['asset_id']}-{copy}"}
+            files.append((f"{stem}-{copy}.json", json.dumps(data).encode()))
+    return files
+
+
+async def run_mode(mode, concurrency, rpc: StubRPCServer, storage: StubStorageService, samples):
+    settings.json_upload_concurrency = 1 if mode == "sequential" else concurrency
+    await close_service_container()
+    handler = UploadHandler(
+        asset_service=MemoryAssetService(),
+        ipfs_service=IPFSService(),
+        blockchain_service=BlockchainService(),
+        auth_context={"auth_method": "api_key", "wallet_address": API_KEY_USER}
+    )
+    files = [UploadFile(file=io.BytesIO(content), filename=name) for name, content in samples]
+
+    rpc_before = rpc.request_count
+    storage_before = storage.request_count
+    start = time.perf_counter()
+    result = await handler.handle_json_files(files, API_KEY_USER)
+    elapsed = time.perf_counter() - start
+
+    statuses = [r["status"] for r in result["results"]]
+    return {
+        "mode": mode,
+        "results": result["results"],
+        "succeeded": statuses.count("success"),
+        "failed": statuses.count("error"),
+        "rpc_calls": rpc.request_count - rpc_before,
+        "ipfs_calls": storage.request_count - storage_before,
+        "seconds": elapsed,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and concurrent JSON file ingestion")
+    parser.add_argument("--copies", type=int, default=4, help="Times the test_data/json samples are repeated")
+    parser.add_argument("--concurrency", type=int, default=8, help="JSON_UPLOAD_CONCURRENCY for the concurrent mode")
+    parser.add_argument("--latency", type=float, default=0.01, help="Stub RPC and storage latency per call in seconds")
+    parser.add_argument("--mining-delay", type=float, default=0.2, help="Seconds before a transaction has a receipt")
+    args = parser.parse_args()
+
+    rpc = StubRPCServer(latency=args.latency, mining_delay=args.mining_delay).start()
+    storage = StubStorageService(latency=args.latency, handshake=0.0).start()
+    settings.alchemy_sepolia_url = rpc.url
+    settings.web3_storage_service_url = storage.url
+    settings.blockchain_write_batching = False
+
+    samples = load_samples(args.copies)
+    try:
+        results = [
+            await run_mode(mode, args.concurrency, rpc, storage, samples)
+            for mode in ("sequential", "concurrent")
+        ]
+    finally:
+        await close_async_providers()
+        await close_http_client()
+        rpc.stop()
+        storage.stop()
+
+    sequential, concurrent = results
+    same_order = [r.get("filename") for r in sequential["results"]] == [r.get("filename") for r in concurrent["results"]]
+
+    print(f"\n{len(samples)} files from {TEST_DATA_DIR.name}/ x {args.copies}, concurrency {args.concurrency}, "
+          f"latency {args.latency * 1000:.0f} ms, mining {args.mining_delay:.1f} s")
+    print(f"{'mode':<12}{'ok':>6}{'errors':>8}{'RPC calls':>11}{'IPFS calls':>12}{'seconds':>9}")
+    for r in results:
+        print(f"{r['mode']:<12}{r['succeeded']:>6}{r['failed']:>8}{r['rpc_calls']:>11}"
+              f"{r['ipfs_calls']:>12}{r['seconds']:>9.2f}")
+    print(f"\nconcurrent: {sequential['seconds'] / concurrent['seconds']:.1f}x faster, "
+          f"results in input order: {same_order}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+Log Scan Test: tiered create_filter scan vs. the concurrent adaptive getLogs scan
+
+Recovers an asset's latest CID from its IPFSUpdated events with the event
+index off, for an asset updated recently and one last updated near the
+registry deployment block.
+
+- tiered: the previous recover_data_from_events; searches the newest 50k,
+  200k, 500k and 1M blocks and then the whole chain, each in 10k-block
+  create_filter + get_all_entries chunks fetched one after another
+- adaptive: recover_data_from_events; one newest-first pass of eth_getLogs
+  calls, LOG_SCAN_CONCURRENCY at a time, with chunks that grow on success,
+  split when the provider rejects them and stop at the newest update
+
+The chain is a local stub JSON-RPC server with injected latency that rejects
+log queries wider than --max-range blocks, like a hosted provider.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.log_scan_test [--history 300000] [--concurrency 4] [--max-range 10000]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from eth_abi import encode
+from web3 import Web3
+
+from app.config import settings
+from app.services.blockchain_service import BlockchainService
+from app.utilities.web3_utils import close_async_providers, maybe_await
+from tests.performance_tests.stubs import StubRPCServer
+
+OWNER = "0x" + "55" * 20
+DEPLOY_BLOCK = 1000
+
+
+async def tiered(service: BlockchainService, asset_id: str):
+    """The previous implementation: widening tiers of sequential 10k-block filters."""
+    latest_block = (await maybe_await(service.web3.eth.get_block("latest")))["number"]
+    for max_blocks in (50000, 200000, 500000, 1000000, latest_block):
+        from_block = max(0, latest_block - max_blocks)
+        events = []
+        current_from = from_block
+        while current_from <= latest_block:
+            current_to = min(current_from + 10000 - 1, latest_block)
+            try:
+                event_filter = await maybe_await(service.contract.events.IPFSUpdated.create_filter(
+                    from_block=current_from,
+                    to_block=current_to,
+                    argument_filters={"owner": Web3.to_checksum_address(OWNER), "assetId": asset_id}
+                ))
+                events.extend(await maybe_await(event_filter.get_all_entries()))
+            except Exception:
+                pass
+            current_from = current_to + 1
+        if events:
+            return max(events, key=lambda e: e["args"]["ipfsVersion"])["args"]["cid"]
+    return None
+
+
+async def adaptive(service: BlockchainService, asset_id: str):
+    return (await service.recover_data_from_events(asset_id, OWNER))["cid"]
+
+
+async def run_mode(mode, service: BlockchainService, rpc: StubRPCServer, asset_id: str):
+    rpc_before = rpc.request_count
+    start = time.perf_counter()
+    try:
+        cid = await (tiered if mode == "tiered" else adaptive)(service, asset_id)
+    except Exception as e:
+        cid = f"error: {e}"
+    return {
+        "mode": mode,
+        "found": cid == f"cid-{asset_id}",
+        "rpc_calls": rpc.request_count - rpc_before,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare tiered filter scans with the adaptive getLogs scan")
+    parser.add_argument("--history", type=int, default=300_000, help="Blocks between the registry deployment and the head")
+    parser.add_argument("--concurrency", type=int, default=4, help="LOG_SCAN_CONCURRENCY for the adaptive scan")
+    parser.add_argument("--max-range", type=int, default=10000, help="Widest getLogs block range the stub accepts")
+    parser.add_argument("--latency", type=float, default=0.002, help="Stub RPC latency per call in seconds")
+    args = parser.parse_args()
+
+    logging.getLogger("app.services.blockchain_service").setLevel(logging.WARNING)
+    head = DEPLOY_BLOCK + args.history
+    rpc = StubRPCServer(latency=args.latency, head_block=head, max_log_range=args.max_range).start()
+    settings.alchemy_sepolia_url = rpc.url
+    settings.event_indexer_enabled = False
+    settings.event_indexer_start_block = DEPLOY_BLOCK
+    settings.log_scan_concurrency = args.concurrency
+
+    scenarios = {"recent": head - 12_000, "old": DEPLOY_BLOCK + 500}
+    rows = []
+    try:
+        service = BlockchainService()
+        topic = bytes.fromhex(service.contract.events.IPFSUpdated.topic[2:])
+        for name, block in scenarios.items():
+            asset_id = f"log-scan-{name}"
+            for version, offset in ((1, -300), (2, 0)):
+                rpc.add_log(
+                    service.contract.address,
+                    block + offset,
+                    [topic, bytes(12) + bytes.fromhex(OWNER[2:]), Web3.keccak(text=asset_id)],
+                    encode(["uint32", "string", "bool"], [version, f"cid-{asset_id}" if version == 2 else "cid-old", False])
+                )
+            for mode in ("tiered", "adaptive"):
+                rows.append((name, await run_mode(mode, service, rpc, asset_id)))
+    finally:
+        await close_async_providers()
+        rpc.stop()
+
+    print(f"\n{args.history:,} blocks of history, provider limit {args.max_range:,} blocks, "
+          f"concurrency {args.concurrency}, latency {args.latency * 1000:.0f} ms")
+    print(f"{'update':<8}{'mode':<10}{'found':>7}{'RPC calls':>11}{'seconds':>9}")
+    for name, r in rows:
+        print(f"{name:<8}{r['mode']:<10}{str(r['found']):>7}{r['rpc_calls']:>11}{r['seconds']:>9.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
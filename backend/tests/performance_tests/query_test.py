@@ -5,18 +5,26 @@ This script compares query response times across different storage approaches
 without creating new test assets. It uses existing assets in your MongoDB database
 and reads connection details from your .env file.
 
+With --explain, it instead runs explain() on every query shape the handlers
+issue against the assets and transactions collections and reports which index
+each one uses. It exits non-zero if any query falls back to a collection scan.
+Add --create-indexes to build the indexes the API creates at startup first.
+
 Usage:
     python query_test.py [--requests 20]
+    python -m tests.performance_tests.query_test --explain [--create-indexes]
 """
 
 import argparse
+import asyncio
+import sys
 import time
 import random
 import statistics
 import os
 import requests
 import pymongo
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, MongoClient
 import matplotlib.pyplot as plt
 import pandas as pd
 from dotenv import load_dotenv
@@ -239,12 +247,103 @@ class QueryTest:
         except Exception as e:
             print(f"Could not create visualization: {e}")
 
+    def create_app_indexes(self):
+        """Create the assets and transactions indexes using the repositories' own definitions."""
+        from types import SimpleNamespace
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from app.repositories.asset_repo import AssetRepository
+        from app.repositories.transaction_repo import TransactionRepository
+
+        async def create():
+            client = AsyncIOMotorClient(self.mongodb_uri)
+            db = client[self.db_name]
+            collections = SimpleNamespace(assets_collection=db["assets"], transaction_collection=db["transactions"])
+            await AssetRepository(collections).create_indexes()
+            await TransactionRepository(collections).create_indexes()
+            client.close()
+
+        asyncio.run(create())
+        print("Created asset and transaction indexes")
+
+    def handler_query_shapes(self):
+        """Queries issued by the handlers, filled in with a real asset where one exists."""
+        sample = self.assets_collection.find_one({"isCurrent": True}) or {}
+        asset_id = sample.get("assetId", "sample-asset")
+        wallet = sample.get("walletAddress", self.wallet_address or "0x0000000000000000000000000000000000000000")
+        normalized = wallet.lower()
+
+        return [
+            # (name, collection, filter, sort)
+            ("asset: current version", "assets", {"assetId": asset_id, "isDeleted": False, "isCurrent": True}, None),
+            ("asset: specific version", "assets", {"assetId": asset_id, "isDeleted": False, "versionNumber": 1}, None),
+            ("asset: current incl. deleted", "assets", {"assetId": asset_id, "isCurrent": True}, None),
+            ("asset: deleted versions", "assets", {"assetId": asset_id, "isDeleted": True}, None),
+            ("asset: version history", "assets", {"assetId": asset_id, "isDeleted": False}, [("versionNumber", ASCENDING)]),
+            ("asset: all versions", "assets", {"assetId": asset_id}, None),
+            ("wallet: current assets", "assets",
+             {"walletAddressLower": normalized, "isDeleted": False, "isCurrent": True}, [("lastUpdated", DESCENDING), ("_id", DESCENDING)]),
+            ("wallet: all versions", "assets",
+             {"walletAddressLower": normalized, "isDeleted": False}, [("lastUpdated", DESCENDING)]),
+            ("tx: asset history", "transactions", {"assetId": asset_id}, [("timestamp", DESCENDING)]),
+            ("tx: wallet summary", "transactions", {"walletAddressLower": normalized}, [("timestamp", DESCENDING)]),
+            ("tx: wallet history ($or)", "transactions", {
+                "$or": [{"walletAddressLower": normalized}, {"performedByLower": normalized}],
+                "assetId": {"$in": [asset_id]},
+            }, [("timestamp", DESCENDING)]),
+        ]
+
+    @staticmethod
+    def plan_stages(plan, stages=None, indexes=None):
+        """Collect stage names and index names from an explain() winning plan."""
+        if stages is None:
+            stages, indexes = [], set()
+        # Slot-based engine plans nest the classic tree under queryPlan
+        plan = plan.get("queryPlan", plan)
+        stages.append(plan.get("stage"))
+        if "indexName" in plan:
+            indexes.add(plan["indexName"])
+        for child in [plan.get("inputStage")] + plan.get("inputStages", []):
+            if child:
+                QueryTest.plan_stages(child, stages, indexes)
+        return stages, indexes
+
+    def run_explain(self):
+        """Explain every handler query shape and report the index each uses."""
+        print(f"\n{'query':<32}{'verdict':<16}indexes")
+        failures = 0
+        for name, collection, query, sort in self.handler_query_shapes():
+            cursor = self.db[collection].find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            winning_plan = cursor.explain()["queryPlanner"]["winningPlan"]
+            stages, indexes = self.plan_stages(winning_plan)
+
+            if "COLLSCAN" in stages:
+                verdict = "COLLSCAN"
+                failures += 1
+            elif "SORT" in stages:
+                # Index-backed filter, but results are sorted in memory
+                verdict = "IXSCAN+SORT"
+            else:
+                verdict = "IXSCAN"
+            print(f"{name:<32}{verdict:<16}{', '.join(sorted(indexes)) or '-'}")
+
+        print(f"\n{failures} collection scan(s)")
+        return failures
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Query performance comparison test using .env config")
     parser.add_argument("--requests", default=20, type=int, help="Number of queries to run")
+    parser.add_argument("--explain", action="store_true", help="Check that handler queries use indexes instead of timing them")
+    parser.add_argument("--create-indexes", action="store_true", help="Create the API's asset and transaction indexes before explaining")
     
     args = parser.parse_args()
     
     # Run the test
     test = QueryTest()
+    if args.explain:
+        if args.create_indexes:
+            test.create_app_indexes()
+        sys.exit(1 if test.run_explain() else 0)
     test.run_benchmark(args.requests)
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Retrieve Pipeline Test: sequential vs. concurrent verification stages
+
+Times RetrieveHandler.retrieve_metadata for an owned, untampered asset and a
+delegated one, against services that only add latency: MongoDB reads,
+RPC calls (getIPFSInfo, verifyCID, the transaction lookup, delegation
+check) and the IPFS CID computation.
+
+- sequential: the stage graph run one stage at a time in dependency order,
+  as the handler awaited each step before
+- concurrent: the stage graph as the handler runs it; every check starts as
+  soon as the document is loaded
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.retrieve_pipeline_test [--requests 20] [--rpc-latency 0.08] [--db-latency 0.005] [--ipfs-latency 0.03]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from unittest.mock import patch
+
+from app.handlers import retrieve_handler as retrieve_module
+from app.handlers.retrieve_handler import RetrieveHandler
+
+OWNER = "0x" + "66" * 20
+DELEGATE = "0x" + "77" * 20
+SERVER_WALLET = "0x" + "11" * 20
+CID = "bafkreibenchmarkcid"
+
+DOCUMENT = {
+    "_id": "doc-1",
+    "assetId": "asset-1",
+    "walletAddress": OWNER,
+    "smartContractTxId": "0xtx",
+    "ipfsHash": CID,
+    "versionNumber": 1,
+    "isCurrent": True,
+    "isDeleted": False,
+    "criticalMetadata": {"name": "Benchmark asset"},
+    "nonCriticalMetadata": {},
+    "lastUpdated": "2025-01-01T00:00:00+00:00"
+}
+
+
+class LatencyAssets:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.asset_repository = self
+
+    async def get_asset(self, asset_id, version=None):
+        await asyncio.sleep(self.latency)
+        return DOCUMENT
+
+    async def get_asset_with_deleted(self, asset_id, version=None):
+        await asyncio.sleep(self.latency)
+        return DOCUMENT
+
+    async def find_asset(self, query):
+        await asyncio.sleep(self.latency)
+        return DOCUMENT
+
+
+class LatencyChain:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def check_delegation(self, owner_address, delegate_address):
+        await asyncio.sleep(self.latency)
+        return True
+
+    async def get_ipfs_info(self, asset_id, owner_address):
+        await asyncio.sleep(self.latency)
+        return {"ipfs_version": 1, "is_deleted": False}
+
+    async def verify_cid_on_chain(self, asset_id, owner_address, cid, claimed_version):
+        await asyncio.sleep(self.latency)
+        return {"is_valid": True, "actual_version": 1, "is_deleted": False, "message": "CID verified"}
+
+    async def get_transaction_details(self, tx_hash, asset_id):
+        await asyncio.sleep(self.latency)
+        return {"cid": CID, "tx_sender": SERVER_WALLET}
+
+    def get_server_wallet_address(self):
+        return SERVER_WALLET
+
+
+class LatencyIPFS:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def compute_cid(self, metadata):
+        await asyncio.sleep(self.latency)
+        return CID
+
+
+async def run_stages_sequentially(stages, on_complete=None):
+    """Run each stage on its own, in dependency order, like the handler before the stage graph."""
+    results = {}
+    remaining = dict(stages)
+    while remaining:
+        name = next(n for n, stage in remaining.items() if all(d in results for d in stage.depends_on))
+        stage = remaining.pop(name)
+        try:
+            result = await stage.run(results)
+        except Exception as e:
+            result = e
+        results[name] = result
+        if on_complete:
+            for cancelled in await on_complete(name, result) or ():
+                remaining.pop(cancelled, None)
+    return results
+
+
+async def time_requests(handler: RetrieveHandler, initiator: str, requests: int):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await handler.retrieve_metadata("asset-1", initiator_address=initiator)
+        timings.append(time.perf_counter() - start)
+        assert response.verification.verified
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and concurrent retrieve verification stages")
+    parser.add_argument("--requests", type=int, default=20, help="Retrievals timed per mode and caller")
+    parser.add_argument("--rpc-latency", type=float, default=0.08, help="Seconds per blockchain RPC call")
+    parser.add_argument("--db-latency", type=float, default=0.005, help="Seconds per MongoDB read")
+    parser.add_argument("--ipfs-latency", type=float, default=0.03, help="Seconds per CID computation")
+    args = parser.parse_args()
+
+    handler = RetrieveHandler(
+        asset_service=LatencyAssets(args.db_latency),
+        blockchain_service=LatencyChain(args.rpc_latency),
+        ipfs_service=LatencyIPFS(args.ipfs_latency)
+    )
+
+    print(f"\nRPC {args.rpc_latency * 1000:.0f} ms, MongoDB {args.db_latency * 1000:.0f} ms, "
+          f"CID computation {args.ipfs_latency * 1000:.0f} ms; {args.requests} retrievals each")
+    print(f"{'caller':<10}{'mode':<12}{'p50 ms':>9}{'max ms':>9}")
+    for caller, initiator in (("owner", OWNER), ("delegate", DELEGATE)):
+        for mode in ("sequential", "concurrent"):
+            if mode == "sequential":
+                with patch.object(retrieve_module, "run_stages", run_stages_sequentially):
+                    timings = await time_requests(handler, initiator, args.requests)
+            else:
+                timings = await time_requests(handler, initiator, args.requests)
+            print(f"{caller:<10}{mode:<12}{statistics.median(timings) * 1000:>9.1f}{max(timings) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""
+RPC Concurrency Test: synchronous vs. async Web3 provider
+
+Measures read latency on the retrieve path (getIPFSInfo eth_call) while
+server-signed uploads are waiting for their receipts. With the synchronous
+provider every RPC call, including receipt polling, blocks the event loop, so
+reads queue behind in-flight uploads. With the async provider they overlap.
+
+The chain is a local stub JSON-RPC server with injected latency, so no network
+or wallet is needed.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.rpc_concurrency_test [--reads 200] [--uploads 5] [--read-rate 50] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.config import settings
+from app.services.blockchain_service import BlockchainService
+from app.utilities.web3_utils import close_async_providers
+from tests.performance_tests.stubs import StubRPCServer
+
+OWNER = "0x" + "11" * 20
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(use_async: bool, rpc_url: str, reads: int, uploads: int, read_rate: float):
+    settings.blockchain_async_provider = use_async
+    settings.alchemy_sepolia_url = rpc_url
+    service = BlockchainService()
+
+    latencies = []
+
+    async def read(i, scheduled_at):
+        # Open-loop arrivals: latency is measured from the scheduled arrival time,
+        # so time spent waiting for a blocked event loop is counted
+        delay = scheduled_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await service.get_ipfs_info(f"asset-{i}", OWNER)
+        latencies.append(time.perf_counter() - scheduled_at)
+
+    async def upload(i):
+        await service.store_hash_for(f"Qm{i:044d}", f"upload-{i}", OWNER)
+
+    start = time.perf_counter()
+    upload_tasks = [asyncio.create_task(upload(i)) for i in range(uploads)]
+    # Let the uploads reach their receipt wait before reads start
+    await asyncio.sleep(0.2)
+    first_arrival = time.perf_counter()
+    await asyncio.gather(*(read(i, first_arrival + i / read_rate) for i in range(reads)))
+    await asyncio.gather(*upload_tasks)
+    elapsed = time.perf_counter() - start
+
+    if use_async:
+        await close_async_providers()
+
+    return {
+        "mode": "async" if use_async else "sync",
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "total_s": elapsed,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare sync vs async Web3 provider under concurrent load")
+    parser.add_argument("--reads", type=int, default=200, help="Number of retrieve-path reads")
+    parser.add_argument("--uploads", type=int, default=5, help="Server-signed uploads in flight")
+    parser.add_argument("--read-rate", type=float, default=50.0, help="Read arrivals per second")
+    parser.add_argument("--latency", type=float, default=0.05, help="Injected RPC latency in seconds")
+    parser.add_argument("--mining-delay", type=float, default=2.0, help="Seconds until receipts are available")
+    args = parser.parse_args()
+
+    stub = StubRPCServer(latency=args.latency, mining_delay=args.mining_delay).start()
+    try:
+        results = []
+        for use_async in (False, True):
+            results.append(await run_mode(use_async, stub.url, args.reads, args.uploads, args.read_rate))
+    finally:
+        stub.stop()
+
+    print(f"\n{args.reads} reads, {args.uploads} uploads in flight, {args.latency * 1000:.0f} ms RPC latency")
+    print(f"{'mode':<8}{'p50 (ms)':>12}{'p99 (ms)':>12}{'max (ms)':>12}{'total (s)':>12}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['p50_ms']:>12.1f}{r['p99_ms']:>12.1f}{r['max_ms']:>12.1f}{r['total_s']:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
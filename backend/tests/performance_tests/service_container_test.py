@@ -0,0 +1,90 @@
+"""
+Service Container Test: per-request service construction vs. shared instances
+
+Measures the overhead a route dependency adds before the handler runs. The old
+dependencies built BlockchainService, IPFSService and TransactionStateService
+on every request: the ABI was re-parsed into a contract object, a nonce
+sender was created and, with the synchronous provider, the RPC endpoint was
+pinged. The service container builds them once and probes RPC health from a
+background task.
+
+Each request also makes one getIPFSInfo read, so the totals show the overhead
+relative to a typical request. The chain is a local stub JSON-RPC server with
+injected latency.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.service_container_test [--requests 200] [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.config import settings
+from app.services.blockchain_service import BlockchainService
+from app.services.ipfs_service import IPFSService
+from app.services.service_container import close_service_container, get_service_container
+from app.services.transaction_state_service import TransactionStateService
+from app.utilities.web3_utils import close_async_providers
+from tests.performance_tests.stubs import StubRPCServer
+
+OWNER = "0x" + "11" * 20
+
+
+def build_per_request():
+    return BlockchainService(), IPFSService(), TransactionStateService()
+
+
+def build_from_container():
+    container = get_service_container()
+    return container.blockchain_service, container.ipfs_service, container.transaction_state_service
+
+
+async def run_mode(name: str, build, use_async: bool, requests: int):
+    settings.blockchain_async_provider = use_async
+    setup, total = [], []
+    for i in range(requests):
+        start = time.perf_counter()
+        blockchain_service, _, _ = build()
+        built = time.perf_counter()
+        await blockchain_service.get_ipfs_info(f"asset-{i}", OWNER)
+        setup.append(built - start)
+        total.append(time.perf_counter() - start)
+
+    await close_service_container()
+    await close_async_providers()
+    return {
+        "mode": name,
+        "provider": "async" if use_async else "sync",
+        "setup_ms": statistics.mean(setup) * 1000,
+        "p50_ms": statistics.median(total) * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare per-request and shared service construction")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per mode")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub RPC latency per call in seconds")
+    args = parser.parse_args()
+
+    rpc = StubRPCServer(latency=args.latency).start()
+    settings.alchemy_sepolia_url = rpc.url
+    settings.blockchain_write_batching = False
+
+    try:
+        results = []
+        for use_async in (False, True):
+            results.append(await run_mode("per-request", build_per_request, use_async, args.requests))
+            results.append(await run_mode("container", build_from_container, use_async, args.requests))
+    finally:
+        rpc.stop()
+
+    print(f"\n{args.requests} requests, RPC latency {args.latency * 1000:.0f} ms")
+    print(f"{'mode':<14}{'provider':<10}{'setup (ms)':>12}{'p50 total (ms)':>16}")
+    for r in results:
+        print(f"{r['mode']:<14}{r['provider']:<10}{r['setup_ms']:>12.2f}{r['p50_ms']:>16.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,174 @@
+"""
+Session Auth Test: authentication overhead per request with and without the session cache
+
+Sends requests with a session cookie through AuthManager.authenticate, the
+call AuthMiddleware makes for every protected route, from concurrent clients
+spread over several simulated workers. Each worker has its own AuthManager
+and in-process cache tier; the Redis tier, when on, is shared. MongoDB and
+Redis are in-memory stand-ins with injected latency.
+
+- uncached: SESSION_CACHE_ENABLED=false, every request reads the sessions collection
+- memory: in-process tier only
+- memory+redis: in-process tier, then the shared Redis tier (SESSION_CACHE_REDIS=true)
+- invalid cookies: requests carrying unknown or malformed session IDs, uncached and cached
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.session_auth_test [--requests 4000] [--sessions 200] [--workers 4] [--concurrency 32] [--db-latency 0.002] [--redis-latency 0.0003]
+"""
+
+import argparse
+import asyncio
+import contextvars
+import random
+import secrets
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from starlette.requests import Request
+
+from app.config import settings
+from app.services import wallet_auth_provider as provider_module
+from app.services.api_key_auth_provider import APIKeyAuthProvider
+from app.services.auth_manager import AuthManager
+from app.services.session_cache import SessionCache
+from app.services.wallet_auth_provider import WalletAuthProvider
+
+WALLET = "0x" + "66" * 20
+
+current_cache = contextvars.ContextVar("current_cache", default=None)
+
+
+class LatencySessions:
+    """Sessions collection lookups through AuthRepository.get_session, with latency."""
+
+    def __init__(self, sessions, latency: float):
+        self.sessions = sessions
+        self.latency = latency
+        self.reads = 0
+
+    async def get_session(self, query):
+        self.reads += 1
+        await asyncio.sleep(self.latency)
+        session = self.sessions.get(query["sessionId"])
+        return dict(session) if session else None
+
+
+class LatencyRedis:
+    """The GET and SET commands the session cache uses, with latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.values = {}
+        self.round_trips = 0
+
+    async def get(self, key):
+        self.round_trips += 1
+        await asyncio.sleep(self.latency)
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        self.round_trips += 1
+        await asyncio.sleep(self.latency)
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+
+def make_request(session_id: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/assets/user/" + WALLET,
+        "headers": [(b"cookie", f"session_id={session_id}".encode())],
+    })
+
+
+def make_manager(repository: LatencySessions) -> AuthManager:
+    manager = AuthManager.__new__(AuthManager)
+    manager.wallet_auth_provider = WalletAuthProvider(repository, None)
+    manager.api_key_provider = APIKeyAuthProvider(None, None)
+    return manager
+
+
+async def run_mode(mode, cookies, sessions, args):
+    repository = LatencySessions(sessions, args.db_latency)
+    managers = [make_manager(repository) for _ in range(args.workers)]
+    redis_client = LatencyRedis(args.redis_latency) if mode == "memory+redis" else None
+    caches = [
+        SessionCache(
+            ttl=settings.session_cache_ttl,
+            negative_ttl=settings.session_cache_negative_ttl,
+            redis_ttl=settings.session_cache_redis_ttl if redis_client else None,
+            redis_client=redis_client
+        ) if mode != "uncached" else None
+        for _ in range(args.workers)
+    ]
+    timings = []
+    authenticated = 0
+
+    async def client(index: int):
+        nonlocal authenticated
+        worker = index % args.workers
+        current_cache.set(caches[worker])
+        rng = random.Random(index)
+        for _ in range(index, args.requests, args.concurrency):
+            start = time.perf_counter()
+            context = await managers[worker].authenticate(make_request(rng.choice(cookies)))
+            timings.append(time.perf_counter() - start)
+            authenticated += context is not None
+
+    with patch.object(provider_module, "get_session_cache", lambda: current_cache.get()):
+        start = time.perf_counter()
+        await asyncio.gather(*(client(i) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "authenticated": authenticated,
+        "db_reads": repository.reads,
+        "redis_round_trips": redis_client.round_trips if redis_client else 0,
+        "mean_us": statistics.mean(timings) * 1e6,
+        "p50_us": statistics.median(timings) * 1e6,
+        "p99_us": statistics.quantiles(timings, n=100)[98] * 1e6,
+        "requests_per_second": args.requests / elapsed,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Measure AuthMiddleware session validation overhead per request")
+    parser.add_argument("--requests", type=int, default=4000, help="Authenticated requests per mode")
+    parser.add_argument("--sessions", type=int, default=200, help="Distinct active sessions")
+    parser.add_argument("--workers", type=int, default=4, help="Simulated worker processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--db-latency", type=float, default=0.002, help="Seconds per MongoDB session lookup")
+    parser.add_argument("--redis-latency", type=float, default=0.0003, help="Seconds per Redis command")
+    args = parser.parse_args()
+
+    settings.api_key_auth_enabled = False
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    sessions = {
+        session_id: {"sessionId": session_id, "walletAddress": WALLET, "expiresAt": expires_at, "isActive": True}
+        for session_id in (secrets.token_hex(32) for _ in range(args.sessions))
+    }
+    valid_cookies = list(sessions)
+    invalid_cookies = [secrets.token_hex(32) for _ in range(20)] + ["expired-or-forged", "' OR 1=1"]
+
+    results = [await run_mode(mode, valid_cookies, sessions, args) for mode in ("uncached", "memory", "memory+redis")]
+    for mode in ("uncached", "memory"):
+        result = await run_mode(mode, invalid_cookies, sessions, args)
+        result["mode"] = f"invalid/{mode}"
+        results.append(result)
+
+    print(f"\n{args.requests} requests per mode, {args.sessions} sessions, {args.workers} workers, "
+          f"{args.concurrency} clients; MongoDB {args.db_latency * 1000:.1f} ms, Redis {args.redis_latency * 1000:.1f} ms")
+    print(f"{'mode':<18}{'auth ok':>8}{'DB reads':>10}{'Redis ops':>11}{'mean us':>10}{'p50 us':>9}{'p99 us':>9}{'req/s':>9}")
+    for r in results:
+        print(f"{r['mode']:<18}{r['authenticated']:>8}{r['db_reads']:>10}{r['redis_round_trips']:>11}"
+              f"{r['mean_us']:>10.0f}{r['p50_us']:>9.0f}{r['p99_us']:>9.0f}{r['requests_per_second']:>9.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
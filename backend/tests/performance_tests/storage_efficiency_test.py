@@ -6,11 +6,19 @@ This test evaluates how efficiently the application stores metadata by measuring
 2. Deduplication efficiency
 3. Version control overhead
 
+With --version-growth it instead measures the bytes stored per version for an
+asset with 1, 100 and 1000 versions, comparing the current documents with the
+documentHistory arrays that older versions carried. Versions are created
+through AssetService against an in-memory repository, so neither the API nor
+MongoDB is needed for that mode.
+
 Usage:
     python storage_efficiency_test.py --host localhost --port 8000 --assets 1000
+    python -m tests.performance_tests.storage_efficiency_test --version-growth [--versions 1 100 1000]
 """
 
 import argparse
+import asyncio
 import json
 import os
 import random
@@ -23,6 +31,84 @@ import pymongo
 from pymongo import MongoClient
 import matplotlib.pyplot as plt
 import seaborn as sns
+import bson
+from bson import ObjectId
+
+from app.services.asset_service import AssetService
+
+
+class InMemoryAssetRepository:
+    """Minimal AssetRepository stand-in holding version documents in a list."""
+
+    def __init__(self):
+        self.documents = []
+
+    @staticmethod
+    def _public(document):
+        return {**document, "_id": str(document["_id"])}
+
+    async def find_asset(self, query):
+        for document in reversed(self.documents):
+            if all(document.get(key) == value for key, value in query.items()):
+                return self._public(document)
+        return None
+
+    async def run_in_transaction(self, operation):
+        return await operation(None)
+
+    async def claim_current_version(self, asset_id, session=None):
+        for document in self.documents:
+            if document["assetId"] == asset_id and document["isCurrent"]:
+                claimed = self._public(document)
+                document["isCurrent"] = False
+                return claimed
+        return None
+
+    async def insert_asset(self, document, session=None):
+        document = {"_id": ObjectId(), **document}
+        self.documents.append(document)
+        return str(document["_id"])
+
+
+async def measure_version_growth(version_counts):
+    """
+    Measure stored bytes per version with and without documentHistory arrays.
+
+    Args:
+        version_counts: Numbers of versions to create for one asset
+
+    Returns:
+        List of result dicts, one per version count
+    """
+    wallet = "0x" + "ab" * 20
+    metadata = {"name": "Growth test", "document_type": "contract", "status": "final"}
+    results = []
+    for count in version_counts:
+        repository = InMemoryAssetRepository()
+        service = AssetService(repository)
+        await service.create_asset("growth-asset", wallet, "0x" + "00" * 32, "bafkreigrowth", metadata)
+        for version in range(2, count + 1):
+            await service.create_new_version(
+                "growth-asset", wallet, f"0x{version:064x}", "bafkreigrowth", metadata
+            )
+
+        current_bytes = sum(len(bson.encode(doc)) for doc in repository.documents)
+
+        # The old layout copied every earlier version's ID into each new version
+        legacy_bytes = 0
+        history = []
+        for doc in repository.documents:
+            legacy_bytes += len(bson.encode({**doc, "documentHistory": history}))
+            history = [*history, str(doc["_id"])]
+
+        results.append({
+            "versions": count,
+            "legacy_bytes_per_version": legacy_bytes / count,
+            "current_bytes_per_version": current_bytes / count,
+            "legacy_total_bytes": legacy_bytes,
+            "current_total_bytes": current_bytes,
+        })
+    return results
 
 
 class StorageEfficiencyTest:
@@ -217,8 +303,17 @@ if __name__ == "__main__":
     parser.add_argument("--db-uri", default="mongodb://localhost:27017", help="MongoDB URI")
     parser.add_argument("--assets", default=100, type=int, help="Number of test assets to create")
     parser.add_argument("--no-versions", action="store_true", help="Skip version creation")
+    parser.add_argument("--version-growth", action="store_true", help="Measure bytes per version instead of running the API test")
+    parser.add_argument("--versions", default=[1, 100, 1000], type=int, nargs="+", help="Version counts for --version-growth")
     
     args = parser.parse_args()
     
+    if args.version_growth:
+        print(f"{'versions':>10}{'legacy B/version':>20}{'current B/version':>20}{'legacy total':>16}{'current total':>16}")
+        for r in asyncio.run(measure_version_growth(args.versions)):
+            print(f"{r['versions']:>10}{r['legacy_bytes_per_version']:>20.0f}{r['current_bytes_per_version']:>20.0f}"
+                  f"{r['legacy_total_bytes']:>16}{r['current_total_bytes']:>16}")
+        raise SystemExit(0)
+    
     test = StorageEfficiencyTest(args.host, args.port, args.db_uri)
     test.run_test(args.assets, not args.no_versions)
\ No newline at end of file
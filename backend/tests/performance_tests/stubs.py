@@ -0,0 +1,426 @@
+"""
+Local stand-ins for the external services used by the backend benchmarks.
+
+StubRPCServer answers the JSON-RPC methods BlockchainService relies on with a
+configurable latency, running on its own thread so that it keeps responding even
+when a synchronous Web3 client blocks the benchmark's event loop. Logs added
+with add_log are served by eth_getLogs and log filters. eth_call answers
+getIPFSInfo-shaped data unless call_results holds a response for the
+function selector, and a Multicall3 aggregate3 contract can be simulated.
+
+StubStorageService mimics the web3-storage-service endpoints IPFSService calls,
+with a delay on every new connection standing in for TCP/TLS handshakes.
+
+MemoryAssetService replaces the MongoDB-backed AssetService for benchmarks
+that run the upload handler.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from eth_abi import encode
+
+from app.utilities.cid_utils import compute_cid
+
+ZERO_HASH = "0x" + "00" * 32
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+
+class StubRPCError(Exception):
+    """Returned to the client as a JSON-RPC error response."""
+
+
+class StubRPCServer:
+    """Minimal threaded JSON-RPC endpoint with injected latency."""
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        mining_delay: float = 1.0,
+        chain_id: int = 1337,
+        head_block: int = 1000,
+        max_log_range: Optional[int] = None,
+        multicall: bool = False
+    ):
+        """
+        Args:
+            latency: Seconds added to every RPC response
+            mining_delay: Seconds before a sent transaction has a receipt
+            chain_id: Chain ID reported by eth_chainId
+            head_block: Block number reported by eth_blockNumber
+            max_log_range: Widest block range a log query may span, like a provider's getLogs limit
+            multicall: Serve Multicall3's aggregate3 at its canonical address
+        """
+        self.latency = latency
+        self.mining_delay = mining_delay
+        self.chain_id = chain_id
+        self.head_block = head_block
+        self.max_log_range = max_log_range
+        self.multicall = multicall
+        # eth_call return data by 4-byte function selector ("0x" + 8 hex digits); a str reverts with that reason
+        self.call_results: Dict[str, Any] = {}
+        self.request_count = 0
+        # HTTP requests; a JSON-RPC batch is one request but many request_count calls
+        self.round_trips = 0
+        self.method_counts: Dict[str, int] = {}
+        self._sent_at: Dict[str, float] = {}
+        self._nonces: Dict[str, int] = {}
+        self._logs: List[Dict[str, Any]] = []
+        self._filters: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubRPCServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                payload = json.loads(body)
+                with stub._lock:
+                    stub.round_trips += 1
+                time.sleep(stub.latency)
+                if isinstance(payload, list):
+                    response = [stub.handle(item) for item in payload]
+                else:
+                    response = stub.handle(payload)
+                data = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request["method"]
+        with self._lock:
+            self.request_count += 1
+            self.method_counts[method] = self.method_counts.get(method, 0) + 1
+        params = request.get("params", [])
+        handler = getattr(self, f"rpc_{method}", None)
+        if handler is None:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": f"{method} not supported"}}
+        try:
+            result = handler(*params)
+        except StubRPCError as e:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32602, "message": str(e)}}
+        return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+    # JSON-RPC methods
+
+    def rpc_web3_clientVersion(self):
+        return "stub-rpc/1.0"
+
+    def rpc_eth_chainId(self):
+        return hex(self.chain_id)
+
+    def rpc_eth_gasPrice(self):
+        return hex(1_000_000_000)
+
+    def rpc_eth_blockNumber(self):
+        return hex(self.head_block)
+
+    def add_log(self, address: str, block_number: int, topics: List[bytes], data: bytes, log_index: int = 0) -> None:
+        """Add a log served by eth_getLogs and eth_getFilterLogs."""
+        from eth_utils import keccak
+        self._logs.append({
+            "address": address,
+            "topics": ["0x" + bytes(topic).hex() for topic in topics],
+            "data": "0x" + data.hex(),
+            "blockNumber": hex(block_number),
+            "blockHash": self._block_hash(block_number),
+            "transactionHash": "0x" + keccak(f"{block_number}:{log_index}".encode()).hex(),
+            "transactionIndex": "0x0",
+            "logIndex": hex(log_index),
+            "removed": False,
+        })
+
+    @staticmethod
+    def _block_hash(block_number: int) -> str:
+        from eth_utils import keccak
+        return "0x" + keccak(block_number.to_bytes(8, "big")).hex()
+
+    def _block_number(self, tag) -> int:
+        if tag in (None, "latest", "safe", "finalized", "pending"):
+            return self.head_block
+        return 0 if tag == "earliest" else int(tag, 16) if isinstance(tag, str) else tag
+
+    def _matching_logs(self, log_filter: Dict[str, Any]) -> List[Dict[str, Any]]:
+        from_block = self._block_number(log_filter.get("fromBlock"))
+        to_block = self._block_number(log_filter.get("toBlock"))
+        if self.max_log_range and to_block - from_block + 1 > self.max_log_range:
+            raise StubRPCError(f"query exceeds max block range {self.max_log_range}")
+        address = log_filter.get("address") or []
+        addresses = {a.lower() for a in (address if isinstance(address, list) else [address])}
+        matches = []
+        for log in self._logs:
+            if not from_block <= int(log["blockNumber"], 16) <= to_block:
+                continue
+            if addresses and log["address"].lower() not in addresses:
+                continue
+            topics_match = True
+            for position, wanted in enumerate(log_filter.get("topics") or []):
+                if wanted is None:
+                    continue
+                options = wanted if isinstance(wanted, list) else [wanted]
+                if position >= len(log["topics"]) or log["topics"][position] not in options:
+                    topics_match = False
+                    break
+            if topics_match:
+                matches.append(log)
+        return matches
+
+    def rpc_eth_getLogs(self, log_filter):
+        return self._matching_logs(log_filter)
+
+    def rpc_eth_newFilter(self, log_filter):
+        with self._lock:
+            filter_id = hex(len(self._filters) + 1)
+            self._filters[filter_id] = log_filter
+        return filter_id
+
+    def rpc_eth_getFilterLogs(self, filter_id):
+        return self._matching_logs(self._filters[filter_id])
+
+    def rpc_eth_getBlockByNumber(self, tag, full_transactions=False):
+        number = self._block_number(tag)
+        if number > self.head_block:
+            return None
+        return {
+            "number": hex(number),
+            "hash": self._block_hash(number),
+            "parentHash": self._block_hash(number - 1) if number else ZERO_HASH,
+            "timestamp": hex(1_700_000_000 + number * 12),
+            "transactions": [],
+        }
+
+    def rpc_eth_getTransactionCount(self, address, block="latest"):
+        with self._lock:
+            return hex(self._nonces.get(address.lower(), 0))
+
+    def rpc_eth_estimateGas(self, tx, *args):
+        return hex(100_000)
+
+    def rpc_eth_getCode(self, address, block="latest"):
+        return "0x6080" if self.multicall and address.lower() == MULTICALL3_ADDRESS.lower() else "0x"
+
+    def _call_result(self, data: str) -> bytes:
+        selector = data[:10]
+        if isinstance(self.call_results.get(selector), str):
+            raise StubRPCError(f"execution reverted: {self.call_results[selector]}")
+        if selector in self.call_results:
+            return self.call_results[selector]
+        # getIPFSInfo-shaped response: (uint32, bytes32, uint64, uint64, bool)
+        return encode(["uint32", "bytes32", "uint64", "uint64", "bool"], [1, b"\x00" * 32, 0, 0, False])
+
+    def rpc_eth_call(self, tx, *args):
+        data = tx.get("data") or tx.get("input") or "0x"
+        if self.multicall and (tx.get("to") or "").lower() == MULTICALL3_ADDRESS.lower():
+            from eth_abi import decode
+            calls = decode(["(address,bool,bytes)[]"], bytes.fromhex(data[10:]))[0]
+            results = []
+            for _, _, call_data in calls:
+                reason = self.call_results.get("0x" + call_data[:4].hex())
+                if isinstance(reason, str):
+                    # Error(string) revert data
+                    results.append((False, bytes.fromhex("08c379a0") + encode(["string"], [reason])))
+                else:
+                    results.append((True, self._call_result("0x" + call_data.hex())))
+            return "0x" + encode(["(bool,bytes)[]"], [results]).hex()
+        return "0x" + self._call_result(data).hex()
+
+    def rpc_eth_sendRawTransaction(self, raw_tx):
+        from eth_utils import keccak
+        tx_hash = "0x" + keccak(hexstr=raw_tx).hex()
+        with self._lock:
+            self._sent_at[tx_hash] = time.time()
+        return tx_hash
+
+    def rpc_eth_getTransactionReceipt(self, tx_hash):
+        with self._lock:
+            sent_at = self._sent_at.get(tx_hash)
+        if sent_at is None or time.time() - sent_at < self.mining_delay:
+            return None
+        return {
+            "transactionHash": tx_hash,
+            "transactionIndex": "0x0",
+            "blockHash": ZERO_HASH,
+            "blockNumber": "0x3e8",
+            "from": "0x" + "00" * 20,
+            "to": "0x" + "00" * 20,
+            "cumulativeGasUsed": "0x186a0",
+            "gasUsed": "0x186a0",
+            "effectiveGasPrice": "0x3b9aca00",
+            "contractAddress": None,
+            "logs": [],
+            "logsBloom": "0x" + "00" * 256,
+            "status": "0x1",
+            "type": "0x0",
+        }
+
+
+class StubStorageService:
+    """Threaded HTTP stand-in for web3-storage-service with connection setup cost."""
+
+    def __init__(self, latency: float = 0.02, handshake: float = 0.05):
+        """
+        Args:
+            latency: Seconds added to every response
+            handshake: Seconds added when a client opens a new connection
+        """
+        self.latency = latency
+        self.handshake = handshake
+        self.connection_count = 0
+        self.request_count = 0
+        self._stored: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubStorageService":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                with stub._lock:
+                    stub.connection_count += 1
+                time.sleep(stub.handshake)
+                super().setup()
+
+            def _reply(self, payload: Any, status: int = 200):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub._lock:
+                    stub.request_count += 1
+                time.sleep(stub.latency)
+                cid = compute_cid(body)
+                with stub._lock:
+                    stub._stored[cid] = body
+                if self.path == "/upload":
+                    self._reply({"cids": [{"filename": "metadata.json", "cid": cid}]})
+                elif self.path == "/calculate-cid":
+                    self._reply({"computed_cid": cid})
+                else:
+                    self._reply({"error": "not found"}, 404)
+
+            def _reply_bytes(self, data: bytes):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.request_count += 1
+                time.sleep(stub.latency)
+                parts = self.path.strip("/").split("/")
+                content_cid = None
+                if len(parts) == 3 and parts[0] == "file" and parts[2] == "contents":
+                    content_cid = parts[1]
+                elif len(parts) == 2 and parts[0] == "ipfs":
+                    # Path-style gateway URL
+                    content_cid = parts[1]
+                if content_cid is not None:
+                    with stub._lock:
+                        data = stub._stored.get(content_cid)
+                    if data is None:
+                        self._reply({"error": "not found"}, 404)
+                    else:
+                        self._reply_bytes(data)
+                elif len(parts) >= 2 and parts[0] == "file":
+                    self._reply({"cid": parts[1], "url": f"https://{parts[1]}.ipfs.w3s.link"})
+                else:
+                    self._reply({"error": "not found"}, 404)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def put(self, content: bytes) -> str:
+        """
+        Store content so it can be fetched by CID.
+
+        Args:
+            content: File content
+
+        Returns:
+            The content's CID
+        """
+        cid = compute_cid(content)
+        with self._lock:
+            self._stored[cid] = content
+        return cid
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+class MemoryAssetService:
+    """In-memory stand-in for AssetService with a fixed per-call database latency."""
+
+    def __init__(self, latency: float = 0.002):
+        """
+        Args:
+            latency: Seconds added to every call
+        """
+        self.latency = latency
+        self.assets: Dict[str, Dict[str, Any]] = {}
+
+    async def get_asset(self, asset_id):
+        await asyncio.sleep(self.latency)
+        return self.assets.get(asset_id)
+
+    async def get_asset_with_deleted(self, asset_id):
+        await asyncio.sleep(self.latency)
+        return None
+
+    async def create_asset(self, asset_id, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.assets[asset_id] = {"assetId": asset_id, **kwargs}
+        return f"doc-{asset_id}"
@@ -0,0 +1,165 @@
+"""
+User Assets Test: per-asset version 1 lookups vs. a single $in query
+
+Lists a wallet's assets through AssetService.get_user_assets against an
+in-memory repository that adds a fixed latency to every database round trip.
+The old listing issued one find_asset call per asset to look up its creation
+time (N+1 round trips); the current code stores createdAt and looks up any
+legacy assets with one $in query. Both the legacy document shape (no
+createdAt) and the current one are measured, plus paged listing.
+
+No MongoDB server is needed. Round trips are counted exactly; latencies
+reflect the simulated --rtt-ms per round trip.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.user_assets_test [--assets 500] [--rtt-ms 1.0] [--page-size 50]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+from app.services.asset_service import AssetService
+
+WALLET = "0x2c7536E3605D9C16a7a3D7b1898e529396a65c23"
+
+
+class CountingAssetRepository:
+    """In-memory stand-in for AssetRepository that counts and delays round trips."""
+
+    def __init__(self, documents, rtt: float):
+        self.documents = documents
+        self.rtt = rtt
+        self.round_trips = 0
+
+    async def _round_trip(self):
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt)
+
+    @staticmethod
+    def _matches(doc, query):
+        for key, value in query.items():
+            if key == "$or":
+                if not any(CountingAssetRepository._matches(doc, q) for q in value):
+                    return False
+            elif isinstance(value, dict) and "$in" in value:
+                if doc.get(key) not in value["$in"]:
+                    return False
+            elif isinstance(value, dict) and "$lt" in value:
+                if not doc.get(key) < value["$lt"]:
+                    return False
+            elif doc.get(key) != value:
+                return False
+        return True
+
+    async def find_asset(self, query):
+        await self._round_trip()
+        for doc in self.documents:
+            if self._matches(doc, query):
+                return {**doc, "_id": str(doc["_id"])}
+        return None
+
+    async def find_assets(self, query, sort_field="lastUpdated", sort_direction=-1):
+        await self._round_trip()
+        return [{**doc, "_id": str(doc["_id"])} for doc in self.documents if self._matches(doc, query)]
+
+    async def find_assets_page(self, query, sort, limit=None):
+        await self._round_trip()
+        matches = [doc for doc in self.documents if self._matches(doc, query)]
+        matches.sort(key=lambda d: (d["lastUpdated"], d["_id"]), reverse=True)
+        return [{**doc, "_id": str(doc["_id"])} for doc in matches[:limit]]
+
+
+def seed(count: int, with_created_at: bool):
+    now = datetime.now(timezone.utc)
+    documents = []
+    for i in range(count):
+        created = now - timedelta(days=1, seconds=i)
+        first_version = {
+            "_id": ObjectId.from_datetime(created),
+            "assetId": f"user-assets-{i}",
+            "versionNumber": 1,
+            "walletAddressLower": WALLET.lower(),
+            "lastUpdated": created,
+            "isCurrent": False,
+            "isDeleted": False,
+        }
+        current = {
+            **first_version,
+            "_id": ObjectId(),
+            "versionNumber": 2,
+            "lastUpdated": now - timedelta(seconds=i),
+            "isCurrent": True,
+        }
+        if with_created_at:
+            first_version["createdAt"] = current["createdAt"] = created
+        documents.extend([first_version, current])
+    return documents
+
+
+async def legacy_get_user_assets(repository, wallet_address: str):
+    """The pre-change listing: one version 1 lookup per asset."""
+    assets = await repository.find_assets({
+        "walletAddressLower": wallet_address.lower(),
+        "isCurrent": True,
+        "isDeleted": False
+    })
+    for asset in assets:
+        first_version = await repository.find_asset({"assetId": asset["assetId"], "versionNumber": 1})
+        if first_version:
+            asset["createdAt"] = ObjectId(first_version["_id"]).generation_time
+    return assets
+
+
+async def measure(name, repository, call):
+    repository.round_trips = 0
+    start = time.perf_counter()
+    assets = await call()
+    elapsed = time.perf_counter() - start
+    return {"mode": name, "assets": len(assets), "round_trips": repository.round_trips, "ms": elapsed * 1000}
+
+
+async def list_all_pages(service, page_size: int):
+    assets, cursor = [], None
+    while True:
+        page = await service.get_user_assets_page(WALLET, limit=page_size, after=cursor)
+        assets.extend(page["assets"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return assets
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Count database round trips when listing a wallet's assets")
+    parser.add_argument("--assets", type=int, default=500, help="Current assets owned by the wallet")
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="Simulated latency per database round trip")
+    parser.add_argument("--page-size", type=int, default=50, help="Page size for the paged listing")
+    args = parser.parse_args()
+
+    rtt = args.rtt_ms / 1000
+    legacy_repo = CountingAssetRepository(seed(args.assets, with_created_at=False), rtt)
+    current_repo = CountingAssetRepository(seed(args.assets, with_created_at=True), rtt)
+    legacy_service = AssetService(legacy_repo)
+    current_service = AssetService(current_repo)
+
+    results = [
+        await measure("per-asset lookup", legacy_repo, lambda: legacy_get_user_assets(legacy_repo, WALLET)),
+        await measure("$in lookup", legacy_repo, lambda: legacy_service.get_user_assets(WALLET)),
+        await measure("stored createdAt", current_repo, lambda: current_service.get_user_assets(WALLET)),
+        await measure(f"pages of {args.page_size}", current_repo, lambda: list_all_pages(current_service, args.page_size)),
+    ]
+
+    print(f"\n{args.assets} assets, {args.rtt_ms:.1f} ms per round trip")
+    print(f"{'mode':<20}{'assets':>8}{'round trips':>14}{'time (ms)':>12}")
+    for r in results:
+        print(f"{r['mode']:<20}{r['assets']:>8}{r['round_trips']:>14}{r['ms']:>12.1f}")
+
+    if any(r["round_trips"] > 2 for r in results[1:3]):
+        raise SystemExit("Regression: listing issued more than two round trips")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Verification Cache Test: dashboard polling with and without cached verifications
+
+Simulates dashboards polling GET /retrieve/{asset_id} for a fixed set of
+unchanged assets, through RetrieveHandler.retrieve_metadata against
+services that only add latency (see retrieve_pipeline_test). One asset gets
+a new version part way through, as an upload would write it.
+
+- uncached: every retrieval verifies on chain, as before
+- cached: successful verifications are reused until the asset changes
+- strict: cached, but every request passes ?verify=strict
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.verification_cache_test [--assets 20] [--polls 10] [--rpc-latency 0.08]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.handlers.retrieve_handler import RetrieveHandler
+from app.services.verification_cache import VerificationCache
+from tests.performance_tests.retrieve_pipeline_test import LatencyAssets, LatencyChain, LatencyIPFS, OWNER
+
+
+class CountingChain(LatencyChain):
+    def __init__(self, latency: float):
+        super().__init__(latency)
+        self.verifications = 0
+
+    async def verify_cid_on_chain(self, *args, **kwargs):
+        self.verifications += 1
+        return await super().verify_cid_on_chain(*args, **kwargs)
+
+
+async def run_mode(mode: str, args) -> dict:
+    chain = CountingChain(args.rpc_latency)
+    cache = VerificationCache(max_age=30) if mode != "uncached" else None
+    handler = RetrieveHandler(
+        asset_service=LatencyAssets(args.db_latency),
+        blockchain_service=chain,
+        ipfs_service=LatencyIPFS(args.ipfs_latency),
+        verification_cache=cache
+    )
+    assets = [f"asset-{i}" for i in range(args.assets)]
+    cached_responses = 0
+    start = time.perf_counter()
+    for poll in range(args.polls):
+        if cache is not None and poll == args.polls // 2:
+            # A new version of one asset was written through AssetService
+            cache.invalidate(assets[0])
+        responses = await asyncio.gather(*(
+            handler.retrieve_metadata(asset_id, initiator_address=OWNER, strict=mode == "strict")
+            for asset_id in assets
+        ))
+        assert all(response.verification.verified for response in responses)
+        cached_responses += sum(response.verification.cached for response in responses)
+    elapsed = time.perf_counter() - start
+    requests = args.assets * args.polls
+    return {
+        "requests": requests,
+        "verifications": chain.verifications,
+        "cached": cached_responses,
+        "ms_per_poll": elapsed / args.polls * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare retrieve polling with and without the verification cache")
+    parser.add_argument("--assets", type=int, default=20, help="Assets on the dashboard, retrieved concurrently per poll")
+    parser.add_argument("--polls", type=int, default=10, help="Dashboard refreshes")
+    parser.add_argument("--rpc-latency", type=float, default=0.08, help="Seconds per blockchain RPC call")
+    parser.add_argument("--db-latency", type=float, default=0.005, help="Seconds per MongoDB read")
+    parser.add_argument("--ipfs-latency", type=float, default=0.03, help="Seconds per CID computation")
+    args = parser.parse_args()
+
+    print(f"\n{args.assets} assets x {args.polls} polls, RPC {args.rpc_latency * 1000:.0f} ms")
+    print(f"{'mode':<10}{'requests':>9}{'on-chain verifications':>24}{'cached':>8}{'ms per poll':>13}")
+    for mode in ("uncached", "cached", "strict"):
+        r = await run_mode(mode, args)
+        print(f"{mode:<10}{r['requests']:>9}{r['verifications']:>24}{r['cached']:>8}{r['ms_per_poll']:>13.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
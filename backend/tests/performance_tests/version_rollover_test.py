@@ -0,0 +1,145 @@
+"""
+Version Rollover Test: read-update-insert vs. atomic claim for new asset versions
+
+Runs concurrent writers that each create new versions of a small set of hot
+assets, then counts the assets left with more than one isCurrent document.
+
+- legacy: the old create_new_version sequence (find_asset, update_asset to
+  clear isCurrent, insert_asset); three round trips with a race window. It
+  runs without the assetId_current_unique index, as deployed before that index
+  existed, so lost races show up as duplicate current versions.
+- atomic: AssetService.create_new_version, which claims the current version
+  with find_one_and_update and inserts the next one, inside a transaction when
+  the server is a replica set.
+
+Requires a MongoDB server (MONGODB_URI, default mongodb://localhost:27017).
+The scratch database is dropped afterwards.
+
+Usage (from the backend directory):
+    python -m tests.performance_tests.version_rollover_test [--assets 10] [--writers 50] [--updates 20]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.repositories.asset_repo import AssetRepository
+from app.services.asset_service import AssetService
+
+WALLET = "0x2c7536E3605D9C16a7a3D7b1898e529396a65c23"
+
+
+async def legacy_create_new_version(repository: AssetRepository, asset_id: str, tx_id: str):
+    """The pre-change rollover: read, clear isCurrent, insert."""
+    current = await repository.find_asset({"assetId": asset_id, "isCurrent": True})
+    if not current:
+        raise ValueError(f"Asset not found: {asset_id}")
+    await repository.update_asset({"_id": ObjectId(current["_id"])}, {"$set": {"isCurrent": False}})
+    await repository.insert_asset({
+        "assetId": asset_id,
+        "versionNumber": current["versionNumber"] + 1,
+        "walletAddress": WALLET,
+        "walletAddressLower": WALLET.lower(),
+        "smartContractTxId": tx_id,
+        "ipfsHash": "bafkreirollover",
+        "lastUpdated": datetime.now(timezone.utc),
+        "criticalMetadata": {},
+        "isCurrent": True,
+        "isDeleted": False,
+        "previousVersionId": current["_id"],
+    })
+
+
+async def run_mode(mode: str, client, db_name: str, assets: int, writers: int, updates: int):
+    await client.drop_database(db_name)
+    db = client[db_name]
+    db_client = SimpleNamespace(assets_collection=db["assets"], client=client)
+
+    async def supports_transactions():
+        hello = await client.admin.command("hello")
+        return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+    db_client.supports_transactions = supports_transactions
+    repository = AssetRepository(db_client)
+    if mode == "atomic":
+        await repository.create_indexes()
+    service = AssetService(repository)
+
+    asset_ids = [f"rollover-{i}" for i in range(assets)]
+    for asset_id in asset_ids:
+        await service.create_asset(asset_id, WALLET, "0x0", "bafkreirollover", {})
+
+    latencies = []
+    errors = 0
+
+    async def writer(w: int):
+        nonlocal errors
+        for u in range(updates):
+            asset_id = asset_ids[(w + u) % assets]
+            start = time.perf_counter()
+            try:
+                if mode == "legacy":
+                    await legacy_create_new_version(repository, asset_id, f"0x{w:x}{u:x}")
+                else:
+                    await service.create_new_version(asset_id, WALLET, f"0x{w:x}{u:x}", "bafkreirollover", {})
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(w) for w in range(writers)))
+    elapsed = time.perf_counter() - start
+
+    duplicates = await db["assets"].aggregate([
+        {"$match": {"isCurrent": True}},
+        {"$group": {"_id": "$assetId", "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]).to_list(length=None)
+
+    return {
+        "mode": mode,
+        "updates": len(latencies),
+        "errors": errors,
+        "duplicate_assets": len(duplicates),
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0,
+        "throughput": len(latencies) / elapsed,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Stress concurrent version rollovers on hot assets")
+    parser.add_argument("--assets", type=int, default=10, help="Hot assets shared by all writers")
+    parser.add_argument("--writers", type=int, default=50, help="Concurrent writers")
+    parser.add_argument("--updates", type=int, default=20, help="Updates per writer")
+    parser.add_argument("--db", default="fusevault_rollover_bench", help="Scratch database name")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+    try:
+        results = [
+            await run_mode(mode, client, args.db, args.assets, args.writers, args.updates)
+            for mode in ("legacy", "atomic")
+        ]
+    finally:
+        await client.drop_database(args.db)
+        client.close()
+
+    print(f"\n{args.writers} writers x {args.updates} updates over {args.assets} assets")
+    print(f"{'mode':<10}{'updates':>9}{'errors':>8}{'dup current':>13}{'p50 (ms)':>10}{'updates/s':>11}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['updates']:>9}{r['errors']:>8}{r['duplicate_assets']:>13}"
+              f"{r['p50_ms']:>10.2f}{r['throughput']:>11.1f}")
+
+    if results[-1]["duplicate_assets"]:
+        raise SystemExit("Duplicate current versions after atomic rollover")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api import upload_routes
+from app.services import progress_service
+from app.services.progress_service import BatchProgressTracker
+
+WALLET = "0x2c7536E3605D9C16a7a3D7b1898e529396a65c23"
+
+
+def parse_events(body: str):
+    return [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = BatchProgressTracker()
+    monkeypatch.setattr(progress_service, "get_progress_tracker", lambda: tracker)
+    return tracker
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(upload_routes.router)
+
+    @app.middleware("http")
+    async def authenticate(request, call_next):
+        request.state.user = {"walletAddress": WALLET}
+        request.state.auth_context = {"wallet_address": WALLET, "auth_method": "wallet", "permissions": ["read"]}
+        return await call_next(request)
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+class TestBatchProgressStream:
+    @pytest.mark.asyncio
+    async def test_unknown_batch_is_404(self, tracker, client):
+        async with client:
+            response = await client.get("/upload/batch/missing/stream")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_streams_snapshot_then_deltas_until_finished(self, tracker, client):
+        await tracker.create_batch("b1", ["a1", "a2"], 2)
+
+        async def upload():
+            await asyncio.sleep(0.05)
+            tracker.update_asset_progress("b1", "a1", 100, "completed", ipfs_cid="cid-a1")
+            tracker.update_asset_progress("b1", "a2", 0, "error", error="boom")
+            await tracker.set_blockchain_prepared("b1", {"to": "0xabc"}, "pending_tx:1")
+            await tracker.finish_batch("b1")
+
+        task = asyncio.create_task(upload())
+        async with client:
+            response = await client.get("/upload/batch/b1/stream")
+        await task
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_events(response.text)
+        assert [e["type"] for e in events] == ["snapshot", "assets", "assets", "blockchain_prepared", "finished"]
+        assert set(events[0]["assets"]) == {"a1", "a2"}
+        # Deltas only carry the asset that changed
+        assert list(events[1]["assets"]) == ["a1"]
+        assert (events[2]["completed_count"], events[2]["error_count"]) == (1, 1)
+        assert events[3]["transaction_data"] == {"to": "0xabc"}
+
+    @pytest.mark.asyncio
+    async def test_finished_batch_sends_only_snapshot(self, tracker, client):
+        await tracker.create_batch("b1", ["a1"], 1)
+        tracker.update_asset_progress("b1", "a1", 100, "completed")
+        await tracker.finish_batch("b1")
+
+        async with client:
+            response = await client.get("/upload/batch/b1/stream")
+
+        events = parse_events(response.text)
+        assert len(events) == 1
+        assert events[0]["type"] == "snapshot"
+        assert events[0]["finished"] is True
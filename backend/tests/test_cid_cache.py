@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from app.utilities.cid_cache import CIDCache
+from app.utilities.cid_utils import compute_cid
+
+
+def entry(text, profile="web3storage"):
+    content = text.encode()
+    return compute_cid(content, profile), content
+
+
+class TestCIDCache:
+    @pytest.mark.asyncio
+    async def test_put_then_get_hits_memory(self):
+        cache = CIDCache()
+        cid, content = entry('{"name":"Test Asset"}')
+
+        assert await cache.put(cid, content)
+        assert await cache.get(cid) == content
+        assert cache.stats()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_content_that_does_not_match_cid(self):
+        """A corrupted response is never cached."""
+        cache = CIDCache()
+        cid, _ = entry('{"name":"Test Asset"}')
+
+        assert not await cache.put(cid, b'{"name":"Test Asset"}garbage}')
+        assert await cache.get(cid) is None
+        assert cache.stats()["rejected"] == 1
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_accepts_cidv0(self):
+        cache = CIDCache()
+        cid, content = entry('{"v":0}', profile="ipfs-only-hash")
+
+        assert cid.startswith("Qm")
+        assert await cache.put(cid, content)
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        cache = CIDCache(max_memory_bytes=20)
+        a = entry("a" * 8)
+        b = entry("b" * 8)
+        c = entry("c" * 8)
+
+        await cache.put(*a)
+        await cache.put(*b)
+        await cache.get(a[0])  # a is now more recent than b
+        await cache.put(*c)
+
+        assert await cache.get(a[0]) == a[1]
+        assert await cache.get(b[0]) is None
+        assert cache.stats()["memory_bytes"] == 16
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_new_instance(self, tmp_path):
+        cid, content = entry('{"name":"Persisted"}')
+        await CIDCache(disk_dir=str(tmp_path)).put(cid, content)
+
+        cache = CIDCache(disk_dir=str(tmp_path))
+
+        assert await cache.get(cid) == content
+        assert cache.stats()["disk_hits"] == 1
+        # Promoted to memory on the disk hit
+        assert await cache.get(cid) == content
+        assert cache.stats()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_corrupted_disk_file_is_discarded(self, tmp_path):
+        cid, content = entry('{"name":"Persisted"}')
+        cache = CIDCache(disk_dir=str(tmp_path))
+        await cache.put(cid, content)
+        path = cache._disk_path(cid)
+        with open(path, "wb") as f:
+            f.write(b"tampered")
+
+        fresh = CIDCache(disk_dir=str(tmp_path))
+
+        assert await fresh.get(cid) is None
+        assert not os.path.exists(path)
+
+    @pytest.mark.asyncio
+    async def test_malformed_cids_never_reach_the_disk(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        secret = tmp_path / "secret"
+        secret.write_bytes(b"not cached content")
+        cache = CIDCache(disk_dir=str(cache_dir))
+
+        for cid in ("../secret", "bafy/../../secret", "Qm" + "." * 44, ""):
+            assert await cache.get(cid) is None
+            assert not await cache.put(cid, b"content")
+
+        assert os.listdir(cache_dir) == []
+        assert cache.stats()["rejected"] == 4
@@ -0,0 +1,92 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services.ipfs_service import IPFSService
+from app.utilities.cid_utils import CID_PROFILES, compute_cid
+from app.utilities.format import format_json, get_ipfs_metadata
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CORPUS = json.loads((Path(__file__).parent / "fixtures" / "cid_parity.json").read_text())
+
+
+def corpus_payload(entry):
+    """Bytes the backend hashes for a corpus entry."""
+    if entry["payload"] is None:
+        return (REPO_ROOT / entry["source"]).read_bytes()
+    return entry["payload"].encode("utf-8")
+
+
+class TestComputeCid:
+    @pytest.mark.parametrize("content,expected", [
+        (b"", "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH"),
+        (b"hello world", "Qmf412jQZiuVUtdgnB36FXFX7xg5V6KEbSJ4dpQuhkLyfD"),
+        (b"hello world\n", "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"),
+    ])
+    def test_ipfs_only_hash_profile_matches_ipfs_add(self, content, expected):
+        """CIDv0 output matches `ipfs add` / ipfs-only-hash for known inputs."""
+        assert compute_cid(content, "ipfs-only-hash") == expected
+
+    @pytest.mark.parametrize("content,expected", [
+        (b"", "bafkreihdwdcefgh4dqkjv67uzcmw7ojee6xedzdetojuzjevtenxquvyku"),
+        (b"hello world", "bafkreifzjut3te2nhyekklss27nh3k72ysco7y32koao5eei66wof36n5e"),
+    ])
+    def test_web3storage_profile_single_chunk_is_raw_cid(self, content, expected):
+        """Files that fit in one chunk are encoded as a raw-leaf CIDv1."""
+        assert compute_cid(content) == expected
+
+    def test_chunk_boundary(self):
+        """Content larger than one chunk becomes a dag-pb root over raw leaves."""
+        chunk_size = CID_PROFILES["web3storage"].chunk_size
+
+        assert compute_cid(b"a" * chunk_size).startswith("bafkrei")
+        assert compute_cid(b"a" * (chunk_size + 1)).startswith("bafybei")
+
+    def test_multi_chunk_cid_depends_on_every_chunk(self):
+        """Changing a byte in any chunk changes the root CID."""
+        chunk_size = CID_PROFILES["ipfs-only-hash"].chunk_size
+        content = bytearray(b"x" * (chunk_size * 3))
+        original = compute_cid(bytes(content), "ipfs-only-hash")
+
+        content[chunk_size * 2 + 5] = ord("y")
+
+        assert original.startswith("Qm")
+        assert compute_cid(bytes(content), "ipfs-only-hash") != original
+
+
+class TestCidParityCorpus:
+    @pytest.mark.parametrize(
+        "entry",
+        CORPUS["entries"],
+        ids=[f"{e['source'].split('/')[-1]}{'-payload' if e['payload'] is not None else ''}" for e in CORPUS["entries"]]
+    )
+    def test_matches_storage_service(self, entry):
+        """Local CIDs match the web3-storage-service output (regenerate with `node cid-corpus.js --write`)."""
+        assert compute_cid(corpus_payload(entry), CORPUS["profile"]) == entry["cid"]
+
+    def test_corpus_payloads_match_current_formatting(self):
+        """The corpus payloads are still what format_json produces for test_data."""
+        for entry in CORPUS["entries"]:
+            if entry["payload"] is None:
+                continue
+            data = json.loads((REPO_ROOT / entry["source"]).read_text())
+            metadata = {
+                "asset_id": data.get("asset_id", data.get("assetId")),
+                "wallet_address": data.get("wallet_address", data.get("walletAddress")),
+                "critical_metadata": data.get("critical_metadata", data.get("criticalMetadata")),
+            }
+            assert format_json(get_ipfs_metadata(metadata), encode=False) == entry["payload"]
+
+    @pytest.mark.asyncio
+    async def test_ipfs_service_computes_locally(self, monkeypatch):
+        """IPFSService.compute_cid no longer needs the storage service."""
+        def fail(*args, **kwargs):
+            raise AssertionError("HTTP client should not be used")
+
+        monkeypatch.setattr("httpx.AsyncClient", fail)
+        entry = next(e for e in CORPUS["entries"] if e["payload"] is not None)
+
+        cid = await IPFSService().compute_cid(json.loads(entry["payload"]))
+
+        assert cid == entry["cid"]
@@ -0,0 +1,147 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from eth_abi import encode
+from eth_utils import function_abi_to_4byte_selector
+from web3.exceptions import ContractLogicError
+
+from app.handlers.delete_handler import DeleteHandler
+from app.handlers.transfer_handler import TransferHandler
+from app.services import blockchain_service as blockchain_module
+from app.services.blockchain_service import BlockchainService
+from app.services.contract_reader import ContractReader
+from app.utilities.web3_utils import close_async_providers, maybe_await
+from tests.performance_tests.stubs import StubRPCServer
+
+OWNER = "0x2c7536E3605D9C16a7a3D7b1898e529396a65c23"
+RECIPIENT = "0x" + "ab" * 20
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def selector(call):
+    return "0x" + function_abi_to_4byte_selector(call.abi).hex()
+
+
+@pytest.fixture(params=[True, False], ids=["multicall", "json-rpc-batch"])
+async def chain(request, monkeypatch):
+    rpc = StubRPCServer(latency=0, multicall=request.param).start()
+    monkeypatch.setattr(blockchain_module.settings, "alchemy_sepolia_url", rpc.url)
+    service = BlockchainService()
+    functions = service.contract.functions
+    rpc.call_results[selector(functions.assetExists("", OWNER))] = encode(["bool", "bool"], [True, True])
+    rpc.call_results[selector(functions.getPendingTransfer("", OWNER))] = encode(["address"], [RECIPIENT])
+    yield SimpleNamespace(rpc=rpc, service=service, functions=functions)
+    await close_async_providers()
+    rpc.stop()
+
+
+class TestContractReader:
+    @pytest.mark.asyncio
+    async def test_results_match_individual_calls_in_one_round_trip(self, chain):
+        calls = [
+            chain.functions.getIPFSInfo("asset-1", OWNER),
+            chain.functions.assetExists("asset-1", OWNER),
+            chain.functions.getPendingTransfer("asset-1", OWNER)
+        ]
+        expected = [await maybe_await(call.call()) for call in calls]
+        reader = ContractReader(chain.service.web3)
+        await reader.call(calls[:1])
+
+        before = chain.rpc.round_trips
+        results = await reader.call(calls)
+
+        assert results == expected
+        assert results[2] == "0xABaBaBaBABabABabAbAbABAbABabababaBaBABaB"
+        assert chain.rpc.round_trips - before == 1
+
+    @pytest.mark.asyncio
+    async def test_a_reverted_call_does_not_fail_the_others(self, chain):
+        chain.rpc.call_results[selector(chain.functions.verifyCID("", OWNER, "", 0))] = "Asset does not exist"
+
+        results = await ContractReader(chain.service.web3).call([
+            chain.functions.verifyCID("missing", OWNER, "cid", 1),
+            chain.functions.assetExists("asset-1", OWNER)
+        ])
+
+        assert "Asset does not exist" in str(results[0])
+        assert results[1] == [True, True]
+
+    @pytest.mark.asyncio
+    async def test_calls_are_sent_in_chunks(self, chain):
+        reader = ContractReader(chain.service.web3, max_batch_size=2)
+        await reader.call([chain.functions.assetExists("asset-0", OWNER)])
+
+        before = chain.rpc.round_trips
+        results = await reader.call([chain.functions.assetExists(f"asset-{i}", OWNER) for i in range(5)])
+
+        assert results == [[True, True]] * 5
+        assert chain.rpc.round_trips - before == 3
+
+    @pytest.mark.asyncio
+    async def test_providers_without_batching_get_single_calls(self, chain):
+        reader = ContractReader(chain.service.web3, multicall_address=None)
+        rejected = AsyncMock(return_value={"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Batch requests are not supported"}})
+
+        with patch.object(chain.service.web3.provider, "make_batch_request", rejected):
+            results = await reader.call([chain.functions.assetExists(f"asset-{i}", OWNER) for i in range(3)])
+
+        rejected.assert_awaited_once()
+        assert results == [[True, True]] * 3
+        assert chain.rpc.method_counts["eth_call"] == 3
+
+    @pytest.mark.asyncio
+    async def test_bulk_methods_format_like_the_single_ones(self, chain):
+        assets = [("asset-1", OWNER), ("asset-2", OWNER.lower())]
+
+        assert await chain.service.check_asset_exists_many(assets) == [{"exists": True, "is_deleted": True}] * 2
+        assert await chain.service.get_ipfs_info_many(assets) == [await chain.service.get_ipfs_info(*assets[0])] * 2
+        assert await chain.service.get_pending_transfer_many(assets) == [await chain.service.get_pending_transfer(*assets[0])] * 2
+
+
+class TestHandlersUseBulkReads:
+    @pytest.mark.asyncio
+    async def test_pending_transfers_are_read_in_one_call(self):
+        asset_service = MagicMock()
+        asset_service.get_documents_by_wallet = AsyncMock(return_value=[
+            {"_id": "doc-1", "assetId": "asset-1"}, {"_id": "doc-2", "assetId": "asset-2"}, {"_id": "doc-3", "assetId": "asset-3"}
+        ])
+        blockchain_service = MagicMock()
+        blockchain_service.get_pending_transfer_many = AsyncMock(
+            return_value=[RECIPIENT, ZERO_ADDRESS, ContractLogicError("execution reverted")]
+        )
+        handler = TransferHandler(asset_service=asset_service, blockchain_service=blockchain_service)
+
+        result = await handler.get_pending_transfers(OWNER)
+
+        blockchain_service.get_pending_transfer_many.assert_awaited_once_with(
+            [("asset-1", OWNER), ("asset-2", OWNER), ("asset-3", OWNER)]
+        )
+        assert [t["asset_id"] for t in result["outgoing_transfers"]] == ["asset-1"]
+
+    @pytest.mark.asyncio
+    async def test_batch_deletion_checks_the_chain_in_one_call(self):
+        asset_service = MagicMock()
+        asset_service.get_asset = AsyncMock(side_effect=lambda asset_id: {"_id": f"doc-{asset_id}", "walletAddress": OWNER})
+        asset_service.soft_delete = AsyncMock(return_value=True)
+        blockchain_service = MagicMock()
+        blockchain_service.check_asset_exists_many = AsyncMock(return_value=[
+            {"exists": True, "is_deleted": False},
+            {"exists": True, "is_deleted": True},
+            ContractLogicError("execution reverted")
+        ])
+        blockchain_service.batch_delete_assets = AsyncMock(return_value={"tx_hash": "0x01"})
+        handler = DeleteHandler(asset_service=asset_service, blockchain_service=blockchain_service)
+
+        result = await handler.prepare_batch_deletion(["asset-1", "asset-2", "asset-3"], OWNER)
+
+        blockchain_service.check_asset_exists_many.assert_awaited_once_with(
+            [("asset-1", OWNER.lower()), ("asset-2", OWNER.lower()), ("asset-3", OWNER.lower())]
+        )
+        blockchain_service.check_asset_exists.assert_not_called()
+        # The already deleted asset is only synced; unverifiable ones are still deleted on chain
+        blockchain_service.batch_delete_assets.assert_awaited_once_with(asset_ids=["asset-1", "asset-3"])
+        assert result["success_count"] == 2
+        assert sorted(call.kwargs["asset_id"] for call in asset_service.soft_delete.await_args_list) == [
+            "asset-1", "asset-2", "asset-3"
+        ]
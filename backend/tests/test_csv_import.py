@@ -0,0 +1,229 @@
+import io
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from starlette.datastructures import UploadFile
+
+from app.api import upload_routes
+from app.handlers.upload_handler import UploadHandler
+from app.services import import_result_store
+from app.services.import_result_store import ImportResultStore, RedisImportResultStore
+from app.utilities.csv_stream import AssetIdSet, iter_csv_chunks
+
+API_KEY_USER = "0x2c7536E3605D9C16a7a3D7b1898e529396a65c23"
+OWNER_A = "0x" + "aa" * 20
+OWNER_B = "0x" + "bb" * 20
+
+
+def csv_file(rows, header="asset_id,wallet_address,name,notes", filename="assets.csv"):
+    content = "\n".join([header, *rows]) + "\n"
+    return UploadFile(file=io.BytesIO(content.encode()), filename=filename)
+
+
+def asset_rows(count, owner, prefix="asset"):
+    return [f"{prefix}-{i},{owner},Name {i},note {i}" for i in range(count)]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = ImportResultStore()
+    monkeypatch.setattr(import_result_store, "get_import_result_store", lambda: store)
+    return store
+
+
+@pytest.fixture
+def handler():
+    asset_service = MagicMock()
+    asset_service.get_asset = AsyncMock(return_value=None)
+    asset_service.get_asset_with_deleted = AsyncMock(return_value=None)
+    asset_service.create_asset = AsyncMock(side_effect=lambda asset_id, **kwargs: f"doc-{asset_id}")
+    asset_service.create_new_version = AsyncMock(return_value={"document_id": "doc-v2", "version_number": 2})
+
+    ipfs_service = MagicMock()
+
+    async def store_batch(metadata_list, progress_callback=None, max_concurrent=10):
+        return [{"asset_id": m["asset_id"], "cid": f"cid-{m['asset_id']}", "status": "completed", "error": None}
+                for m in metadata_list]
+
+    ipfs_service.store_metadata_batch_concurrent = AsyncMock(side_effect=store_batch)
+    ipfs_service.compute_cid = AsyncMock(return_value="cid-unchanged")
+
+    blockchain_service = MagicMock()
+    blockchain_service.get_server_wallet_address.return_value = "0x" + "ff" * 20
+    blockchain_service.check_delegation = AsyncMock(return_value=True)
+    blockchain_service.execute_batch_transaction = AsyncMock(return_value={"success": True, "tx_hash": "0xtx"})
+
+    return UploadHandler(
+        asset_service=asset_service,
+        ipfs_service=ipfs_service,
+        blockchain_service=blockchain_service,
+        transaction_service=MagicMock(record_transaction=AsyncMock()),
+        transaction_state_service=MagicMock(),
+        auth_context={"auth_method": "api_key", "wallet_address": API_KEY_USER}
+    )
+
+
+class TestCsvStream:
+    @pytest.mark.asyncio
+    async def test_rows_are_yielded_in_chunks(self):
+        file = csv_file(asset_rows(5, OWNER_A)).file
+
+        chunks = [chunk async for chunk in iter_csv_chunks(file, ["name"], chunk_rows=2)]
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert chunks[0][0] == {
+            "asset_id": "asset-0",
+            "owner_address": OWNER_A,
+            "critical_metadata": {"name": "Name 0"},
+            "non_critical_metadata": {"notes": "note 0"}
+        }
+
+    @pytest.mark.asyncio
+    async def test_missing_critical_column_is_rejected(self):
+        file = csv_file(asset_rows(1, OWNER_A)).file
+
+        with pytest.raises(ValueError, match="Missing critical columns"):
+            [chunk async for chunk in iter_csv_chunks(file, ["name", "description"])]
+
+    def test_asset_id_set(self):
+        seen = AssetIdSet()
+
+        assert seen.add("asset-1") is True
+        assert seen.add("asset-1") is False
+        assert "asset-1" in seen and "asset-2" not in seen
+        assert len(seen) == 1
+
+
+class TestProcessCsvUpload:
+    @pytest.mark.asyncio
+    async def test_rows_are_written_in_per_owner_batches(self, handler, store, monkeypatch):
+        monkeypatch.setattr(upload_routes.settings, "csv_import_chunk_rows", 16)
+        rows = asset_rows(70, OWNER_A, "a") + asset_rows(50, OWNER_B, "b") + [f"a-3,{OWNER_A},Dup,dup"]
+
+        result = await handler.process_csv_upload([csv_file(rows)], API_KEY_USER, ["name"])
+
+        assert result["upload_count"] == 121
+        assert result["results"] == []
+        assert result["status_counts"] == {"success": 120, "skipped": 1}
+
+        calls = handler.blockchain_service.execute_batch_transaction.await_args_list
+        assert sorted(len(c.kwargs["asset_ids"]) for c in calls) == [20, 50, 50]
+        for c in calls:
+            assert len(set(c.kwargs["owner_addresses"])) == 1
+        # One two-step delegation check per owner, not per row
+        assert handler.blockchain_service.check_delegation.await_count == 4
+
+        stored = await store.get_results(result["import_id"], offset=0, limit=1000)
+        assert len(stored) == 121
+        assert {r["filename"] for r in stored} == {"assets.csv"}
+
+    @pytest.mark.asyncio
+    async def test_own_rows_are_written_like_single_uploads(self, handler, store):
+        """The initiator's own rows go through batchUpdateIPFS, as store_hash uses updateIPFS."""
+        rows = asset_rows(2, API_KEY_USER, "mine") + asset_rows(2, OWNER_A, "theirs")
+
+        result = await handler.process_csv_upload([csv_file(rows)], API_KEY_USER, ["name"])
+
+        assert result["status_counts"] == {"success": 4}
+        owners = {
+            tuple(c.kwargs["asset_ids"]): c.kwargs["owner_addresses"]
+            for c in handler.blockchain_service.execute_batch_transaction.await_args_list
+        }
+        assert owners == {("mine-0", "mine-1"): None, ("theirs-0", "theirs-1"): [OWNER_A, OWNER_A]}
+
+    @pytest.mark.asyncio
+    async def test_undelegated_owner_rows_are_rejected(self, handler, store):
+        handler.blockchain_service.check_delegation = AsyncMock(side_effect=lambda owner_address, **kw: owner_address != OWNER_B)
+        rows = asset_rows(3, OWNER_A, "a") + asset_rows(2, OWNER_B, "b")
+
+        result = await handler.process_csv_upload([csv_file(rows)], API_KEY_USER, ["name"])
+
+        assert result["status_counts"] == {"success": 3, "error": 2}
+        errors = [r for r in await store.get_results(result["import_id"]) if r["status"] == "error"]
+        assert all("has not delegated" in r["detail"] for r in errors)
+
+    @pytest.mark.asyncio
+    async def test_non_critical_changes_skip_ipfs_and_chain(self, handler, store):
+        handler.asset_service.get_asset = AsyncMock(return_value={
+            "ipfsHash": "cid-unchanged", "smartContractTxId": "0xold", "ipfsVersion": 1
+        })
+
+        result = await handler.process_csv_upload([csv_file(asset_rows(3, API_KEY_USER))], API_KEY_USER, ["name"])
+
+        assert result["status_counts"] == {"success": 3}
+        handler.ipfs_service.store_metadata_batch_concurrent.assert_not_awaited()
+        handler.blockchain_service.execute_batch_transaction.assert_not_awaited()
+        actions = {c.kwargs["action"] for c in handler.transaction_service.record_transaction.await_args_list}
+        assert actions == {"UPDATE"}
+
+    @pytest.mark.asyncio
+    async def test_failed_transaction_fails_only_its_batch(self, handler, store):
+        async def execute(asset_ids, cids, owner_addresses):
+            if owner_addresses[0] == OWNER_B:
+                raise HTTPException(status_code=500, detail="Batch transaction failed: reverted")
+            return {"success": True, "tx_hash": "0xtx"}
+
+        handler.blockchain_service.execute_batch_transaction = AsyncMock(side_effect=execute)
+        rows = asset_rows(2, OWNER_A, "a") + asset_rows(2, OWNER_B, "b")
+
+        result = await handler.process_csv_upload([csv_file(rows)], API_KEY_USER, ["name"])
+
+        assert result["status_counts"] == {"success": 2, "error": 2}
+        handler.asset_service.create_asset.assert_awaited()
+        assert {c.kwargs["asset_id"] for c in handler.asset_service.create_asset.await_args_list} == {"a-0", "a-1"}
+
+    @pytest.mark.asyncio
+    async def test_file_level_errors_are_returned_inline(self, handler, store):
+        bad_header = csv_file(asset_rows(1, OWNER_A), header="asset_id,name,notes,extra")
+        not_csv = csv_file([], filename="assets.txt")
+
+        result = await handler.process_csv_upload([bad_header, not_csv], API_KEY_USER, ["name"])
+
+        assert result["upload_count"] == 2
+        assert "wallet_address" in result["results"][0]["detail"]
+        assert "Not a CSV file" in result["results"][1]["detail"]
+
+
+@pytest.mark.parametrize("backend, expected", [("memory", ImportResultStore), ("redis", RedisImportResultStore)])
+def test_result_store_backend_is_configured_separately(monkeypatch, backend, expected):
+    monkeypatch.setattr(import_result_store, "_import_result_store", None)
+    monkeypatch.setattr(upload_routes.settings, "csv_import_result_backend", backend)
+    monkeypatch.setattr(upload_routes.settings, "progress_backend", "memory" if backend == "redis" else "redis")
+
+    assert isinstance(import_result_store.get_import_result_store(), expected)
+
+
+class TestCsvImportResultsRoute:
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(upload_routes.router)
+
+        @app.middleware("http")
+        async def authenticate(request, call_next):
+            request.state.user = {"walletAddress": API_KEY_USER}
+            request.state.auth_context = {"wallet_address": API_KEY_USER, "auth_method": "wallet", "permissions": ["read"]}
+            return await call_next(request)
+
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    @pytest.mark.asyncio
+    async def test_results_are_paged_for_the_initiator_only(self, store, client):
+        await store.create_import("mine", API_KEY_USER.lower())
+        await store.add_results("mine", [{"asset_id": f"a-{i}", "status": "success"} for i in range(5)])
+        await store.finish_import("mine")
+        await store.create_import("theirs", OWNER_A)
+
+        async with client:
+            page = await client.get("/upload/csv/mine/results", params={"offset": 3, "limit": 10})
+            forbidden = await client.get("/upload/csv/theirs/results")
+            missing = await client.get("/upload/csv/unknown/results")
+
+        assert page.status_code == 200
+        body = page.json()
+        assert (body["finished"], body["resultCount"], body["statusCounts"]) == (True, 5, {"success": 5})
+        assert [r["asset_id"] for r in body["results"]] == ["a-3", "a-4"]
+        assert forbidden.status_code == 403
+        assert missing.status_code == 404
@@ -0,0 +1,160 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import service_container
+from app.services.blockchain_service import BlockchainService
+from app.services.delegation_cache import DelegationCache, DelegationEventWatcher
+
+OWNER = "0x2c7536E3605D9C16a7a3D7b1898e529396a65c23"
+DELEGATE = "0x" + "11" * 20
+
+
+def counting_loader(value=True, delay=0.0):
+    calls = {"count": 0}
+
+    async def loader():
+        calls["count"] += 1
+        await asyncio.sleep(delay)
+        return value
+
+    return loader, calls
+
+
+class TestDelegationCache:
+    @pytest.mark.asyncio
+    async def test_repeated_lookups_read_the_chain_once(self):
+        cache = DelegationCache()
+        loader, calls = counting_loader()
+
+        results = [await cache.get_or_load(OWNER, DELEGATE.upper().replace("0X", "0x"), loader) for _ in range(100)]
+
+        assert all(results)
+        assert calls["count"] == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (99, 1)
+        assert stats["hit_rate"] == 0.99
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_read(self):
+        cache = DelegationCache()
+        loader, calls = counting_loader(delay=0.01)
+
+        results = await asyncio.gather(*(cache.get_or_load(OWNER, DELEGATE, loader) for _ in range(10)))
+
+        assert results == [True] * 10
+        assert calls["count"] == 1
+        assert cache.stats()["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self):
+        cache = DelegationCache(ttl=0.01)
+        loader, calls = counting_loader()
+
+        await cache.get_or_load(OWNER, DELEGATE, loader)
+        await asyncio.sleep(0.02)
+        await cache.get_or_load(OWNER, DELEGATE, loader)
+
+        assert calls["count"] == 2
+        assert cache.stats()["expired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_read_in_flight_during_invalidation_is_not_cached(self):
+        cache = DelegationCache()
+        loader, calls = counting_loader(delay=0.02)
+
+        lookup = asyncio.create_task(cache.get_or_load(OWNER, DELEGATE, loader))
+        await asyncio.sleep(0.005)
+        cache.invalidate(OWNER, DELEGATE)
+
+        assert await lookup is True
+        assert cache.get(OWNER, DELEGATE) is None
+        assert cache.stats()["discarded_fills"] == 1
+
+    @pytest.mark.asyncio
+    async def test_strict_reads_bypass_but_refresh_the_cache(self):
+        cache = DelegationCache()
+        cache.put(OWNER, DELEGATE, True)
+        loader, calls = counting_loader(value=False)
+
+        assert await cache.get_or_load(OWNER, DELEGATE, loader, strict=True) is False
+        assert calls["count"] == 1
+        assert cache.get(OWNER, DELEGATE) is False
+
+    @pytest.mark.asyncio
+    async def test_concurrent_strict_reads_share_one_call(self):
+        cache = DelegationCache()
+        loader, calls = counting_loader(delay=0.02)
+
+        # A cached read in flight does not serve strict callers
+        cached = asyncio.create_task(cache.get_or_load(OWNER, DELEGATE, loader))
+        await asyncio.sleep(0)
+        results = await asyncio.gather(*(cache.get_or_load(OWNER, DELEGATE, loader, strict=True) for _ in range(5)))
+
+        assert await cached is True and results == [True] * 5
+        assert calls["count"] == 2
+        assert cache.stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_read_is_not_cached(self):
+        cache = DelegationCache()
+
+        async def failing():
+            raise ConnectionError("rpc down")
+
+        with pytest.raises(ConnectionError):
+            await cache.get_or_load(OWNER, DELEGATE, failing)
+        loader, calls = counting_loader()
+        assert await cache.get_or_load(OWNER, DELEGATE, loader) is True
+        assert calls["count"] == 1
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = DelegationCache(max_entries=2)
+        for i in range(3):
+            cache.put(OWNER, f"0x{i:040x}", True)
+
+        assert cache.get(OWNER, f"0x{0:040x}") is None
+        assert cache.stats()["entries"] == 2
+
+
+class TestDelegationEventWatcher:
+    @pytest.mark.asyncio
+    async def test_events_invalidate_cached_pairs_in_chunks(self):
+        cache = DelegationCache()
+        service = MagicMock()
+        service.get_latest_block_number = AsyncMock(side_effect=[100, 2600])
+        service.get_delegate_status_changes = AsyncMock(side_effect=[
+            [{"owner": OWNER, "delegate": DELEGATE, "status": False, "block_number": 150}],
+            [],
+        ])
+        watcher = DelegationEventWatcher(service, cache, max_block_range=2000)
+
+        cache.put(OWNER, "0x" + "22" * 20, True)
+        assert await watcher.poll_once() == 0
+        # Entries cached before the watcher knew the head are dropped
+        assert cache.stats()["entries"] == 0
+
+        cache.put(OWNER, DELEGATE, True)
+        assert await watcher.poll_once() == 1
+
+        assert cache.get(OWNER, DELEGATE) is None
+        assert [c.args for c in service.get_delegate_status_changes.await_args_list] == [(101, 2100), (2101, 2600)]
+        assert watcher.status()["last_block"] == 2600
+
+
+class TestCheckDelegation:
+    @pytest.mark.asyncio
+    async def test_check_delegation_uses_cache_unless_strict(self):
+        service = BlockchainService.__new__(BlockchainService)
+        service.contract = MagicMock()
+        service.contract.functions.delegates.return_value.call = AsyncMock(return_value=True)
+        cache = DelegationCache()
+
+        with patch.object(service_container, "get_delegation_cache", return_value=cache):
+            for _ in range(5):
+                assert await service.check_delegation(OWNER, DELEGATE) is True
+            await service.check_delegation(OWNER, DELEGATE, strict=True)
+
+        assert service.contract.functions.delegates.return_value.call.await_count == 2
+        assert cache.stats()["strict_reads"] == 1
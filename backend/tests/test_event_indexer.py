@@ -0,0 +1,234 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from eth_abi import encode
+from hexbytes import HexBytes
+from web3 import Web3
+
+from app.database import MockCollection
+from app.repositories.chain_event_repo import ChainEventRepository
+from app.services import blockchain_service as blockchain_module
+from app.services.blockchain_service import BlockchainService
+from app.services.event_indexer import ChainEventIndexer
+
+OWNER = "0x2c7536E3605D9C16a7a3D7b1898e529396a65c23"
+DELEGATE = "0x" + "11" * 20
+
+
+def asset_hash(asset_id):
+    return Web3.keccak(text=asset_id).hex()
+
+
+class FakeChain:
+    """Blocks with fork-dependent hashes and registry events, shaped like BlockchainService's results."""
+
+    def __init__(self, head):
+        self.head = head
+        self.fork = {}
+        self.events = []
+        self.get_logs_calls = []
+
+    def block_hash(self, number):
+        if number > self.head:
+            return None
+        return f"{self.fork.get(number, 'a')}{number:063x}"
+
+    def add_update(self, block, asset_id, cid, version, log_index=0, owner=OWNER):
+        self.events.append({
+            "event": "IPFSUpdated",
+            "block_number": block,
+            "block_hash": self.block_hash(block),
+            "transaction_hash": f"{block:04x}{log_index:060x}",
+            "log_index": log_index,
+            "args": {"owner": owner, "assetId": asset_hash(asset_id), "ipfsVersion": version, "cid": cid, "isDeleted": False}
+        })
+
+    def reorg_from(self, block):
+        """Replace every block from `block` on and drop their events."""
+        for number in range(block, self.head + 1):
+            self.fork[number] = "b"
+        self.events = [e for e in self.events if e["block_number"] < block]
+
+    def service(self):
+        async def get_contract_events(from_block, to_block, event_names):
+            self.get_logs_calls.append((from_block, to_block))
+            return [e for e in self.events if from_block <= e["block_number"] <= to_block]
+
+        return SimpleNamespace(
+            get_latest_block_number=AsyncMock(side_effect=lambda: self.head),
+            get_block_hash=AsyncMock(side_effect=self.block_hash),
+            get_contract_events=AsyncMock(side_effect=get_contract_events)
+        )
+
+
+@pytest.fixture
+def db_client():
+    return SimpleNamespace(
+        chain_events_collection=MockCollection("chain_events"),
+        chain_indexer_state_collection=MockCollection("chain_indexer_state")
+    )
+
+
+@pytest.fixture
+def repository(db_client):
+    return ChainEventRepository(db_client)
+
+
+class TestChainEventIndexer:
+    @pytest.mark.asyncio
+    async def test_backfill_stops_short_of_unconfirmed_blocks_and_resumes(self, repository):
+        chain = FakeChain(head=5000)
+        chain.add_update(150, "asset-1", "cid-1", 1)
+        chain.add_update(4995, "asset-1", "cid-unconfirmed", 2)
+        indexer = ChainEventIndexer(chain.service(), repository, start_block=100, confirmations=10, max_block_range=2000)
+
+        assert await indexer.poll_once() == 1
+        assert chain.get_logs_calls == [(100, 2099), (2100, 4099), (4100, 4990)]
+        assert (await repository.get_checkpoint())["last_block"] == 4990
+
+        # A new process picks up from the stored checkpoint
+        chain.head = 5100
+        restarted = ChainEventIndexer(chain.service(), repository, start_block=100, confirmations=10, max_block_range=2000)
+        assert await restarted.poll_once() == 1
+        assert chain.get_logs_calls[-1] == (4991, 5090)
+
+        latest = await repository.find_latest_ipfs_update(OWNER.upper().replace("0X", "0x"), asset_hash("asset-1"))
+        assert (latest["cid"], latest["blockNumber"], latest["owner"]) == ("cid-unconfirmed", 4995, OWNER.lower())
+
+    @pytest.mark.asyncio
+    async def test_reorg_rolls_back_to_the_last_canonical_range(self, repository):
+        chain = FakeChain(head=1000)
+        chain.add_update(150, "asset-1", "cid-1", 1)
+        chain.add_update(750, "asset-1", "cid-orphaned", 2)
+        indexer = ChainEventIndexer(chain.service(), repository, start_block=0, confirmations=0, max_block_range=300)
+        await indexer.poll_once()
+
+        chain.reorg_from(700)
+        chain.add_update(710, "asset-1", "cid-2", 2)
+        assert await indexer.poll_once() == 1
+
+        # Ranges ended at 299, 599, 899 and 1000; the fork at 700 invalidates the last two
+        assert chain.get_logs_calls[-2:] == [(600, 899), (900, 1000)]
+        latest = await repository.find_latest_ipfs_update(OWNER, asset_hash("asset-1"))
+        assert latest["cid"] == "cid-2"
+        assert await repository.chain_events_collection.count_documents({}) == 2
+        assert indexer.status()["reorgs"] == 1
+
+    @pytest.mark.asyncio
+    async def test_latest_update_is_by_chain_order_not_version(self, repository):
+        """A deleted and recreated asset restarts at version 1."""
+        chain = FakeChain(head=100)
+        chain.add_update(10, "asset-1", "cid-old", 3)
+        chain.add_update(20, "asset-1", "cid-recreated", 1)
+        chain.add_update(20, "asset-1", "cid-recreated-v2", 2, log_index=4)
+        await ChainEventIndexer(chain.service(), repository, confirmations=0).poll_once()
+
+        latest = await repository.find_latest_ipfs_update(OWNER, asset_hash("asset-1"))
+
+        assert latest["cid"] == "cid-recreated-v2"
+
+    @pytest.mark.asyncio
+    async def test_each_range_is_one_bulk_write(self, repository):
+        chain = FakeChain(head=100)
+        for log_index in range(5):
+            chain.add_update(10, f"asset-{log_index}", "cid-1", 1, log_index=log_index)
+        collection = repository.chain_events_collection
+        collection.bulk_write = AsyncMock(side_effect=collection.bulk_write)
+
+        assert await repository.upsert_events([]) == 0
+        await ChainEventIndexer(chain.service(), repository, confirmations=0).poll_once()
+        documents = [ChainEventIndexer.to_document(event) for event in chain.events]
+        # Indexing the range again overwrites instead of duplicating
+        assert await repository.upsert_events(documents) == 5
+
+        assert collection.bulk_write.await_count == 2
+        assert collection.bulk_write.await_args.kwargs == {"ordered": False}
+        assert await collection.count_documents({}) == 5
+
+
+class TestBlockchainServiceEvents:
+    @pytest.fixture
+    def service(self):
+        return BlockchainService()
+
+    @pytest.mark.asyncio
+    async def test_get_contract_events_decodes_one_get_logs_call(self, service):
+        events = service.contract.events
+        logs = [
+            {
+                "address": service.contract.address,
+                "topics": [HexBytes(events.DelegateStatusChanged.topic), HexBytes(b"\0" * 12 + bytes.fromhex(OWNER[2:])),
+                           HexBytes(b"\0" * 12 + bytes.fromhex(DELEGATE[2:]))],
+                "data": HexBytes(encode(["bool"], [True])),
+                "blockNumber": 8, "blockHash": HexBytes(b"\1" * 32), "transactionHash": HexBytes(b"\3" * 32),
+                "logIndex": 1, "transactionIndex": 0, "removed": False
+            },
+            {
+                "address": service.contract.address,
+                "topics": [HexBytes(events.IPFSUpdated.topic), HexBytes(b"\0" * 12 + bytes.fromhex(OWNER[2:])),
+                           Web3.keccak(text="asset-1")],
+                "data": HexBytes(encode(["uint32", "string", "bool"], [2, "bafy-cid", False])),
+                "blockNumber": 7, "blockHash": HexBytes(b"\1" * 32), "transactionHash": HexBytes(b"\2" * 32),
+                "logIndex": 0, "transactionIndex": 0, "removed": False
+            }
+        ]
+
+        with patch.object(service.web3.eth, "get_logs", AsyncMock(return_value=logs)) as get_logs:
+            result = await service.get_contract_events(1, 10, ["IPFSUpdated", "DelegateStatusChanged"])
+
+        query = get_logs.await_args.args[0]
+        assert (query["fromBlock"], query["toBlock"]) == (1, 10)
+        assert set(query["topics"][0]) == {events.IPFSUpdated.topic, events.DelegateStatusChanged.topic}
+        assert [e["event"] for e in result] == ["IPFSUpdated", "DelegateStatusChanged"]
+        document = ChainEventIndexer.to_document(result[0])
+        assert document["_id"] == f"{'02' * 32}:0"
+        assert (document["owner"], document["assetIdHash"], document["cid"]) == (OWNER.lower(), asset_hash("asset-1"), "bafy-cid")
+        assert ChainEventIndexer.to_document(result[1])["delegate"] == DELEGATE.lower()
+
+    @pytest.mark.asyncio
+    async def test_recovery_uses_the_index_and_scans_only_the_tail(self, service, db_client, repository, monkeypatch):
+        monkeypatch.setattr(blockchain_module.settings, "event_indexer_enabled", True)
+        chain = FakeChain(head=5000)
+        chain.add_update(150, "asset-1", "cid-indexed", 1)
+        await ChainEventIndexer(chain.service(), repository, confirmations=12).poll_once()
+
+        service.get_latest_block_number = AsyncMock(return_value=5000)
+        service._query_events_chunked = AsyncMock(return_value=[])
+        with patch("app.database.get_db_client", return_value=db_client):
+            recovered = await service.recover_data_from_events("asset-1", OWNER)
+
+            assert recovered == {"cid": "cid-indexed", "tx_hash": chain.events[0]["transaction_hash"]}
+            service._query_events_chunked.assert_awaited_once_with("asset-1", OWNER, 4989, 5000)
+
+            # An update the indexer has not reached yet wins
+            service._query_events_chunked.return_value = [{
+                "args": {"cid": "cid-recent", "isDeleted": False},
+                "blockNumber": 4995, "logIndex": 0, "transactionHash": HexBytes(b"\5" * 32)
+            }]
+            assert (await service.recover_data_from_events("asset-1", OWNER))["cid"] == "cid-recent"
+
+            service._query_events_chunked.return_value = []
+            with pytest.raises(ValueError):
+                await service.recover_data_from_events("asset-unknown", OWNER)
+
+    @pytest.mark.asyncio
+    async def test_recovery_scans_logs_until_the_indexer_has_caught_up(self, service, db_client, repository, monkeypatch):
+        monkeypatch.setattr(blockchain_module.settings, "event_indexer_enabled", True)
+        await repository.save_checkpoint({"start_block": 0, "last_block": 1999, "recent_blocks": []})
+        service.get_latest_block_number = AsyncMock(return_value=1_000_000)
+        service.web3 = MagicMock()
+        service.web3.eth.get_block = AsyncMock(return_value={"number": 1_000_000})
+        event = {
+            "args": {"cid": "cid-scanned", "ipfsVersion": 1, "isDeleted": False},
+            "blockNumber": 1500, "logIndex": 0, "transactionHash": HexBytes(b"\6" * 32)
+        }
+        service._query_events_chunked = AsyncMock(return_value=[event])
+
+        with patch("app.database.get_db_client", return_value=db_client):
+            recovered = await service.recover_data_from_events("asset-1", OWNER)
+
+        assert recovered["cid"] == "cid-scanned"
+        # Without the index the whole history is scanned, newest first
+        assert service._query_events_chunked.await_args.args[2:] == (0, 1_000_000)
+        assert service._query_events_chunked.await_args.kwargs == {"newest_only": True}
@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.utilities.cid_utils import compute_cid
+from app.utilities.gateway_fetch import GatewayLatencyTracker, hedged_fetch
+
+CONTENT = b'{"name":"Test Asset"}'
+CID = compute_cid(CONTENT)
+
+
+def stub_gateways(behaviour):
+    """
+    Build a client whose hosts act as local stub gateways.
+
+    behaviour maps host -> (delay seconds, status code, body).
+    """
+    calls = []
+    cancelled = []
+
+    async def handler(request):
+        host = request.url.host
+        calls.append(host)
+        delay, status, body = behaviour[host]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(host)
+            raise
+        return httpx.Response(status, content=body)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, calls, cancelled
+
+
+def sources(*hosts):
+    return [(host, f"http://{host}/ipfs/{CID}") for host in hosts]
+
+
+class TestHedgedFetch:
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged(self):
+        """A slow primary does not hold up retrieval once the hedge delay passes."""
+        client, calls, cancelled = stub_gateways({
+            "primary": (5.0, 200, CONTENT),
+            "backup": (0.01, 200, CONTENT),
+        })
+
+        start = time.perf_counter()
+        async with client:
+            response = await hedged_fetch(client, CID, sources("primary", "backup"), hedge_delay=0.05, timeout=10)
+
+        assert response.content == CONTENT
+        assert time.perf_counter() - start < 1
+        assert calls == ["primary", "backup"]
+        assert cancelled == ["primary"]
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        client, calls, _ = stub_gateways({
+            "primary": (0.01, 200, CONTENT),
+            "backup": (0.01, 200, CONTENT),
+        })
+
+        async with client:
+            await hedged_fetch(client, CID, sources("primary", "backup"), hedge_delay=0.5, timeout=10)
+
+        assert calls == ["primary"]
+
+    @pytest.mark.asyncio
+    async def test_failure_starts_next_gateway_immediately(self):
+        client, calls, _ = stub_gateways({
+            "primary": (0.0, 500, b""),
+            "backup": (0.01, 200, CONTENT),
+        })
+
+        start = time.perf_counter()
+        async with client:
+            response = await hedged_fetch(client, CID, sources("primary", "backup"), hedge_delay=5, timeout=10)
+
+        assert response.content == CONTENT
+        assert time.perf_counter() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_unverified_content_loses_to_verified(self):
+        """A faster gateway serving tampered bytes does not win."""
+        client, _, _ = stub_gateways({
+            "primary": (0.0, 200, CONTENT + b"garbage}"),
+            "backup": (0.05, 200, CONTENT),
+        })
+
+        async with client:
+            response = await hedged_fetch(client, CID, sources("primary", "backup"), hedge_delay=0, timeout=10)
+
+        assert response.content == CONTENT
+
+    @pytest.mark.asyncio
+    async def test_unverified_content_used_when_nothing_verifies(self):
+        client, _, _ = stub_gateways({
+            "primary": (0.0, 200, b"other"),
+            "backup": (0.0, 404, b""),
+        })
+
+        async with client:
+            response = await hedged_fetch(client, CID, sources("primary", "backup"), hedge_delay=0, timeout=10)
+
+        assert response.content == b"other"
+
+    @pytest.mark.asyncio
+    async def test_raises_first_gateway_error_when_all_fail(self):
+        client, _, _ = stub_gateways({
+            "primary": (0.0, 500, b""),
+            "backup": (0.0, 404, b""),
+        })
+
+        async with client:
+            with pytest.raises(httpx.HTTPStatusError) as exc_info:
+                await hedged_fetch(client, CID, sources("primary", "backup"), hedge_delay=0, timeout=10)
+
+        assert exc_info.value.response.status_code == 500
+
+
+class TestGatewayLatencyTracker:
+    def test_orders_by_ewma_with_unmeasured_first(self):
+        tracker = GatewayLatencyTracker(alpha=0.5, failure_penalty=30)
+        tracker.record("slow", 2.0)
+        tracker.record("fast", 0.1)
+
+        assert tracker.order(["slow", "fast", "new"]) == ["new", "fast", "slow"]
+
+    def test_failures_push_gateway_back(self):
+        tracker = GatewayLatencyTracker(alpha=0.5, failure_penalty=30)
+        tracker.record("a", 0.1)
+        tracker.record("b", 0.5)
+        tracker.record_failure("a")
+
+        assert tracker.order(["a", "b"]) == ["b", "a"]
+
+    @pytest.mark.asyncio
+    async def test_hedged_fetch_updates_tracker(self):
+        tracker = GatewayLatencyTracker(failure_penalty=30)
+        client, _, _ = stub_gateways({
+            "primary": (0.0, 500, b""),
+            "backup": (0.0, 200, CONTENT),
+        })
+
+        async with client:
+            await hedged_fetch(client, CID, sources("primary", "backup"), hedge_delay=0, timeout=10, tracker=tracker)
+
+        assert tracker.order(["primary", "backup"]) == ["backup", "primary"]
@@ -0,0 +1,63 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.utilities.http_client import HostLimitedTransport, close_http_client, get_http_client
+
+
+class TestHostLimitedTransport:
+    @pytest.mark.asyncio
+    async def test_caps_in_flight_requests_per_host(self):
+        """No more than max_per_host requests to one host run at once; other hosts are unaffected."""
+        in_flight = {}
+        peak = {}
+
+        async def handler(request):
+            host = request.url.host
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+            await asyncio.sleep(0.01)
+            in_flight[host] -= 1
+            return httpx.Response(200, json={"ok": True})
+
+        transport = HostLimitedTransport(httpx.MockTransport(handler), max_per_host=3)
+        async with httpx.AsyncClient(transport=transport) as client:
+            await asyncio.gather(
+                *(client.get("http://storage/file") for _ in range(10)),
+                *(client.get("http://gateway/file") for _ in range(2)),
+            )
+
+        assert peak["storage"] == 3
+        assert peak["gateway"] == 2
+
+    @pytest.mark.asyncio
+    async def test_slot_released_after_error_response(self):
+        """Error responses free their slot so later requests are not starved."""
+        async def handler(request):
+            return httpx.Response(500)
+
+        transport = HostLimitedTransport(httpx.MockTransport(handler), max_per_host=1)
+        async with httpx.AsyncClient(transport=transport) as client:
+            responses = await asyncio.wait_for(
+                asyncio.gather(*(client.get("http://storage/file") for _ in range(3))),
+                timeout=1
+            )
+
+        assert [r.status_code for r in responses] == [500, 500, 500]
+
+
+class TestSharedClient:
+    @pytest.mark.asyncio
+    async def test_client_is_shared_until_closed(self):
+        """Every caller gets the same pooled client until shutdown closes it."""
+        client = get_http_client()
+
+        assert get_http_client() is client
+
+        await close_http_client()
+
+        assert client.is_closed
+        new_client = get_http_client()
+        assert new_client is not client
+        await close_http_client()
@@ -0,0 +1,107 @@
+import asyncio
+import io
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.config import settings
+from app.handlers.upload_handler import UploadHandler
+
+API_KEY_USER = "0x2c7536E3605D9C16a7a3D7b1898e529396a65c23"
+OWNER_A = "0x" + "aa" * 20
+OWNER_B = "0x" + "bb" * 20
+
+
+def json_file(asset_id, owner=API_KEY_USER, filename=None):
+    content = json.dumps({
+        "asset_id": asset_id,
+        "wallet_address": owner,
+        "critical_metadata": {"name": asset_id}
+    }).encode()
+    return UploadFile(file=io.BytesIO(content), filename=filename or f"{asset_id}.json")
+
+
+def make_handler(delays=None):
+    """Handler whose process_metadata sleeps per asset and records how many run at once."""
+    blockchain_service = MagicMock()
+    blockchain_service.get_server_wallet_address.return_value = "0x" + "ff" * 20
+    blockchain_service.check_delegation = AsyncMock(return_value=True)
+    handler = UploadHandler(
+        asset_service=MagicMock(),
+        ipfs_service=MagicMock(),
+        blockchain_service=blockchain_service,
+        transaction_state_service=MagicMock(),
+        auth_context={"auth_method": "api_key", "wallet_address": API_KEY_USER}
+    )
+    stats = {"in_flight": 0, "max_in_flight": 0}
+
+    async def process_metadata(asset_id, owner_address, initiator_address, critical_metadata,
+                               non_critical_metadata, file_info=None):
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        await asyncio.sleep((delays or {}).get(asset_id, 0.01))
+        stats["in_flight"] -= 1
+        return {"asset_id": asset_id, "status": "success", **(file_info or {})}
+
+    handler.process_metadata = process_metadata
+    return handler, stats
+
+
+class TestHandleJsonFilesConcurrency:
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order(self, monkeypatch):
+        monkeypatch.setattr(settings, "json_upload_concurrency", 4)
+        # Later files finish first
+        handler, stats = make_handler({f"asset-{i}": 0.05 - i * 0.005 for i in range(8)})
+        files = [json_file(f"asset-{i}") for i in range(8)]
+        files.insert(3, UploadFile(file=io.BytesIO(b"{}"), filename="notes.txt"))
+
+        result = await handler.handle_json_files(files, API_KEY_USER)
+
+        assert [r.get("asset_id", r["filename"]) for r in result["results"]] == [
+            "asset-0", "asset-1", "asset-2", "notes.txt", *(f"asset-{i}" for i in range(3, 8))
+        ]
+        assert stats["max_in_flight"] == 4
+
+    @pytest.mark.asyncio
+    async def test_concurrency_of_one_is_sequential(self, monkeypatch):
+        monkeypatch.setattr(settings, "json_upload_concurrency", 1)
+        handler, stats = make_handler()
+
+        result = await handler.handle_json_files([json_file(f"asset-{i}") for i in range(4)], API_KEY_USER)
+
+        assert result["upload_count"] == 4
+        assert stats["max_in_flight"] == 1
+
+    @pytest.mark.asyncio
+    async def test_first_duplicate_wins_even_if_slow(self, monkeypatch):
+        monkeypatch.setattr(settings, "json_upload_concurrency", 4)
+        handler, _ = make_handler({"asset-1": 0.05})
+        files = [json_file("asset-1", filename="first.json"), json_file("asset-1", filename="second.json")]
+
+        result = await handler.handle_json_files(files, API_KEY_USER)
+
+        assert [r["status"] for r in result["results"]] == ["success", "skipped"]
+        assert result["results"][0]["filename"] == "first.json"
+
+    @pytest.mark.asyncio
+    async def test_delegation_is_checked_once_per_owner(self, monkeypatch):
+        monkeypatch.setattr(settings, "json_upload_concurrency", 8)
+        handler, _ = make_handler()
+
+        async def check_delegation(owner_address, delegate_address, strict=False):
+            await asyncio.sleep(0.01)
+            return owner_address != OWNER_B
+
+        handler.blockchain_service.check_delegation = AsyncMock(side_effect=check_delegation)
+        files = [json_file(f"asset-{i}", OWNER_A if i % 2 else OWNER_B) for i in range(6)]
+
+        result = await handler.handle_json_files(files, API_KEY_USER)
+
+        # Two-step check (API key user and server wallet) for each of the two owners
+        assert handler.blockchain_service.check_delegation.await_count == 4
+        statuses = [r["status"] for r in result["results"]]
+        assert statuses == ["error", "success"] * 3
+        assert "has not delegated" in result["results"][0]["detail"]
@@ -0,0 +1,142 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from eth_abi import encode
+from hexbytes import HexBytes
+from web3 import Web3
+
+from app.services import blockchain_service as blockchain_module
+from app.services.blockchain_service import BlockchainService
+from app.utilities.log_scan import LogScanError, is_range_error, scan_block_ranges
+
+OWNER = "0x2c7536E3605D9C16a7a3D7b1898e529396a65c23"
+
+
+class FakeLogs:
+    """getLogs stand-in with one log per listed block, an optional range limit and call tracing."""
+
+    def __init__(self, blocks=(), max_range=None, delays=None):
+        self.blocks = sorted(blocks)
+        self.max_range = max_range
+        self.delays = delays or {}
+        self.calls = []
+        self.failures = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch(self, start, end):
+        self.calls.append((start, end))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get((start, end), 0.001))
+            if self.failures.get((start, end), 0) > 0:
+                self.failures[(start, end)] -= 1
+                raise ConnectionError("upstream timeout")
+            if self.max_range and end - start + 1 > self.max_range:
+                raise ValueError(f"query exceeds max block range {self.max_range}")
+            return [block for block in self.blocks if start <= block <= end]
+        finally:
+            self.in_flight -= 1
+
+
+def covered(calls, results):
+    """Blocks of the successful calls, checking no block was fetched twice."""
+    blocks = []
+    for start, end in calls:
+        if (start, end) in results:
+            blocks.extend(range(start, end + 1))
+    assert len(blocks) == len(set(blocks))
+    return set(blocks)
+
+
+class TestScanBlockRanges:
+    @pytest.mark.asyncio
+    async def test_chunks_run_concurrently_and_grow(self):
+        logs = FakeLogs(blocks=[5, 40_000, 99_999])
+
+        result = await scan_block_ranges(logs.fetch, 0, 99_999, chunk_size=1000, max_chunk_size=8000, concurrency=3)
+
+        assert sorted(result) == [5, 40_000, 99_999]
+        assert logs.max_in_flight == 3
+        assert max(end - start + 1 for start, end in logs.calls) == 8000
+        assert sum(end - start + 1 for start, end in logs.calls) == 100_000
+
+    @pytest.mark.asyncio
+    async def test_rejected_ranges_are_split_and_the_chunk_size_shrinks(self):
+        logs = FakeLogs(blocks=range(0, 20_000, 777), max_range=1500)
+
+        result = await scan_block_ranges(logs.fetch, 0, 19_999, chunk_size=10_000, concurrency=2, retry_delay=0)
+
+        assert sorted(result) == list(range(0, 20_000, 777))
+        succeeded = {(s, e) for s, e in logs.calls if e - s + 1 <= 1500}
+        assert covered(logs.calls, succeeded) == set(range(20_000))
+
+    @pytest.mark.asyncio
+    async def test_failed_chunks_are_retried_not_dropped(self):
+        logs = FakeLogs(blocks=[1500])
+        logs.failures[(1000, 1999)] = 2
+
+        result = await scan_block_ranges(logs.fetch, 0, 2999, chunk_size=1000, max_chunk_size=1000, retry_delay=0)
+
+        assert result == [1500]
+        assert logs.calls.count((1000, 1999)) == 3
+
+        logs.failures[(1000, 1999)] = 5
+        with pytest.raises(LogScanError, match="after 3 retries"):
+            await scan_block_ranges(logs.fetch, 0, 2999, chunk_size=1000, max_chunk_size=1000, retry_delay=0)
+
+    @pytest.mark.asyncio
+    async def test_newest_first_stops_at_the_newest_match(self):
+        # The newest chunk answers last; the scan must still wait for it
+        logs = FakeLogs(blocks=[100, 97_500, 99_999], delays={(99_000, 99_999): 0.05})
+
+        result = await scan_block_ranges(
+            logs.fetch, 0, 99_999, chunk_size=1000, max_chunk_size=1000, concurrency=4,
+            newest_first=True, stop_when=bool
+        )
+
+        assert 99_999 in result and 100 not in result
+        assert min(start for start, _ in logs.calls) >= 90_000
+
+    def test_range_errors_are_told_apart_from_rate_limits(self):
+        assert is_range_error(ValueError("query returned more than 10000 results"))
+        assert is_range_error(ValueError("Log response size exceeded. You can make eth_getLogs requests with up to a 2K block range"))
+        assert not is_range_error(ValueError("Your app has exceeded its compute units per second capacity"))
+        assert not is_range_error(ConnectionError("429 Too Many Requests"))
+
+
+class TestQueryEventsChunked:
+    @pytest.mark.asyncio
+    async def test_topics_are_filtered_by_the_node(self, monkeypatch):
+        monkeypatch.setattr(blockchain_module.settings, "log_scan_chunk_size", 1000)
+        monkeypatch.setattr(blockchain_module.settings, "log_scan_max_chunk_size", 1000)
+        monkeypatch.setattr(blockchain_module.settings, "log_scan_concurrency", 1)
+        service = BlockchainService()
+        topic = service.contract.events.IPFSUpdated.topic
+        queries = []
+
+        async def get_logs(query):
+            queries.append(query)
+            if not query["fromBlock"] <= 4321 <= query["toBlock"]:
+                return []
+            return [{
+                "address": service.contract.address,
+                "topics": [HexBytes(topic), HexBytes(b"\0" * 12 + bytes.fromhex(OWNER[2:])), Web3.keccak(text="asset-1")],
+                "data": HexBytes(encode(["uint32", "string", "bool"], [4, "bafy-latest", False])),
+                "blockNumber": 4321, "blockHash": HexBytes(b"\1" * 32), "transactionHash": HexBytes(b"\2" * 32),
+                "logIndex": 0, "transactionIndex": 0, "removed": False
+            }]
+
+        with patch.object(service.web3.eth, "get_logs", get_logs):
+            events = await service._query_events_chunked("asset-1", OWNER.lower(), 0, 9999, newest_only=True)
+
+        assert [e["args"]["cid"] for e in events] == ["bafy-latest"]
+        assert queries[0]["topics"] == [
+            topic,
+            "0x" + "00" * 12 + OWNER[2:].lower(),
+            Web3.to_hex(Web3.keccak(text="asset-1"))
+        ]
+        # Nothing older than the chunk holding the update is fetched
+        assert [q["fromBlock"] for q in queries] == [9000, 8000, 7000, 6000, 5000, 4000]
@@ -0,0 +1,201 @@
+import asyncio
+import time
+
+import pytest
+from eth_utils import keccak
+
+pytest.importorskip("eth_tester")
+
+from web3 import AsyncWeb3
+from web3.providers.eth_tester import AsyncEthereumTesterProvider
+
+from app.services.nonce_manager import NonceManager, TransactionSender
+
+RECIPIENT = "0x" + "22" * 20
+
+
+class DelayedReceiptProvider(AsyncEthereumTesterProvider):
+    """
+    eth-tester chain that hides receipts until `block_time` has passed.
+
+    eth-tester mines every transaction immediately, which would make receipt
+    waits free. Delaying receipts stands in for a real block time while the EVM
+    still validates every nonce.
+    """
+
+    def __init__(self, block_time: float):
+        super().__init__()
+        self.block_time = block_time
+        self.drop_next_send = False
+        self.fail_after_next_send = False
+        self._sent_at = {}
+
+    async def make_request(self, method, params):
+        if method == "eth_sendRawTransaction" and self.drop_next_send:
+            # Accept the transaction but never mine it, like a stuck mempool entry
+            self.drop_next_send = False
+            tx_hash = "0x" + keccak(hexstr=params[0]).hex()
+            return {"jsonrpc": "2.0", "id": 0, "result": tx_hash}
+
+        if method == "eth_getTransactionReceipt":
+            sent_at = self._sent_at.get(str(params[0]).lower())
+            if sent_at is not None and time.monotonic() - sent_at < self.block_time:
+                return {"jsonrpc": "2.0", "id": 0, "result": None}
+
+        response = await super().make_request(method, params)
+
+        if method == "eth_sendRawTransaction" and response.get("result"):
+            self._sent_at[str(response["result"]).lower()] = time.monotonic()
+            if self.fail_after_next_send:
+                # The node accepted the transaction but the response was lost
+                self.fail_after_next_send = False
+                raise TimeoutError("eth_sendRawTransaction timed out")
+        return response
+
+
+@pytest.fixture
+def chain():
+    provider = DelayedReceiptProvider(block_time=0.2)
+    web3 = AsyncWeb3(provider)
+    account = web3.eth.account.from_key(provider.ethereum_tester.backend.account_keys[0])
+    return provider, web3, account
+
+
+def make_sender(web3, account, **kwargs):
+    kwargs.setdefault("poll_interval", 0.02)
+    return TransactionSender(
+        web3,
+        account.address,
+        account.key,
+        nonce_manager=NonceManager(web3, account.address),
+        **kwargs
+    )
+
+
+async def transfer(web3):
+    return {"to": RECIPIENT, "value": 1, "gas": 21000, "chainId": await web3.eth.chain_id}
+
+
+class TestNonceManager:
+    @pytest.mark.asyncio
+    async def test_concurrent_sends_use_sequential_nonces(self, chain):
+        """Concurrent server-signed writes get distinct, gap-free nonces and all succeed."""
+        _, web3, account = chain
+        sender = make_sender(web3, account)
+        tx = await transfer(web3)
+
+        submitted = await asyncio.gather(*(sender.submit(tx) for _ in range(10)))
+        receipts = await asyncio.gather(*(sender.wait_for_receipt(s) for s in submitted))
+
+        assert sorted(s.nonce for s in submitted) == list(range(10))
+        assert all(r["status"] == 1 for r in receipts)
+        assert await web3.eth.get_transaction_count(account.address) == 10
+
+    @pytest.mark.asyncio
+    async def test_throughput_scales_with_concurrency(self, chain):
+        """In-flight writes overlap their receipt waits instead of running one per block."""
+        provider, web3, account = chain
+        sender = make_sender(web3, account)
+        tx = await transfer(web3)
+        count = 8
+
+        start = time.monotonic()
+        for _ in range(count):
+            await sender.send(tx)
+        sequential = time.monotonic() - start
+
+        start = time.monotonic()
+        await asyncio.gather(*(sender.send(tx) for _ in range(count)))
+        concurrent = time.monotonic() - start
+
+        assert sequential >= count * provider.block_time
+        # Loose bound: py-evm signing and mining are CPU-bound and slow under a loaded test run
+        assert concurrent < sequential / 2
+
+    @pytest.mark.asyncio
+    async def test_resyncs_after_external_transaction(self, chain):
+        """A nonce used outside the manager is detected and the counter resynced."""
+        _, web3, account = chain
+        sender = make_sender(web3, account)
+        tx = await transfer(web3)
+
+        await sender.send(tx)
+        external = account.sign_transaction({**tx, "nonce": 1, "gasPrice": await web3.eth.gas_price})
+        await web3.eth.send_raw_transaction(external.raw_transaction)
+
+        submitted = await sender.submit(tx)
+
+        assert submitted.nonce == 2
+        assert (await sender.wait_for_receipt(submitted))["status"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_send_does_not_consume_nonce(self, chain):
+        """A transaction rejected by the node leaves no nonce gap."""
+        _, web3, account = chain
+        sender = make_sender(web3, account)
+        tx = await transfer(web3)
+
+        with pytest.raises(Exception):
+            await sender.submit({**tx, "gas": 1000})  # below intrinsic gas
+
+        submitted = await sender.submit(tx)
+
+        assert submitted.nonce == 0
+        assert (await sender.wait_for_receipt(submitted))["status"] == 1
+
+    @pytest.mark.asyncio
+    async def test_send_error_after_acceptance_consumes_nonce(self, chain):
+        """A send that fails after the node accepted it does not get its nonce reused."""
+        provider, web3, account = chain
+        sender = make_sender(web3, account)
+        tx = await transfer(web3)
+        provider.fail_after_next_send = True
+
+        with pytest.raises(TimeoutError):
+            await sender.submit(tx)
+
+        # Counted as used up front, not discovered through a "nonce too low" rejection
+        assert sender.nonce_manager._next_nonce == 1
+        submitted = await sender.submit(tx)
+
+        assert submitted.nonce == 1
+        assert (await sender.wait_for_receipt(submitted))["status"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stuck_transaction_is_replaced(self, chain):
+        """A transaction that is never mined is re-sent with the same nonce and a higher gas price."""
+        provider, web3, account = chain
+        sender = make_sender(web3, account, replace_after=0.3)
+        tx = await transfer(web3)
+
+        provider.drop_next_send = True
+        submitted = await sender.submit(tx)
+        original_price = submitted.tx["gasPrice"]
+        receipt = await sender.wait_for_receipt(submitted)
+
+        assert len(submitted.tx_hashes) == 2
+        assert submitted.tx["nonce"] == 0
+        assert submitted.tx["gasPrice"] > original_price
+        assert receipt["transactionHash"] == submitted.tx_hashes[-1]
+        assert receipt["status"] == 1
+
+    @pytest.mark.asyncio
+    async def test_dropped_transaction_nonce_is_filled(self, chain):
+        """A transaction the node dropped has its nonce taken by a no-op so later ones are not stuck."""
+        provider, web3, account = chain
+        sender = make_sender(web3, account, replace_after=0.1, max_replacements=0)
+        tx = await transfer(web3)
+
+        provider.drop_next_send = True
+        submitted = await sender.submit(tx)
+        with pytest.raises(TimeoutError, match="dropped"):
+            await sender.wait_for_receipt(submitted)
+
+        assert await web3.eth.get_transaction_count(account.address, "pending") == 1
+        block = await web3.eth.get_block("latest", full_transactions=True)
+        filler = block["transactions"][-1]
+        assert (filler["nonce"], filler["to"], filler["value"]) == (0, account.address, 0)
+        later = await sender.submit(tx)
+        assert later.nonce == 1
+        sender.replace_after = 1
+        assert (await sender.wait_for_receipt(later))["status"] == 1
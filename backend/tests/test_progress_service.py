@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.progress_service import BatchProgressTracker, RedisBatchProgressTracker
+
+
+@pytest.fixture
+def redis_tracker(redis_client):
+    return RedisBatchProgressTracker(redis_client=redis_client, batch_ttl=600, flush_interval=0.01)
+
+
+class TestBatchProgressTracker:
+    @pytest.mark.asyncio
+    async def test_updates_counters_and_notifies_subscribers(self):
+        tracker = BatchProgressTracker()
+        await tracker.create_batch("b1", ["a1", "a2"], 2)
+
+        async with tracker.subscribe("b1") as events:
+            tracker.update_asset_progress("b1", "a1", 100, "completed", ipfs_cid="bafy1")
+            tracker.update_asset_progress("b1", "a2", 0, "error", error="boom")
+            first = await asyncio.wait_for(events.__anext__(), 1)
+
+        assert first["assets"]["a1"]["ipfs_cid"] == "bafy1"
+        progress = await tracker.get_batch_progress("b1")
+        assert progress["completed_count"] == 1
+        assert progress["error_count"] == 1
+        assert await tracker.is_batch_complete("b1") is True
+        assert tracker._subscribers == {}
+
+    @pytest.mark.asyncio
+    async def test_cleanup_stops_at_first_young_batch(self):
+        tracker = BatchProgressTracker(batch_ttl=60)
+        for batch_id in ("old1", "old2", "young"):
+            await tracker.create_batch(batch_id, ["a"], 1)
+        tracker._batch_metadata["old1"]["created_at"] -= 120
+        tracker._batch_metadata["old2"]["created_at"] -= 120
+
+        tracker.cleanup_old_batches(60)
+
+        assert await tracker.get_batch_progress("old1") is None
+        assert await tracker.get_batch_progress("old2") is None
+        assert await tracker.get_batch_progress("young") is not None
+
+
+class TestRedisBatchProgressTracker:
+    @pytest.mark.asyncio
+    async def test_create_batch_sets_ttl_and_any_instance_can_read_it(self, redis_client, redis_tracker):
+        await redis_tracker.create_batch("b1", ["a2", "a1"], 2)
+
+        other_worker = RedisBatchProgressTracker(redis_client=redis_client)
+        progress = await other_worker.get_batch_progress("b1")
+
+        assert redis_client.expires["batch_progress:b1"] == pytest.approx(time.time() + 600, abs=5)
+        assert list(progress["assets"]) == ["a2", "a1"]
+        assert progress["assets"]["a1"]["status"] == "pending"
+        assert progress["total_assets"] == 2
+        assert await other_worker.get_batch_progress("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_updates_are_coalesced_into_one_flush(self, redis_client, redis_tracker):
+        await redis_tracker.create_batch("b1", ["a1", "a2"], 2)
+        redis_client.round_trips = 0
+
+        for asset_id in ("a1", "a2"):
+            redis_tracker.update_asset_progress("b1", asset_id, 0, "uploading")
+            redis_tracker.update_asset_progress("b1", asset_id, 100, "completed", ipfs_cid=f"cid-{asset_id}")
+        await asyncio.sleep(0.05)
+
+        assert redis_client.round_trips == 1
+        [(channel, event)] = redis_client.published
+        assert channel == "batch_progress_events:b1"
+        assert {a: p["status"] for a, p in event["assets"].items()} == {"a1": "completed", "a2": "completed"}
+
+        other_worker = RedisBatchProgressTracker(redis_client=redis_client)
+        progress = await other_worker.get_batch_progress("b1")
+        assert progress["completed_count"] == 2
+        assert progress["assets"]["a2"]["ipfs_cid"] == "cid-a2"
+        assert await other_worker.is_batch_complete("b1") is True
+
+    @pytest.mark.asyncio
+    async def test_blockchain_prepared_flushes_first_and_reaches_subscribers(self, redis_client, redis_tracker):
+        await redis_tracker.create_batch("b1", ["a1"], 1)
+        subscriber = RedisBatchProgressTracker(redis_client=redis_client)
+
+        async with subscriber.subscribe("b1") as events:
+            redis_tracker.update_asset_progress("b1", "a1", 100, "completed")
+            await redis_tracker.set_blockchain_prepared("b1", {"to": "0xabc"}, "pending_tx:1")
+            received = [await asyncio.wait_for(events.__anext__(), 1) for _ in range(2)]
+
+        assert [e["type"] for e in received] == ["assets", "blockchain_prepared"]
+        assert received[1]["pending_tx_id"] == "pending_tx:1"
+        progress = await subscriber.get_batch_progress("b1")
+        assert progress["blockchain_prepared"] is True
+        assert progress["transaction_data"] == {"to": "0xabc"}
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_updates_for_retry(self, redis_client, redis_tracker):
+        await redis_tracker.create_batch("b1", ["a1"], 1)
+        redis_tracker.update_asset_progress("b1", "a1", 100, "completed")
+
+        original = redis_client.pipeline
+        redis_client.pipeline = lambda transaction=True: (_ for _ in ()).throw(ConnectionError("down"))
+        await redis_tracker.flush()
+        redis_client.pipeline = original
+
+        assert "a1" in redis_tracker._pending["b1"]
+        await redis_tracker.close()
+        assert (await redis_tracker.get_batch_progress("b1"))["completed_count"] == 1
@@ -0,0 +1,241 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.handlers.retrieve_handler import RetrieveHandler
+from app.utilities.stage_graph import Stage, StageSkipped, run_stages
+
+OWNER = "0x2c7536E3605D9C16a7a3D7b1898e529396a65c23"
+SERVER_WALLET = "0x" + "11" * 20
+CID = "bafkreistoredcid"
+
+
+def delayed(value, delay=0.05, log=None, name=None):
+    """Coroutine function returning (or raising) value after a delay, recording start and end."""
+    async def run(*args, **kwargs):
+        if log is not None:
+            log.append(("start", name))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", name))
+        if isinstance(value, Exception):
+            raise value
+        return value
+    return run
+
+
+class TestRunStages:
+    @pytest.mark.asyncio
+    async def test_independent_stages_run_concurrently(self):
+        log = []
+        stages = {
+            "a": Stage(delayed(1, log=log, name="a")),
+            "b": Stage(delayed(2, log=log, name="b")),
+            "c": Stage(delayed(3, log=log, name="c"), ["a", "b"])
+        }
+
+        results = await run_stages(stages)
+
+        assert results == {"a": 1, "b": 2, "c": 3}
+        assert log[:2] == [("start", "a"), ("start", "b")]
+        assert log.index(("start", "c")) > max(log.index(("end", "a")), log.index(("end", "b")))
+
+    @pytest.mark.asyncio
+    async def test_stages_see_the_results_of_their_dependencies(self):
+        async def double(results):
+            return results["a"] * 2
+
+        results = await run_stages({"a": Stage(delayed(21)), "b": Stage(double, ["a"])})
+
+        assert results["b"] == 42
+
+    @pytest.mark.asyncio
+    async def test_failures_are_results_and_skip_dependents(self):
+        results = await run_stages({
+            "a": Stage(delayed(ValueError("boom"))),
+            "b": Stage(delayed(2), ["a"]),
+            "c": Stage(delayed(3), ["b"]),
+            "d": Stage(delayed(4))
+        })
+
+        assert isinstance(results["a"], ValueError)
+        assert isinstance(results["b"], StageSkipped)
+        assert isinstance(results["c"], StageSkipped)
+        assert results["d"] == 4
+
+    @pytest.mark.asyncio
+    async def test_callback_can_cancel_running_stages(self):
+        slow_finished = []
+
+        async def slow(results):
+            await asyncio.sleep(1)
+            slow_finished.append(True)
+
+        async def on_complete(name, result):
+            return ["slow"] if name == "fast" else None
+
+        results = await run_stages({
+            "fast": Stage(delayed(1, delay=0.01)),
+            "slow": Stage(slow),
+            "after_slow": Stage(delayed(2), ["slow"])
+        }, on_complete)
+
+        assert results == {"fast": 1}
+        assert not slow_finished
+
+    @pytest.mark.asyncio
+    async def test_callback_errors_cancel_everything(self):
+        slow = AsyncMock()
+
+        async def on_complete(name, result):
+            if isinstance(result, Exception):
+                raise result
+
+        async def slow_stage(results):
+            await asyncio.sleep(1)
+            await slow()
+
+        with pytest.raises(KeyError):
+            await run_stages({"fails": Stage(delayed(KeyError("x"), delay=0.01)), "slow": Stage(slow_stage)}, on_complete)
+        slow.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_bad_graphs_are_rejected(self):
+        with pytest.raises(ValueError, match="unknown"):
+            await run_stages({"a": Stage(delayed(1), ["missing"])})
+        with pytest.raises(ValueError, match="depend on each other"):
+            await run_stages({"a": Stage(delayed(1), ["b"]), "b": Stage(delayed(2), ["a"])})
+
+
+def make_handler(document=None, delay=0.05, verify=None, delegated=True):
+    """RetrieveHandler over mocks where every remote call takes `delay` seconds."""
+    document = document or {
+        "_id": "doc-1",
+        "assetId": "asset-1",
+        "walletAddress": OWNER,
+        "smartContractTxId": "0xtx",
+        "ipfsHash": CID,
+        "versionNumber": 1,
+        "isCurrent": True,
+        "isDeleted": False,
+        "criticalMetadata": {"name": "Asset"},
+        "nonCriticalMetadata": {},
+        "lastUpdated": "2025-01-01T00:00:00+00:00"
+    }
+    asset_service = MagicMock()
+    asset_service.get_asset_with_deleted = AsyncMock(side_effect=delayed(document, delay))
+    asset_service.get_asset = AsyncMock(side_effect=delayed(document, delay))
+    asset_service.asset_repository.find_asset = AsyncMock(side_effect=delayed(document, delay))
+    blockchain_service = MagicMock()
+    blockchain_service.check_delegation = AsyncMock(side_effect=delayed(delegated, delay))
+    blockchain_service.get_ipfs_info = AsyncMock(side_effect=delayed({"ipfs_version": 1, "is_deleted": False}, delay))
+    blockchain_service.verify_cid_on_chain = AsyncMock(side_effect=delayed(verify or {
+        "is_valid": True, "actual_version": 1, "is_deleted": False, "message": "CID verified"
+    }, delay))
+    blockchain_service.get_transaction_details = AsyncMock(
+        side_effect=delayed({"cid": CID, "tx_sender": SERVER_WALLET}, delay)
+    )
+    blockchain_service.get_server_wallet_address = MagicMock(return_value=SERVER_WALLET)
+    ipfs_service = MagicMock()
+    ipfs_service.compute_cid = AsyncMock(side_effect=delayed(CID, delay))
+    return RetrieveHandler(asset_service=asset_service, blockchain_service=blockchain_service, ipfs_service=ipfs_service)
+
+
+class TestRetrieveStages:
+    @pytest.mark.asyncio
+    async def test_verification_calls_overlap(self):
+        handler = make_handler(delay=0.1)
+
+        start = asyncio.get_running_loop().time()
+        response = await handler.retrieve_metadata("asset-1", initiator_address=OWNER)
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert response.verification.verified
+        assert response.verification.cid_match
+        assert response.verification.tx_sender_verified
+        # Document load, then every check at once: two rounds rather than seven
+        assert elapsed < 0.35
+
+    @pytest.mark.asyncio
+    async def test_missing_asset_cancels_everything(self):
+        handler = make_handler()
+        handler.asset_service.get_asset_with_deleted = AsyncMock(return_value=None)
+
+        with pytest.raises(HTTPException) as error:
+            await handler.retrieve_metadata("asset-1", initiator_address=OWNER)
+
+        assert error.value.status_code == 404
+        handler.blockchain_service.verify_cid_on_chain.assert_not_called()
+        handler.ipfs_service.compute_cid.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_denied_access_cancels_the_checks_in_flight(self):
+        handler = make_handler(delegated=False)
+        finished = []
+
+        async def slow_compute(*args):
+            await asyncio.sleep(1)
+            finished.append(True)
+
+        handler.ipfs_service.compute_cid = AsyncMock(side_effect=slow_compute)
+
+        with pytest.raises(HTTPException) as error:
+            await handler.retrieve_metadata("asset-1", initiator_address="0x" + "22" * 20)
+
+        assert error.value.status_code == 403
+        assert not finished
+
+    @pytest.mark.asyncio
+    async def test_deletion_tampering_skips_the_cid_checks(self):
+        handler = make_handler(verify={
+            "is_valid": False, "actual_version": 1, "is_deleted": True, "message": "Asset deleted"
+        })
+        handler.ipfs_service.compute_cid = AsyncMock(side_effect=delayed(CID, 1))
+
+        start = asyncio.get_running_loop().time()
+        response = await handler.retrieve_metadata("asset-1", auto_recover=False, initiator_address=OWNER)
+
+        assert asyncio.get_running_loop().time() - start < 0.5
+        assert response.verification.deletion_status_tampered
+        assert not response.verification.verified
+        assert not response.verification.cid_match
+
+    @pytest.mark.asyncio
+    async def test_chain_errors_fail_verification_without_failing_the_request(self):
+        handler = make_handler()
+        handler.blockchain_service.verify_cid_on_chain = AsyncMock(side_effect=ConnectionError("rpc down"))
+
+        response = await handler.retrieve_metadata("asset-1", auto_recover=False, initiator_address=OWNER)
+
+        assert not response.verification.verified
+        assert response.verification.blockchain_cid == "unknown"
+        assert response.verification.recovery_needed
+        assert not response.verification.tx_sender_verified
+
+    @pytest.mark.asyncio
+    async def test_progress_steps_are_in_order(self):
+        handler = make_handler()
+        steps = []
+
+        async def progress(step, total, message):
+            steps.append((step, message))
+
+        await handler.retrieve_metadata_with_progress("asset-1", progress, initiator_address=OWNER)
+
+        assert [step for step, _ in steps] == [1, 2, 3, 4]
+        assert steps[1][1] == "Verifying asset authenticity..."
+
+    @pytest.mark.asyncio
+    async def test_recovery_reuses_the_transaction_lookup(self):
+        handler = make_handler()
+        handler.ipfs_service.compute_cid = AsyncMock(return_value="bafkreitampered")
+        handler.ipfs_service.retrieve_metadata = AsyncMock(return_value={"critical_metadata": {"name": "Asset"}})
+        handler.asset_service.create_new_version = AsyncMock(return_value={"document_id": "doc-2"})
+
+        response = await handler.retrieve_metadata("asset-1", initiator_address=OWNER)
+
+        assert response.verification.recovery_successful
+        assert response.ipfs_hash == CID
+        handler.blockchain_service.get_transaction_details.assert_awaited_once()
@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import service_container
+from app.services.service_container import ServiceContainer
+
+
+@pytest.fixture
+def container():
+    with patch.object(service_container, "BlockchainService") as blockchain_cls, \
+            patch.object(service_container, "IPFSService"), \
+            patch.object(service_container, "TransactionStateService"):
+        blockchain_cls.return_value.is_connected = AsyncMock(return_value=True)
+        yield ServiceContainer(health_check_interval=0.01)
+
+
+class TestServiceContainer:
+    def test_services_are_built_once(self, container):
+        """Every dependency lookup returns the same instance."""
+        assert container.blockchain_service is container.blockchain_service
+        assert container.ipfs_service is container.ipfs_service
+        assert container.transaction_state_service is container.transaction_state_service
+        assert service_container.BlockchainService.call_count == 1
+
+    def test_caches_follow_their_settings(self, container, monkeypatch):
+        """Caches are built once, and not at all while switched off."""
+        monkeypatch.setattr(service_container.settings, "verification_cache_enabled", False)
+        monkeypatch.setattr(service_container.settings, "delegation_cache_enabled", False)
+        monkeypatch.setattr(service_container.settings, "session_cache_enabled", False)
+        assert container.verification_cache is None
+        assert container.delegation_cache is None
+        assert container.session_cache is None
+
+        monkeypatch.setattr(service_container.settings, "verification_cache_enabled", True)
+        monkeypatch.setattr(service_container.settings, "delegation_cache_enabled", True)
+        monkeypatch.setattr(service_container.settings, "session_cache_enabled", True)
+        assert container.verification_cache is container.verification_cache
+        assert container.delegation_cache is container.delegation_cache
+        assert container.session_cache is container.session_cache
+        assert container.cid_cache is container.cid_cache
+        assert container.write_batcher is container.write_batcher
+
+    def test_failed_construction_is_retried(self, container):
+        """A BlockchainService that fails to build is not cached."""
+        service_container.BlockchainService.side_effect = [RuntimeError("rpc down"), MagicMock()]
+
+        with pytest.raises(RuntimeError):
+            container.blockchain_service
+        assert container.blockchain_service is not None
+
+    @pytest.mark.asyncio
+    async def test_check_health_records_result(self, container):
+        assert container.health()["blockchain_connected"] is None
+
+        assert await container.check_health() is True
+        assert container.health()["blockchain_connected"] is True
+        assert container.health()["last_checked"] is not None
+
+        container.blockchain_service.is_connected.side_effect = Exception("timeout")
+        assert await container.check_health() is False
+        assert container.health() | {"last_checked": None} == {
+            "blockchain_connected": False, "last_checked": None, "last_error": "timeout"
+        }
+
+    @pytest.mark.asyncio
+    async def test_background_probe_runs_until_closed(self, container):
+        """The health probe repeats on its interval and stops on close."""
+        container.start()
+        await asyncio.sleep(0.05)
+        await container.close()
+
+        probes = container.blockchain_service.is_connected.await_count
+        assert probes >= 2
+        await asyncio.sleep(0.03)
+        assert container.blockchain_service.is_connected.await_count == probes
+
+    @pytest.mark.asyncio
+    async def test_dependencies_share_the_process_container(self, container):
+        with patch.object(service_container, "_service_container", container):
+            assert service_container.get_blockchain_service() is container.blockchain_service
+            assert service_container.get_ipfs_service() is container.ipfs_service
+            assert service_container.get_transaction_state_service() is container.transaction_state_service
+
+            await service_container.close_service_container()
+            assert service_container._service_container is None
@@ -0,0 +1,195 @@
+import asyncio
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import session_cache as cache_module
+from app.services.session_cache import INVALIDATED_MARKER, SESSION_KEY_PREFIX, SessionCache
+from app.services.wallet_auth_provider import WalletAuthProvider
+
+WALLET = "0x2c7536E3605D9C16a7a3D7b1898e529396a65c23"
+
+
+def make_session(session_id, expires_in=3600):
+    now = datetime.now(timezone.utc)
+    return {
+        "_id": "session-doc",
+        "sessionId": session_id,
+        "walletAddress": WALLET,
+        "createdAt": now,
+        "expiresAt": now + timedelta(seconds=expires_in),
+        "isActive": True
+    }
+
+
+def loader_returning(value, delay=0):
+    async def load():
+        await asyncio.sleep(delay)
+        return value
+    return AsyncMock(side_effect=load)
+
+
+class TestSessionCache:
+    @pytest.mark.asyncio
+    async def test_hits_skip_the_loader_and_return_copies(self):
+        cache = SessionCache()
+        session_id = secrets.token_hex(32)
+        loader = loader_returning(make_session(session_id))
+
+        first = await cache.get_or_load(session_id, loader)
+        first["walletAddress"] = "changed by a caller"
+        second = await cache.get_or_load(session_id, loader)
+
+        assert second["walletAddress"] == WALLET
+        loader.assert_awaited_once()
+        assert cache.stats()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_entries_do_not_outlive_the_session(self):
+        cache = SessionCache(ttl=60)
+        session_id = secrets.token_hex(32)
+        loader = loader_returning(make_session(session_id, expires_in=10))
+
+        with patch.object(cache_module.time, "monotonic", return_value=1000.0):
+            await cache.get_or_load(session_id, loader)
+        with patch.object(cache_module.time, "monotonic", return_value=1009.0):
+            await cache.get_or_load(session_id, loader)
+        with patch.object(cache_module.time, "monotonic", return_value=1011.0):
+            await cache.get_or_load(session_id, loader)
+
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_and_malformed_ids_are_cheap(self):
+        cache = SessionCache(max_entries=1)
+        known = secrets.token_hex(32)
+        await cache.get_or_load(known, loader_returning(make_session(known)))
+        unknown = secrets.token_hex(32)
+        loader = loader_returning(None)
+
+        assert await cache.get_or_load(unknown, loader) is None
+        assert await cache.get_or_load(unknown, loader) is None
+        assert await cache.get_or_load("not-a-session-id", loader) is None
+
+        loader.assert_awaited_once()
+        # Negative entries live apart from sessions and cannot evict them
+        assert await cache.get_or_load(known, loader) is not None
+        stats = cache.stats()
+        assert (stats["negative_hits"], stats["rejected"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_loader_errors_are_not_cached(self):
+        cache = SessionCache()
+        session_id = secrets.token_hex(32)
+
+        with pytest.raises(ConnectionError):
+            await cache.get_or_load(session_id, AsyncMock(side_effect=ConnectionError("mongo down")))
+
+        assert await cache.get_or_load(session_id, loader_returning(make_session(session_id))) is not None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        cache = SessionCache()
+        session_id = secrets.token_hex(32)
+        loader = loader_returning(make_session(session_id), delay=0.05)
+
+        results = await asyncio.gather(*(cache.get_or_load(session_id, loader) for _ in range(10)))
+
+        assert all(result["sessionId"] == session_id for result in results)
+        loader.assert_awaited_once()
+        assert cache.stats()["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_invalidation_discards_a_load_in_flight(self):
+        cache = SessionCache()
+        session_id = secrets.token_hex(32)
+        loader = loader_returning(make_session(session_id), delay=0.05)
+
+        lookup = asyncio.create_task(cache.get_or_load(session_id, loader))
+        await asyncio.sleep(0.01)
+        await cache.invalidate(session_id)
+        await lookup
+        await cache.get_or_load(session_id, loader)
+
+        assert loader.await_count == 2
+
+
+class TestRedisTier:
+    @pytest.mark.asyncio
+    async def test_workers_share_sessions_through_redis(self, redis_client):
+        first = SessionCache(redis_ttl=60, redis_client=redis_client)
+        second = SessionCache(redis_ttl=60, redis_client=redis_client)
+        session_id = secrets.token_hex(32)
+        loader = loader_returning(make_session(session_id))
+
+        await first.get_or_load(session_id, loader)
+        session = await second.get_or_load(session_id, loader)
+
+        loader.assert_awaited_once()
+        assert second.stats()["redis_hits"] == 1
+        assert isinstance(session["expiresAt"], datetime)
+        assert redis_client.expires[SESSION_KEY_PREFIX + session_id] <= time.time() + 60
+
+    @pytest.mark.asyncio
+    async def test_invalidation_marker_blocks_stale_fills(self, redis_client):
+        worker = SessionCache(redis_ttl=60, redis_client=redis_client)
+        other_worker = SessionCache(redis_ttl=60, redis_client=redis_client)
+        session_id = secrets.token_hex(32)
+        await worker.get_or_load(session_id, loader_returning(make_session(session_id)))
+
+        await worker.invalidate(session_id)
+        # A lookup that read MongoDB before the logout finishes afterwards
+        await other_worker.get_or_load(session_id, loader_returning(make_session(session_id)))
+
+        assert redis_client.values[SESSION_KEY_PREFIX + session_id] == INVALIDATED_MARKER
+        loader = loader_returning(None)
+        assert await worker.get_or_load(session_id, loader) is None
+        loader.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_the_loader(self):
+        redis_client = MagicMock()
+        redis_client.get = AsyncMock(side_effect=ConnectionError("redis down"))
+        redis_client.set = AsyncMock(side_effect=ConnectionError("redis down"))
+        cache = SessionCache(redis_ttl=60, redis_client=redis_client)
+        session_id = secrets.token_hex(32)
+
+        assert await cache.get_or_load(session_id, loader_returning(make_session(session_id))) is not None
+        assert cache.stats()["redis_errors"] == 2
+
+
+class TestWalletAuthProvider:
+    def make_provider(self, session):
+        auth_repository = MagicMock()
+        auth_repository.get_session = AsyncMock(return_value=session)
+        auth_repository.update_session = AsyncMock(return_value=True)
+        return WalletAuthProvider(auth_repository, MagicMock())
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("change", ["logout", "extend_session"])
+    async def test_session_changes_invalidate(self, change):
+        cache = SessionCache()
+        session_id = secrets.token_hex(32)
+        provider = self.make_provider(make_session(session_id))
+
+        with patch("app.services.wallet_auth_provider.get_session_cache", return_value=cache):
+            await provider.validate_session(session_id)
+            await getattr(provider, change)(session_id)
+            await provider.validate_session(session_id)
+
+        # One read per validation plus the one extend_session makes itself
+        assert provider.auth_repository.get_session.await_count == (3 if change == "extend_session" else 2)
+
+    @pytest.mark.asyncio
+    async def test_lookup_errors_still_deny(self):
+        cache = SessionCache()
+        provider = self.make_provider(None)
+        provider.auth_repository.get_session = AsyncMock(side_effect=ConnectionError("mongo down"))
+
+        with patch("app.services.wallet_auth_provider.get_session_cache", return_value=cache):
+            assert await provider.validate_session(secrets.token_hex(32)) is None
+
+        assert cache.stats()["unknown_entries"] == 0
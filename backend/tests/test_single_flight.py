@@ -0,0 +1,57 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.utilities.single_flight import SingleFlight
+
+
+def loader_returning(value, delay=0.05):
+    async def load():
+        await asyncio.sleep(delay)
+        return value
+    return AsyncMock(side_effect=load)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_share_one_load():
+    flights = SingleFlight()
+    load = loader_returning("value")
+
+    results = await asyncio.gather(*(flights.run("key", load) for _ in range(5)))
+    other = await flights.run("other", load)
+
+    assert results == ["value"] * 5 and other == "value"
+    assert load.await_count == 2
+    assert flights.coalesced == 4
+
+
+@pytest.mark.asyncio
+async def test_waiters_share_the_load_error():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise ConnectionError("rpc down")
+
+    results = await asyncio.gather(*(flights.run("key", fail) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    # Nothing is remembered once the load finishes
+    assert await flights.run("key", loader_returning("value", delay=0)) == "value"
+
+
+@pytest.mark.asyncio
+async def test_waiter_loads_again_when_the_leader_is_cancelled():
+    flights = SingleFlight()
+    load = loader_returning("value")
+
+    leader = asyncio.create_task(flights.run("key", load))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.create_task(flights.run("key", load))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await waiter == "value"
+    assert leader.cancelled()
+    assert load.await_count == 2
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from app.services.transaction_state_service import ALL_INDEX_KEY, TransactionStateService
+
+USER = "0xAbCdEf1234567890abcdef1234567890ABCDEF12"
+
+
+@pytest.fixture
+def service(redis_client):
+    return TransactionStateService(redis_client=redis_client)
+
+
+class TestTransactionStateService:
+    @pytest.mark.asyncio
+    async def test_store_and_list_use_indexes(self, service, redis_client):
+        """Listings read the user's index and fetch all data with one MGET."""
+        ids = [await service.store_pending_transaction(USER, {"action": "upload", "n": i}) for i in range(3)]
+        await service.store_pending_transaction("0x" + "99" * 20, {"action": "delete"})
+
+        redis_client.round_trips = 0
+        transactions = await service.get_user_pending_transactions(USER.lower())
+
+        assert sorted(t["tx_id"] for t in transactions) == sorted(ids)
+        assert redis_client.round_trips == 2
+
+    @pytest.mark.asyncio
+    async def test_store_is_one_round_trip_and_expires_index_with_longest_member(self, service, redis_client):
+        await service.store_pending_transaction(USER, {"action": "upload"}, ttl=600)
+        user_index = f"pending_tx_index:{USER.lower()}"
+        long_expiry = redis_client.expires[user_index]
+
+        redis_client.round_trips = 0
+        await service.store_pending_transaction(USER, {"action": "upload"}, ttl=60)
+
+        assert redis_client.round_trips == 1
+        assert redis_client.expires[user_index] == long_expiry
+
+    @pytest.mark.asyncio
+    async def test_remove_drops_index_entries(self, service, redis_client):
+        tx_id = await service.store_pending_transaction(USER, {"action": "upload"})
+
+        assert await service.remove_pending_transaction(tx_id) is True
+        assert await service.remove_pending_transaction(tx_id) is False
+        assert await service.get_user_pending_transactions(USER) == []
+        assert ALL_INDEX_KEY not in redis_client.zsets
+
+    @pytest.mark.asyncio
+    async def test_update_keeps_ttl_and_fails_once_expired(self, service, redis_client):
+        tx_id = await service.store_pending_transaction(USER, {"action": "upload"}, ttl=120)
+        expiry = redis_client.expires[tx_id]
+
+        assert await service.update_pending_transaction(tx_id, {"status": "signed"}) is True
+        assert (await service.get_pending_transaction(tx_id))["status"] == "signed"
+        assert redis_client.expires[tx_id] == expiry
+
+        redis_client.expires[tx_id] = time.time() - 1
+        assert await service.update_pending_transaction(tx_id, {"status": "late"}) is False
+        assert tx_id not in redis_client.values
+
+    @pytest.mark.asyncio
+    async def test_stats_and_cleanup_skip_expired_entries(self, service, redis_client):
+        live = await service.store_pending_transaction(USER, {"action": "upload"})
+        expired = await service.store_pending_transaction(USER, {"action": "delete"})
+        for key in (ALL_INDEX_KEY, f"pending_tx_index:{USER.lower()}"):
+            redis_client.zsets[key][expired] = time.time() - 1
+        redis_client.expires[expired] = time.time() - 1
+
+        stats = await service.get_transaction_stats()
+        assert stats["total_pending"] == 1
+        assert stats["action_distribution"] == {"upload": 1}
+
+        assert await service.cleanup_expired_transactions() == 1
+        assert list(redis_client.zsets[ALL_INDEX_KEY]) == [live]
+        assert list(redis_client.zsets[f"pending_tx_index:{USER.lower()}"]) == [live]
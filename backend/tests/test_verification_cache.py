@@ -0,0 +1,209 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from web3 import Web3
+
+from app.schemas.retrieve_schema import MetadataVerificationResult
+from app.services import verification_cache as cache_module
+from app.services.asset_service import AssetService
+from app.services.event_indexer import ChainEventIndexer
+from app.services.verification_cache import VerificationCache
+from tests.test_retrieve_stages import make_handler, OWNER
+
+DOCUMENT = {
+    "_id": "doc-1",
+    "assetId": "asset-1",
+    "walletAddress": OWNER,
+    "smartContractTxId": "0xtx",
+    "ipfsHash": "bafkreistoredcid",
+    "versionNumber": 1,
+    "isCurrent": True,
+    "isDeleted": False,
+    "criticalMetadata": {"name": "Asset"},
+    "lastUpdated": "2025-01-01T00:00:00+00:00"
+}
+
+
+def verified_result(**overrides):
+    fields = dict(verified=True, cid_match=True, blockchain_cid="cid", computed_cid="cid", recovery_needed=False)
+    fields.update(overrides)
+    return MetadataVerificationResult(**fields)
+
+
+def chain_calls(handler):
+    service = handler.blockchain_service
+    return (
+        service.get_ipfs_info.await_count + service.verify_cid_on_chain.await_count
+        + service.get_transaction_details.await_count + handler.ipfs_service.compute_cid.await_count
+    )
+
+
+class TestVerificationCache:
+    def test_hit_requires_the_same_document_state(self):
+        cache = VerificationCache()
+        cache.put("asset-1", DOCUMENT, verified_result())
+
+        result, age = cache.get("asset-1", DOCUMENT)
+        assert result.verified and age >= 0
+        assert cache.get("asset-1", {**DOCUMENT, "criticalMetadata": {"name": "Tampered"}}) is None
+        assert cache.get("asset-1", {**DOCUMENT, "lastUpdated": "2025-02-01T00:00:00+00:00"}) is None
+        assert cache.get("asset-1", {**DOCUMENT, "versionNumber": 2}) is None
+        assert cache.stats()["changed"] == 2
+
+    def test_failed_verifications_are_not_cached(self):
+        cache = VerificationCache()
+
+        assert not cache.put("asset-1", DOCUMENT, verified_result(verified=False, recovery_needed=True))
+        assert cache.get("asset-1", DOCUMENT) is None
+
+    def test_staleness_bound(self):
+        cache = VerificationCache(max_age=60)
+        with patch.object(cache_module.time, "monotonic", return_value=1000.0):
+            cache.put("asset-1", DOCUMENT, verified_result())
+        with patch.object(cache_module.time, "monotonic", return_value=1030.0):
+            assert cache.get("asset-1", DOCUMENT, max_age=10) is None
+            assert cache.get("asset-1", DOCUMENT)[1] == 30.0
+            # Callers can only tighten the bound
+            assert cache.get("asset-1", DOCUMENT, max_age=3600)[1] == 30.0
+        with patch.object(cache_module.time, "monotonic", return_value=1061.0):
+            assert cache.get("asset-1", DOCUMENT) is None
+
+    def test_results_are_copies(self):
+        cache = VerificationCache()
+        cache.put("asset-1", DOCUMENT, verified_result())
+
+        cache.get("asset-1", DOCUMENT)[0].message = "changed by a caller"
+
+        assert cache.get("asset-1", DOCUMENT)[0].message is None
+
+    def test_invalidation_discards_verifications_in_flight(self):
+        cache = VerificationCache()
+        epoch = cache.epoch("asset-1")
+        other_epoch = cache.epoch("asset-2")
+
+        cache.invalidate("asset-1")
+
+        assert not cache.put("asset-1", DOCUMENT, verified_result(), epoch)
+        assert cache.put("asset-2", {**DOCUMENT, "assetId": "asset-2"}, verified_result(), other_epoch)
+        assert cache.stats()["discarded_fills"] == 1
+
+    def test_forgotten_invalidations_still_discard_fills(self):
+        cache = VerificationCache(max_entries=2)
+        epoch = cache.epoch("asset-1")
+        for asset_id in ("asset-1", "asset-2", "asset-3"):
+            cache.invalidate(asset_id)
+
+        assert not cache.put("asset-1", DOCUMENT, verified_result(), epoch)
+
+    def test_indexed_events_invalidate_by_asset_id_hash(self):
+        cache = VerificationCache()
+        cache.put("asset-1", DOCUMENT, verified_result())
+        cache.put("asset-2", {**DOCUMENT, "assetId": "asset-2"}, verified_result())
+
+        dropped = cache.invalidate_events([
+            {"event": "TransferInitiated", "assetIdHash": Web3.keccak(text="asset-2").hex()},
+            {"event": "IPFSUpdated", "assetIdHash": "0x" + Web3.keccak(text="asset-1").hex().removeprefix("0x").upper()},
+            {"event": "IPFSUpdated", "assetIdHash": Web3.keccak(text="unknown").hex()}
+        ])
+
+        assert dropped == 1
+        assert cache.get("asset-1", DOCUMENT) is None
+        assert cache.get("asset-2", {**DOCUMENT, "assetId": "asset-2"}) is not None
+
+
+class TestInvalidationSources:
+    @pytest.mark.asyncio
+    async def test_asset_service_writes_invalidate(self):
+        cache = VerificationCache()
+        cache.put("asset-1", DOCUMENT, verified_result())
+        repository = MagicMock()
+        repository.update_assets = AsyncMock(return_value=2)
+
+        with patch("app.services.service_container.get_verification_cache", return_value=cache):
+            await AssetService(repository).soft_delete("asset-1", OWNER)
+
+        assert cache.get("asset-1", DOCUMENT) is None
+
+    @pytest.mark.asyncio
+    async def test_indexer_passes_events_to_listeners(self):
+        cache = VerificationCache()
+        cache.put("asset-1", DOCUMENT, verified_result())
+        blockchain_service = MagicMock()
+        blockchain_service.get_latest_block_number = AsyncMock(return_value=120)
+        blockchain_service.get_block_hash = AsyncMock(return_value="0xhash")
+        blockchain_service.get_contract_events = AsyncMock(return_value=[{
+            "event": "IPFSUpdated",
+            "block_number": 100,
+            "block_hash": "0xblock",
+            "transaction_hash": "0xtx",
+            "log_index": 0,
+            "args": {"assetId": Web3.keccak(text="asset-1").hex(), "owner": OWNER, "cid": "cid-2"}
+        }])
+        repository = MagicMock()
+        repository.get_checkpoint = AsyncMock(return_value=None)
+        repository.upsert_events = AsyncMock()
+        repository.save_checkpoint = AsyncMock()
+        indexer = ChainEventIndexer(blockchain_service, repository, start_block=100, confirmations=12)
+        indexer.add_listener(cache.invalidate_events)
+
+        await indexer.poll_once()
+
+        assert cache.get("asset-1", DOCUMENT) is None
+
+
+class TestCachedRetrieval:
+    @pytest.mark.asyncio
+    async def test_repeat_retrievals_skip_the_chain(self):
+        handler = make_handler(delay=0)
+        handler.verification_cache = VerificationCache()
+
+        first = await handler.retrieve_metadata("asset-1", initiator_address=OWNER)
+        calls = chain_calls(handler)
+        second = await handler.retrieve_metadata("asset-1", initiator_address=OWNER)
+
+        assert first.verification.verified and not first.verification.cached
+        assert second.verification.verified and second.verification.cached
+        assert second.verification.cache_age >= 0
+        assert second.verification.computed_cid == first.verification.computed_cid
+        assert chain_calls(handler) == calls
+        assert second.model_dump(by_alias=True)["verification"]["cacheAge"] is not None
+
+    @pytest.mark.asyncio
+    async def test_strict_and_zero_max_age_verify_again(self):
+        handler = make_handler(delay=0)
+        handler.verification_cache = VerificationCache()
+        await handler.retrieve_metadata("asset-1", initiator_address=OWNER)
+        calls = chain_calls(handler)
+
+        strict = await handler.retrieve_metadata("asset-1", initiator_address=OWNER, strict=True)
+        fresh = await handler.retrieve_metadata("asset-1", initiator_address=OWNER, max_age=0)
+
+        assert not strict.verification.cached and not fresh.verification.cached
+        assert chain_calls(handler) == calls + 8
+
+    @pytest.mark.asyncio
+    async def test_access_is_checked_on_cache_hits(self):
+        handler = make_handler(delay=0, delegated=False)
+        handler.verification_cache = VerificationCache()
+        await handler.retrieve_metadata("asset-1", initiator_address=OWNER)
+
+        with pytest.raises(HTTPException) as error:
+            await handler.retrieve_metadata("asset-1", initiator_address="0x" + "22" * 20)
+
+        assert error.value.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_tampered_documents_miss_the_cache(self):
+        handler = make_handler(delay=0)
+        handler.verification_cache = VerificationCache()
+        await handler.retrieve_metadata("asset-1", initiator_address=OWNER)
+        tampered = {**(await handler.asset_service.get_asset("asset-1")), "criticalMetadata": {"name": "Tampered"}}
+        handler.asset_service.get_asset = AsyncMock(return_value=tampered)
+        handler.ipfs_service.compute_cid = AsyncMock(return_value="bafkreitampered")
+
+        response = await handler.retrieve_metadata("asset-1", auto_recover=False, initiator_address=OWNER)
+
+        assert not response.verification.cached
+        assert not response.verification.verified
+        assert not response.verification.cid_match
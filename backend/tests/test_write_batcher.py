@@ -0,0 +1,218 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from web3.exceptions import ContractLogicError
+
+from app.services.blockchain_service import BlockchainService
+from app.services.nonce_manager import TransactionSender
+from app.services.write_batcher import BlockchainWriteBatcher
+
+OWNER_A = "0x" + "aa" * 20
+OWNER_B = "0x" + "bb" * 20
+
+
+class FakeChain:
+    """Records batch and single sends instead of submitting transactions."""
+
+    def __init__(self, batch_error: Exception = None, bad_assets: tuple = ()):
+        self.batches = []
+        self.singles = []
+        self.batch_error = batch_error
+        self.bad_assets = bad_assets
+
+    async def send_batch(self, owner, items):
+        self.batches.append((owner, list(items)))
+        if self.batch_error:
+            raise self.batch_error
+        return {"tx_hash": f"batch-{len(self.batches)}"}
+
+    async def send_single(self, owner, asset_id, cid):
+        self.singles.append((owner, asset_id, cid))
+        if asset_id in self.bad_assets:
+            raise Exception(f"{asset_id} reverted")
+        return {"tx_hash": f"single-{asset_id}"}
+
+
+def submit(batcher, chain, owner, asset_id, cid="Qm", operation="update"):
+    return batcher.submit(operation, owner, asset_id, cid, chain.send_batch, chain.send_single)
+
+
+def make_service(batch_status):
+    """BlockchainService whose batch delete is mined with `batch_status` and single deletes succeed."""
+    service = BlockchainService.__new__(BlockchainService)
+    service.wallet_address = OWNER_B
+    service.web3 = MagicMock()
+    service.web3.eth.gas_price = 1
+    service.contract = MagicMock()
+    functions = service.contract.functions
+    functions.batchDeleteAssetsFor.return_value.estimate_gas = AsyncMock(return_value=100000)
+    functions.batchDeleteAssetsFor.return_value.build_transaction = AsyncMock(return_value={"data": "batch"})
+    functions.deleteAssetFor.return_value.build_transaction = AsyncMock(return_value={"data": "single"})
+    sender = TransactionSender.__new__(TransactionSender)
+    sender.submit = AsyncMock(side_effect=lambda tx: tx)
+    sender.wait_for_receipt = AsyncMock(side_effect=lambda tx: AttributeDict({
+        "status": batch_status if tx["data"] == "batch" else 1,
+        "transactionHash": HexBytes("0x" + ("ba" if tx["data"] == "batch" else "51") * 32)
+    }))
+    service.transaction_sender = sender
+    return service
+
+
+def submit_delete(batcher, service, asset_id):
+    return batcher.submit(
+        "delete", OWNER_A, asset_id, None,
+        send_batch=service._delete_asset_for_batch,
+        send_single=lambda owner, aid, _: service._delete_asset_for_signed(aid, owner)
+    )
+
+
+class TestBlockchainWriteBatcher:
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_share_one_transaction(self):
+        """Writes for the same owner within the window become one batch with a shared hash."""
+        batcher = BlockchainWriteBatcher(window=0.05)
+        chain = FakeChain()
+
+        results = await asyncio.gather(*(submit(batcher, chain, OWNER_A, f"asset-{i}") for i in range(10)))
+
+        assert len(chain.batches) == 1
+        assert [asset_id for asset_id, _ in chain.batches[0][1]] == [f"asset-{i}" for i in range(10)]
+        assert {r["tx_hash"] for r in results} == {"batch-1"}
+        assert all(r["batch_size"] == 10 for r in results)
+
+    @pytest.mark.asyncio
+    async def test_owners_and_operations_are_batched_separately(self):
+        """Batches never mix owners or updates with deletes."""
+        batcher = BlockchainWriteBatcher(window=0.05)
+        chain = FakeChain()
+
+        await asyncio.gather(
+            submit(batcher, chain, OWNER_A, "a1"),
+            submit(batcher, chain, OWNER_A, "a2"),
+            submit(batcher, chain, OWNER_B, "b1"),
+            submit(batcher, chain, OWNER_B, "b2"),
+            submit(batcher, chain, OWNER_A, "a3", cid=None, operation="delete"),
+            submit(batcher, chain, OWNER_A, "a4", cid=None, operation="delete"),
+        )
+
+        groups = sorted((owner, tuple(a for a, _ in items)) for owner, items in chain.batches)
+        assert groups == [
+            (OWNER_A, ("a1", "a2")),
+            (OWNER_A, ("a3", "a4")),
+            (OWNER_B, ("b1", "b2")),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_flushes_early(self):
+        """A full batch is sent immediately instead of waiting for the window."""
+        batcher = BlockchainWriteBatcher(window=10, max_batch_size=5)
+        chain = FakeChain()
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(submit(batcher, chain, OWNER_A, f"asset-{i}") for i in range(5))),
+            timeout=1
+        )
+
+        assert len(chain.batches) == 1
+        assert len(results) == 5
+
+    @pytest.mark.asyncio
+    async def test_single_write_uses_single_send(self):
+        """A lone write is sent with the single-asset call, not a batch of one."""
+        batcher = BlockchainWriteBatcher(window=0.01)
+        chain = FakeChain()
+
+        result = await submit(batcher, chain, OWNER_A, "asset-1")
+
+        assert chain.batches == []
+        assert result == {"tx_hash": "single-asset-1", "batch_size": 1}
+
+    @pytest.mark.asyncio
+    async def test_reverted_batch_falls_back_to_individual_writes(self):
+        """If the batch reverts, only the writes that fail on their own raise."""
+        batcher = BlockchainWriteBatcher(window=0.05)
+        chain = FakeChain(batch_error=ContractLogicError("execution reverted"), bad_assets=("asset-1",))
+
+        results = await asyncio.gather(
+            *(submit(batcher, chain, OWNER_A, f"asset-{i}") for i in range(3)),
+            return_exceptions=True
+        )
+
+        assert len(chain.singles) == 3
+        assert isinstance(results[1], Exception)
+        assert results[0]["tx_hash"] == "single-asset-0"
+        assert results[2]["tx_hash"] == "single-asset-2"
+
+    @pytest.mark.asyncio
+    async def test_reverted_batch_receipt_falls_back_to_individual_writes(self):
+        """A batch mined with status 0 is not reported as sent; each delete is retried alone."""
+        batcher = BlockchainWriteBatcher(window=0.05)
+        service = make_service(batch_status=0)
+
+        results = await asyncio.gather(*(submit_delete(batcher, service, f"asset-{i}") for i in range(3)))
+
+        assert all(r["batch_size"] == 1 for r in results)
+        assert service.contract.functions.deleteAssetFor.call_count == 3
+        assert service.contract.functions.batchDeleteAssetsFor.return_value.estimate_gas.await_count == 1
+        built = service.contract.functions.batchDeleteAssetsFor.return_value.build_transaction.await_args
+        assert built.args[0]["gas"] == 120000
+
+    @pytest.mark.asyncio
+    async def test_batch_that_may_still_be_mined_is_not_retried(self):
+        """A receipt timeout fails every caller instead of sending each update a second time."""
+        batcher = BlockchainWriteBatcher(window=0.05)
+        chain = FakeChain(batch_error=TimeoutError("not mined"))
+
+        results = await asyncio.gather(
+            *(submit(batcher, chain, OWNER_A, f"asset-{i}") for i in range(3)),
+            return_exceptions=True
+        )
+
+        assert chain.singles == []
+        assert all(isinstance(result, TimeoutError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_writes_are_sent_once(self):
+        """A repeated delete in the same window shares the queued write instead of reverting the batch."""
+        batcher = BlockchainWriteBatcher(window=0.05)
+        chain = FakeChain()
+
+        results = await asyncio.gather(
+            submit(batcher, chain, OWNER_A, "asset-1", cid=None, operation="delete"),
+            submit(batcher, chain, OWNER_A, "asset-1", cid=None, operation="delete"),
+            submit(batcher, chain, OWNER_A, "asset-2", cid=None, operation="delete"),
+        )
+
+        assert chain.batches == [(OWNER_A, [("asset-1", None), ("asset-2", None)])]
+        assert {r["tx_hash"] for r in results} == {"batch-1"}
+
+    @pytest.mark.asyncio
+    async def test_later_write_to_a_queued_asset_is_sent_after_it(self):
+        """A second update of a queued asset goes in the next batch, mined after the first."""
+        batcher = BlockchainWriteBatcher(window=0.05)
+        chain = FakeChain()
+
+        await asyncio.gather(
+            submit(batcher, chain, OWNER_A, "asset-1", cid="Qm1"),
+            submit(batcher, chain, OWNER_A, "asset-2", cid="Qm1"),
+            submit(batcher, chain, OWNER_A, "asset-1", cid="Qm2"),
+        )
+
+        assert chain.batches == [(OWNER_A, [("asset-1", "Qm1"), ("asset-2", "Qm1")])]
+        assert chain.singles == [(OWNER_A, "asset-1", "Qm2")]
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending_writes(self):
+        """Shutdown sends queued writes without waiting out the window."""
+        batcher = BlockchainWriteBatcher(window=10)
+        chain = FakeChain()
+
+        pending = [asyncio.create_task(submit(batcher, chain, OWNER_A, f"asset-{i}")) for i in range(2)]
+        await asyncio.sleep(0)
+        await batcher.close()
+
+        assert len(chain.batches) == 1
+        assert all(task.done() for task in pending)
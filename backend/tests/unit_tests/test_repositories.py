@@ -1,6 +1,6 @@
 import pytest
-from unittest.mock import MagicMock, patch
-from pymongo import DESCENDING
+from unittest.mock import AsyncMock, MagicMock, patch
+from pymongo import DESCENDING, ReturnDocument
 from pymongo.errors import DuplicateKeyError, ServerSelectionTimeoutError, OperationFailure, NetworkTimeout
 from bson import ObjectId
 from datetime import datetime, timezone
@@ -13,6 +13,28 @@ from app.repositories.user_repo import UserRepository
 
 # Asset Repository Tests
 class TestAssetRepository:
+    @pytest.mark.asyncio
+    async def test_create_indexes(self, mock_db_client):
+        """Test that asset indexes include the one-current-version-per-asset constraint."""
+        mock_db_client.assets_collection.create_indexes = AsyncMock()
+        repo = AssetRepository(mock_db_client)
+
+        await repo.create_indexes()
+
+        specs = [
+            index.document
+            for call in mock_db_client.assets_collection.create_indexes.await_args_list
+            for index in call.args[0]
+        ]
+        by_name = {spec["name"]: spec for spec in specs}
+        current = by_name["assetId_current_unique"]
+        assert current["unique"] is True
+        assert current["partialFilterExpression"] == {"isCurrent": True}
+        assert list(by_name["assetId_versionNumber"]["key"]) == ["assetId", "versionNumber"]
+        assert list(by_name["walletAddressLower_isCurrent_isDeleted_lastUpdated_id"]["key"]) == [
+            "walletAddressLower", "isCurrent", "isDeleted", "lastUpdated", "_id"
+        ]
+
     @pytest.mark.asyncio
     async def test_insert_asset(self, mock_db_client):
         """Test inserting a new asset document."""
@@ -41,6 +63,150 @@ class TestAssetRepository:
         assert result == str(mock_result.inserted_id)
         mock_db_client.assets_collection.insert_one.assert_called_once_with(document)
     
+    @pytest.mark.asyncio
+    async def test_backfill_lowercase_fields(self, mock_db_client):
+        """Test that the backfill updates documents in batches until none are left."""
+        batches = [[{"_id": 1}, {"_id": 2}], [{"_id": 3}], []]
+
+        def find(query, projection):
+            assert query == {"walletAddressLower": {"$exists": False}, "walletAddress": {"$type": "string"}}
+            cursor = MagicMock()
+            cursor.limit.return_value.to_list = AsyncMock(return_value=batches.pop(0))
+            return cursor
+
+        mock_db_client.assets_collection.find = find
+        mock_db_client.assets_collection.update_many = AsyncMock(
+            side_effect=[MagicMock(modified_count=2), MagicMock(modified_count=1)]
+        )
+        repo = AssetRepository(mock_db_client)
+
+        result = await repo.backfill_lowercase_fields({"walletAddress": "walletAddressLower"}, batch_size=2)
+
+        assert result == 3
+        first_update = mock_db_client.assets_collection.update_many.await_args_list[0].args
+        assert first_update == (
+            {"_id": {"$in": [1, 2]}},
+            [{"$set": {"walletAddressLower": {"$toLower": "$walletAddress"}}}]
+        )
+
+    @pytest.mark.asyncio
+    async def test_unset_fields(self, mock_db_client):
+        """Test that fields are removed in batches until no document has them."""
+        batches = [[{"_id": 1}, {"_id": 2}], []]
+
+        def find(query, projection):
+            assert query == {"$or": [{"documentHistory": {"$exists": True}}]}
+            cursor = MagicMock()
+            cursor.limit.return_value.to_list = AsyncMock(return_value=batches.pop(0))
+            return cursor
+
+        mock_db_client.assets_collection.find = find
+        mock_db_client.assets_collection.update_many = AsyncMock(return_value=MagicMock(modified_count=2))
+        repo = AssetRepository(mock_db_client)
+
+        result = await repo.unset_fields(["documentHistory"], batch_size=2)
+
+        assert result == 2
+        mock_db_client.assets_collection.update_many.assert_awaited_once_with(
+            {"_id": {"$in": [1, 2]}},
+            {"$unset": {"documentHistory": ""}}
+        )
+
+    @pytest.mark.asyncio
+    async def test_claim_current_version(self, mock_db_client):
+        """Test that the current version is flipped and returned in one find_one_and_update."""
+        doc_id = ObjectId()
+        mock_db_client.assets_collection.find_one_and_update = AsyncMock(
+            return_value={"_id": doc_id, "assetId": "test-asset-123", "versionNumber": 2, "isCurrent": True}
+        )
+        repo = AssetRepository(mock_db_client)
+
+        result = await repo.claim_current_version("test-asset-123")
+
+        assert result["_id"] == str(doc_id)
+        assert result["versionNumber"] == 2
+        query, update = mock_db_client.assets_collection.find_one_and_update.await_args.args
+        assert query == {"assetId": "test-asset-123", "isCurrent": True}
+        assert update["$set"]["isCurrent"] is False
+        assert isinstance(update["$set"]["claimedAt"], datetime)
+        assert mock_db_client.assets_collection.find_one_and_update.await_args.kwargs == {
+            "return_document": ReturnDocument.BEFORE
+        }
+
+    @pytest.mark.parametrize("claimed_at, restored", [
+        (datetime(2025, 1, 1, 0, 0), True),
+        (datetime(2025, 1, 1, 0, 10), False),
+        (None, True),
+    ], ids=["abandoned", "in-progress", "unrecorded"])
+    @pytest.mark.asyncio
+    async def test_restore_current_version(self, mock_db_client, claimed_at, restored):
+        """Test that only versions claimed before the cutoff are made current again."""
+        doc_id = ObjectId()
+        latest = {"_id": doc_id, "assetId": "test-asset-123", "versionNumber": 3, "isCurrent": False}
+        if claimed_at:
+            latest["claimedAt"] = claimed_at
+        collection = mock_db_client.assets_collection
+        collection.find_one = AsyncMock(return_value=None)
+        collection.find.return_value.sort.return_value.limit.return_value.to_list = AsyncMock(return_value=[latest])
+        collection.find_one_and_update = AsyncMock(return_value={**latest, "isCurrent": True})
+        repo = AssetRepository(mock_db_client)
+
+        result = await repo.restore_current_version("test-asset-123", datetime(2025, 1, 1, 0, 5, tzinfo=timezone.utc))
+
+        assert (result is not None) == restored
+        collection.find.return_value.sort.assert_called_once_with("versionNumber", DESCENDING)
+        if restored:
+            assert result["_id"] == str(doc_id)
+            collection.find_one_and_update.assert_awaited_once_with(
+                {"_id": doc_id, "isCurrent": False},
+                {"$set": {"isCurrent": True}},
+                return_document=ReturnDocument.AFTER
+            )
+        else:
+            collection.find_one_and_update.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_restore_current_version_loses_to_a_new_version(self, mock_db_client):
+        """Test that a restore rejected by the one-current-version index restores nothing."""
+        collection = mock_db_client.assets_collection
+        collection.find_one = AsyncMock(return_value=None)
+        collection.find.return_value.sort.return_value.limit.return_value.to_list = AsyncMock(
+            return_value=[{"_id": ObjectId(), "assetId": "test-asset-123", "versionNumber": 3, "isCurrent": False}]
+        )
+        collection.find_one_and_update = AsyncMock(side_effect=DuplicateKeyError("assetId_current_unique"))
+        repo = AssetRepository(mock_db_client)
+
+        assert await repo.restore_current_version("test-asset-123", datetime.now(timezone.utc)) is None
+
+    @pytest.mark.asyncio
+    async def test_run_in_transaction_without_support(self, mock_db_client):
+        """Test that operations run without a session when transactions are unavailable."""
+        mock_db_client.supports_transactions = AsyncMock(return_value=False)
+        repo = AssetRepository(mock_db_client)
+        operation = AsyncMock(return_value="done")
+
+        assert await repo.run_in_transaction(operation) == "done"
+        operation.assert_awaited_once_with(None)
+
+    @pytest.mark.asyncio
+    async def test_run_in_transaction_with_support(self, mock_db_client):
+        """Test that operations run through with_transaction on a session when supported."""
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+
+        async def with_transaction(operation):
+            return await operation(session)
+
+        session.with_transaction = AsyncMock(side_effect=with_transaction)
+        mock_db_client.supports_transactions = AsyncMock(return_value=True)
+        mock_db_client.client.start_session = AsyncMock(return_value=session)
+        repo = AssetRepository(mock_db_client)
+        operation = AsyncMock(return_value="done")
+
+        assert await repo.run_in_transaction(operation) == "done"
+        operation.assert_awaited_once_with(session)
+    
     @pytest.mark.asyncio
     async def test_find_asset(self, mock_db_client):
         """Test finding an asset by query."""
@@ -426,6 +592,19 @@ class TestAuthRepository:
 
 # Transaction Repository Tests
 class TestTransactionRepository:
+    @pytest.mark.asyncio
+    async def test_create_indexes(self, mock_db_client):
+        """Test that every transaction lookup field is indexed together with timestamp."""
+        mock_db_client.transaction_collection.create_indexes = AsyncMock()
+        repo = TransactionRepository(mock_db_client)
+
+        await repo.create_indexes()
+
+        indexes = mock_db_client.transaction_collection.create_indexes.await_args.args[0]
+        keys = [list(index.document["key"].items()) for index in indexes]
+        for field in ("assetId", "walletAddressLower", "performedByLower"):
+            assert [(field, 1), ("timestamp", DESCENDING)] in keys
+
     @pytest.mark.asyncio
     async def test_insert_transaction(self, mock_db_client):
         """Test inserting a new transaction record."""
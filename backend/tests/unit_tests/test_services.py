@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 from datetime import datetime, timezone
@@ -16,6 +17,47 @@ from app.services.ipfs_service import IPFSService
 from app.schemas.user_schema import UserCreate
 
 
+class InterleavingAssetRepository:
+    """In-memory repository without transactions that yields to the event loop on every round trip."""
+
+    def __init__(self, current=True, claimed_at=None):
+        self.documents = [{"_id": str(ObjectId()), "assetId": "a1", "versionNumber": 1, "isCurrent": current}]
+        if claimed_at is not None:
+            self.documents[0]["claimedAt"] = claimed_at
+
+    async def run_in_transaction(self, operation):
+        return await operation(None)
+
+    async def claim_current_version(self, asset_id, session=None):
+        await asyncio.sleep(0)
+        for doc in self.documents:
+            if doc["assetId"] == asset_id and doc["isCurrent"]:
+                doc["isCurrent"] = False
+                doc["claimedAt"] = datetime.now(timezone.utc)
+                return {**doc, "isCurrent": True}
+        return None
+
+    async def restore_current_version(self, asset_id, claimed_before):
+        await asyncio.sleep(0)
+        versions = [d for d in self.documents if d["assetId"] == asset_id]
+        if not versions or any(d["isCurrent"] for d in versions):
+            return None
+        latest = max(versions, key=lambda d: d["versionNumber"])
+        if latest.get("claimedAt") and latest["claimedAt"] >= claimed_before:
+            return None
+        latest["isCurrent"] = True
+        return latest
+
+    async def find_asset(self, query):
+        await asyncio.sleep(0)
+        return next((d for d in self.documents if d["assetId"] == query["assetId"]), None)
+
+    async def insert_asset(self, document, session=None):
+        await asyncio.sleep(0)
+        self.documents.append({"_id": str(ObjectId()), **document})
+        return self.documents[-1]["_id"]
+
+
 # Asset Service Tests - focusing on business logic not tested in repositories
 class TestAssetServiceLogic:
     @pytest.mark.asyncio
@@ -32,8 +74,7 @@ class TestAssetServiceLogic:
             "isDeleted": False,
             "documentHistory": ["doc1", "doc2"]  # Previous versions
         }
-        mock_asset_repo.find_asset.return_value = current_version
-        mock_asset_repo.update_asset.return_value = True
+        mock_asset_repo.claim_current_version.return_value = current_version
         mock_asset_repo.insert_asset.return_value = "doc456"
         
         # Initialize service with mock repository
@@ -52,14 +93,14 @@ class TestAssetServiceLogic:
         # Verify the version number was incremented to 4
         assert result["version_number"] == 4
         
-        # Verify the document history includes the previous version
+        # Verify the new version links to the previous one without copying its history
         insert_call_args = mock_asset_repo.insert_asset.call_args[0][0]
-        assert valid_id in insert_call_args["documentHistory"]
         assert insert_call_args["previousVersionId"] == valid_id
+        assert "documentHistory" not in insert_call_args
     
     @pytest.mark.asyncio
-    async def test_create_new_version_marks_previous_as_not_current(self, mock_asset_repo):
-        """Test that creating a new version updates the current flag on the previous version."""
+    async def test_create_new_version_claims_current_version(self, mock_asset_repo):
+        """Test that the previous version is claimed atomically rather than read and then updated."""
         # Mock the current version with a valid ObjectId
         valid_id = str(ObjectId())
         current_version = {
@@ -71,8 +112,7 @@ class TestAssetServiceLogic:
             "isDeleted": False,
             "documentHistory": []
         }
-        mock_asset_repo.find_asset.return_value = current_version
-        mock_asset_repo.update_asset.return_value = True
+        mock_asset_repo.claim_current_version.return_value = current_version
         mock_asset_repo.insert_asset.return_value = "doc456"
         
         # Initialize service with mock repository
@@ -88,10 +128,116 @@ class TestAssetServiceLogic:
             non_critical_metadata={"tags": ["updated", "test"]}
         )
         
-        # Verify the previous version was marked as not current
-        update_call_args = mock_asset_repo.update_asset.call_args[0]
-        assert update_call_args[0]["_id"] == ObjectId(valid_id)
-        assert update_call_args[1]["$set"]["isCurrent"] is False
+        # Verify the previous version was claimed in one call, with no separate read or update
+        mock_asset_repo.claim_current_version.assert_awaited_once_with("test-asset-123", session=None)
+        mock_asset_repo.find_asset.assert_not_called()
+        mock_asset_repo.update_asset.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_new_version_retries_while_another_update_holds_the_asset(self, mock_asset_repo):
+        """Test that a writer that loses the claim backs off and builds on the winner's version."""
+        winner_version = {
+            "_id": str(ObjectId()),
+            "assetId": "test-asset-123",
+            "versionNumber": 2,
+            "isCurrent": True,
+            "isDeleted": False
+        }
+        mock_asset_repo.claim_current_version.side_effect = [None, None, winner_version]
+        mock_asset_repo.find_asset.return_value = {"_id": str(ObjectId()), "assetId": "test-asset-123"}
+        mock_asset_repo.insert_asset.return_value = "doc789"
+        service = AssetService(mock_asset_repo, rollover_backoff=0)
+
+        result = await service.create_new_version(
+            asset_id="test-asset-123",
+            wallet_address="0x1234567890123456789012345678901234567890",
+            smart_contract_tx_id="0xabc123",
+            ipfs_hash="QmNewHash456",
+            critical_metadata={"name": "Updated Asset"}
+        )
+
+        assert result["version_number"] == 3
+        assert mock_asset_repo.claim_current_version.await_count == 3
+        mock_asset_repo.insert_asset.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_new_versions_leave_one_current_version(self):
+        """Test that concurrent updates to one asset produce a linear history with one current version."""
+        repo = InterleavingAssetRepository()
+        service = AssetService(repo, max_rollover_attempts=50, rollover_backoff=0.0005)
+
+        await asyncio.gather(*(
+            service.create_new_version("a1", "0x1234567890123456789012345678901234567890", f"0x{i}", "Qm", {})
+            for i in range(20)
+        ))
+
+        assert [d["versionNumber"] for d in repo.documents if d["isCurrent"]] == [21]
+        assert sorted(d["versionNumber"] for d in repo.documents) == list(range(1, 22))
+
+    @pytest.mark.asyncio
+    async def test_abandoned_claim_is_repaired_instead_of_retried(self):
+        """Test that an asset left without a current version by a crashed update can be updated again."""
+        repo = InterleavingAssetRepository(current=False, claimed_at=datetime(2025, 1, 1, tzinfo=timezone.utc))
+        service = AssetService(repo, rollover_backoff=10)
+
+        result = await asyncio.wait_for(
+            service.create_new_version("a1", "0x1234567890123456789012345678901234567890", "0x1", "Qm", {}),
+            timeout=1
+        )
+
+        assert result["version_number"] == 2
+        assert [d["versionNumber"] for d in repo.documents if d["isCurrent"]] == [2]
+
+    @pytest.mark.asyncio
+    async def test_claims_in_progress_are_not_repaired(self):
+        """Test that a version claimed moments ago is left to the writer that claimed it."""
+        repo = InterleavingAssetRepository(current=False, claimed_at=datetime.now(timezone.utc))
+        service = AssetService(repo, max_rollover_attempts=2, rollover_backoff=0)
+
+        with pytest.raises(RuntimeError, match="too many concurrent updates"):
+            await service.create_new_version("a1", "0x1234567890123456789012345678901234567890", "0x1", "Qm", {})
+
+        assert not any(d["isCurrent"] for d in repo.documents)
+
+    @pytest.mark.asyncio
+    async def test_create_new_version_of_missing_asset_fails_without_retrying(self, mock_asset_repo):
+        mock_asset_repo.claim_current_version.return_value = None
+        mock_asset_repo.find_asset.return_value = None
+        service = AssetService(mock_asset_repo)
+
+        with pytest.raises(ValueError, match="Asset not found"):
+            await service.create_new_version(
+                asset_id="missing-asset",
+                wallet_address="0x1234567890123456789012345678901234567890",
+                smart_contract_tx_id="0xabc123",
+                ipfs_hash="QmNewHash456",
+                critical_metadata={"name": "Updated Asset"}
+            )
+
+        assert mock_asset_repo.claim_current_version.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_create_new_version_restores_claim_when_insert_fails(self, mock_asset_repo):
+        """Test that without a transaction a failed insert hands the current flag back."""
+        valid_id = str(ObjectId())
+        mock_asset_repo.claim_current_version.return_value = {
+            "_id": valid_id, "assetId": "test-asset-123", "versionNumber": 1, "isCurrent": True
+        }
+        mock_asset_repo.insert_asset.side_effect = Exception("write failed")
+        service = AssetService(mock_asset_repo)
+
+        with pytest.raises(Exception, match="write failed"):
+            await service.create_new_version(
+                asset_id="test-asset-123",
+                wallet_address="0x1234567890123456789012345678901234567890",
+                smart_contract_tx_id="0xabc123",
+                ipfs_hash="QmNewHash456",
+                critical_metadata={"name": "Updated Asset"}
+            )
+
+        mock_asset_repo.update_asset.assert_awaited_once_with(
+            {"_id": ObjectId(valid_id)}, {"$set": {"isCurrent": True}}
+        )
     
     @pytest.mark.asyncio
     async def test_create_new_version_of_deleted_asset_undeletes(self, mock_asset_repo):
@@ -107,8 +253,7 @@ class TestAssetServiceLogic:
             "isDeleted": True,  # Asset is deleted
             "documentHistory": []
         }
-        mock_asset_repo.find_asset.return_value = deleted_version
-        mock_asset_repo.update_asset.return_value = True
+        mock_asset_repo.claim_current_version.return_value = deleted_version
         mock_asset_repo.update_assets.return_value = 1  # One document undeleted
         mock_asset_repo.insert_asset.return_value = "doc456"
         
@@ -162,7 +307,86 @@ class TestAssetServiceLogic:
         assert update_call_args[1]["$set"]["isDeleted"] is True
         assert update_call_args[1]["$set"]["deletedBy"] == "0x1234567890123456789012345678901234567890"
         assert "deletedAt" in update_call_args[1]["$set"]
-        
+
+    @pytest.mark.asyncio
+    async def test_migrate_version_history_strips_document_history(self, mock_asset_repo):
+        mock_asset_repo.unset_fields = AsyncMock(return_value=7)
+        service = AssetService(mock_asset_repo)
+
+        result = await service.migrate_version_history(batch_size=500)
+
+        mock_asset_repo.unset_fields.assert_awaited_once_with(["documentHistory"], batch_size=500)
+        assert result == {"status": "completed", "migrated": 7}
+
+    @pytest.mark.asyncio
+    async def test_get_user_assets_queries_lowercase_field(self, mock_asset_repo):
+        """Test that wallet listings use an exact match on walletAddressLower instead of a regex."""
+        mock_asset_repo.find_assets_page = AsyncMock(return_value=[])
+        service = AssetService(mock_asset_repo)
+
+        await service.get_user_assets("0xAbCdEf1234567890abcdef1234567890ABCDEF12")
+
+        query = mock_asset_repo.find_assets_page.call_args[0][0]
+        assert query == {
+            "walletAddressLower": "0xabcdef1234567890abcdef1234567890abcdef12",
+            "isCurrent": True,
+            "isDeleted": False
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_user_assets_looks_up_creation_times_in_one_query(self, mock_asset_repo):
+        """Test that assets without createdAt share a single version 1 lookup instead of one per asset."""
+        stored_created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        first_version_id = ObjectId()
+        mock_asset_repo.find_assets_page = AsyncMock(return_value=[
+            {"_id": str(ObjectId()), "assetId": "a1", "createdAt": stored_created_at, "lastUpdated": stored_created_at},
+            {"_id": str(ObjectId()), "assetId": "a2", "lastUpdated": stored_created_at},
+            {"_id": str(ObjectId()), "assetId": "a3", "lastUpdated": stored_created_at},
+        ])
+        mock_asset_repo.find_assets.return_value = [{"_id": str(first_version_id), "assetId": "a2"}]
+        service = AssetService(mock_asset_repo)
+
+        assets = await service.get_user_assets("0x1234567890123456789012345678901234567890")
+
+        mock_asset_repo.find_asset.assert_not_called()
+        mock_asset_repo.find_assets.assert_called_once_with({"assetId": {"$in": ["a2", "a3"]}, "versionNumber": 1})
+        created = {asset["assetId"]: asset["createdAt"] for asset in assets}
+        assert created["a1"] == stored_created_at.isoformat()
+        assert created["a2"] == first_version_id.generation_time.isoformat()
+        assert created["a3"] == stored_created_at.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_get_user_assets_page_cursor_round_trip(self, mock_asset_repo):
+        """Test that a full page returns a cursor that resumes after its last asset."""
+        updated = [datetime(2024, 1, day, tzinfo=timezone.utc) for day in (3, 2, 1)]
+        ids = [ObjectId() for _ in updated]
+        docs = [
+            {"_id": str(i), "assetId": f"a{n}", "createdAt": u, "lastUpdated": u}
+            for n, (i, u) in enumerate(zip(ids, updated))
+        ]
+        mock_asset_repo.find_assets_page = AsyncMock(return_value=docs)
+        service = AssetService(mock_asset_repo)
+
+        page = await service.get_user_assets_page("0x1234567890123456789012345678901234567890", limit=2)
+
+        assert [a["assetId"] for a in page["assets"]] == ["a0", "a1"]
+        assert mock_asset_repo.find_assets_page.call_args.kwargs["limit"] == 3
+
+        await service.get_user_assets_page("0x1234567890123456789012345678901234567890", limit=2, after=page["next_cursor"])
+
+        query = mock_asset_repo.find_assets_page.call_args[0][0]
+        assert query["$or"] == [
+            {"lastUpdated": {"$lt": updated[1]}},
+            {"lastUpdated": updated[1], "_id": {"$lt": ids[1]}}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_user_assets_page_rejects_bad_cursor(self, mock_asset_repo):
+        service = AssetService(mock_asset_repo)
+
+        with pytest.raises(ValueError):
+            await service.get_user_assets_page("0x1234567890123456789012345678901234567890", limit=2, after="not-a-cursor")
+
 
 # Auth Service Tests - focusing on business logic not tested in repositories
 class TestWalletAuthProviderLogic:
@@ -321,6 +545,19 @@ class TestTransactionServiceLogic:
         # Verify repository not called
         mock_transaction_repo.insert_transaction.assert_not_called()
     
+    @pytest.mark.asyncio
+    async def test_record_transaction_writes_lowercase_addresses(self, mock_transaction_repo):
+        """Test that recorded transactions carry normalized address fields for indexed lookups."""
+        mock_transaction_repo.insert_transaction.return_value = "tx1"
+        service = TransactionService(mock_transaction_repo)
+
+        await service.record_transaction("asset1", "CREATE", "0xABCdef", "0xDEFabc")
+
+        document = mock_transaction_repo.insert_transaction.call_args[0][0]
+        assert document["walletAddress"] == "0xABCdef"
+        assert document["walletAddressLower"] == "0xabcdef"
+        assert document["performedByLower"] == "0xdefabc"
+
     @pytest.mark.asyncio
     async def test_get_transaction_summary_aggregation(self, mock_transaction_repo):
         """Test that get_transaction_summary correctly aggregates transaction data."""
@@ -375,7 +612,7 @@ class TestTransactionServiceLogic:
         
         # Verify repository was called correctly
         mock_transaction_repo.find_transactions.assert_called_once_with(
-            {"walletAddress": wallet_address}
+            {"walletAddressLower": wallet_address.lower()}
         )
     
     @pytest.mark.asyncio
@@ -629,16 +866,9 @@ class TestIPFSServiceLogic:
         # Mock storage service URL
         service.storage_service_url = "http://storage_service"
         
-        # Create test context
-        class AsyncContextManager:
-            async def __aenter__(self):
-                return mock_client
-                
-            async def __aexit__(self, exc_type, exc_val, exc_tb):
-                pass
-        
-        # Mock httpx.AsyncClient
-        monkeypatch.setattr("httpx.AsyncClient", lambda **kwargs: AsyncContextManager())
+        # Mock the shared HTTP client
+        monkeypatch.setattr("app.services.ipfs_service.get_http_client", lambda: mock_client)
+        monkeypatch.setattr("app.services.ipfs_service.settings.ipfs_gateway_hedging", False)
         
         # Call method with a CID
         cid = "QmTest123"
@@ -0,0 +1,50 @@
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { computeCID } from './utilities.js';
+
+/**
+ * Checks the backend's CID parity corpus against this service's computeCID.
+ *
+ * Each corpus entry is either a file from test_data/json (payload: null) or an
+ * inline payload exactly as the backend sends it to /calculate-cid.
+ *
+ * Usage: node cid-corpus.js [--write]
+ *   --write  update the expected CIDs in the corpus instead of failing on mismatch
+ */
+const here = path.dirname(fileURLToPath(import.meta.url));
+const repoRoot = path.resolve(here, '..');
+const corpusPath = path.join(repoRoot, 'backend', 'tests', 'fixtures', 'cid_parity.json');
+const write = process.argv.includes('--write');
+
+(async () => {
+  const corpus = JSON.parse(await fs.promises.readFile(corpusPath, 'utf8'));
+  const tmpDir = await fs.promises.mkdtemp(path.join(os.tmpdir(), 'cid-corpus-'));
+  let mismatches = 0;
+
+  try {
+    for (const [index, entry] of corpus.entries.entries()) {
+      let filePath = path.join(repoRoot, entry.source);
+      if (entry.payload !== null) {
+        filePath = path.join(tmpDir, `payload-${index}.json`);
+        await fs.promises.writeFile(filePath, entry.payload, 'utf8');
+      }
+
+      const cid = await computeCID(filePath);
+      if (cid !== entry.cid) {
+        mismatches++;
+        console.log(`${write ? 'updated' : 'MISMATCH'} ${entry.source}${entry.payload !== null ? ' (payload)' : ''}: ${entry.cid} -> ${cid}`);
+        entry.cid = cid;
+      }
+    }
+  } finally {
+    await fs.promises.rm(tmpDir, { recursive: true, force: true });
+  }
+
+  if (write) {
+    await fs.promises.writeFile(corpusPath, JSON.stringify(corpus, null, 2) + '\n');
+  }
+  console.log(`${corpus.entries.length} entries checked, ${mismatches} mismatches`);
+  process.exit(mismatches && !write ? 1 : 0);
+})();